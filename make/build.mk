@@ -30,6 +30,37 @@ ifeq ($(SHOWSTATIC), true)
 PYFLAGS += --show-static
 endif
 
+# 3. Se ENGINE è impostato, aggiungi --engine
+ifneq ($(ENGINE),)
+PYFLAGS += --engine $(ENGINE)
+endif
+
+# 4. Se JOBS > 1, genera gli stream (e renderizza gli stem) in parallelo
+ifneq ($(JOBS),1)
+PYFLAGS += --jobs $(JOBS)
+endif
+
+# 5. Se FROM/TO sono impostati, genera solo l'estratto [FROM, TO)
+ifneq ($(FROM),)
+PYFLAGS += --from $(FROM)
+endif
+ifneq ($(TO),)
+PYFLAGS += --to $(TO)
+endif
+
+# 6. Se COMPACT è true, score con codifica compatta (+ report)
+ifeq ($(COMPACT), true)
+PYFLAGS += --compact
+endif
+ifneq ($(PRECISION),)
+PYFLAGS += --precision $(PRECISION)
+endif
+
+# 7. Se STABLETABLES è true, numeri ftable derivati dal contenuto
+ifeq ($(STABLETABLES), true)
+PYFLAGS += --stable-tables
+endif
+
 ifeq ($(AUTOKILL),true)
 ALL_PRE += rx-stop
 endif
@@ -59,19 +90,12 @@ all: $(ALL_PRE) stems-build
 stems-build: venv-setup $(CACHEDIR)
 	@echo "[STEMS] Pulizia score intermedi..."
 	rm -f $(GENDIR)/*.sco
-	$(PYTHON_VENV) $(INCDIR)/main.py $(YMLDIR)/$(FILE).yml $(GENDIR)/$(FILE).sco $(PYFLAGS)
-	@for sco in $(GENDIR)/*.sco; do \
-		[ -f "$$sco" ] || continue; \
-		stem=$$(basename $$sco .sco); \
-		csound \
-			--env:INCDIR+=$(PWD_DIR)/$(INCDIR) \
-			--env:SSDIR+=$(PWD_DIR)/$(SSDIR) \
-			--env:SFDIR=$(PWD_DIR)/$(SFDIR) \
-			-m 134 \
-			$(CSDIR)/main.orc $$sco \
-			--logfile=$(LOGDIR)/$$stem.log \
-			-o $(SFDIR)/$$stem.aif; \
-	done
+	$(PYTHON_VENV) $(INCDIR)/main.py $(YMLDIR)/$(FILE).yml $(GENDIR)/$(FILE).sco $(PYFLAGS) \
+		--render \
+		--orc $(CSDIR)/main.orc \
+		--ss-dir $(PWD_DIR)/$(SSDIR) \
+		--sf-dir $(SFDIR) \
+		--log-dir $(LOGDIR)
 	@if [ "$(AUTOPEN)" = "true" ]; then \
 		for aif in $(SFDIR)/*.aif; do $(OPEN_CMD) "$$aif"; done; \
 	fi
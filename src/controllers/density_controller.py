@@ -5,13 +5,33 @@ Implementa il modello Truax per la distribuzione temporale:
 - SYNCHRONOUS (distribution=0): inter-onset fisso
 - ASYNCHRONOUS (distribution=1): random(0, 2×avg)
 - INTERPOLAZIONE: blend lineare tra i due
+
+Due interfacce per la ricorrenza degli onset:
+- calculate_inter_onset(): un passo alla volta (ScalarGrainEngine)
+- schedule_onsets(): schedule a blocchi con predittore/correttore
+  (VectorizedGrainEngine); in modalita' integral_density gli onset
+  vengono dall'inversione di N(t) = integrale di density
 """
 
 import random
+from bisect import bisect_right
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
 from parameters.parameter_schema import DENSITY_PARAMETER_SCHEMA
 from strategies.strategy_registry import StrategyFactory, DENSITY_STRATEGIES
+from strategies.strategie import IntegralDensityStrategy
 from core.stream_config import StreamConfig
 from parameters.parameter_orchestrator import ParameterOrchestrator
+from parameters.parameter import Parameter
+from shared.rng import child_rng, batch_generator
+
+# Scheduler a blocchi (schedule_onsets)
+SCHEDULE_BLOCK_SIZE = 1024
+SCHEDULE_MIN_BLOCK_SIZE = 16
+SCHEDULE_MAX_ITERATIONS = 8
+SCHEDULE_TOLERANCE = 1e-12
 
 class DensityController:
     """
@@ -23,6 +43,9 @@ class DensityController:
        
     2. DENSITY diretta: valore fisso o Envelope
        - Controllo esplicito della densità in grani/secondo
+
+    3. INTEGRAL_DENSITY: come density, ma onset dove N(t) = k
+       - Conteggio e posizione dei grani esatti, calcolati in blocco
     """
     
     def __init__(
@@ -52,6 +75,11 @@ class DensityController:
             self._loaded_params  # Passa tutti i params per accedere a 'distribution'
         )
         self.distribution_param = self._loaded_params['distribution']
+        # Sorgente della componente asincrona Truax (None = modulo random)
+        self._rng = child_rng(config.rng, 'density.truax')
+        # Checkpoint di schedule_onsets(): {block_size: [(onset, size, stato rng)]}
+        self._checkpoints = {}
+        self._initial_rng_state = None if self._rng is None else self._rng.generator.bit_generator.state
     
     def _find_selected_param(self) -> str:
         """
@@ -112,12 +140,251 @@ class DensityController:
             return avg_iot
         else:
             # Async: random 0..2×avg
-            async_iot = random.uniform(0.0, 2.0 * avg_iot)
+            async_iot = (self._rng or random).uniform(0.0, 2.0 * avg_iot)
             
             # Blend lineare tra sync e async
             return (1.0 - dist_val) * avg_iot + dist_val * async_iot
     
     
+    # =========================================================================
+    # SCHEDULE A BLOCCHI
+    # =========================================================================
+
+    def schedule_onsets(
+        self,
+        stream_duration: float,
+        grain_duration: Union[float, Parameter],
+        block_size: int = SCHEDULE_BLOCK_SIZE,
+        from_time: float = 0.0
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Versione batch della ricorrenza
+        onset[i+1] = onset[i] + calculate_inter_onset(onset[i], dur[i]).
+        
+        Per ogni blocco di block_size grani:
+        1. jitter Truax estratto in anticipo (un uniforme [0, 1) per grano)
+        2. predittore: tutti i parametri valutati all'inizio del blocco,
+           onset con np.cumsum degli IOT
+        3. correttore: parametri rivalutati sugli onset predetti, nuovo
+           cumsum; si ripete finche' gli onset non cambiano
+        
+        La ricorrenza e' triangolare (l'onset i dipende solo dai precedenti):
+        dopo k iterazioni i primi k onset sono esatti. Se un envelope cambia
+        piu' in fretta del blocco e SCHEDULE_MAX_ITERATIONS non bastano, il
+        blocco si ferma al prefisso convergente e il successivo riparte da li'.
+        
+        Le componenti stocastiche dei parametri (range, gate) usano un
+        Generator per blocco, ricreato a ogni iterazione: stesse estrazioni,
+        quindi la correzione converge. Con distribution=0 e parametri
+        deterministici gli onset coincidono con calculate_inter_onset().
+        
+        Checkpoint: all'inizio di ogni blocco vengono salvati onset,
+        dimensione del blocco e stato del Generator (con seed). Con
+        from_time > 0 lo schedule riparte dall'ultimo checkpoint <= from_time
+        invece che da 0: con seed la sequenza e' identica a quella completa.
+        
+        Args:
+            stream_duration: fine dello schedule (onset < stream_duration)
+            grain_duration: durata costante (float) o Parameter
+            block_size: grani per blocco
+            from_time: restituisce solo gli onset >= from_time
+            
+        Yields:
+            (elapsed_times, durations): array float64 non vuoti, in ordine
+        """
+        if isinstance(self._strategy, IntegralDensityStrategy):
+            yield from self._schedule_integral(stream_duration, grain_duration, block_size, from_time)
+            return
+
+        current, size = self._restore_checkpoint(from_time, block_size)
+        while current < stream_duration:
+            self._save_checkpoint(current, size, block_size)
+            block_rng = batch_generator(self._rng)
+            jitter = block_rng.random(size)
+            seed = int(block_rng.integers(2 ** 63))
+            onsets, durations, next_onset = self._solve_block(current, jitter, seed, grain_duration)
+            
+            skip = int(np.searchsorted(onsets, from_time))
+            keep = int(np.searchsorted(onsets, stream_duration))
+            if keep > skip:
+                yield onsets[skip:keep], durations[skip:keep]
+            if keep < len(onsets):
+                return
+            current = next_onset
+            # Blocco adattivo: si accorcia dove l'envelope cambia piu' in
+            # fretta del blocco, torna a crescere quando converge per intero
+            if len(onsets) < size:
+                size = min(max(2 * len(onsets), SCHEDULE_MIN_BLOCK_SIZE), block_size)
+            else:
+                size = min(2 * size, block_size)
+
+    def _save_checkpoint(self, onset: float, size: int, block_size: int) -> None:
+        """Checkpoint a inizio blocco (solo onset nuovi, in ordine)."""
+        checkpoints = self._checkpoints.setdefault(block_size, [])
+        if checkpoints and onset <= checkpoints[-1][0]:
+            return
+        state = None if self._rng is None else self._rng.generator.bit_generator.state
+        checkpoints.append((onset, size, state))
+
+    def _restore_checkpoint(self, time: float, block_size: int) -> Tuple[float, int]:
+        """
+        Ultimo checkpoint con onset <= time (o l'inizio dello stream).
+        
+        Ripristina lo stato del Generator con seed; senza seed la ripresa
+        e' statisticamente equivalente, non identica.
+        
+        Returns:
+            (onset, size): onset e dimensione del blocco da cui ripartire
+        """
+        checkpoints = self._checkpoints.get(block_size, [])
+        index = bisect_right([onset for onset, _, _ in checkpoints], time) - 1
+        if index < 0:
+            onset, size, state = 0.0, block_size, self._initial_rng_state
+        else:
+            onset, size, state = checkpoints[index]
+        if state is not None:
+            self._rng.generator.bit_generator.state = state
+        return onset, size
+
+    def seek(self, time: float, grain_duration: Union[float, Parameter]) -> float:
+        """
+        Primo onset >= time, senza generare le colonne dei grani.
+        
+        - integral_density: t_k con k = ceil(N(time)), O(log n) (onset
+          sincrono, prima della perturbazione di distribution)
+        - ricorrenza: schedule a blocchi dall'ultimo checkpoint <= time
+        
+        Args:
+            time: tempo di ripresa (secondi dall'inizio dello stream)
+            grain_duration: come in schedule_onsets()
+        """
+        if isinstance(self._strategy, IntegralDensityStrategy):
+            return self._strategy.next_onset(time)
+        for onsets, _ in self.schedule_onsets(float('inf'), grain_duration, from_time=time):
+            return float(onsets[0])
+        return float('inf')
+
+    def _solve_block(
+        self,
+        start: float,
+        jitter: np.ndarray,
+        seed: int,
+        grain_duration
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Predittore/correttore su un blocco che parte da start.
+        
+        Returns:
+            (onsets, durations, next_onset): grani risolti (prefisso
+            convergente) e onset da cui riparte il blocco successivo
+        """
+        onsets = np.full(len(jitter) + 1, start)
+        for _ in range(SCHEDULE_MAX_ITERATIONS):
+            times = onsets[:-1]
+            inter_onsets, _ = self._block_inter_onsets(times, jitter, seed, grain_duration, log_clips=False)
+            # cumsum a partire da start: stesse somme del loop sequenziale
+            updated = np.cumsum(np.concatenate(([start], inter_onsets)))
+            changed = np.abs(updated - onsets) > SCHEDULE_TOLERANCE * np.maximum(1.0, np.abs(updated))
+            onsets = updated
+            if not changed.any():
+                break
+
+        # Valutazione finale (con log dei clip) sui tempi dell'ultima iterazione
+        _, durations = self._block_inter_onsets(times, jitter, seed, grain_duration, log_clips=True)
+        if not changed.any():
+            return onsets[:-1], durations, float(onsets[-1])
+        # Onset[first] e' calcolato da predecessori gia' convergenti: e' esatto
+        first = int(np.argmax(changed))
+        return onsets[:first], durations[:first], float(onsets[first])
+
+    def _block_inter_onsets(
+        self,
+        times: np.ndarray,
+        jitter: np.ndarray,
+        seed: int,
+        grain_duration,
+        log_clips: bool
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """IOT Truax e durate per un array di onset (un passo della correzione)."""
+        rng = np.random.default_rng(seed)
+        if isinstance(grain_duration, (int, float)):
+            durations = np.full(len(times), float(grain_duration))
+        else:
+            durations = grain_duration.get_values(times, rng, log_clips)[0]
+        
+        density = self._strategy.calculate_density_many(
+            times, rng, log_clips, grain_duration=durations
+        )
+        avg_iot = 1.0 / density
+        dist_val = self.distribution_param.get_values(times, rng, log_clips)[0]
+        
+        async_iot = 2.0 * avg_iot * jitter
+        inter_onsets = np.where(
+            dist_val <= 0.0,
+            avg_iot,
+            (1.0 - dist_val) * avg_iot + dist_val * async_iot
+        )
+        return inter_onsets, durations
+
+    def _schedule_integral(
+        self,
+        stream_duration: float,
+        grain_duration,
+        block_size: int,
+        from_time: float = 0.0
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Schedule della modalita' integral_density: nessuna ricorrenza.
+        
+        Gli onset sincroni t_k (N(t_k) = k) vengono calcolati tutti insieme;
+        distribution sposta ciascun onset di d * (u - 0.5) * IOT locale,
+        con u uniforme [0, 1): la stessa escursione del blend Truax, ma
+        come perturbazione di posizione, quindi il numero di grani resta
+        esatto.
+        
+        Con from_time > 0 si parte da k0 = ceil(N(from_time)) - 1 (lo
+        spostamento, al massimo mezzo IOT, non puo' portare oltre from_time
+        un onset precedente). Le estrazioni u sono indicizzate per k: stessi
+        valori dello schedule completo.
+        """
+        strategy = self._strategy
+        count = strategy.grain_count(stream_duration)
+        first = max(strategy.grain_count(from_time) - 1, 0)
+        if first >= count:
+            return
+        lattice = strategy._invert(np.arange(first, count + 1, dtype=np.float64))
+        local_iot = np.diff(lattice)
+        lattice = lattice[:-1]
+        
+        rng = batch_generator(self._rng)
+        jitter = rng.random(count)[first:]
+        # Come onset_times(): un t_k arrotondato su stream_duration non e' un onset
+        inside = lattice < stream_duration
+        lattice, local_iot, jitter = lattice[inside], local_iot[inside], jitter[inside]
+        dist_val = self.distribution_param.get_values(lattice, rng)[0]
+        onsets = lattice + dist_val * (jitter - 0.5) * local_iot
+        onsets = np.sort(np.clip(onsets, 0.0, np.nextafter(stream_duration, 0.0)))
+        onsets = onsets[onsets >= from_time]
+        
+        if isinstance(grain_duration, (int, float)):
+            durations = np.full(len(onsets), float(grain_duration))
+        else:
+            durations = grain_duration.get_values(onsets, rng)[0]
+        
+        for start in range(0, len(onsets), block_size):
+            yield onsets[start:start + block_size], durations[start:start + block_size]
+
+    def predict_grain_count(self, stream_duration: float) -> Optional[int]:
+        """
+        Numero di grani dello stream senza generarli.
+        
+        Disponibile solo in modalita' integral_density (O(log n) nei
+        breakpoints); None per le modalita' a ricorrenza.
+        """
+        if isinstance(self._strategy, IntegralDensityStrategy):
+            return self._strategy.grain_count(stream_duration)
+        return None
+
     @property
     def mode(self) -> str:
         return self._strategy.name
@@ -141,6 +408,13 @@ class DensityController:
             return self._loaded_params.get('density')
         return None
 
+    @property
+    def integral_density(self):
+        """Espone parametro integral_density (se attivo), altrimenti None."""
+        if self.mode == 'integral_density':
+            return self._loaded_params.get('integral_density')
+        return None
+
     def __repr__(self) -> str:
         active_param = self._find_selected_param()
         return f"<DensityController [{self.mode}:{active_param}]>"
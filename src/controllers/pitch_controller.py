@@ -11,6 +11,8 @@ Supporta range stocastico in entrambe le modalità.
 Ispirato al DMX-1000 di Barry Truax (1988)
 """
 
+from typing import Optional
+import numpy as np
 from parameters.parameter_schema import PITCH_PARAMETER_SCHEMA
 from strategies.strategy_registry import StrategyFactory, PITCH_STRATEGIES
 from parameters.parameter_orchestrator import ParameterOrchestrator
@@ -97,7 +99,28 @@ class PitchController:
         if grain_reverse:
             pitch_ratio *= -1
         
-        return pitch_ratio    
+        return pitch_ratio
+
+    def calculate_many(
+        self,
+        elapsed_times: np.ndarray,
+        grain_reverse: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Versione batch di calculate().
+        
+        Args:
+            elapsed_times: array dei tempi dei grani
+            grain_reverse: maschera booleana dei grani reverse (opzionale)
+        
+        Returns:
+            np.ndarray: pitch ratio per grano (negativi dove reverse)
+        """
+        pitch_ratio = self._strategy.calculate_many(elapsed_times)
+        if grain_reverse is not None:
+            pitch_ratio = np.where(grain_reverse, -pitch_ratio, pitch_ratio)
+        return pitch_ratio
+
     @property
     def mode(self) -> str:
         return self._strategy.name    
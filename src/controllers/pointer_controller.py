@@ -10,12 +10,23 @@ Gestisce la posizione di lettura nel sample con:
 Ispirato al DMX-1000 di Barry Truax (1988)
 """
 
-from typing import Callable
+from bisect import bisect_right
+from typing import Callable, Optional
+import numpy as np
 from envelopes.envelope import Envelope
 from parameters.parameter_schema import POINTER_PARAMETER_SCHEMA
 from parameters.parameter_orchestrator import ParameterOrchestrator
+from parameters.parameter import Parameter
 from core.stream_config import StreamConfig
+from shared.utils import evaluate_per_element
 from shared.logger import log_config_warning, log_loop_drift_warning, log_loop_dynamic_mode, log_loop_init
+
+# seek(): distanza minima tra checkpoint (secondi) e passi massimi della
+# griglia di grani virtuali
+CHECKPOINT_INTERVAL = 1.0
+SEEK_MAX_STEPS = 100_000
+
+
 class PointerController:
     """
     Gestisce il posizionamento della testina di lettura nel sample.
@@ -57,6 +68,9 @@ class PointerController:
         self._orchestrator = ParameterOrchestrator(config=config)
         self._init_params(params)
         self._init_loop_state()
+        # Checkpoint dello stato del loop registrati da calculate_many():
+        # lista di (elapsed_time, stato) in ordine di tempo
+        self._checkpoints = []
     
     # =========================================================================
     # INITIALIZATION
@@ -185,6 +199,8 @@ class PointerController:
         self._drift_log_interval = 5.0      
         self._drift_last_logged = -999.0    
         self._drift_first_warning_emitted = False   
+        self._speed_envelope = None         # envelope di speed_ratio ...
+        self._speed_cursor = None           # ... e suo cursore per integrate()
     # =========================================================================
     # CALCULATION
     # =========================================================================
@@ -232,6 +248,48 @@ class PointerController:
         # 5. Wrap finale sempre sul buffer intero
         return final_pos % self._sample_dur_sec
 
+    def calculate_many(
+        self,
+        elapsed_times: np.ndarray,
+        grain_durations: Optional[np.ndarray] = None,
+        grain_reverse: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Versione batch di calculate() su tempi crescenti.
+        
+        Posizione lineare, bounds del loop e deviazione sono valutati
+        sull'intero array; il loop e' risolto da _apply_loop_many() in forma
+        chiusa. Lo stato del loop avanza come nella generazione scalare,
+        quindi chiamate successive (chunk) proseguono la stessa sequenza:
+        i tempi devono essere ordinati.
+        
+        Args:
+            elapsed_times: array dei tempi dei grani (crescenti)
+            grain_durations: array durate (default 0)
+            grain_reverse: maschera booleana dei grani reverse (default False)
+        
+        Returns:
+            np.ndarray: posizioni in secondi nel sample sorgente
+        """
+        times = np.asarray(elapsed_times, dtype=np.float64)
+        n = len(times)
+        durations = np.zeros(n) if grain_durations is None else np.asarray(grain_durations, dtype=np.float64)
+        reverse = np.zeros(n, dtype=bool) if grain_reverse is None else np.asarray(grain_reverse, dtype=bool)
+        if n == 0:
+            return np.empty(0)
+
+        linear_pos = self._calculate_linear_positions(times)
+        if self.has_loop:
+            base_pos, loop_length = self._apply_loop_many(linear_pos, times)
+        else:
+            base_pos = linear_pos % self._sample_dur_sec
+            loop_length = self._sample_dur_sec
+
+        dev_normalized = self.deviation.get_values(times)[0]
+        final_pos = base_pos + dev_normalized * loop_length
+        final_pos = np.where(reverse, final_pos + durations, final_pos)
+        return final_pos % self._sample_dur_sec
+
     def _apply_loop(
         self,
         linear_pos: float,
@@ -305,6 +363,25 @@ class PointerController:
         # =========================================================================
         # STEP 3: Siamo DENTRO il loop
         # =========================================================================
+        self._advance_in_loop(linear_pos, elapsed_time, current_loop_start, current_loop_end, loop_length)
+        base_pos = self._loop_absolute_pos % self._sample_dur_sec
+        return base_pos, loop_length
+
+    def _advance_in_loop(
+        self,
+        linear_pos: float,
+        elapsed_time: float,
+        current_loop_start: float,
+        current_loop_end: float,
+        loop_length: float
+    ) -> None:
+        """
+        Un passo del phase accumulator dentro il loop (aggiorna lo stato).
+        
+        Condiviso da _apply_loop() e da _apply_loop_many(), che lo usa solo
+        sui grani dove i bounds cambiano.
+        """
+        delta_pos = 0.0
         # ---------------------------------------------------------------------
         # STEP 3a: Calcola movimento inerziale del pointer
         # ---------------------------------------------------------------------
@@ -371,13 +448,194 @@ class PointerController:
         # ---------------------------------------------------------------------
         self._prev_loop_start = current_loop_start
         self._prev_loop_end = current_loop_end
+
+    # =========================================================================
+    # LOOP BATCH (calculate_many)
+    # =========================================================================
+
+    def _apply_loop_many(
+        self,
+        linear_pos: np.ndarray,
+        times: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Versione batch di _apply_loop(): stessa sequenza di stati, risolta
+        a tratti.
         
-        # ---------------------------------------------------------------------
-        # STEP 3e: Restituisci risultato
-        # ---------------------------------------------------------------------
-        base_pos = self._loop_absolute_pos % self._sample_dur_sec
+        - Entrata: per il loop statico, primo grano con la posizione lineare
+          (modulo sample) dentro [loop_start, loop_end); prima dell'entrata
+          posizione lineare wrappata, finestra = sample intero.
+        - Tratti a bounds invariati: il wrap modulare accumulato si riduce
+          a loop_start + (pos - loop_start) % loop_length sulla posizione
+          lineare integrata, in forma chiusa.
+        - Grani dove i bounds cambiano (o loop piu' corto di 1 ms): un passo
+          di _advance_in_loop() (reset direction-aware, log).
+        
+        Con bounds costanti tutto il batch e' un unico tratto in forma chiusa.
+        
+        Returns:
+            (base_pos, loop_length): array come le coppie di _apply_loop()
+        """
+        n = len(times)
+        loop_starts, loop_ends, loop_durs, lengths = self._loop_bounds_many(times)
+        base_pos = np.empty(n)
+        loop_length = lengths.copy()
+        # Posizione assoluta nel loop per grano (NaN prima dell'entrata)
+        absolute = np.full(n, np.nan)
+
+        first = 0
+        if not self._in_loop:
+            first = self._enter_loop_many(linear_pos, times, loop_starts, loop_ends, base_pos, loop_length)
+            if first >= n:
+                return base_pos, loop_length
+            absolute[first] = self._loop_absolute_pos
+            base_pos[first] = self._loop_absolute_pos % self._sample_dur_sec
+            first += 1
+
+        # Grani che richiedono un passo: bounds diversi dal grano precedente
+        # (il primo si confronta con lo stato) o loop degenere
+        prev_starts = np.concatenate(([self._prev_loop_start], loop_starts[first:-1])) if first < n else np.empty(0)
+        prev_ends = np.concatenate(([self._prev_loop_end], loop_ends[first:-1])) if first < n else np.empty(0)
+        degenerate = loop_durs[first:] < 0.001
+        step_mask = (loop_starts[first:] != prev_starts) | (loop_ends[first:] != prev_ends) | degenerate
+        steps = first + np.flatnonzero(step_mask)
+
+        run_start = first
+        for index in steps.tolist() + [n]:
+            if index > run_start:
+                self._wrap_run(linear_pos, loop_starts, loop_ends, lengths, absolute, run_start, index)
+            if index < n:
+                self._advance_in_loop(
+                    float(linear_pos[index]), float(times[index]),
+                    float(loop_starts[index]), float(loop_ends[index]), float(lengths[index])
+                )
+                absolute[index] = self._loop_absolute_pos
+            run_start = index + 1
+
+        base_pos[first:] = absolute[first:] % self._sample_dur_sec
+        self._save_checkpoints(times, linear_pos, absolute, loop_starts, loop_ends)
         return base_pos, loop_length
 
+    def _enter_loop_many(
+        self,
+        linear_pos: np.ndarray,
+        times: np.ndarray,
+        loop_starts: np.ndarray,
+        loop_ends: np.ndarray,
+        base_pos: np.ndarray,
+        loop_length: np.ndarray
+    ) -> int:
+        """
+        Fase pre-loop del batch: riempie base_pos/loop_length fino
+        all'entrata e inizializza lo stato del loop.
+        
+        Returns:
+            indice del grano di entrata (len(times) se non avviene)
+        """
+        if self._loop_is_dynamic:
+            entry = 0
+            entry_pos = float(loop_starts[0])
+        else:
+            check_pos = linear_pos % self._sample_dur_sec
+            inside = (loop_starts <= check_pos) & (check_pos < loop_ends)
+            entry = int(np.argmax(inside)) if inside.any() else len(times)
+            base_pos[:entry] = check_pos[:entry]
+            loop_length[:entry] = self._sample_dur_sec
+            self._emit_loop_drift_warnings(check_pos, times, loop_starts, loop_ends, entry)
+            if entry == len(times):
+                return entry
+            entry_pos = float(check_pos[entry])
+
+        self._in_loop = True
+        self._loop_absolute_pos = entry_pos
+        self._last_linear_pos = float(linear_pos[entry])
+        self._prev_loop_start = float(loop_starts[entry])
+        self._prev_loop_end = float(loop_ends[entry])
+        return entry
+
+    def _emit_loop_drift_warnings(
+        self,
+        check_pos: np.ndarray,
+        times: np.ndarray,
+        loop_starts: np.ndarray,
+        loop_ends: np.ndarray,
+        stop: int
+    ) -> None:
+        """
+        Warning di drift per i grani pre-loop [0, stop).
+        
+        _emit_loop_drift_warning() logga al massimo ogni _drift_log_interval
+        secondi: viene chiamato solo sui grani che possono superare il limite.
+        """
+        index = 0
+        while index < stop:
+            self._emit_loop_drift_warning(
+                float(check_pos[index]), float(loop_starts[index]),
+                float(loop_ends[index]), float(times[index])
+            )
+            next_index = int(np.searchsorted(
+                times[:stop], self._drift_last_logged + self._drift_log_interval
+            ))
+            index = max(index + 1, next_index)
+
+    def _wrap_run(
+        self,
+        linear_pos: np.ndarray,
+        loop_starts: np.ndarray,
+        loop_ends: np.ndarray,
+        lengths: np.ndarray,
+        absolute: np.ndarray,
+        start: int,
+        stop: int
+    ) -> None:
+        """
+        Tratto [start, stop) a bounds invariati, in forma chiusa.
+        
+        Il phase accumulator somma i delta della posizione lineare e wrappa
+        nel loop: il risultato e' l'unico rappresentante in
+        [loop_start, loop_end) della posizione accumulata.
+        """
+        loop_start = loop_starts[start]
+        loop_end = loop_ends[start]
+        positions = self._loop_absolute_pos + (linear_pos[start:stop] - self._last_linear_pos)
+        inside = (loop_start <= positions) & (positions < loop_end)
+        positions = np.where(
+            inside, positions, loop_start + (positions - loop_start) % lengths[start]
+        )
+        absolute[start:stop] = positions
+
+        self._loop_absolute_pos = float(positions[-1])
+        self._last_linear_pos = float(linear_pos[stop - 1])
+        self._prev_loop_start = float(loop_start)
+        self._prev_loop_end = float(loop_end)
+
+    def _loop_bounds_many(
+        self,
+        times: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bounds del loop su un array di tempi, con le stesse operazioni di
+        _apply_loop() (loop_end = loop_start + loop_dur).
+        
+        Returns:
+            (loop_starts, loop_ends, loop_durs, loop_lengths): loop_durs
+            grezze, loop_lengths limitate a 1 ms come in _apply_loop()
+        """
+        loop_starts = self._param_values(self.loop_start, times)
+        if self.loop_dur is not None:
+            loop_durs = self._param_values(self.loop_dur, times)
+        else:
+            loop_durs = self._param_values(self.loop_end, times) - loop_starts
+        loop_ends = loop_starts + loop_durs
+        return loop_starts, loop_ends, loop_durs, np.maximum(loop_durs, 0.001)
+
+    @staticmethod
+    def _param_values(param, times: np.ndarray) -> np.ndarray:
+        """Valori batch di un parametro (get_values per i Parameter)."""
+        if isinstance(param, Parameter):
+            return param.get_values(times)[0]
+        return evaluate_per_element(param.get_value, times)
+
     def _emit_loop_drift_warning(
         self,
         pointer_pos: float,
@@ -434,11 +692,142 @@ class PointerController:
         """
         internal_val = self.speed_ratio.value
         if isinstance(internal_val, Envelope):
-            sample_position = internal_val.integrate(0, elapsed_time)
+            sample_position = self._speed_cursor_for(internal_val).integrate(0, elapsed_time)
         else:
             sample_position = elapsed_time * float(internal_val)
         return self.start + sample_position
 
+    def _calculate_linear_positions(self, elapsed_times: np.ndarray) -> np.ndarray:
+        """Versione batch di _calculate_linear_position() (integrale in blocco)."""
+        internal_val = self.speed_ratio.value
+        if isinstance(internal_val, Envelope):
+            sample_position = internal_val.integrate_many(0, elapsed_times)
+        else:
+            sample_position = elapsed_times * float(internal_val)
+        return self.start + sample_position
+
+    def _speed_cursor_for(self, envelope: Envelope):
+        """
+        Cursore sull'envelope di speed_ratio (creato al primo uso).
+        
+        calculate() integra da 0 a tempi crescenti: il cursore avanza
+        invece di ripetere la ricerca del tratto a ogni grano.
+        """
+        if self._speed_envelope is not envelope:
+            self._speed_envelope = envelope
+            self._speed_cursor = envelope.cursor()
+        return self._speed_cursor
+
+    # =========================================================================
+    # SEEK
+    # =========================================================================
+
+    def seek(self, elapsed_time: float) -> None:
+        """
+        Porta lo stato del loop a quello dopo un grano a elapsed_time,
+        senza simulare i grani precedenti.
+        
+        - Senza loop: il pointer non ha stato, basta il reset.
+        - Loop a bounds costanti gia' attraversato (checkpoint nel loop):
+          forma chiusa, posizione = wrap modulare dell'integrale lineare.
+        - Altrimenti (entrata, bounds dinamici): dall'ultimo checkpoint
+          <= elapsed_time il loop avanza su una griglia di grani virtuali
+          abbastanza fitta da non saltare un giro (|delta pos| <= meta'
+          loop). Con bounds dinamici i reset dipendono dai tempi dei grani:
+          lo stato e' quello di uno stream a densita' uniforme, non quello
+          degli onset reali. Per lo stato esatto vedi needs_replay/replay().
+        
+        Dopo seek(), calculate()/calculate_many() proseguono da elapsed_time.
+        """
+        resume = self._restore_checkpoint(elapsed_time)
+        if not self.has_loop:
+            return
+
+        if self._in_loop and self._loop_bounds_static():
+            grid = np.array([elapsed_time])
+        elif resume is None:
+            grid = self._seek_grid(0.0, elapsed_time)
+        else:
+            grid = self._seek_grid(resume, elapsed_time)[1:]
+        if len(grid):
+            self._apply_loop_many(self._calculate_linear_positions(grid), grid)
+
+    @property
+    def needs_replay(self) -> bool:
+        """
+        True se seek() non e' esatto: loop con bounds dinamici, il cui stato
+        dipende dai tempi reali dei grani precedenti. I motori allora
+        ripercorrono gli onset veri con replay() invece di chiamare seek().
+        """
+        return self.has_loop and not self._loop_bounds_static()
+
+    def replay(self, elapsed_times: np.ndarray) -> None:
+        """
+        Avanza lo stato del loop come calculate_many() sugli stessi tempi
+        (crescenti), senza calcolare posizioni, deviazione e reverse.
+        """
+        times = np.asarray(elapsed_times, dtype=np.float64)
+        if self.has_loop and len(times):
+            self._apply_loop_many(self._calculate_linear_positions(times), times)
+
+    def _seek_grid(self, start: float, stop: float) -> np.ndarray:
+        """Griglia di grani virtuali su [start, stop], estremi inclusi."""
+        *_, lengths = self._loop_bounds_many(np.array([start, stop]))
+        step = 0.5 * float(lengths.min()) / max(self._max_abs_speed(), 1e-9)
+        count = int(np.clip(np.ceil((stop - start) / step), 1, SEEK_MAX_STEPS))
+        return np.linspace(start, stop, count + 1)
+
+    def _max_abs_speed(self) -> float:
+        internal_val = self.speed_ratio.value
+        if isinstance(internal_val, Envelope):
+            low, high = internal_val.value_range()
+            return max(abs(low), abs(high))
+        return abs(float(internal_val))
+
+    def _loop_bounds_static(self) -> bool:
+        """True se tutti i bounds del loop sono costanti (Parameter compilati)."""
+        bounds = [self.loop_start, self.loop_dur if self.loop_dur is not None else self.loop_end]
+        return all(isinstance(param, Parameter) and param.is_time_invariant for param in bounds)
+
+    def _save_checkpoints(
+        self,
+        times: np.ndarray,
+        linear_pos: np.ndarray,
+        absolute: np.ndarray,
+        loop_starts: np.ndarray,
+        loop_ends: np.ndarray
+    ) -> None:
+        """Checkpoint ogni CHECKPOINT_INTERVAL secondi tra i grani nel loop di un batch."""
+        inside = np.flatnonzero(~np.isnan(absolute))
+        if not len(inside):
+            return
+        last = self._checkpoints[-1][0] if self._checkpoints else -np.inf
+        index = inside[0]
+        while index < len(times):
+            if times[index] - last >= CHECKPOINT_INTERVAL:
+                last = float(times[index])
+                self._checkpoints.append((last, (
+                    True, float(absolute[index]), float(linear_pos[index]),
+                    float(loop_starts[index]), float(loop_ends[index])
+                )))
+            index = max(index + 1, int(np.searchsorted(times, last + CHECKPOINT_INTERVAL)))
+
+    def _restore_checkpoint(self, elapsed_time: float) -> Optional[float]:
+        """
+        Stato dell'ultimo checkpoint <= elapsed_time (o stato iniziale).
+        
+        Returns:
+            tempo del checkpoint ripristinato, None se nessuno
+        """
+        self._init_loop_state()
+        index = bisect_right([time for time, _ in self._checkpoints], elapsed_time) - 1
+        if index < 0:
+            return None
+        checkpoint_time, state = self._checkpoints[index]
+        (self._in_loop, self._loop_absolute_pos, self._last_linear_pos,
+         self._prev_loop_start, self._prev_loop_end) = state
+        return checkpoint_time
+
     # =========================================================================
     # STATE MANAGEMENT
     # =========================================================================
@@ -450,6 +839,10 @@ class PointerController:
     def get_speed(self, elapsed_time: float) -> float:
         """Ritorna la velocità istantanea al tempo specificato."""
         return self.speed_ratio.get_value(elapsed_time)
+
+    def get_speeds(self, elapsed_times: np.ndarray) -> np.ndarray:
+        """Versione batch di get_speed()."""
+        return self._param_values(self.speed_ratio, np.asarray(elapsed_times, dtype=np.float64))
         
     # =========================================================================
     # PROPERTIES (Read-only access)
@@ -0,0 +1,197 @@
+# src/controllers/voice_manager.py
+"""
+VoiceManager - Voci multiple di uno stream granulare.
+
+Ogni voce e' un flusso di grani indipendente (schedule degli onset e stato
+del pointer propri, vedi Stream._init_voices) che condivide i parametri
+dello stream e riceve offset per voce:
+- pitch:   voce v trasposta di v × pitch_offset semitoni
+- pointer: voce v spostata di v × pointer_offset (normalizzato sul sample)
+           + micro-jitter uniforme per grano entro pointer_range
+- pan:     offset macro da VoicePanStrategy, fisso per tutta la durata
+
+Invariante: la voce 0 e' il riferimento per pitch e pointer (offset nulli);
+il pan e' distribuito dalla strategy su tutte le voci. Con num_voices = 1
+lo stream e' identico a uno stream senza blocco 'voices'.
+
+num_voices puo' essere un envelope: la voce v suona dove v < num_voices(t)
+(attivazione dinamica), le voci allocate sono quelle del massimo.
+
+YAML:
+    voices:
+      num_voices: 4
+      pitch_offset: 7        # semitoni tra voci consecutive
+      pointer_offset: 0.05   # frazione del sample tra voci consecutive
+      pointer_range: 0.01    # jitter per grano (frazione del sample)
+      pan_spread: 90         # gradi
+      pan_strategy: linear   # linear | random | additive | custom
+"""
+
+import random
+
+import numpy as np
+
+from core.stream_config import StreamConfig
+from envelopes.envelope import Envelope
+from parameters.parameter_definitions import GRANULAR_PARAMETERS
+from parameters.parameter_orchestrator import ParameterOrchestrator
+from parameters.parameter_schema import VOICE_PARAMETER_SCHEMA
+from shared.rng import child_rng, batch_generator
+from strategies.voice_pan_strategy import VoicePanStrategyFactory
+
+
+class VoiceManager:
+    """
+    Gestisce numero, attivazione e offset delle voci di uno stream.
+
+    Due interfacce, come gli altri controller:
+    - scalare (get_voice_*): una voce, un istante (ScalarGrainEngine)
+    - batch (*_many): array di indici di voce e di tempi, gli offset
+      vengono calcolati per broadcast (VectorizedGrainEngine)
+    """
+
+    def __init__(
+        self,
+        params: dict,
+        config: StreamConfig
+    ):
+        """
+        Args:
+            params: blocco YAML 'voices' ({} = una sola voce)
+            config: configurazione dello stream
+        """
+        self._sample_dur_sec = config.context.sample_dur_sec
+        self._orchestrator = ParameterOrchestrator(config=config)
+        self._loaded_params = self._orchestrator.create_all_parameters(
+            params,
+            schema=VOICE_PARAMETER_SCHEMA
+        )
+        self.num_voices = self._loaded_params['num_voices']
+        self.pitch_offset = self._loaded_params['voice_pitch_offset']
+        self.pointer_offset = self._loaded_params['voice_pointer_offset']
+        self.pointer_range = self._loaded_params['voice_pointer_range']
+
+        self.max_voices = self._compute_max_voices()
+        self._pan_strategy = VoicePanStrategyFactory.create(
+            self._loaded_params['voice_pan_strategy'],
+            rng=child_rng(config.rng, 'voices.pan')
+        )
+        self._pan_offsets = self._compute_pan_offsets()
+        # Sorgente del micro-jitter del pointer (None = modulo random)
+        self._rng = child_rng(config.rng, 'voices.pointer_jitter')
+
+    def _compute_max_voices(self) -> int:
+        """Voci da allocare: massimo di num_voices (envelope e range inclusi)."""
+        value = self.num_voices.value
+        high = value.value_range()[1] if isinstance(value, Envelope) else float(value)
+        mod_range = getattr(self.num_voices, '_mod_range', None)
+        if isinstance(mod_range, (int, float)):
+            high += mod_range
+        bounds = GRANULAR_PARAMETERS['num_voices']
+        return int(min(max(round(high), bounds.min_val), bounds.max_val))
+
+    def _compute_pan_offsets(self) -> np.ndarray:
+        """
+        Offset macro di pan, uno per voce, calcolati una sola volta.
+
+        Con una sola voce nessun offset. pan_spread e' valutato
+        all'inizio dello stream.
+        """
+        offsets = np.zeros(self.max_voices)
+        if self.max_voices == 1:
+            return offsets
+        spread = self._loaded_params['voice_pan_spread'].get_value(0.0)
+        for voice in range(self.max_voices):
+            offsets[voice] = self._pan_strategy.get_pan_offset(voice, self.max_voices, spread)
+        return offsets
+
+    # =========================================================================
+    # INTERFACCIA SCALARE
+    # =========================================================================
+
+    def is_voice_active(self, voice_index: int, elapsed_time: float) -> bool:
+        """La voce 0 e' sempre attiva, la voce v dove v < num_voices(t)."""
+        if voice_index == 0:
+            return True
+        return voice_index < round(self.num_voices.get_value(elapsed_time))
+
+    def get_voice_pitch_multiplier(self, voice_index: int, elapsed_time: float) -> float:
+        """Ratio di trasposizione della voce: 2^(v × offset / 12)."""
+        if voice_index == 0:
+            return 1.0
+        return 2.0 ** (voice_index * self.pitch_offset.get_value(elapsed_time) / 12.0)
+
+    def get_voice_pointer_offset(self, voice_index: int, elapsed_time: float) -> float:
+        """Offset strutturale del pointer in secondi: v × offset × durata sample."""
+        if voice_index == 0:
+            return 0.0
+        return voice_index * self.pointer_offset.get_value(elapsed_time) * self._sample_dur_sec
+
+    def get_voice_pointer_range(self, voice_index: int, elapsed_time: float) -> float:
+        """Ampiezza del micro-jitter del pointer in secondi (0 per la voce 0)."""
+        if voice_index == 0:
+            return 0.0
+        return self.pointer_range.get_value(elapsed_time) * self._sample_dur_sec
+
+    def get_voice_pointer_jitter(self, voice_index: int, elapsed_time: float) -> float:
+        """Micro-jitter per grano, uniforme in [-range/2, +range/2]."""
+        width = self.get_voice_pointer_range(voice_index, elapsed_time)
+        if width <= 0.0:
+            return 0.0
+        return (self._rng or random).uniform(-width / 2.0, width / 2.0)
+
+    def get_voice_pan_offset(self, voice_index: int) -> float:
+        """Offset macro di pan della voce (gradi)."""
+        return float(self._pan_offsets[voice_index])
+
+    # =========================================================================
+    # INTERFACCIA BATCH
+    # =========================================================================
+
+    def active_many(self, voice_indices: np.ndarray, elapsed_times: np.ndarray) -> np.ndarray:
+        """Maschera dei grani la cui voce e' attiva al loro onset."""
+        if self.num_voices.is_time_invariant:
+            return voice_indices < max(round(self.num_voices.get_value(0.0)), 1)
+        counts = np.rint(self.num_voices.get_values(elapsed_times)[0])
+        return (voice_indices == 0) | (voice_indices < counts)
+
+    def pitch_multipliers_many(self, voice_indices: np.ndarray, elapsed_times: np.ndarray) -> np.ndarray:
+        """Versione batch di get_voice_pitch_multiplier()."""
+        semitones = self._values(self.pitch_offset, elapsed_times)
+        return np.exp2(voice_indices * semitones / 12.0)
+
+    def pointer_offsets_many(self, voice_indices: np.ndarray, elapsed_times: np.ndarray) -> np.ndarray:
+        """
+        Offset strutturale + micro-jitter del pointer, in secondi.
+
+        Il jitter e' estratto in un'unica chiamata per tutti i grani.
+        """
+        offsets = voice_indices * self._values(self.pointer_offset, elapsed_times) * self._sample_dur_sec
+        widths = np.where(
+            voice_indices > 0,
+            self._values(self.pointer_range, elapsed_times) * self._sample_dur_sec,
+            0.0
+        )
+        if np.any(widths > 0.0):
+            jitter = batch_generator(self._rng).random(len(voice_indices)) - 0.5
+            offsets = offsets + widths * jitter
+        return offsets
+
+    def pan_offsets_many(self, voice_indices: np.ndarray) -> np.ndarray:
+        """Offset macro di pan per grano (lookup per indice di voce)."""
+        return self._pan_offsets[voice_indices]
+
+    @staticmethod
+    def _values(param, elapsed_times: np.ndarray):
+        """Costante fuori dal loop, altrimenti Parameter.get_values()."""
+        if param.is_time_invariant:
+            return param.get_value(0.0)
+        return param.get_values(elapsed_times)[0]
+
+    @property
+    def sample_dur_sec(self) -> float:
+        return self._sample_dur_sec
+
+    def __repr__(self) -> str:
+        return (f"VoiceManager(max_voices={self.max_voices}, "
+                f"pan_strategy={self._pan_strategy.name})")
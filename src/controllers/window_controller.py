@@ -1,10 +1,12 @@
 # src/window_controller.py
 from typing import List, Tuple, Dict, Any
+import numpy as np
 from controllers.window_registry import WindowRegistry
 import random
 from core.stream_config import StreamConfig
 from parameters.gate_factory import GateFactory
 from parameters.parameter_definitions import DEFAULT_PROB
+from shared.rng import child_rng, batch_generator
 
 class WindowController:
     """Gestisce selezione grain envelope."""
@@ -81,6 +83,7 @@ class WindowController:
         # Gate: delega la decisione probabilistica al sistema unificato.
         # Supporta DISABLED, IMPLICIT, GLOBAL, SPECIFIC e EnvelopeGate.
         has_explicit_range = self._range > 0
+        self._rng = child_rng(config.rng, 'grain_envelope')
         self._gate = GateFactory.create_gate(
             dephase=config.dephase,
             param_key='pc_rand_envelope',
@@ -88,7 +91,9 @@ class WindowController:
             has_explicit_range=has_explicit_range,
             range_always_active=config.range_always_active,
             duration=config.context.duration,
-            time_mode=config.time_mode
+            time_mode=config.time_mode,
+            rng=child_rng(self._rng, 'gate'),
+            shared=getattr(config, 'gate_cache', None)
         )
     
     def select_window(self, elapsed_time: float = 0.0) -> str:
@@ -110,4 +115,25 @@ class WindowController:
             return self._windows[0]
         
         # Variazione attiva → selezione casuale
-        return random.choice(self._windows)
\ No newline at end of file
+        return (self._rng or random).choice(self._windows)
+
+    def select_windows(self, elapsed_times) -> Tuple[List[str], np.ndarray]:
+        """
+        Versione batch di select_window().
+        
+        Args:
+            elapsed_times: array dei tempi dei grani
+        
+        Returns:
+            (windows, indices): lista delle finestre selezionabili e, per ogni
+            grano, l'indice della finestra scelta in quella lista
+        """
+        n = len(elapsed_times)
+        indices = np.zeros(n, dtype=np.intp)
+        if self._range == 0:
+            return self._windows, indices
+        active = self._gate.should_apply_many(np.asarray(elapsed_times, dtype=np.float64))
+        n_active = int(active.sum())
+        if n_active:
+            indices[active] = batch_generator(self._rng).integers(len(self._windows), size=n_active)
+        return self._windows, indices
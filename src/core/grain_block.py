@@ -0,0 +1,246 @@
+"""
+GrainBlock - storage colonnare per blocchi di grani.
+
+Sostituisce List[Grain] come output nativo di Stream: invece di un oggetto
+Grain per evento, ogni campo del grano vive in una colonna NumPy tipizzata.
+
+- 6 colonne float64: onset, duration, pointer_pos, pitch_ratio, volume, pan
+- 2 colonne int32:   sample_table, envelope_table
+
+Memoria: 56 byte per grano contro ~230 byte di un Grain (slots + 6 float boxed
++ puntatore nella lista).
+
+Backward compatibility:
+- len(block), block[i], iterazione → viste Grain costruite on-demand
+- block == [Grain, ...] confronta grano per grano
+
+I consumer che vogliono lavorare su colonne intere (ScoreWriter,
+ScoreVisualizer, ...) accedono direttamente agli attributi array.
+
+Score: to_score_text() formatta l'intero blocco in un'unica operazione
+'%' su un template ripetuto, byte per byte identico a Grain.to_score_line.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+
+import numpy as np
+
+from core.grain import Grain
+
+FLOAT_FIELDS = ('onset', 'duration', 'pointer_pos', 'pitch_ratio', 'volume', 'pan')
+INT_FIELDS = ('sample_table', 'envelope_table')
+GRAIN_FIELDS = FLOAT_FIELDS + INT_FIELDS
+
+# Stessa formattazione di Grain.to_score_line, in sintassi '%'
+SCORE_LINE_FORMAT = 'i "Grain" %.6f %.6f %.6f %.6f %.2f %.3f %d %d\n'
+
+
+class GrainBlock:
+    """
+    Blocco immutabile di grani in formato colonnare.
+
+    Le colonne sono array NumPy read-only della stessa lunghezza.
+    Le colonne intere accettano anche uno scalare (broadcast su tutto il blocco),
+    caso tipico per sample_table che e' costante all'interno di uno stream.
+    """
+
+    __slots__ = GRAIN_FIELDS
+
+    def __init__(
+        self,
+        onset,
+        duration,
+        pointer_pos,
+        pitch_ratio,
+        volume,
+        pan,
+        sample_table,
+        envelope_table
+    ):
+        values = dict(zip(GRAIN_FIELDS, (
+            onset, duration, pointer_pos, pitch_ratio,
+            volume, pan, sample_table, envelope_table
+        )))
+
+        n = len(np.atleast_1d(np.asarray(onset)))
+        for name in FLOAT_FIELDS:
+            object.__setattr__(self, name, self._as_float_column(name, values[name], n))
+        for name in INT_FIELDS:
+            object.__setattr__(self, name, self._as_int_column(name, values[name], n))
+
+    # =========================================================================
+    # VALIDAZIONE COLONNE
+    # =========================================================================
+
+    @staticmethod
+    def _as_float_column(name: str, data, n: int) -> np.ndarray:
+        arr = np.asarray(data)
+        if arr.dtype.kind not in 'iuf':
+            raise TypeError(
+                f"Column '{name}' must be numeric (int or float), "
+                f"got dtype {arr.dtype}"
+            )
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        if arr.ndim == 0:
+            arr = np.full(n, float(arr), dtype=np.float64)
+        if arr.ndim != 1 or len(arr) != n:
+            raise ValueError(
+                f"Column '{name}' must be 1-D with length {n}, got shape {arr.shape}"
+            )
+        arr.flags.writeable = False
+        return arr
+
+    @staticmethod
+    def _as_int_column(name: str, data, n: int) -> np.ndarray:
+        arr = np.asarray(data)
+        if arr.dtype.kind not in 'iu' and arr.size:
+            raise TypeError(
+                f"Column '{name}' must be int, got dtype {arr.dtype}"
+            )
+        if arr.ndim == 0:
+            arr = np.full(n, int(arr), dtype=np.int32)
+        arr = np.ascontiguousarray(arr, dtype=np.int32)
+        if arr.ndim != 1 or len(arr) != n:
+            raise ValueError(
+                f"Column '{name}' must be 1-D with length {n}, got shape {arr.shape}"
+            )
+        arr.flags.writeable = False
+        return arr
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GrainBlock is immutable")
+
+    def __reduce__(self):
+        """Pickle tramite le colonne (es. ritorno dai worker di Generator)."""
+        return (self.__class__.from_columns, (self.columns(),))
+
+    # =========================================================================
+    # COSTRUTTORI ALTERNATIVI
+    # =========================================================================
+
+    @classmethod
+    def empty(cls) -> 'GrainBlock':
+        """Blocco vuoto (zero grani)."""
+        return cls(*([np.empty(0)] * len(FLOAT_FIELDS)),
+                   *([np.empty(0, dtype=np.int32)] * len(INT_FIELDS)))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Union[Sequence, np.ndarray]]) -> 'GrainBlock':
+        """
+        Crea un blocco da un dict {nome_campo: colonna}.
+
+        Raises:
+            KeyError: se manca una colonna
+        """
+        missing = [name for name in GRAIN_FIELDS if name not in columns]
+        if missing:
+            raise KeyError(f"Colonne mancanti per GrainBlock: {missing}")
+        return cls(**{name: columns[name] for name in GRAIN_FIELDS})
+
+    @classmethod
+    def from_grains(cls, grains: Iterable[Grain]) -> 'GrainBlock':
+        """Converte una sequenza di Grain in blocco colonnare."""
+        grains = list(grains)
+        if not grains:
+            return cls.empty()
+        return cls(**{
+            name: [getattr(g, name) for g in grains]
+            for name in GRAIN_FIELDS
+        })
+
+    @classmethod
+    def concatenate(cls, blocks: Iterable['GrainBlock']) -> 'GrainBlock':
+        """Concatena piu' blocchi preservando l'ordine."""
+        blocks = [b for b in blocks if len(b)]
+        if not blocks:
+            return cls.empty()
+        if len(blocks) == 1:
+            return blocks[0]
+        return cls(**{
+            name: np.concatenate([getattr(b, name) for b in blocks])
+            for name in GRAIN_FIELDS
+        })
+
+    # =========================================================================
+    # ACCESSO
+    # =========================================================================
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Ritorna {nome_campo: colonna} (array read-only, nessuna copia)."""
+        return {name: getattr(self, name) for name in GRAIN_FIELDS}
+
+    def grain(self, index: int) -> Grain:
+        """Vista Grain del grano all'indice specificato."""
+        return Grain(
+            onset=float(self.onset[index]),
+            duration=float(self.duration[index]),
+            pointer_pos=float(self.pointer_pos[index]),
+            pitch_ratio=float(self.pitch_ratio[index]),
+            volume=float(self.volume[index]),
+            pan=float(self.pan[index]),
+            sample_table=int(self.sample_table[index]),
+            envelope_table=int(self.envelope_table[index])
+        )
+
+    def to_score_text(self) -> str:
+        """
+        Linee di score di tutti i grani in un'unica stringa.
+
+        Le colonne vengono interlacciate riga per riga in un solo array
+        float64 (gli int32 sono rappresentati esattamente, '%d' li tronca
+        senza perdita) e formattate con un solo '%' sul template ripetuto:
+        nessuna chiamata Python per grano.
+        """
+        if not len(self):
+            return ''
+        values = np.column_stack([getattr(self, name) for name in GRAIN_FIELDS])
+        return (SCORE_LINE_FORMAT * len(self)) % tuple(values.ravel().tolist())
+
+    def to_grains(self) -> List[Grain]:
+        """Materializza tutti i grani come lista di Grain."""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria occupata dalle colonne (byte)."""
+        return sum(getattr(self, name).nbytes for name in GRAIN_FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.onset)
+
+    def __getitem__(self, key) -> Union[Grain, 'GrainBlock']:
+        """
+        - indice intero → Grain
+        - slice / maschera booleana / array di indici → GrainBlock
+        """
+        if isinstance(key, (int, np.integer)):
+            n = len(self)
+            if not -n <= key < n:
+                raise IndexError(f"GrainBlock index {key} out of range ({n} grains)")
+            return self.grain(key)
+        return GrainBlock(**{name: getattr(self, name)[key] for name in GRAIN_FIELDS})
+
+    def __iter__(self) -> Iterator[Grain]:
+        columns = [getattr(self, name).tolist() for name in GRAIN_FIELDS]
+        for values in zip(*columns):
+            yield Grain(*values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, GrainBlock):
+            return len(self) == len(other) and all(
+                np.array_equal(getattr(self, name), getattr(other, name))
+                for name in GRAIN_FIELDS
+            )
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "GrainBlock(grains=0)"
+        return (f"GrainBlock(grains={len(self)}, "
+                f"onset={self.onset[0]:.3f}-{self.onset[-1]:.3f})")
@@ -7,25 +7,33 @@ Fase 6 del refactoring: questa classe coordina i controller specializzati:
 - PointerController: posizionamento testina con loop e jitter
 - PitchController: trasposizione (semitoni o ratio)
 - DensityController: densità e distribuzione temporale
-- VoiceManager: voci multiple con offset pitch/pointer
+- VoiceManager: voci multiple con offset pitch/pointer/pan
 
 Mantiene backward compatibility con Generator e ScoreVisualizer.
 Ispirato al DMX-1000 di Barry Truax (1988).
 """
 import random
-from typing import List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 
 from core.grain import Grain
+from core.grain_block import GrainBlock
+from engine.grain_engine import GrainEngineFactory, DEFAULT_ENGINE, DEFAULT_CHUNK_SIZE
 from envelopes.envelope import Envelope
 from controllers.window_controller import WindowController
 from controllers.pointer_controller import PointerController
 from controllers.pitch_controller import PitchController
 from controllers.density_controller import DensityController
+from controllers.voice_manager import VoiceManager
 from shared.utils import get_sample_duration
+from shared.rng import SeededRandom, child_rng
+from parameters.parameter import Parameter
+from parameters.parameter_definitions import GRANULAR_PARAMETERS
 from parameters.parameter_schema import STREAM_PARAMETER_SCHEMA
 from parameters.parameter_orchestrator import ParameterOrchestrator
 from core.stream_config import StreamConfig, StreamContext
-from dataclasses import fields
+from dataclasses import fields, replace
 
 
 class Stream:
@@ -36,33 +44,44 @@ class Stream:
     Mantiene compatibilità con Generator e ScoreVisualizer.
     
     Attributes:
-        voices: List[List[Grain]] - grani organizzati per voce
-        grains: List[Grain] - lista flattened (backward compatibility)
+        voices: List[GrainBlock] - grani organizzati per voce (colonnare)
+        grains: GrainBlock - blocco flattened (backward compatibility)
     """
     
-    def __init__(self, params: dict):
+    def __init__(self, params: dict, rng: Optional[SeededRandom] = None):
         """
         Inizializza lo stream dai parametri YAML.
         
         Args:
             params: dizionario parametri dallo YAML
+            rng: nodo dello stream nella gerarchia di seed, derivato da
+                 Generator dal seed globale (None = nessun seed)
         """
+        # === 2. SORGENTE CASUALE ===
+        self._init_rng(params, rng)
         # === 3. CONFIGURATION ===
-        config = StreamConfig.from_yaml(params,StreamContext.from_yaml(params, sample_dur_sec=get_sample_duration(params['sample'])))
+        config = StreamConfig.from_yaml(params,StreamContext.from_yaml(params, sample_dur_sec=get_sample_duration(params['sample'])), rng=self.rng)
         self._init_stream_context(params)
         # === 4. PARAMETRI SPECIALI ===
         self._init_grain_reverse(params)
+        self._init_engine(params)
         # === 5. PARAMETRI DIRETTI (riceve config) ===
         self._init_stream_parameters(params, config)
         # === 6. CONTROLLER (riceve config) ===
         self._init_controllers(params, config)
+        self._init_voices(params, config)
+        self._analyze_time_invariance()
         # === 7. RIFERIMENTI CSOUND (assegnati da Generator) ===
+        # Owner delle ftable in FtableManager: stream_id, con suffisso #n per gli id ripetuti
+        self.table_owner: str = self.stream_id
         self.sample_table_num: Optional[int] = None
         self.envelope_table_num: Optional[int] = None
         # === 8. STATO ===
-        self.voices: List[List[Grain]] = []
-        self.grains: List[Grain] = []  # backward compatibility
+        self.voices: List[GrainBlock] = []
+        self.grains: GrainBlock = GrainBlock.empty()  # backward compatibility
         self.generated = False
+        # Finestra di generazione (tempi dall'inizio dello stream), vedi set_time_window()
+        self.time_window: Optional[Tuple[float, float]] = None
 
     def _init_stream_context(self, params):
         base = {field.name for field in fields(StreamContext) if field.name != 'sample_dur_sec'}
@@ -78,6 +97,32 @@ class Stream:
             setattr(self, key, params[key])
         self.sample_dur_sec = get_sample_duration(self.sample)
 
+    def _init_rng(self, params: dict, rng: Optional[SeededRandom]) -> None:
+        """
+        Risolve la sorgente casuale dello stream.
+        
+        - chiave YAML 'seed' dello stream → radice propria (ha la precedenza)
+        - rng da Generator (seed globale) → sotto-flusso dello stream
+        - nessuno dei due → None, i componenti usano il modulo random
+        
+        La sorgente viene consumata dalla generazione: rigenerare lo stesso
+        Stream prosegue la sequenza, ricostruirlo la ripete identica.
+        """
+        if params.get('seed') is not None:
+            rng = SeededRandom.from_seed(params['seed'])
+        self.rng: Optional[SeededRandom] = rng
+
+    def _init_engine(self, params: dict) -> None:
+        """
+        Legge il motore di generazione specifico dello stream (chiave 'engine').
+        
+        None significa "usa il default globale" passato a generate_grains().
+        Il nome viene validato subito per fallire prima della generazione.
+        """
+        self.engine: Optional[str] = params.get('engine')
+        if self.engine is not None:
+            GrainEngineFactory.create(self.engine)
+
     def _init_stream_parameters(self, params: dict, config: StreamConfig) -> None:
         """
         Inizializza parametri diretti di Stream usando ParameterFactory.
@@ -99,6 +144,21 @@ class Stream:
         for name, param in parameters.items():
             setattr(self, name, param)
 
+    def _analyze_time_invariance(self) -> None:
+        """
+        Individua i parametri dello stream che non dipendono dal tempo.
+        
+        time_invariant_parameters: {nome: valore} dei Parameter compilati
+        come costanti (valore fisso nei bounds, nessun gate). I motori li
+        valutano una volta sola, fuori dal loop per grano.
+        """
+        self.time_invariant_parameters: Dict[str, float] = {
+            spec.name: getattr(self, spec.name).get_value(0.0)
+            for spec in STREAM_PARAMETER_SCHEMA
+            if isinstance(getattr(self, spec.name, None), Parameter)
+            and getattr(self, spec.name).is_time_invariant
+        }
+
     # =========================================================================
     # INIZIALIZZAZIONE CONTROLLER
     # =========================================================================
@@ -128,6 +188,26 @@ class Stream:
             config=config
         )    
             
+    def _init_voices(self, params: dict, config: StreamConfig) -> None:
+        """
+        Inizializza VoiceManager e i controller con stato di ogni voce.
+        
+        Ogni voce ha il proprio DensityController (schedule degli onset)
+        e il proprio PointerController (fase del loop, jitter), costruiti
+        con un sotto-flusso rng 'voice{v}'. La voce 0 usa i controller
+        dello stream: con una sola voce nulla cambia.
+        """
+        self._voice_manager = VoiceManager(
+            params=params.get('voices', {}),
+            config=config
+        )
+        self._voice_densities = [self._density]
+        self._voice_pointers = [self._pointer]
+        for voice in range(1, self._voice_manager.max_voices):
+            voice_config = replace(config, rng=child_rng(config.rng, f'voice{voice}'))
+            self._voice_densities.append(DensityController(params=params, config=voice_config))
+            self._voice_pointers.append(PointerController(params=params.get('pointer', {}), config=voice_config))
+
     def _init_grain_reverse(self, params: dict) -> None:
         """
         Inizializza parametri reverse del grano.
@@ -175,41 +255,135 @@ class Stream:
     # GENERAZIONE GRANI
     # =========================================================================
     
-    def generate_grains(self) -> List[List[Grain]]:
+    def generate_grains(self, engine: Optional[str] = None) -> List[GrainBlock]:
         """
         Genera grani per tutte le voices.
         
-        Algoritmo:
-        2. Per ogni voice (0 a max_voices-1):
-           - Mantiene il proprio current_onset
-           - Verifica se è attiva (voice_index < active_voices)
-           - Se attiva: genera grano con parametri calcolati
-           - Sempre: avanza current_onset per mantenere la "fase"
+        La generazione e' delegata a un GrainEngine (vedi engine/grain_engine.py):
+        - 'scalar': loop grano per grano (default)
+        - 'vectorized': schedule degli onset + colonne valutate in batch
+        
+        Precedenza: chiave YAML 'engine' dello stream > argomento engine > DEFAULT_ENGINE.
+        
+        Args:
+            engine: motore di default per gli stream senza chiave 'engine'
         
         Returns:
-            List[List[Grain]]: grani organizzati per voce
+            List[GrainBlock]: grani organizzati per voce
         """
         # Reset stato
         self.voices = []
-        self.grains = []
-        voice_grains: List[Grain] = []                
-        # 2. Loop per ogni voice
-        current_onset = 0.0
-        
-        # Loop temporale per questa voice
-        while current_onset < self.duration:
-            elapsed_time = current_onset
-            grain_dur = self.grain_duration.get_value(elapsed_time)
-            grain = self._create_grain(elapsed_time, grain_dur)
-            voice_grains.append(grain)
-            inter_onset = self._density.calculate_inter_onset(elapsed_time,grain_dur)
-            current_onset += inter_onset
-        self.voices = [voice_grains]
-        self.grains = voice_grains
-        self.generated = True
+        self.grains = GrainBlock.empty()
+
+        self.attach_grains(self._resolve_engine(engine).generate_voices(self))
         
         return self.voices
     
+    def attach_grains(self, voices: List[GrainBlock]) -> None:
+        """
+        Assegna grani generati altrove (es. in un processo worker).
+        
+        Args:
+            voices: grani organizzati per voce
+        """
+        self.voices = list(voices)
+        self.grains = self.voices[0] if len(self.voices) == 1 else GrainBlock.concatenate(self.voices)
+        self.generated = True
+
+    def __getstate__(self) -> dict:
+        """
+        Stato per pickle (ritorno dai worker di Generator): grains e'
+        derivato dalle voci e non viene serializzato due volte.
+        """
+        state = self.__dict__.copy()
+        state.pop('grains', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.generated:
+            self.attach_grains(self.voices)
+        else:
+            self.grains = GrainBlock.empty()
+
+    def iter_grain_blocks(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        engine: Optional[str] = None
+    ) -> Iterator[GrainBlock]:
+        """
+        Genera i grani in streaming, a blocchi di al massimo chunk_size grani.
+        
+        I blocchi arrivano in ordine di onset e non vengono trattenuti:
+        la memoria di picco dipende da chunk_size, non dalla durata dello
+        stream. self.voices/self.grains non vengono popolati.
+        
+        Args:
+            chunk_size: grani massimi per blocco
+            engine: motore di default per gli stream senza chiave 'engine'
+        
+        Yields:
+            GrainBlock: blocchi consecutivi non vuoti
+        
+        Raises:
+            ValueError: se chunk_size non e' un intero positivo
+        """
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError(f"chunk_size deve essere un intero positivo, ricevuto: {chunk_size}")
+        return self._resolve_engine(engine).iter_blocks(self, chunk_size)
+
+    def iter_grains(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        engine: Optional[str] = None
+    ) -> Iterator[Grain]:
+        """
+        Come iter_grain_blocks(), ma restituisce un Grain alla volta.
+        
+        Yields:
+            Grain: grani in ordine di onset
+        """
+        for block in self.iter_grain_blocks(chunk_size, engine):
+            yield from block
+
+    def set_time_window(self, start: float, end: float) -> None:
+        """
+        Limita la generazione a una finestra [start, end) in tempo assoluto.
+        
+        I motori producono solo i grani con onset < end che suonano ancora
+        a start (onset + durata > start): gli onset precedenti vengono
+        saltati con DensityController.seek() / PointerController.seek(),
+        senza calcolare le colonne dei grani.
+        
+        Args:
+            start: inizio finestra (secondi, tempo della partitura)
+            end: fine finestra (secondi, tempo della partitura)
+        
+        Raises:
+            ValueError: se end <= start
+        """
+        if end <= start:
+            raise ValueError(f"Finestra temporale vuota: from={start}, to={end}")
+        self.time_window = (start - self.onset, end - self.onset)
+
+    @property
+    def grain_lookback(self) -> float:
+        """
+        Durata massima di un grano: quanto prima di un istante puo' iniziare
+        un grano che suona in quell'istante.
+        
+        Durata costante → il valore stesso; altrimenti il limite superiore
+        di grain_duration nei bounds.
+        """
+        fixed = self.time_invariant_parameters.get('grain_duration')
+        if fixed is not None:
+            return fixed
+        return GRANULAR_PARAMETERS['grain_duration'].max_val
+
+    def _resolve_engine(self, engine: Optional[str] = None):
+        """Chiave YAML 'engine' dello stream > argomento engine > DEFAULT_ENGINE."""
+        return GrainEngineFactory.create(self.engine or engine or DEFAULT_ENGINE)
+
     def _create_grain(self, 
                       elapsed_time: float, 
                       grain_dur: float) -> Grain:
@@ -217,13 +391,31 @@ class Stream:
         Crea un singolo grano con tutti i parametri calcolati.
         
         Args:
-            voice_index: indice della voce (0-based)
             elapsed_time: tempo trascorso dall'inizio dello stream
             grain_dur: durata del grano (già calcolata in generate_grains con eventuale dephase)
         
         Returns:
             Grain: oggetto grano completo
         """
+        return Grain(*self._compute_grain_fields(elapsed_time, grain_dur))
+
+    def _compute_grain_fields(self,
+                              elapsed_time: float,
+                              grain_dur: float,
+                              voice: Optional[int] = None) -> tuple:
+        """
+        Calcola i campi di un grano nell'ordine di GRAIN_FIELDS.
+        
+        Args:
+            elapsed_time: tempo trascorso dall'inizio dello stream
+            grain_dur: durata del grano (già calcolata in generate_grains con eventuale dephase)
+            voice: indice della voce (pointer della voce + offset di VoiceManager);
+                   None per gli stream a voce singola
+        
+        Returns:
+            tuple: (onset, duration, pointer_pos, pitch_ratio, volume, pan,
+                    sample_table, envelope_table)
+        """
         grain_reverse = self._calculate_grain_reverse(elapsed_time)
 
         # === 1. PITCH ===
@@ -232,10 +424,22 @@ class Stream:
         
         # === 2. POINTER ===
         # Base + Voice Offset + Jitter Voce
-        pointer_pos = self._pointer.calculate(elapsed_time,grain_dur,grain_reverse)
+        pointer = self._voice_pointers[voice] if voice else self._pointer
+        pointer_pos = pointer.calculate(elapsed_time,grain_dur,grain_reverse)
 
         volume = self.volume.get_value(elapsed_time)
         pan = self.pan.get_value(elapsed_time)        
+
+        if voice is not None:
+            voices = self._voice_manager
+            pitch_ratio *= voices.get_voice_pitch_multiplier(voice, elapsed_time)
+            pointer_pos = (
+                pointer_pos
+                + voices.get_voice_pointer_offset(voice, elapsed_time)
+                + voices.get_voice_pointer_jitter(voice, elapsed_time)
+            ) % self.sample_dur_sec
+            pan += voices.get_voice_pan_offset(voice)
+
         # === 6. ONSET ===
         absolute_onset = self.onset + elapsed_time
 
@@ -243,15 +447,15 @@ class Stream:
         window_name = self._window_controller.select_window()
         window_table_num = self.window_table_map[window_name]
 
-        return Grain(
-            onset=absolute_onset,
-            duration=grain_dur,
-            pointer_pos=pointer_pos,
-            pitch_ratio=pitch_ratio,
-            volume=volume,
-            pan=pan,
-            sample_table=self.sample_table_num,
-            envelope_table=window_table_num
+        return (
+            absolute_onset,
+            grain_dur,
+            pointer_pos,
+            pitch_ratio,
+            volume,
+            pan,
+            self.sample_table_num,
+            window_table_num
         )
 
 
@@ -290,6 +494,29 @@ class Stream:
         if should_flip:
             return not is_reverse_base
         return is_reverse_base
+
+    def _calculate_grain_reverse_many(self, elapsed_times: np.ndarray) -> np.ndarray:
+        """
+        Versione batch di _calculate_grain_reverse().
+        
+        Args:
+            elapsed_times: array dei tempi dei grani
+            
+        Returns:
+            np.ndarray: maschera booleana dei grani reverse
+        """
+        times = np.asarray(elapsed_times, dtype=np.float64)
+        if self.grain_reverse_mode == 'auto':
+            is_reverse_base = self._pointer.get_speeds(times) < 0
+        else:
+            val = self.reverse._value
+            if hasattr(val, 'evaluate'):
+                is_reverse_base = np.array([val.evaluate(t) > 0.5 for t in times.tolist()], dtype=bool)
+            else:
+                is_reverse_base = np.full(len(times), (val > 0.5) if val is not None else True)
+
+        should_flip = self.reverse._probability_gate.should_apply_many(times)
+        return is_reverse_base ^ should_flip
     # =========================================================================
     # PROPRIETÀ PER BACKWARD COMPATIBILITY
     # =========================================================================
@@ -349,8 +576,13 @@ class Stream:
         
     @property
     def num_voices(self):
-        """Espone voice_pitch_offset per ScoreVisualizer."""
-        return 1
+        """Espone il parametro num_voices di VoiceManager (ScoreWriter, ScoreVisualizer)."""
+        return self._voice_manager.num_voices
+
+    @property
+    def max_voices(self) -> int:
+        """Voci allocate (massimo di num_voices)."""
+        return self._voice_manager.max_voices
             
     # =========================================================================
     # REPR
@@ -1,6 +1,7 @@
 # stream_config.py
-from dataclasses import dataclass,fields
+from dataclasses import dataclass, field, fields
 from typing import Optional, Union
+from shared.rng import SeededRandom
     
 @dataclass(frozen=True)
 class StreamContext:
@@ -42,6 +43,12 @@ class StreamConfig:
     
     Condiviso tra Stream e i suoi controller (PointerController, 
     PitchController, DensityController, VoiceManager).
+
+    rng: nodo dello stream nella gerarchia di seed (shared/rng.py).
+    None = nessun seed configurato, i componenti usano il modulo random.
+
+    gate_cache: stato di GateFactory condiviso dai gate dello stream
+    (dephase envelope globale). Vive e muore con la configurazione.
     """
     dephase: Optional[Union[dict, bool, int, float, list]] = False
     range_always_active: bool = False
@@ -49,9 +56,17 @@ class StreamConfig:
     time_mode: str = 'absolute'
     time_scale: float = 1.0
     context: Optional[StreamContext] = None  
+    rng: Optional[SeededRandom] = None
+    gate_cache: dict = field(default_factory=dict, compare=False, repr=False)
 
     @classmethod
-    def from_yaml(cls, yaml_data: dict, context: StreamContext, allow_none: bool = True) -> 'StreamConfig':
+    def from_yaml(
+        cls,
+        yaml_data: dict,
+        context: StreamContext,
+        allow_none: bool = True,
+        rng: Optional[SeededRandom] = None
+    ) -> 'StreamConfig':
         """
         Regole di processo per la sintesi granulare.
         
@@ -61,7 +76,7 @@ class StreamConfig:
         Può essere condiviso tra più stream che utilizzano le stesse
         regole di processo (anche se tipicamente ogni stream ha il suo).
         """
-        field_names = [f.name for f in fields(cls)]
+        field_names = [f.name for f in fields(cls) if f.name not in ('rng', 'gate_cache')]
         
         if allow_none:
             # Includi i campi anche se il valore è None
@@ -74,4 +89,5 @@ class StreamConfig:
                 if name in yaml_data and yaml_data[name] is not None
             }
         kwargs['context'] = context
+        kwargs['rng'] = rng
         return cls(**kwargs)
\ No newline at end of file
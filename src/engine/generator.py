@@ -12,13 +12,20 @@ Mantiene backward compatibility con l'API pubblica esistente.
 import yaml
 import re
 import math
-from typing import List, Tuple, Dict, Any
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional
 
 from core.stream import Stream
 from core.cartridge import Cartridge
 from rendering.ftable_manager import FtableManager
+from rendering.compact_score import CompactScoreEncoder
 from rendering.score_writer import ScoreWriter
 from controllers.window_controller import WindowController
+from parameters.parameter_definitions import GRANULAR_PARAMETERS
+from shared import logger
+from shared.rng import SeededRandom
 
 class Generator:
     """
@@ -44,22 +51,74 @@ class Generator:
         score_writer: scrittore file score
     """
     
-    def __init__(self, yaml_path: str):
+    def __init__(
+        self,
+        yaml_path: str,
+        engine: Optional[str] = None,
+        streaming: bool = False,
+        jobs: int = 1,
+        time_window: Optional[Tuple[float, float]] = None,
+        compact_score: bool = False,
+        score_precision: Optional[Dict[str, int]] = None,
+        stable_tables: bool = False
+    ):
         """
         Inizializza il Generator.
         
         Args:
             yaml_path: percorso file YAML di configurazione
+            engine: motore di generazione grani di default ('scalar', 'vectorized').
+                    None = default di Stream. La chiave YAML 'engine' di uno
+                    stream ha la precedenza.
+            streaming: se True i grani non vengono generati in create_elements()
+                       ma prodotti a blocchi da ScoreWriter durante la scrittura
+                       (memoria limitata, generazione e scrittura sovrapposte)
+            jobs: processi per la generazione parallela degli stream (1 = seriale)
+            time_window: (from, to) in secondi: genera solo l'estratto della
+                         partitura in [from, to), vedi _time_window_offset()
+            compact_score: se True i grani sono scritti con CompactScoreEncoder
+                           (carry, onset relativi) e report accanto allo score
+            score_precision: cifre decimali per colonna della codifica compatta
+            stable_tables: se True i numeri delle ftable sono derivati dal
+                           contenuto (path del sample, nome della window) e non
+                           dall'ordine di registrazione: gli stem invariati
+                           restano identici tra una modifica e l'altra del YAML
+        
+        Raises:
+            ValueError: se jobs < 1, se la finestra non ha 0 <= from < to
+                        o se score_precision non e' valida
         """
+        if not isinstance(jobs, int) or jobs < 1:
+            raise ValueError(f"jobs deve essere un intero >= 1, ricevuto: {jobs}")
+        if time_window is not None:
+            start, end = time_window
+            if start < 0 or end <= start:
+                raise ValueError(
+                    f"Finestra temporale non valida: from={start}, to={end} "
+                    f"(richiesto 0 <= from < to)"
+                )
         self.yaml_path = yaml_path
+        self.engine = engine
+        self.streaming = streaming
+        self.jobs = jobs
+        self.time_window = time_window
+        self.time_offset = 0.0
         self.data: Dict[str, Any] = None
         self.streams: List[Stream] = []
         self.cartridges: List[Cartridge] = []
         
         # Delegati specializzati
-        self.ftable_manager = FtableManager(start_num=1)
+        if stable_tables:
+            self.ftable_manager = FtableManager(start_num=1, numbering='stable')
+        else:
+            self.ftable_manager = FtableManager(start_num=1)
         self.score_writer = ScoreWriter(self.ftable_manager)
+        if compact_score:
+            self.score_writer.encoder = CompactScoreEncoder(precision=score_precision)
         self._stream_data_map: Dict[str, dict] = {}
+        # Path .sco -> stream/cartridge dell'ultima generate_score_files_per_stream
+        # (stima del costo di rendering, vedi RenderScheduler)
+        self.stem_elements: Dict[str, Any] = {}
     # =========================================================================
     # PUBLIC API
     # =========================================================================
@@ -101,12 +160,21 @@ class Generator:
         # Estrai e filtra stream
         stream_data_list = self.data.get('streams', [])
         filtered_streams = self._filter_solo_mute(stream_data_list)
+        cartridge_data_list = self.data.get('cartridges', [])
+
+        # Finestra temporale: scarta (senza costruirli) e sposta gli elementi
+        if self.time_window is not None:
+            filtered_streams = self._filter_time_window(filtered_streams, self._stream_lookback)
+            cartridge_data_list = self._filter_time_window(cartridge_data_list, lambda data: 0.0)
+            self.time_offset = self._time_window_offset(filtered_streams, cartridge_data_list)
+            self.score_writer.advance = self.time_window[0] - self.time_offset
+            filtered_streams = [self._shift_onset(data) for data in filtered_streams]
+            cartridge_data_list = [self._shift_onset(data) for data in cartridge_data_list]
         
         # Crea stream (QUI viene chiamato _register_stream_windows)
         self._create_streams(filtered_streams)
         
         # Crea cartridges
-        cartridge_data_list = self.data.get('cartridges', [])
         if cartridge_data_list:
             self._create_cartridges(cartridge_data_list)
         
@@ -159,6 +227,7 @@ class Generator:
         import os
         os.makedirs(output_dir, exist_ok=True)
         generated = []
+        self.stem_elements = {}
 
         # --- Determina quali stream scrivere ---
         if cache_manager is not None:
@@ -195,6 +264,7 @@ class Generator:
                 yaml_source=self.yaml_path
             )
             generated.append(filepath)
+            self.stem_elements[filepath] = stream
 
         # --- Aggiorna cache dopo scrittura ---
         if cache_manager is not None and dirty_dicts:
@@ -216,6 +286,7 @@ class Generator:
                 yaml_source=self.yaml_path
             )
             generated.append(filepath)
+            self.stem_elements[filepath] = cartridge
 
         return generated
 
@@ -227,32 +298,198 @@ class Generator:
         """
         Crea gli stream granulari applicando logica solo/mute.
         
+        Le ftable (sample e finestre) vengono sempre assegnate qui, in ordine,
+        prima di qualsiasi generazione: la numerazione e' identica in modalita'
+        seriale, parallela e streaming.
+        
+        Con 'seed' al livello radice dello YAML ogni stream riceve un
+        sotto-flusso indipendente (vedi _stream_key).
+        
         Args:
             stream_data_list: lista dizionari parametri stream da YAML
         """        
         print(f"Creazione di {len(stream_data_list)} stream...")
+        parallel = self.jobs > 1 and not self.streaming and len(stream_data_list) > 1
+        pending = []
+        root_rng = self._root_rng()
+        occurrences: Dict[str, int] = {}
         
         for stream_data in stream_data_list:
-            # 1. Crea stream
-            #import json
-            #print(f"[DEBUG] PRIMA Stream({stream_data.get('stream_id')}): {json.dumps(stream_data, default=str)[:200]}", flush=True)
-
-            stream = Stream(stream_data)
-            #print(f"[DEBUG] DOPO  Stream({stream_data.get('stream_id')}): {json.dumps(stream_data, default=str)[:200]}", flush=True)
+            owner = self._stream_key(stream_data, occurrences)
+            rng = None if root_rng is None else root_rng.child(owner)
             self._stream_data_map[stream_data['stream_id']] = stream_data
-            # 2. Registra ftable sample
-            stream.sample_table_num = self.ftable_manager.register_sample(stream.sample)
-            
-            # 3. Pre-registra tutte le finestre possibili
-            # CHIAMATA QUI ↓
-            stream.window_table_map = self._register_stream_windows(stream_data)
-            
-            # 4. Genera grani
-            stream.generate_grains()
+            if parallel:
+                # Lo Stream viene costruito solo nel worker: qui le sole ftable
+                pending.append((len(self.streams), stream_data, rng, owner,
+                                *self._register_stream_tables(stream_data, owner)))
+                self.streams.append(None)
+                continue
+
+            # 1. Crea stream
+            stream = Stream(stream_data, rng=rng) if rng is not None else Stream(stream_data)
+            if self.time_window is not None:
+                start, end = self.time_window
+                stream.set_time_window(start - self.time_offset, end - self.time_offset)
+            # 2-3. Registra ftable sample e pre-registra tutte le finestre possibili
+            stream.table_owner = owner
+            stream.sample_table_num, stream.window_table_map = self._register_stream_tables(stream_data, owner)
             
             self.streams.append(stream)
+
+            # 4. Genera grani (in streaming: rinviato a ScoreWriter)
+            if self.streaming:
+                if stream.engine is None:
+                    stream.engine = self.engine
+            else:
+                stream.generate_grains(engine=self.engine)
+            
             print(f"  → Stream '{stream.stream_id}': {stream}")
+
+        if pending:
+            self._generate_streams_parallel(pending)
+
+    def _register_stream_tables(self, stream_data: dict, owner: str) -> Tuple[int, Dict[str, int]]:
+        """Ftable dello stream: (numero del sample, mappa finestra -> numero)."""
+        sample_table_num = self.ftable_manager.register_sample(stream_data['sample'], owner=owner)
+        return sample_table_num, self._register_stream_windows(stream_data, owner)
+
+    def _root_rng(self) -> Optional[SeededRandom]:
+        """Radice della gerarchia di seed (chiave YAML 'seed'), None se assente."""
+        seed = self.data.get('seed') if self.data else None
+        return None if seed is None else SeededRandom.from_seed(seed)
+
+    @staticmethod
+    def _stream_key(stream_data: dict, occurrences: Dict[str, int]) -> str:
+        """
+        Chiave univoca dello stream: stream_id, con un suffisso di occorrenza
+        per gli stream_id ripetuti (texture1, texture1#1, ...).
+        
+        Identifica il sotto-flusso casuale dello stream (il nome e non la
+        posizione nel file: riordinare, silenziare o aggiungere stream non
+        altera le sequenze degli altri) e l'owner delle sue ftable, cosi'
+        due stream omonimi non condividono l'insieme di tabelle dello stem.
+        """
+        stream_id = str(stream_data.get('stream_id'))
+        count = occurrences.get(stream_id, 0)
+        occurrences[stream_id] = count + 1
+        return stream_id if count == 0 else f"{stream_id}#{count}"
+
+    def _generate_streams_parallel(
+        self,
+        pending: List[Tuple[int, dict, Optional[SeededRandom], str, int, Dict[str, int]]]
+    ):
+        """
+        Genera gli stream in un ProcessPoolExecutor.
+        
+        Ogni worker costruisce lo Stream dal dizionario YAML (una sola volta:
+        il processo principale assegna solo le ftable), genera i grani e lo
+        restituisce. Le voci viaggiano come colonne NumPy (56 byte per
+        grano), il blocco grains derivato non viene trasferito.
+        
+        Con un seed configurato il worker riceve il nodo rng dello stream
+        (picklable): i grani sono identici alla generazione seriale.
+        
+        Args:
+            pending: (posizione in self.streams, dizionario YAML, rng, owner
+                      delle ftable, numero ftable del sample, mappa delle finestre)
+        """
+        workers = min(self.jobs, len(pending))
+        print(f"Generazione parallela: {len(pending)} stream su {workers} processi...")
+        time_window = None
+        if self.time_window is not None:
+            start, end = self.time_window
+            time_window = (start - self.time_offset, end - self.time_offset)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_generation_worker,
+            initargs=(dict(logger.CLIP_LOG_CONFIG),)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _generate_stream,
+                    stream_data,
+                    sample_table_num,
+                    window_table_map,
+                    self.engine,
+                    rng,
+                    time_window
+                )
+                for _, stream_data, rng, _, sample_table_num, window_table_map in pending
+            ]
+            for (index, _, _, owner, *_), future in zip(pending, futures):
+                stream = future.result()
+                stream.table_owner = owner
+                self.streams[index] = stream
+                print(f"  → Stream '{stream.stream_id}': {stream}")
     
+    # =========================================================================
+    # FINESTRA TEMPORALE
+    # =========================================================================
+
+    def _filter_time_window(self, data_list: list, lookback) -> list:
+        """
+        Tiene solo gli elementi che suonano nella finestra [from, to).
+        
+        Un elemento e' fuori se inizia a to o dopo, oppure se anche il suo
+        ultimo suono (onset + duration + lookback) finisce entro from.
+        Lavora sui dizionari YAML: gli elementi scartati non vengono costruiti.
+        
+        Args:
+            data_list: dizionari stream o cartridge
+            lookback: funzione dizionario -> durata massima di un evento
+                      oltre la fine dell'elemento (grani che iniziano
+                      vicino alla fine dello stream)
+        """
+        start, end = self.time_window
+        kept = [
+            data for data in data_list
+            if data['onset'] < end and data['onset'] + data['duration'] + lookback(data) > start
+        ]
+        skipped = len(data_list) - len(kept)
+        if skipped:
+            print(f"⏱  Finestra [{start}, {end}): {skipped} elementi fuori finestra saltati")
+        return kept
+
+    def _time_window_offset(self, stream_data_list: list, cartridge_data_list: list) -> float:
+        """
+        Spostamento degli onset per l'estratto: offset = from - lead.
+        
+        Gli eventi gia' in corso a from (grani iniziati fino a lookback prima,
+        cartridges iniziate prima di from) non possono avere onset negativi:
+        lo score parte lead secondi prima di from e ScoreWriter scrive un
+        advance statement ('a 0 0 lead') che Csound esegue senza produrre
+        audio. Il file renderizzato inizia esattamente a from.
+        """
+        start, _ = self.time_window
+        lead = 0.0
+        for data in stream_data_list:
+            lead = max(lead, min(start - data['onset'], self._stream_lookback(data)))
+        for data in cartridge_data_list:
+            lead = max(lead, start - data['onset'])
+        return start - lead
+
+    def _shift_onset(self, data: dict) -> dict:
+        """Copia del dizionario con l'onset nel tempo dell'estratto."""
+        return dict(data, onset=data['onset'] - self.time_offset)
+
+    @staticmethod
+    def _stream_lookback(stream_data: dict) -> float:
+        """
+        Durata massima di un grano dello stream, letta dallo YAML.
+        
+        Durata numerica senza range → il valore stesso; altrimenti (envelope,
+        range, dephase) il limite superiore di grain_duration. La stima
+        e' conservativa: Stream.grain_lookback raffina il seek del motore.
+        """
+        grain = stream_data.get('grain') or {}
+        duration = grain.get('duration', 0.05)
+        if (isinstance(duration, (int, float))
+                and 'duration_range' not in grain
+                and 'dephase' not in stream_data):
+            return float(duration)
+        return GRANULAR_PARAMETERS['grain_duration'].max_val
+
     def _filter_solo_mute(self, stream_data_list: list) -> list:
         """
         Applica logica solo/mute agli stream.
@@ -306,7 +543,7 @@ class Generator:
             
             # Registra ftable sample
             cartridge.sample_table_num = self.ftable_manager.register_sample(
-                cartridge.sample_path
+                cartridge.sample_path, owner=cartridge.cartridge_id
             )
             
             self.cartridges.append(cartridge)
@@ -390,9 +627,10 @@ class Generator:
         else:
             return obj
         
-    def _register_stream_windows(self, stream_data: dict) -> dict:
-        """Pre-registra tutte le finestre per questo stream."""
+    def _register_stream_windows(self, stream_data: dict, owner: Optional[str] = None) -> dict:
+        """Pre-registra tutte le finestre per questo stream (owner: vedi _stream_key)."""
         stream_id = stream_data.get('stream_id', 'unknown')
+        owner = stream_id if owner is None else owner
         
         # USA METODO STATICO (no istanza temporanea!)
         possible_windows = WindowController.parse_window_list(
@@ -403,8 +641,56 @@ class Generator:
         # Registra tutte le finestre nel FtableManager
         window_map = {}
         for window_name in possible_windows:
-            table_num = self.ftable_manager.register_window(window_name)
+            table_num = self.ftable_manager.register_window(window_name, owner=owner)
             window_map[window_name] = table_num
         
         return window_map
         
+
+
+# =============================================================================
+# WORKER GENERAZIONE PARALLELA (top-level: devono essere picklable)
+# =============================================================================
+
+def _init_generation_worker(clip_log_config: dict):
+    """
+    Inizializza un processo worker.
+    
+    - Riseeda il generatore casuale: con fork tutti i worker erediterebbero
+      lo stesso stato e produrrebbero sequenze identiche.
+    - Riconfigura il clip logger con la configurazione del processo
+      principale; ogni worker scrive su un proprio file di log per non
+      troncare quello principale.
+    """
+    random.seed()
+    yaml_name = clip_log_config.get('yaml_name') or 'generator'
+    logger.configure_clip_logger(
+        enabled=clip_log_config['enabled'],
+        console_enabled=clip_log_config['console_enabled'],
+        file_enabled=clip_log_config['file_enabled'],
+        log_dir=clip_log_config['log_dir'],
+        yaml_name=f"{yaml_name}_worker{os.getpid()}",
+        log_transformations=clip_log_config['log_transformations']
+    )
+
+
+def _generate_stream(
+    stream_data: dict,
+    sample_table_num: int,
+    window_table_map: Dict[str, int],
+    engine: Optional[str],
+    rng: Optional[SeededRandom] = None,
+    time_window: Optional[Tuple[float, float]] = None
+) -> Stream:
+    """
+    Job eseguito nel worker: crea lo Stream, genera i grani e lo restituisce
+    (vedi Stream.__getstate__: le voci viaggiano come colonne NumPy).
+    time_window e' la finestra in tempo della partitura (set_time_window).
+    """
+    stream = Stream(stream_data, rng=rng)
+    stream.sample_table_num = sample_table_num
+    stream.window_table_map = window_table_map
+    if time_window is not None:
+        stream.set_time_window(*time_window)
+    stream.generate_grains(engine=engine)
+    return stream
@@ -0,0 +1,603 @@
+# src/engine/grain_engine.py
+"""
+GrainEngine - motori di generazione grani per Stream.
+
+Stream coordina i controller, il motore decide COME percorrerli:
+
+- ScalarGrainEngine ('scalar'): loop grano per grano, una chiamata per
+  parametro per ogni grano. E' il comportamento storico e il riferimento
+  per i test di equivalenza.
+- VectorizedGrainEngine ('vectorized'): calcola prima lo schedule degli
+  onset (unica ricorrenza intrinsecamente sequenziale), poi valuta ogni
+  colonna del GrainBlock in una sola passata sull'array dei tempi.
+
+Selezione:
+- per stream: chiave YAML 'engine: vectorized'
+- globale:    main.py --engine vectorized (default per gli stream senza chiave)
+
+Ogni motore produce i grani a blocchi (iter_blocks): generate() li
+concatena, Stream.iter_grains() li consuma in streaming con memoria
+limitata dalla dimensione del blocco.
+
+Voci multiple (VoiceManager): ogni voce ha il proprio schedule degli onset
+e il proprio pointer; generate_voices() restituisce un GrainBlock per voce.
+
+Con una finestra temporale (Stream.set_time_window) i motori saltano gli
+onset precedenti con i seek dei controller e producono solo i grani che
+iniziano nella finestra o che suonano gia' al suo inizio.
+
+Design Pattern: Strategy + Registry (come strategy_registry.py).
+Il motore vettoriale usa i metodi batch dei collaboratori
+(PitchController.calculate_many, PointerController.calculate_many,
+WindowController.select_windows, ...): ogni collaboratore che non ha ancora
+un'implementazione array-nativa ricade sulla valutazione per elemento,
+quindi l'output resta corretto anche per configurazioni esotiche.
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+
+from core.grain_block import GrainBlock, GRAIN_FIELDS
+from envelopes.envelope import Envelope
+from parameters.parameter import Parameter
+from shared.probability_gate import NeverGate
+from shared.utils import evaluate_per_element
+
+DEFAULT_ENGINE = 'scalar'
+DEFAULT_CHUNK_SIZE = 8192
+
+
+# =============================================================================
+# INTERFACCIA
+# =============================================================================
+
+class GrainEngine(ABC):
+    """Interfaccia base per i motori di generazione grani."""
+
+    def generate(self, stream) -> GrainBlock:
+        """
+        Genera tutti i grani di una voce dello stream.
+
+        Args:
+            stream: Stream inizializzato (controller, parametri, window_table_map)
+
+        Returns:
+            GrainBlock: grani in ordine di onset
+        """
+        return GrainBlock.concatenate(self.iter_blocks(stream, chunk_size=None))
+
+    def generate_voices(self, stream) -> List[GrainBlock]:
+        """
+        Genera tutti i grani dello stream separati per voce.
+
+        Default: una sola voce (motori senza supporto multi-voce).
+
+        Returns:
+            List[GrainBlock]: un blocco per voce, in ordine di onset
+        """
+        return [self.generate(stream)]
+
+    @abstractmethod
+    def iter_blocks(self, stream, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE) -> Iterator[GrainBlock]:
+        """
+        Genera i grani a blocchi consecutivi, in ordine di onset.
+
+        Args:
+            stream: Stream inizializzato
+            chunk_size: grani massimi per blocco (None = un unico blocco)
+
+        Yields:
+            GrainBlock: blocchi non vuoti
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Nome del motore (chiave nel registry)."""
+        pass
+
+    @staticmethod
+    def _window_bounds(stream) -> Tuple[float, float, float]:
+        """
+        Limiti della generazione in tempo dello stream.
+        
+        Returns:
+            (first, start, stop): istante da cui cercare il primo onset,
+            istante in cui un grano deve ancora suonare, fine degli onset.
+            Senza finestra: (0, -inf, durata dello stream).
+        """
+        window = getattr(stream, 'time_window', None)
+        if window is None:
+            return 0.0, float('-inf'), stream.duration
+        start, end = window
+        first = max(0.0, start - stream.grain_lookback)
+        return first, start, min(stream.duration, end)
+
+    @staticmethod
+    def _seek_controllers(stream, first: float, voice: int = 0) -> None:
+        """Porta lo stato del pointer (loop) della voce all'istante first."""
+        if first > 0.0:
+            _voice_pointer(stream, voice).seek(first)
+
+    @staticmethod
+    def _replays_pointer(stream, start: float, voice: int = 0) -> bool:
+        """
+        True se la finestra richiede di ripercorrere gli onset reali: seek()
+        del pointer non e' esatto con loop a bounds dinamici.
+        """
+        return start > float('-inf') and _voice_pointer(stream, voice).needs_replay
+
+    @staticmethod
+    def _replay_pointer(stream, voice: int, elapsed: np.ndarray) -> None:
+        """Avanza il loop della voce sui grani attivi che la finestra scarta."""
+        if voice > 0:
+            elapsed = elapsed[stream._voice_manager.active_many(np.full(len(elapsed), voice), elapsed)]
+        _voice_pointer(stream, voice).replay(elapsed)
+
+    @staticmethod
+    def _voice_count(stream) -> int:
+        """Voci allocate dallo stream (1 senza VoiceManager)."""
+        voices = getattr(stream, '_voice_manager', None)
+        return 1 if voices is None else voices.max_voices
+
+
+# =============================================================================
+# MOTORE SCALARE
+# =============================================================================
+
+class ScalarGrainEngine(GrainEngine):
+    """
+    Loop temporale grano per grano.
+
+    Per ogni grano: durata → campi (Stream._compute_grain_fields) → inter-onset.
+    I valori vengono accumulati per colonna e impacchettati alla fine.
+    Una durata costante (Stream.time_invariant_parameters) viene letta
+    una sola volta, fuori dal loop.
+    Con una finestra temporale il primo onset arriva da
+    DensityController.seek(); da li' la ricorrenza prosegue grano per grano.
+    Con piu' voci il loop di ogni voce avanza a tratti e i grani vengono
+    fusi in ordine di onset (vedi _iter_merged_blocks).
+    """
+
+    # Grani per tratto di ciascuna voce nella fusione (indipendente da
+    # chunk_size: stesso consumo delle sorgenti casuali in streaming e in memoria)
+    VOICE_MERGE_BLOCK = 256
+
+    def iter_blocks(self, stream, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE) -> Iterator[GrainBlock]:
+        if self._voice_count(stream) == 1:
+            yield from self._iter_voice_blocks(stream, 0, chunk_size)
+            return
+        for block, _ in self._iter_merged_blocks(stream, chunk_size):
+            yield block
+
+    def generate_voices(self, stream) -> List[GrainBlock]:
+        count = self._voice_count(stream)
+        if count == 1:
+            return [self.generate(stream)]
+        parts = [[] for _ in range(count)]
+        for block, voice_indices in self._iter_merged_blocks(stream, None):
+            for voice in range(count):
+                parts[voice].append(block[voice_indices == voice])
+        return [GrainBlock.concatenate(blocks) for blocks in parts]
+
+    def _iter_merged_blocks(
+        self,
+        stream,
+        chunk_size: Optional[int]
+    ) -> Iterator[Tuple[GrainBlock, np.ndarray]]:
+        """
+        Grani di tutte le voci fusi per onset (a parita' di onset, in ordine
+        di voce), a blocchi di chunk_size con l'indice di voce di ogni grano.
+        """
+        def voice_rows(voice):
+            for block in self._iter_voice_blocks(stream, voice, self.VOICE_MERGE_BLOCK):
+                for row in zip(*(getattr(block, name).tolist() for name in GRAIN_FIELDS)):
+                    yield row[0], voice, row
+
+        columns = {name: [] for name in GRAIN_FIELDS}
+        appenders = [columns[name].append for name in GRAIN_FIELDS]
+        voices = []
+        rows = heapq.merge(*(voice_rows(voice) for voice in range(self._voice_count(stream))),
+                           key=itemgetter(0, 1))
+        for _, voice, row in rows:
+            for append, value in zip(appenders, row):
+                append(value)
+            voices.append(voice)
+            if len(voices) == chunk_size:
+                yield GrainBlock.from_columns(columns), np.array(voices)
+                for column in columns.values():
+                    column.clear()
+                voices = []
+
+        if voices:
+            yield GrainBlock.from_columns(columns), np.array(voices)
+
+    def _iter_voice_blocks(self, stream, voice: int, chunk_size: Optional[int]) -> Iterator[GrainBlock]:
+        """Loop grano per grano di una voce."""
+        columns = {name: [] for name in GRAIN_FIELDS}
+        appenders = [columns[name].append for name in GRAIN_FIELDS]
+        count = 0
+        fixed_duration = stream.time_invariant_parameters.get('grain_duration')
+        density = _voice_density(stream, voice)
+        voice_index = voice if self._voice_count(stream) > 1 else None
+        first, start, stop = self._window_bounds(stream)
+        replay = self._replays_pointer(stream, start, voice)
+        pointer = _voice_pointer(stream, voice)
+        current_onset = 0.0
+        if first > 0.0 and not replay:
+            current_onset = density.seek(
+                first, stream.grain_duration if fixed_duration is None else fixed_duration
+            )
+            self._seek_controllers(stream, first, voice)
+
+        while current_onset < stop:
+            elapsed_time = current_onset
+            if fixed_duration is None:
+                grain_dur = stream.grain_duration.get_value(elapsed_time)
+            else:
+                grain_dur = fixed_duration
+            active = voice == 0 or stream._voice_manager.is_voice_active(voice, elapsed_time)
+            if active and elapsed_time + grain_dur > start:
+                fields = (stream._compute_grain_fields(elapsed_time, grain_dur) if voice_index is None
+                          else stream._compute_grain_fields(elapsed_time, grain_dur, voice_index))
+                for append, value in zip(appenders, fields):
+                    append(value)
+                count += 1
+                if count == chunk_size:
+                    yield GrainBlock.from_columns(columns)
+                    for column in columns.values():
+                        column.clear()
+                    count = 0
+            elif active and replay:
+                pointer.replay(np.array([elapsed_time]))
+            inter_onset = density.calculate_inter_onset(elapsed_time, grain_dur)
+            current_onset += inter_onset
+
+        if count:
+            yield GrainBlock.from_columns(columns)
+
+    @property
+    def name(self) -> str:
+        return 'scalar'
+
+
+# =============================================================================
+# MOTORE VETTORIALE
+# =============================================================================
+
+class VectorizedGrainEngine(GrainEngine):
+    """
+    Generazione a due fasi: schedule degli onset, poi colonne in batch.
+
+    Fase 1 (schedule): la ricorrenza onset[i+1] = onset[i] + IOT(onset[i], dur[i])
+    produce gli array elapsed_times e durations, risolta a blocchi da
+    DensityController.schedule_onsets() (predittore/correttore + cumsum).
+
+    Fase 2 (colonne): reverse, pitch, pointer, volume, pan e finestra vengono
+    valutati sull'intero array dei tempi. Il pointer resta ordinato nel tempo
+    (phase accumulator del loop), gli altri parametri sono indipendenti
+    grano per grano.
+
+    L'output e' statisticamente equivalente a ScalarGrainEngine: stessi
+    valori deterministici, stesse distribuzioni per le componenti stocastiche
+    (l'ordine di consumo del generatore casuale cambia).
+
+    Con una finestra temporale lo schedule parte da from_time (checkpoint
+    di DensityController) e i grani gia' finiti all'inizio della finestra
+    vengono scartati prima della fase 2.
+
+    Voci multiple: uno schedule per voce, poi un'unica fase 2 sui tempi
+    di tutte le voci concatenati. Gli offset di VoiceManager sono array
+    per broadcast sull'indice di voce; solo il pointer (stato del loop)
+    viene valutato per tratti contigui, uno per voce. Il costo Python
+    resta quello di una voce sola, il lavoro NumPy cresce con i grani.
+    """
+
+    def iter_blocks(self, stream, chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE) -> Iterator[GrainBlock]:
+        for block, _ in self._iter_voice_blocks(stream, chunk_size):
+            yield block
+
+    def generate_voices(self, stream) -> List[GrainBlock]:
+        count = self._voice_count(stream)
+        if count == 1:
+            return [self.generate(stream)]
+        parts = [[] for _ in range(count)]
+        for block, voice_indices in self._iter_voice_blocks(stream, None):
+            for voice in range(count):
+                parts[voice].append(block[voice_indices == voice])
+        return [GrainBlock.concatenate(blocks) for blocks in parts]
+
+    def _iter_voice_blocks(
+        self,
+        stream,
+        chunk_size: Optional[int]
+    ) -> Iterator[Tuple[GrainBlock, Optional[np.ndarray]]]:
+        """
+        Blocchi di grani con l'indice di voce di ogni grano.
+
+        Con piu' voci ogni blocco riunisce al piu' chunk_size / N grani per
+        voce, fusi in ordine di onset anche tra un blocco e l'altro
+        (voice_indices None con una voce sola).
+        """
+        count = self._voice_count(stream)
+        if count == 1:
+            for elapsed, durations in self._iter_schedule(stream, chunk_size):
+                yield self._build_block(stream, elapsed, durations), None
+            return
+
+        voice_chunk = None if chunk_size is None else max(1, chunk_size // count)
+        schedules = [self._iter_schedule(stream, voice_chunk, voice) for voice in range(count)]
+        for elapsed, durations, voice_indices in self._merge_schedules(schedules):
+            active = stream._voice_manager.active_many(voice_indices, elapsed)
+            if not active.all():
+                elapsed, durations, voice_indices = elapsed[active], durations[active], voice_indices[active]
+            if not len(elapsed):
+                continue
+            block = self._build_block(stream, elapsed, durations, voice_indices)
+            order = np.argsort(elapsed, kind='stable')
+            yield block[order], voice_indices[order]
+
+    @staticmethod
+    def _merge_schedules(
+        schedules: List[Iterator[Tuple[np.ndarray, np.ndarray]]]
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Fonde gli schedule delle voci in tratti consecutivi in ordine di onset.
+
+        Ogni voce tiene in sospeso al piu' un tratto del proprio schedule.
+        Un tratto fuso contiene i grani fino all'orizzonte (il minimo, tra
+        le voci non esaurite, dell'ultimo onset in sospeso): nessun grano
+        successivo puo' avere onset precedente. I grani restano raggruppati
+        per voce (in ordine di voce), come richiesto da _build_block().
+
+        Yields:
+            (elapsed_times, durations, voice_indices)
+        """
+        count = len(schedules)
+        pending = [None] * count
+        exhausted = [False] * count
+        while True:
+            for voice in range(count):
+                if not exhausted[voice] and (pending[voice] is None or not len(pending[voice][0])):
+                    pending[voice] = next(schedules[voice], None)
+                    exhausted[voice] = pending[voice] is None
+            live = [pending[voice][0][-1] for voice in range(count) if not exhausted[voice]]
+            if not live:
+                break
+            horizon = min(live)
+
+            parts = []
+            for voice in range(count):
+                if exhausted[voice]:
+                    continue
+                elapsed, durations = pending[voice]
+                cut = int(np.searchsorted(elapsed, horizon, side='right'))
+                if cut:
+                    parts.append((voice, elapsed[:cut], durations[:cut]))
+                    pending[voice] = (elapsed[cut:], durations[cut:])
+            if parts:
+                yield (np.concatenate([part[1] for part in parts]),
+                       np.concatenate([part[2] for part in parts]),
+                       np.concatenate([np.full(len(part[1]), part[0]) for part in parts]))
+
+    def _build_block(
+        self,
+        stream,
+        elapsed: np.ndarray,
+        durations: np.ndarray,
+        voice_indices: Optional[np.ndarray] = None
+    ) -> GrainBlock:
+        """
+        Valuta tutte le colonne per un tratto dello schedule.
+
+        voice_indices (ordinati, un tratto contiguo per voce) attiva gli
+        offset di VoiceManager e il pointer di ciascuna voce.
+        """
+        reverse = stream._calculate_grain_reverse_many(elapsed)
+        pitch_ratio = stream._pitch.calculate_many(elapsed, grain_reverse=reverse)
+        if voice_indices is None:
+            pointer_pos = stream._pointer.calculate_many(elapsed, durations, reverse)
+        else:
+            pointer_pos = self._voice_pointer_positions(stream, elapsed, durations, reverse, voice_indices)
+        volume = parameter_values(stream.volume, elapsed)
+        pan = parameter_values(stream.pan, elapsed)
+
+        windows, window_indices = stream._window_controller.select_windows(elapsed)
+        window_tables = np.array([stream.window_table_map[name] for name in windows], dtype=np.int32)
+
+        if voice_indices is not None:
+            voices = stream._voice_manager
+            pitch_ratio = pitch_ratio * voices.pitch_multipliers_many(voice_indices, elapsed)
+            pointer_pos = (pointer_pos + voices.pointer_offsets_many(voice_indices, elapsed)) % stream.sample_dur_sec
+            pan = pan + voices.pan_offsets_many(voice_indices)
+
+        return GrainBlock(
+            onset=stream.onset + elapsed,
+            duration=durations,
+            pointer_pos=pointer_pos,
+            pitch_ratio=pitch_ratio,
+            volume=volume,
+            pan=pan,
+            sample_table=stream.sample_table_num,
+            envelope_table=window_tables[window_indices]
+        )
+
+    @staticmethod
+    def _voice_pointer_positions(
+        stream,
+        elapsed: np.ndarray,
+        durations: np.ndarray,
+        reverse: np.ndarray,
+        voice_indices: np.ndarray
+    ) -> np.ndarray:
+        """Pointer di ogni voce sul proprio tratto contiguo (stato del loop per voce)."""
+        edges = np.searchsorted(voice_indices, np.arange(voice_indices[-1] + 2))
+        return np.concatenate([
+            _voice_pointer(stream, voice).calculate_many(elapsed[a:b], durations[a:b], reverse[a:b])
+            for voice, (a, b) in enumerate(zip(edges[:-1], edges[1:]))
+            if b > a
+        ])
+
+    def _iter_schedule(
+        self,
+        stream,
+        chunk_size: Optional[int],
+        voice: int = 0
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Calcola la griglia temporale dei grani a tratti di chunk_size.
+
+        I blocchi dello scheduler (dimensione fissa, indipendente da
+        chunk_size) vengono riaccorpati in tratti di esattamente chunk_size
+        grani (l'ultimo puo' essere piu' corto).
+
+        Yields:
+            (elapsed_times, durations): array float64 della stessa lunghezza
+        """
+        grain_duration = stream.time_invariant_parameters.get('grain_duration')
+        if grain_duration is None:
+            grain_duration = stream.grain_duration
+        first, start, stop = self._window_bounds(stream)
+        replay = self._replays_pointer(stream, start, voice)
+        if replay:
+            first = 0.0
+        else:
+            self._seek_controllers(stream, first, voice)
+
+        pending_elapsed = []
+        pending_durations = []
+        pending = 0
+        density = _voice_density(stream, voice)
+        for elapsed, durations in density.schedule_onsets(stop, grain_duration, from_time=first):
+            if elapsed[0] < start:
+                sounding = elapsed + durations > start
+                runs = (self._sounding_runs(elapsed, durations, sounding) if replay
+                        else [(elapsed[sounding], durations[sounding], True)])
+            else:
+                runs = [(elapsed, durations, True)]
+            for elapsed, durations, sounds in runs:
+                if not sounds:
+                    # Il pointer deve vedere i grani gia' emessi prima di questi
+                    if pending:
+                        yield np.concatenate(pending_elapsed), np.concatenate(pending_durations)
+                        pending_elapsed, pending_durations, pending = [], [], 0
+                    self._replay_pointer(stream, voice, elapsed)
+                    continue
+                if not len(elapsed):
+                    continue
+                pending_elapsed.append(elapsed)
+                pending_durations.append(durations)
+                pending += len(elapsed)
+                if chunk_size is None or pending < chunk_size:
+                    continue
+                elapsed = np.concatenate(pending_elapsed)
+                durations = np.concatenate(pending_durations)
+                full = pending - pending % chunk_size
+                for offset in range(0, full, chunk_size):
+                    yield elapsed[offset:offset + chunk_size], durations[offset:offset + chunk_size]
+                pending_elapsed = [elapsed[full:]]
+                pending_durations = [durations[full:]]
+                pending -= full
+
+        if pending:
+            yield np.concatenate(pending_elapsed), np.concatenate(pending_durations)
+
+    @staticmethod
+    def _sounding_runs(
+        elapsed: np.ndarray,
+        durations: np.ndarray,
+        sounding: np.ndarray
+    ) -> List[Tuple[np.ndarray, np.ndarray, bool]]:
+        """Tratti contigui di grani che suonano / non suonano nella finestra."""
+        edges = np.flatnonzero(np.diff(sounding.astype(np.int8))) + 1
+        bounds = np.concatenate(([0], edges, [len(elapsed)]))
+        return [(elapsed[a:b], durations[a:b], bool(sounding[a]))
+                for a, b in zip(bounds[:-1], bounds[1:])]
+
+    @property
+    def name(self) -> str:
+        return 'vectorized'
+
+
+# =============================================================================
+# HELPER VOCI
+# =============================================================================
+
+def _voice_density(stream, voice: int):
+    """DensityController della voce (la voce 0 usa quello dello stream)."""
+    return stream._density if voice == 0 else stream._voice_densities[voice]
+
+
+def _voice_pointer(stream, voice: int):
+    """PointerController della voce (la voce 0 usa quello dello stream)."""
+    return stream._pointer if voice == 0 else stream._voice_pointers[voice]
+
+
+# =============================================================================
+# HELPER BATCH
+# =============================================================================
+
+def parameter_values(param, times: np.ndarray) -> np.ndarray:
+    """
+    Valuta un Parameter su un array di tempi.
+
+    I Parameter usano la valutazione batch Parameter.get_values().
+    Per gli altri oggetti con get_value(): un parametro statico senza gate
+    non dipende dal tempo, viene valutato una sola volta (clamp e log
+    inclusi) e replicato su tutto l'array; negli altri casi ricade su
+    evaluate_per_element().
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if isinstance(param, Parameter):
+        return param.get_values(times)[0]
+    if (len(times)
+            and not isinstance(getattr(param, 'value', None), Envelope)
+            and isinstance(getattr(param, '_probability_gate', None), NeverGate)):
+        return np.full(len(times), param.get_value(float(times[0])), dtype=np.float64)
+    return evaluate_per_element(param.get_value, times)
+
+
+# =============================================================================
+# REGISTRY + FACTORY
+# =============================================================================
+
+GRAIN_ENGINES: Dict[str, Type[GrainEngine]] = {
+    'scalar': ScalarGrainEngine,
+    'vectorized': VectorizedGrainEngine,
+}
+
+
+def register_grain_engine(name: str, engine_class: Type[GrainEngine]):
+    """Registra un nuovo motore di generazione."""
+    GRAIN_ENGINES[name] = engine_class
+    print(f"✅ Registrato nuovo motore grani: {name} -> {engine_class.__name__}")
+
+
+class GrainEngineFactory:
+    """Crea motori di generazione dal nome."""
+
+    @staticmethod
+    def create(name: str = DEFAULT_ENGINE) -> GrainEngine:
+        """
+        Args:
+            name: chiave in GRAIN_ENGINES
+
+        Raises:
+            ValueError: se il motore non e' registrato
+        """
+        if name not in GRAIN_ENGINES:
+            raise ValueError(
+                f"Motore grani '{name}' non trovato. "
+                f"Disponibili: {list(GRAIN_ENGINES.keys())}"
+            )
+        return GRAIN_ENGINES[name]()
+
+    @staticmethod
+    def available() -> list:
+        """Nomi dei motori registrati."""
+        return list(GRAIN_ENGINES.keys())
@@ -8,11 +8,42 @@ Supports:
 - Dict format: {'type': 'cubic', 'points': [...]}
 """
 
-from typing import Union, List, Dict, Any
+from collections.abc import Sequence
+from typing import Union, List, Dict, Any, Tuple
+
+import numpy as np
+
 from envelopes.envelope_factory import InterpolationStrategyFactory
-from envelopes.envelope_segment import NormalSegment, Segment
+from envelopes.envelope_cursor import EnvelopeCursor
+from envelopes.envelope_segment import (
+    NormalSegment, PeriodicBreakpoints, PeriodicSegment, Segment
+)
 from envelopes.envelope_interpolation import InterpolationStrategy
 
+class FritschCarlsonTangents(Sequence):
+    """
+    Tangenti Fritsch-Carlson calcolate on-demand per indice.
+    
+    Usata con PeriodicBreakpoints: la lista completa avrebbe un elemento
+    per ogni breakpoint espanso.
+    """
+    
+    def __init__(self, points):
+        self._points = points
+    
+    def __len__(self) -> int:
+        return len(self._points)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"tangent index {index} out of range")
+        return Envelope._fritsch_carlson_tangent(self._points, index)
+
+
 class Envelope:
     """
     Envelope temporale con supporto formato compatto.
@@ -64,14 +95,21 @@ class Envelope:
         else:
             raise ValueError(f"Formato envelope non valido: {breakpoints}")
         
-        # ESPANDI formato compatto usando Builder
-        expanded_points = EnvelopeBuilder.parse(raw_points)
+        # Formato compatto diretto: pattern + cicli, senza espansione
+        periodic_points = EnvelopeBuilder.parse_periodic(raw_points)
+        
+        # ESPANDI gli altri formati usando Builder
+        if periodic_points is None:
+            expanded_points = EnvelopeBuilder.parse(raw_points)
         
         # Crea strategy usando Factory
         self.strategy = InterpolationStrategyFactory.create(self.type)
         
         # Parse segmenti → List[NormalSegment]
-        self.segments = self._parse_segments(expanded_points)
+        if periodic_points is not None:
+            self.segments = [self._create_periodic_segment(periodic_points)]
+        else:
+            self.segments = self._parse_segments(expanded_points)
         
         # Valida
         if not self.segments:
@@ -109,6 +147,18 @@ class Envelope:
         
         return [segment]
     
+    def _create_periodic_segment(self, points: PeriodicBreakpoints) -> PeriodicSegment:
+        """
+        Crea il PeriodicSegment di un formato compatto diretto.
+        
+        Per cubic le tangenti sono una sequenza lazy (calcolate per
+        indice): costruzione costante nel numero di ripetizioni.
+        """
+        context = {}
+        if self.type == 'cubic':
+            context['tangents'] = FritschCarlsonTangents(points)
+        return PeriodicSegment(points, self.strategy, context)
+
     def _create_context_for_segment(self, points: List[List[float]]) -> Dict[str, Any]:
         """
         Crea context dict per il segmento (es. tangenti per cubic).
@@ -171,6 +221,43 @@ class Envelope:
         
         return tangents
     
+    @staticmethod
+    def _fritsch_carlson_tangent(points, i: int) -> float:
+        """
+        Tangente Fritsch-Carlson del solo breakpoint i.
+        
+        Stesso risultato di _compute_fritsch_carlson_tangents(points)[i],
+        usando solo i breakpoint vicini (i-1, i, i+1).
+        """
+        n = len(points)
+        if n < 2:
+            return 0.0
+        
+        def delta(k):
+            t0, v0 = points[k]
+            t1, v1 = points[k + 1]
+            return (v1 - v0) / (t1 - t0) if t1 > t0 else 0.0
+        
+        if i == 0:
+            return delta(0)
+        if i == n - 1:
+            return delta(n - 2)
+        
+        d_left = delta(i - 1)
+        d_right = delta(i)
+        if d_left * d_right <= 0:
+            return 0.0
+        return 2.0 / (1.0 / d_left + 1.0 / d_right)
+
+    def value_range(self) -> Tuple[float, float]:
+        """
+        (min, max) dei valori dei breakpoints.
+        
+        Per il formato compatto deriva dal solo pattern, senza espandere:
+        usato dal parser per validare i bounds in O(1) nel caso comune.
+        """
+        return self.segments[0].value_range()
+
     def evaluate(self, t: float) -> float:
         """
         Valuta l'envelope al tempo t.
@@ -185,6 +272,31 @@ class Envelope:
         """
         # Singolo segmento: delega direttamente
         return self.segments[0].evaluate(t)
+
+    def cursor(self) -> EnvelopeCursor:
+        """
+        Valutatore con stato per interrogazioni a tempi crescenti.
+        
+        Stessi valori di evaluate()/integrate(), ma la ricerca del tratto
+        riparte dall'ultima posizione (O(1) ammortizzato). Usato dai
+        consumer sequenziali della generazione grani.
+        """
+        return EnvelopeCursor(self)
+
+    def evaluate_many(self, times) -> np.ndarray:
+        """
+        Versione batch di evaluate() su un array di tempi.
+        
+        Supporta linear, step e cubic: ricerca binaria vettoriale
+        (np.searchsorted) sui breakpoints compilati del segmento.
+        
+        Args:
+            times: Array di tempi in secondi (qualsiasi ordine)
+            
+        Returns:
+            np.ndarray: Valori dell'envelope, identici a evaluate() elemento per elemento
+        """
+        return self.segments[0].evaluate_many(times)
     
     def integrate(self, from_time: float, to_time: float) -> float:
         """
@@ -207,6 +319,22 @@ class Envelope:
         
         # Singolo segmento: delega direttamente
         return self.segments[0].integrate(from_time, to_time)
+
+    def integrate_many(self, from_time: float, to_times) -> np.ndarray:
+        """
+        Versione batch di integrate(): integrale da from_time a ogni tempo.
+        
+        Usa la tabella degli integrali cumulativi del segmento: una ricerca
+        binaria vettoriale più un tratto parziale per elemento.
+        
+        Args:
+            from_time: Tempo iniziale (comune a tutti gli elementi)
+            to_times: Array di tempi finali
+            
+        Returns:
+            np.ndarray: Aree con segno (negative se to_time < from_time)
+        """
+        return self.segments[0].integrate_many(from_time, to_times)
         
     @property
     def breakpoints(self) -> List[List[float]]:
@@ -221,7 +349,11 @@ class Envelope:
         """
         # Tipicamente c'è un solo segment con tutti i breakpoints
         if len(self.segments) == 1:
-            return self.segments[0].breakpoints
+            segment = self.segments[0]
+            if isinstance(segment, PeriodicSegment):
+                # Formato compatto: espansione on-demand per codice legacy
+                return segment.expanded_breakpoints()
+            return segment.breakpoints
         
         # Nel caso di multi-segmento (futuro), concatena
         all_breakpoints = []
@@ -14,6 +14,8 @@ MODIFICHE PRINCIPALI:
 
 from typing import List, Union, Tuple, Optional
 
+from envelopes.envelope_segment import PeriodicBreakpoints
+
 
 class EnvelopeBuilder:
     """
@@ -205,38 +207,10 @@ class EnvelopeBuilder:
             ... )
             [[0.3, 30], [0.45, 50], ...] # cicli accelerano
         """
-        # Import TimeDistributionFactory
-        from envelopes.time_distribution import TimeDistributionFactory
-        
-        # Parse input
         pattern_points_pct = compact[0]
-        end_time = compact[1]  # Tempo assoluto finale
         n_reps = compact[2]
-        interp_type = compact[3] if len(compact) >= 4 else None
-        time_dist_spec = compact[4] if len(compact) == 5 else None
-        
-        # Valida
-        if n_reps < 1:
-            raise ValueError(f"n_reps deve essere >= 1, ricevuto: {n_reps}")
-        
-        if end_time <= time_offset:
-            raise ValueError(
-                f"end_time ({end_time}) deve essere > time_offset ({time_offset})"
-            )
-        
-        if not pattern_points_pct:
-            raise ValueError("pattern_points non può essere vuoto")
-        
-        # CALCOLA durata totale dall'offset
-        total_duration = end_time - time_offset
-        
-        # CREA strategia di distribuzione temporale
-        distributor = TimeDistributionFactory.create(time_dist_spec)
-        
-        # OTTIENI distribuzione cicli (tempi relativi a time_offset=0)
-        relative_cycle_starts, cycle_durations = distributor.calculate_distribution(
-            total_duration, 
-            n_reps
+        distributor, total_duration, relative_cycle_starts, cycle_durations = (
+            cls._compact_cycles(compact, time_offset)
         )
         
         # Espandi breakpoints usando la distribuzione
@@ -272,6 +246,96 @@ class EnvelopeBuilder:
         return expanded
 
 
+    @classmethod
+    def _compact_cycles(cls, compact: list, time_offset: float = 0.0) -> tuple:
+        """
+        Valida il formato compatto e calcola la distribuzione dei cicli.
+        
+        Args:
+            compact: [[[x%, y], ...], end_time, n_reps, interp?, time_dist?]
+            time_offset: Tempo di inizio (da ultimo breakpoint precedente)
+            
+        Returns:
+            (distributor, total_duration, relative_cycle_starts, cycle_durations)
+        """
+        from envelopes.time_distribution import TimeDistributionFactory
+        
+        pattern_points_pct = compact[0]
+        end_time = compact[1]  # Tempo assoluto finale
+        n_reps = compact[2]
+        time_dist_spec = compact[4] if len(compact) == 5 else None
+        
+        # Valida
+        if n_reps < 1:
+            raise ValueError(f"n_reps deve essere >= 1, ricevuto: {n_reps}")
+        
+        if end_time <= time_offset:
+            raise ValueError(
+                f"end_time ({end_time}) deve essere > time_offset ({time_offset})"
+            )
+        
+        if not pattern_points_pct:
+            raise ValueError("pattern_points non può essere vuoto")
+        
+        # CALCOLA durata totale dall'offset
+        total_duration = end_time - time_offset
+        
+        # CREA strategia di distribuzione temporale
+        distributor = TimeDistributionFactory.create(time_dist_spec)
+        
+        # OTTIENI distribuzione cicli (tempi relativi a time_offset=0)
+        relative_cycle_starts, cycle_durations = distributor.calculate_distribution(
+            total_duration, 
+            n_reps
+        )
+        return distributor, total_duration, relative_cycle_starts, cycle_durations
+
+    @classmethod
+    def parse_periodic(cls, raw_points) -> Optional[PeriodicBreakpoints]:
+        """
+        Rappresentazione lazy di un formato compatto DIRETTO.
+        
+        Invece di espandere n_reps × len(pattern) breakpoints, memorizza il
+        pattern una sola volta e gli array dei cicli (start, durata) della
+        TimeDistributionStrategy. I tempi dei breakpoints sono calcolati
+        on-demand con la stessa formula di _expand_compact_format (valori
+        identici all'espansione).
+        
+        Args:
+            raw_points: Formato envelope grezzo
+            
+        Returns:
+            PeriodicBreakpoints, oppure None se raw_points non e' un compatto
+            diretto o se il pattern non e' rappresentabile ciclo per ciclo
+            (x non ordinate, cicli sovrapposti): il chiamante usa parse().
+        """
+        if not cls._is_compact_format(raw_points):
+            return None
+        
+        distributor, total_duration, relative_cycle_starts, cycle_durations = (
+            cls._compact_cycles(raw_points, time_offset=0.0)
+        )
+        
+        pattern_x = [p[0] for p in raw_points[0]]
+        if any(x1 < x0 for x0, x1 in zip(pattern_x, pattern_x[1:])):
+            return None
+        
+        points = PeriodicBreakpoints(
+            raw_points[0],
+            relative_cycle_starts,
+            cycle_durations,
+            time_offset=0.0,
+            discontinuity=cls.DISCONTINUITY_OFFSET
+        )
+        if not points.cycles_ordered():
+            return None
+        
+        cls._log_compact_transformation(
+            raw_points, points, 0.0, total_duration, distributor
+        )
+        cls._log_final_envelope(raw_points, points)
+        return points
+
     @classmethod
     def _log_compact_transformation(
         cls, 
@@ -0,0 +1,133 @@
+# envelope_cursor.py
+"""
+EnvelopeCursor - valutatore con stato per interrogazioni monotone.
+
+La generazione dei grani interroga gli envelope a tempi crescenti:
+Envelope.evaluate() rifà ogni volta la ricerca binaria del tratto
+(O(log n)), il cursore invece ricorda l'ultima posizione e avanza
+(O(1) ammortizzato su una sequenza crescente di tempi).
+
+Valori identici (bit a bit) a Envelope.evaluate() / integrate():
+stessa strategia, stesso tratto, stesse operazioni. Un tempo precedente
+all'ultimo richiesto non e' un errore: la posizione viene ricalcolata
+con una ricerca binaria.
+
+Envelope.evaluate(t) resta il punto d'accesso random-access (visualizer,
+valutazioni isolate); i consumer sequenziali (Parameter, EnvelopeGate,
+PointerController) usano un cursore ottenuto da Envelope.cursor().
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List
+
+
+class _MonotonicSearch:
+    """
+    Punto di inserimento di t in una lista ordinata, con memoria.
+
+    side='left'  → equivalente a bisect_left(times, t)
+    side='right' → equivalente a bisect_right(times, t)
+    """
+
+    __slots__ = ('_times', '_right', '_pos')
+
+    def __init__(self, times: List[float], side: str = 'left'):
+        self._times = times
+        self._right = side == 'right'
+        self._pos = 0
+
+    def position(self, t: float) -> int:
+        times = self._times
+        pos = self._pos
+        n = len(times)
+        if self._right:
+            if pos and times[pos - 1] > t:
+                pos = bisect_right(times, t, 0, pos)
+            else:
+                while pos < n and times[pos] <= t:
+                    pos += 1
+        else:
+            if pos and times[pos - 1] >= t:
+                pos = bisect_left(times, t, 0, pos)
+            else:
+                while pos < n and times[pos] < t:
+                    pos += 1
+        self._pos = pos
+        return pos
+
+    def reset(self) -> None:
+        self._pos = 0
+
+
+class _SegmentLocator:
+    """Indice del tratto che contiene t (come NormalSegment._segment_index)."""
+
+    __slots__ = ('_search', '_last')
+
+    def __init__(self, search: _MonotonicSearch, n_points: int):
+        self._search = search
+        self._last = max(n_points - 2, 0)
+
+    def __call__(self, t: float) -> int:
+        return min(max(self._search.position(t) - 1, 0), self._last)
+
+
+class EnvelopeCursor:
+    """
+    Cursore su un Envelope: evaluate() e integrate() con ricerca incrementale.
+
+    Ogni tipo di interrogazione ha il proprio tracker (valutazione, estremo
+    inferiore e superiore dell'integrale), cosi' integrate(0, t) con t
+    crescente avanza solo il tracker di t.
+
+    Examples:
+        cursor = envelope.cursor()
+        for t in onsets:              # tempi crescenti
+            value = cursor.evaluate(t)
+    """
+
+    __slots__ = ('_envelope', '_segment', '_eval_search', '_from_search', '_to_search',
+                 '_locate_from', '_locate_to')
+
+    def __init__(self, envelope):
+        self._envelope = envelope
+        self._segment = envelope.segments[0]
+        time_list = self._segment._time_list
+        self._eval_search = _MonotonicSearch(time_list, self._segment.strategy.search_side)
+        self._from_search = _MonotonicSearch(time_list, 'right')
+        self._to_search = _MonotonicSearch(time_list, 'right')
+        self._locate_from = _SegmentLocator(self._from_search, len(time_list))
+        self._locate_to = _SegmentLocator(self._to_search, len(time_list))
+
+    @property
+    def envelope(self):
+        """Envelope su cui scorre il cursore."""
+        return self._envelope
+
+    def evaluate(self, t: float) -> float:
+        """Come Envelope.evaluate(t)."""
+        segment = self._segment
+        if t < segment.start_time:
+            return segment.breakpoints[0][1]
+        if t > segment.end_time:
+            return segment.breakpoints[-1][1]
+        return segment.strategy.evaluate_at(
+            self._eval_search.position(t), t, segment.breakpoints, **segment.context
+        )
+
+    def integrate(self, from_time: float, to_time: float) -> float:
+        """Come Envelope.integrate(from_time, to_time)."""
+        if from_time > to_time:
+            return -self.integrate(to_time, from_time)
+        if from_time == to_time:
+            return 0.0
+        return self._segment._integrate(from_time, to_time, self._locate_from, self._locate_to)
+
+    def reset(self) -> None:
+        """Riporta il cursore all'inizio dell'envelope."""
+        self._eval_search.reset()
+        self._from_search.reset()
+        self._to_search.reset()
+
+    def __repr__(self) -> str:
+        return f"EnvelopeCursor(type={self._envelope.type}, position={self._eval_search._pos})"
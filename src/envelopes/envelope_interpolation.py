@@ -1,8 +1,11 @@
 # envelope_interpolation.py
 
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Any
 
+import numpy as np
+
 
 class InterpolationStrategy(ABC):
     """Strategy base per interpolazione."""
@@ -18,6 +21,84 @@ class InterpolationStrategy(ABC):
         """Integra il segmento tra from_t e to_t."""
         pass
 
+    # Lato della ricerca binaria che localizza il tratto in evaluate_at():
+    # 'left' = numero di breakpoint con tempo < t, 'right' = con tempo <= t
+    search_side = 'left'
+
+    def evaluate_sorted(self, t: float, time_list: List[float],
+                        breakpoints: List[List[float]], **context) -> float:
+        """
+        Valuta al tempo t usando i tempi compilati (time_list, ordinati)
+        per localizzare il tratto con una ricerca binaria.
+        """
+        search = bisect_right if self.search_side == 'right' else bisect_left
+        return self.evaluate_at(search(time_list, t), t, breakpoints, **context)
+
+    def evaluate_at(self, position: int, t: float,
+                    breakpoints: List[List[float]], **context) -> float:
+        """
+        Valuta al tempo t dato il punto di inserimento di t nei tempi
+        dei breakpoints (lato search_side).
+        
+        Usato da evaluate_sorted() (ricerca binaria) e da EnvelopeCursor
+        (ricerca incrementale). Default: ricade su evaluate() (scansione
+        lineare), le strategie built-in lo ridefiniscono in O(1).
+        """
+        return self.evaluate(t, breakpoints, **context)
+
+    def evaluate_many(self, t: np.ndarray, times: np.ndarray, values: np.ndarray,
+                      breakpoints: List[List[float]], **context) -> np.ndarray:
+        """
+        Versione batch di evaluate_sorted() su un array di tempi interni
+        all'envelope (le regioni di hold sono gestite da NormalSegment).
+        
+        Default: valutazione per elemento.
+        """
+        return np.fromiter(
+            (self.evaluate(x, breakpoints, **context) for x in t.tolist()),
+            dtype=np.float64,
+            count=len(t)
+        )
+
+    @staticmethod
+    def _first_segment_index(t, times, n: int):
+        """
+        Primo tratto [t_i, t_i+1] che contiene t (come la scansione da 0):
+        con breakpoint a tempi coincidenti vince il tratto che termina in t.
+        """
+        return np.clip(np.searchsorted(times, t, side='left') - 1, 0, max(n - 2, 0))
+
+    def integrate_segment(self, index: int, from_t: float, to_t: float,
+                          breakpoints: List[List[float]], **context) -> float:
+        """
+        Integra dentro il singolo tratto [breakpoints[index], breakpoints[index + 1]].
+        
+        from_t e to_t cadono nel tratto. Usato da NormalSegment per la
+        tabella degli integrali cumulativi. Default: ricade su integrate()
+        (scansione completa), le strategie built-in lo ridefiniscono in O(1).
+        """
+        return self.integrate(from_t, to_t, breakpoints, **context)
+
+    def integrate_segment_many(self, indices: np.ndarray, to_times: np.ndarray,
+                               times: np.ndarray, values: np.ndarray,
+                               breakpoints: List[List[float]], **context) -> np.ndarray:
+        """
+        Versione batch di integrate_segment(): integrale da times[indices[k]]
+        a to_times[k] per ogni k.
+        
+        Args:
+            indices: indice del tratto per ogni tempo
+            to_times: tempi di fine integrazione
+            times, values: breakpoints compilati in array (NormalSegment)
+            breakpoints: breakpoints originali (per il fallback per elemento)
+        """
+        return np.fromiter(
+            (self.integrate_segment(i, times[i], t, breakpoints, **context)
+             for i, t in zip(indices.tolist(), to_times.tolist())),
+            dtype=np.float64,
+            count=len(to_times)
+        )
+
 
 class LinearInterpolation(InterpolationStrategy):
     """Interpolazione lineare tra breakpoints."""
@@ -35,6 +116,28 @@ class LinearInterpolation(InterpolationStrategy):
         if t < breakpoints[0][0]:
             return breakpoints[0][1]
         return breakpoints[-1][1]
+
+    def evaluate_at(self, position: int, t: float,
+                    breakpoints: List[List[float]], **context) -> float:
+        if len(breakpoints) < 2:
+            return breakpoints[0][1]
+        i = min(max(position - 1, 0), len(breakpoints) - 2)
+        t0, v0 = breakpoints[i]
+        t1, v1 = breakpoints[i + 1]
+        alpha = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+        return v0 + alpha * (v1 - v0)
+
+    def evaluate_many(self, t: np.ndarray, times: np.ndarray, values: np.ndarray,
+                      breakpoints: List[List[float]], **context) -> np.ndarray:
+        n = len(times)
+        if n < 2:
+            return np.full(len(t), values[0], dtype=np.float64)
+        i = self._first_segment_index(t, times, n)
+        t0 = times[i]
+        v0 = values[i]
+        h = times[i + 1] - t0
+        alpha = np.where(h > 0, (t - t0) / np.where(h > 0, h, 1.0), 0.0)
+        return v0 + alpha * (values[i + 1] - v0)
     
     def integrate(self, from_t: float, to_t: float, 
                    breakpoints: List[List[float]], **context) -> float:
@@ -94,6 +197,32 @@ class LinearInterpolation(InterpolationStrategy):
         
         return total
 
+    def integrate_segment(self, index: int, from_t: float, to_t: float,
+                          breakpoints: List[List[float]], **context) -> float:
+        """Area del trapezio tra from_t e to_t nel tratto index."""
+        t0, v0 = breakpoints[index]
+        t1, v1 = breakpoints[index + 1]
+        if t1 > t0:
+            v_start = v0 + (v1 - v0) * (from_t - t0) / (t1 - t0)
+            v_end = v0 + (v1 - v0) * (to_t - t0) / (t1 - t0)
+        else:
+            v_start = v_end = v0
+        return 0.5 * (v_start + v_end) * (to_t - from_t)
+
+    def integrate_segment_many(self, indices: np.ndarray, to_times: np.ndarray,
+                               times: np.ndarray, values: np.ndarray,
+                               breakpoints: List[List[float]], **context) -> np.ndarray:
+        t0 = times[indices]
+        v0 = values[indices]
+        h = times[indices + 1] - t0
+        # Stesso ordine delle operazioni di integrate_segment (risultati identici)
+        v_end = np.where(
+            h > 0,
+            v0 + (values[indices + 1] - v0) * (to_times - t0) / np.where(h > 0, h, 1.0),
+            v0
+        )
+        return 0.5 * (v0 + v_end) * (to_times - t0)
+
 
 
 class StepInterpolation(InterpolationStrategy):
@@ -105,6 +234,17 @@ class StepInterpolation(InterpolationStrategy):
             if t >= breakpoints[i][0]:
                 return breakpoints[i][1]
         return breakpoints[0][1]
+
+    search_side = 'right'
+
+    def evaluate_at(self, position: int, t: float,
+                    breakpoints: List[List[float]], **context) -> float:
+        # Ultimo breakpoint <= t
+        return breakpoints[max(position - 1, 0)][1]
+
+    def evaluate_many(self, t: np.ndarray, times: np.ndarray, values: np.ndarray,
+                      breakpoints: List[List[float]], **context) -> np.ndarray:
+        return values[np.maximum(np.searchsorted(times, t, side='right') - 1, 0)]
     
     def integrate(self, from_t: float, to_t: float, 
                    breakpoints: List[List[float]], **context) -> float:
@@ -157,11 +297,22 @@ class StepInterpolation(InterpolationStrategy):
         
         return total
 
+    def integrate_segment(self, index: int, from_t: float, to_t: float,
+                          breakpoints: List[List[float]], **context) -> float:
+        """Area del rettangolo (valore sinistro del tratto)."""
+        return breakpoints[index][1] * (to_t - from_t)
+
+    def integrate_segment_many(self, indices: np.ndarray, to_times: np.ndarray,
+                               times: np.ndarray, values: np.ndarray,
+                               breakpoints: List[List[float]], **context) -> np.ndarray:
+        return values[indices] * (to_times - times[indices])
+
 class CubicInterpolation(InterpolationStrategy):
     """
     Interpolazione cubic Hermite con Fritsch-Carlson.
     
-    Usa integrazione numerica di Simpson per calcolare l'area.
+    L'area e' calcolata in forma chiusa: primitiva esatta del polinomio
+    di Hermite di ogni tratto (nessuna integrazione numerica).
     """
     
     def evaluate(self, t: float, breakpoints: List[List[float]], **context) -> float:
@@ -180,14 +331,58 @@ class CubicInterpolation(InterpolationStrategy):
         if t < breakpoints[0][0]:
             return breakpoints[0][1]
         return breakpoints[-1][1]
+
+    def evaluate_at(self, position: int, t: float,
+                    breakpoints: List[List[float]], **context) -> float:
+        if len(breakpoints) < 2:
+            return breakpoints[0][1]
+        tangents = context.get('tangents', [])
+        i = min(max(position - 1, 0), len(breakpoints) - 2)
+        t0, v0 = breakpoints[i]
+        t1, v1 = breakpoints[i + 1]
+        m0 = tangents[i] if i < len(tangents) else 0
+        m1 = tangents[i + 1] if i + 1 < len(tangents) else 0
+        return self._cubic_hermite(t, t0, v0, m0, t1, v1, m1)
+
+    def evaluate_many(self, t: np.ndarray, times: np.ndarray, values: np.ndarray,
+                      breakpoints: List[List[float]], **context) -> np.ndarray:
+        n = len(times)
+        if n < 2:
+            return np.full(len(t), values[0], dtype=np.float64)
+        tangents = self._tangent_array(context.get('tangents', []), n)
+        i = self._first_segment_index(t, times, n)
+        t0 = times[i]
+        t1 = times[i + 1]
+        v0 = values[i]
+        v1 = values[i + 1]
+        h = t1 - t0
+
+        # Stesse operazioni di _cubic_hermite, elemento per elemento
+        s = (t - t0) / np.where(h == 0, 1.0, h)
+        s2 = s * s
+        s3 = s2 * s
+        h00 = 2*s3 - 3*s2 + 1
+        h10 = s3 - 2*s2 + s
+        h01 = -2*s3 + 3*s2
+        h11 = s3 - s2
+        result = h00 * v0 + h10 * h * tangents[i] + h01 * v1 + h11 * h * tangents[i + 1]
+        return np.where(h == 0, v0, result)
+
+    @staticmethod
+    def _tangent_array(tangents, n: int) -> np.ndarray:
+        """Tangenti come array float di lunghezza n (mancanti = 0)."""
+        if isinstance(tangents, np.ndarray) and len(tangents) == n:
+            return tangents
+        result = np.zeros(n, dtype=np.float64)
+        m = min(len(tangents), n)
+        result[:m] = np.asarray(tangents, dtype=np.float64)[:m]
+        return result
     
     def integrate(self, from_t: float, to_t: float, 
                    breakpoints: List[List[float]], **context) -> float:
         """
-        Integrazione cubic usando regola di Simpson composita.
-        
-        Usa 10 sotto-intervalli per ogni segmento tra breakpoints consecutivi.
-        Simpson: ∫f(x)dx ≈ (h/6) * [f(a) + 4*f(mid) + f(b)]
+        Integrazione cubic esatta: primitiva del polinomio di Hermite
+        di ogni tratto valutata agli estremi.
         """
         if from_t >= to_t:
             return 0.0
@@ -214,8 +409,8 @@ class CubicInterpolation(InterpolationStrategy):
             m0 = tangents[i] if i < len(tangents) else 0.0
             m1 = tangents[i + 1] if i + 1 < len(tangents) else 0.0
             
-            # Integra usando Simpson con 10 sotto-intervalli
-            total += self._integrate_simpson(
+            # Integrale esatto del tratto di Hermite
+            total += self._integrate_hermite(
                 seg_start, seg_end,
                 t0, v0, m0,
                 t1, v1, m1
@@ -242,45 +437,73 @@ class CubicInterpolation(InterpolationStrategy):
                 total += first_v * (hold_end - hold_start)
         
         return total
+
+    def integrate_segment(self, index: int, from_t: float, to_t: float,
+                          breakpoints: List[List[float]], **context) -> float:
+        """Integrale esatto (forma chiusa) sul tratto index."""
+        tangents = context.get('tangents', [])
+        t0, v0 = breakpoints[index]
+        t1, v1 = breakpoints[index + 1]
+        m0 = tangents[index] if index < len(tangents) else 0.0
+        m1 = tangents[index + 1] if index + 1 < len(tangents) else 0.0
+        return self._integrate_hermite(from_t, to_t, t0, v0, m0, t1, v1, m1)
     
-    def _integrate_simpson(
+    def integrate_segment_many(self, indices: np.ndarray, to_times: np.ndarray,
+                               times: np.ndarray, values: np.ndarray,
+                               breakpoints: List[List[float]], **context) -> np.ndarray:
+        n = len(times)
+        tangents = self._tangent_array(context.get('tangents', []), n)
+        t0 = times[indices]
+        h = times[indices + 1] - t0
+        s = (to_times - t0) / np.where(h == 0, 1.0, h)
+        area = self._hermite_primitive(
+            s, h, values[indices], tangents[indices],
+            values[indices + 1], tangents[indices + 1]
+        )
+        return np.where(h == 0, 0.0, area)
+
+    def _integrate_hermite(
         self,
         from_t: float, to_t: float,
         t0: float, v0: float, m0: float,
         t1: float, v1: float, m1: float
     ) -> float:
         """
-        Integrazione Simpson composita su [from_t, to_t].
-        
-        Divide l'intervallo in n sotto-intervalli e applica Simpson su ciascuno.
+        Integrale esatto del tratto di Hermite su [from_t, to_t].
         
         Args:
-            from_t, to_t: limiti integrazione
+            from_t, to_t: limiti integrazione (dentro [t0, t1])
             t0, v0, m0: breakpoint e tangente sinistra
             t1, v1, m1: breakpoint e tangente destra
         
         Returns:
             Area sotto la curva cubic
         """
-        n = 10  # Numero di sotto-intervalli
-        dt = (to_t - from_t) / n
-        total = 0.0
-        
-        for i in range(n):
-            # Estremi sotto-intervallo
-            t_a = from_t + i * dt
-            t_b = from_t + (i + 1) * dt
-            t_mid = (t_a + t_b) / 2
-            
-            # Valuta cubic hermite ai tre punti
-            v_a = self._cubic_hermite(t_a, t0, v0, m0, t1, v1, m1)
-            v_mid = self._cubic_hermite(t_mid, t0, v0, m0, t1, v1, m1)
-            v_b = self._cubic_hermite(t_b, t0, v0, m0, t1, v1, m1)
-            
-            # Simpson: (dt/6) * [f(a) + 4*f(mid) + f(b)]
-            total += (dt / 6.0) * (v_a + 4.0 * v_mid + v_b)
+        h = t1 - t0
+        if h == 0:
+            return v0 * (to_t - from_t)
+        s_from = (from_t - t0) / h
+        s_to = (to_t - t0) / h
+        return (self._hermite_primitive(s_to, h, v0, m0, v1, m1)
+                - self._hermite_primitive(s_from, h, v0, m0, v1, m1))
+
+    @staticmethod
+    def _hermite_primitive(s, h, v0, m0, v1, m1):
+        """
+        Integrale da t0 a t0 + s*h del polinomio di Hermite (scalari o array).
         
-        return total
+        Primitive delle basis functions su [0, s]:
+            H00 = s - s^3 + s^4/2      H10 = s^2/2 - 2s^3/3 + s^4/4
+            H01 = s^3 - s^4/2          H11 = s^4/4 - s^3/3
+        """
+        s2 = s * s
+        s3 = s2 * s
+        s4 = s3 * s
+        p00 = s - s3 + 0.5 * s4
+        p10 = 0.5 * s2 - (2.0 / 3.0) * s3 + 0.25 * s4
+        p01 = s3 - 0.5 * s4
+        p11 = 0.25 * s4 - s3 / 3.0
+        return h * (p00 * v0 + p10 * h * m0 + p01 * v1 + p11 * h * m1)
     
     @staticmethod
     def _cubic_hermite(
@@ -5,6 +5,8 @@ Segment classes for Envelope system.
 Design Pattern: Template Method
 - Segment (ABC): defines interface
 - NormalSegment: linear progression with hold at boundaries
+- PeriodicSegment: NormalSegment over a compact-format pattern,
+  stored once and located by cycle instead of expanded
 
 Each Segment:
 - Contains breakpoints in absolute time
@@ -13,7 +15,12 @@ Each Segment:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
 from envelopes.envelope_interpolation import InterpolationStrategy
 
 
@@ -104,8 +111,93 @@ class NormalSegment(Segment):
     - t > end_time: hold last value
     
     This is the standard envelope segment for all envelope phases.
+    
+    Breakpoints are compiled at construction into contiguous arrays
+    (_times, _values, plus list-valued context such as cubic tangents):
+    evaluate() locates the sub-segment with a binary search (O(log n))
+    and evaluate_many() does the same with np.searchsorted.
+    
+    Integration uses a prefix table built once at construction:
+    _prefix[i] = integral from start_time to breakpoints[i].
+    Each integrate() costs one binary search plus at most two partial
+    sub-segments, instead of a scan over all breakpoints.
     """
     
+    def __init__(
+        self,
+        breakpoints: List[List[float]],
+        strategy: InterpolationStrategy,
+        context: Dict[str, Any] = None
+    ):
+        super().__init__(breakpoints, strategy, context)
+        self._time_list = [p[0] for p in self.breakpoints]
+        self._times = np.array(self._time_list, dtype=np.float64)
+        self._values = np.array([p[1] for p in self.breakpoints], dtype=np.float64)
+        self._array_context = {
+            key: np.asarray(value, dtype=np.float64) if isinstance(value, list) else value
+            for key, value in self.context.items()
+        }
+        self._prefix_list = self._build_prefix_table()
+        self._prefix = np.array(self._prefix_list, dtype=np.float64)
+
+    def _build_prefix_table(self) -> List[float]:
+        """Cumulative area at each breakpoint (O(n) with built-in strategies)."""
+        prefix = [0.0]
+        total = 0.0
+        for i in range(len(self.breakpoints) - 1):
+            total += self.strategy.integrate_segment(
+                i, self._time_list[i], self._time_list[i + 1],
+                self.breakpoints, **self.context
+            )
+            prefix.append(total)
+        return prefix
+
+    def _segment_index(self, t: float) -> int:
+        """Index of the sub-segment containing t (clamped to valid range)."""
+        i = bisect_right(self._time_list, t) - 1
+        return min(max(i, 0), max(len(self._time_list) - 2, 0))
+
+    def _primitive(self, t: float, i: int) -> float:
+        """Integral from start_time to t, t inside sub-segment i."""
+        if len(self._time_list) < 2:
+            return 0.0
+        return self._prefix_list[i] + self.strategy.integrate_segment(
+            i, self._time_list[i], t, self.breakpoints, **self.context
+        )
+
+    def _primitive_many(self, times: np.ndarray) -> np.ndarray:
+        """Integral from start_time to each time, hold regions included."""
+        result = np.empty(len(times), dtype=np.float64)
+        before = times < self.start_time
+        after = times > self.end_time
+        inside = ~(before | after)
+
+        result[before] = self._values[0] * (times[before] - self.start_time)
+        result[after] = self._prefix[-1] + self._values[-1] * (times[after] - self.end_time)
+
+        t_inside = times[inside]
+        if len(self._time_list) < 2:
+            result[inside] = 0.0
+        else:
+            indices = np.searchsorted(self._times, t_inside, side='right') - 1
+            indices = np.clip(indices, 0, len(self._time_list) - 2)
+            result[inside] = self._prefix[indices] + self.strategy.integrate_segment_many(
+                indices, t_inside, self._times, self._values,
+                self.breakpoints, **self.context
+            )
+        return result
+
+    def _integrate_interpolated(self, from_t: float, to_t: float,
+                                locate_from, locate_to) -> float:
+        """Integral over [from_t, to_t] inside [start_time, end_time]."""
+        i = locate_from(from_t)
+        j = locate_to(to_t)
+        if i == j:
+            return self.strategy.integrate_segment(
+                i, from_t, to_t, self.breakpoints, **self.context
+            )
+        return self._primitive(to_t, j) - self._primitive(from_t, i)
+    
     def evaluate(self, t: float) -> float:
         """
         Evaluate with hold at boundaries.
@@ -124,8 +216,34 @@ class NormalSegment(Segment):
         if t > self.end_time:
             return self.breakpoints[-1][1]
         
-        # Delegate to strategy for interpolation
-        return self.strategy.evaluate(t, self.breakpoints, **self.context)
+        # Delegate to strategy for interpolation (binary search on _time_list)
+        return self.strategy.evaluate_sorted(t, self._time_list, self.breakpoints, **self.context)
+
+    def value_range(self) -> Tuple[float, float]:
+        """(min, max) of the breakpoint values."""
+        return float(self._values.min()), float(self._values.max())
+
+    def evaluate_many(self, times) -> np.ndarray:
+        """
+        Batch evaluate(): same values, same hold behavior.
+        
+        Examples:
+            seg = NormalSegment([[0, 0], [1, 10]], linear_strategy)
+            seg.evaluate_many([-0.5, 0.5, 1.5]) → [0, 5, 10]
+        """
+        times = np.asarray(times, dtype=np.float64)
+        result = np.empty(len(times), dtype=np.float64)
+        before = times < self.start_time
+        after = times > self.end_time
+        inside = ~(before | after)
+
+        result[before] = self._values[0]
+        result[after] = self._values[-1]
+        result[inside] = self.strategy.evaluate_many(
+            times[inside], self._times, self._values,
+            self.breakpoints, **self._array_context
+        )
+        return result
     
     def integrate(self, from_t: float, to_t: float) -> float:
         """
@@ -143,6 +261,16 @@ class NormalSegment(Segment):
             seg.integrate(1, 2) → 10        # Hold last value (10)
             seg.integrate(-1, 2) → 15       # All three regions
         """
+        return self._integrate(from_t, to_t, self._segment_index, self._segment_index)
+
+    def _integrate(self, from_t: float, to_t: float, locate_from, locate_to) -> float:
+        """
+        integrate() with pluggable sub-segment lookup.
+        
+        locate_from / locate_to map a time inside the segment to its
+        sub-segment index: binary search here, incremental search in
+        EnvelopeCursor (one tracker per bound, both move forward).
+        """
         if from_t >= to_t:
             return 0.0
         
@@ -164,10 +292,8 @@ class NormalSegment(Segment):
             interp_end = min(to_t, self.end_time)
             
             if interp_end > interp_start:
-                total += self.strategy.integrate(
-                    interp_start, interp_end,
-                    self.breakpoints,
-                    **self.context
+                total += self._integrate_interpolated(
+                    interp_start, interp_end, locate_from, locate_to
                 )
                 from_t = interp_end
         
@@ -180,3 +306,259 @@ class NormalSegment(Segment):
             total += hold_value * (to_t - from_t)
         
         return total
+
+    def integrate_many(self, from_t: float, to_times) -> np.ndarray:
+        """
+        Batch integrate(): integral from from_t to each element of to_times.
+        
+        Signed like Envelope.integrate (to_time < from_t gives a negative area).
+        
+        Examples:
+            seg = NormalSegment([[0, 0], [1, 10]], linear_strategy)
+            seg.integrate_many(0, [0.5, 1, 2]) → [1.25, 5, 15]
+        """
+        to_times = np.asarray(to_times, dtype=np.float64)
+        origin = self._primitive_many(np.array([from_t], dtype=np.float64))[0]
+        return self._primitive_many(to_times) - origin
+
+
+class PeriodicBreakpoints(Sequence):
+    """
+    Lazy breakpoint list of a compact-format envelope.
+
+    Stores the pattern once plus one start time and one duration per cycle;
+    breakpoint g = (cycle k, pattern point j) is computed on access with the
+    same arithmetic as EnvelopeBuilder._expand_compact_format, so values are
+    identical to the expanded list. Memory is O(len(pattern) + n_reps)
+    instead of O(len(pattern) * n_reps) boxed [t, v] lists.
+    """
+
+    def __init__(
+        self,
+        pattern: List[List[float]],
+        relative_cycle_starts: List[float],
+        cycle_durations: List[float],
+        time_offset: float = 0.0,
+        discontinuity: float = 0.0
+    ):
+        self._x = [x_pct / 100.0 for x_pct, _ in pattern]
+        self._y = [y for _, y in pattern]
+        self._starts = [time_offset + start for start in relative_cycle_starts]
+        self._durations = list(cycle_durations)
+        self._time_offset = time_offset
+        self._discontinuity = discontinuity
+        self.pattern_size = len(pattern)
+        self.n_cycles = len(self._starts)
+        self.cycle_first_times = [self.time(k * self.pattern_size) for k in range(self.n_cycles)]
+        self.times = _PeriodicTimes(self)
+
+    def time(self, index: int) -> float:
+        """Absolute time of breakpoint index (non-negative)."""
+        k, j = divmod(index, self.pattern_size)
+        t = self._starts[k] + (self._x[j] * self._durations[k])
+        if j == 0 and (k > 0 or self._time_offset > 0):
+            t += self._discontinuity
+        return t
+
+    def cycle_times(self, k: int) -> List[float]:
+        """Times of the pattern points of cycle k."""
+        first = k * self.pattern_size
+        return [self.time(first + j) for j in range(self.pattern_size)]
+
+    def cycles_ordered(self) -> bool:
+        """
+        True if breakpoints are sorted and cycles follow each other strictly.
+
+        Required for cycle lookup. Pattern x values are sorted by the caller;
+        the discontinuity offset on the first point of a cycle can still
+        overtake the next point when a cycle is shorter than the offset,
+        and patterns outside [0, 100]% can make cycles overlap.
+        """
+        m = self.pattern_size
+        first = self.cycle_first_times
+        if m > 1 and any(first[k] > self.time(k * m + 1) for k in range(self.n_cycles)):
+            return False
+        return all(
+            self.time(k * m + m - 1) < first[k + 1]
+            for k in range(self.n_cycles - 1)
+        )
+
+    def value_range(self) -> Tuple[float, float]:
+        """(min, max) of the breakpoint values, from the pattern alone."""
+        return min(self._y), max(self._y)
+
+    def to_list(self) -> List[List[float]]:
+        """Materialize the expanded [[t, v], ...] list."""
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return self.n_cycles * self.pattern_size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"breakpoint index {index} out of range ({n} breakpoints)")
+        return [self.time(index), self._y[index % self.pattern_size]]
+
+    def __repr__(self) -> str:
+        return (f"PeriodicBreakpoints(pattern={self.pattern_size} points, "
+                f"cycles={self.n_cycles})")
+
+
+class _PeriodicTimes(Sequence):
+    """Time column of PeriodicBreakpoints (bisect-compatible view)."""
+
+    __slots__ = ('_points',)
+
+    def __init__(self, points: PeriodicBreakpoints):
+        self._points = points
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._points.time(index)
+
+
+class PeriodicSegment(NormalSegment):
+    """
+    NormalSegment over PeriodicBreakpoints (compact format, not expanded).
+
+    Construction cost does not grow with the breakpoint count: evaluate()
+    locates the cycle with a binary search over the cycle start times, then
+    the point inside the cycle (O(log n_reps + log len(pattern))). Values
+    are identical to a NormalSegment built on the expanded breakpoints.
+
+    The array views used by batch evaluation and integration (_times,
+    _values, prefix table) are compiled on first use, so envelopes that
+    are only evaluated never pay for them.
+    """
+
+    def __init__(
+        self,
+        breakpoints: PeriodicBreakpoints,
+        strategy: InterpolationStrategy,
+        context: Dict[str, Any] = None
+    ):
+        # No Segment.__init__: sorting would materialize every breakpoint.
+        # Ordering is guaranteed by PeriodicBreakpoints.cycles_ordered().
+        self.breakpoints = breakpoints
+        self.strategy = strategy
+        self.context = context or {}
+        self.start_time = breakpoints.time(0)
+        self.end_time = breakpoints.time(len(breakpoints) - 1)
+        self.duration = self.end_time - self.start_time
+        self._time_list = breakpoints.times
+        self._compiled = None
+
+    # =========================================================================
+    # CYCLE LOOKUP
+    # =========================================================================
+
+    def _position(self, t: float, side: str) -> int:
+        """bisect_left/bisect_right of t over all breakpoint times, by cycle."""
+        points = self.breakpoints
+        k = max(bisect_right(points.cycle_first_times, t) - 1, 0)
+        search = bisect_right if side == 'right' else bisect_left
+        return k * points.pattern_size + search(points.cycle_times(k), t)
+
+    def _segment_index(self, t: float) -> int:
+        i = self._position(t, 'right') - 1
+        return min(max(i, 0), max(len(self.breakpoints) - 2, 0))
+
+    def evaluate(self, t: float) -> float:
+        if t < self.start_time:
+            return self.breakpoints[0][1]
+        if t > self.end_time:
+            return self.breakpoints[-1][1]
+        return self.strategy.evaluate_at(
+            self._position(t, self.strategy.search_side), t,
+            self.breakpoints, **self.context
+        )
+
+    def value_range(self) -> Tuple[float, float]:
+        return self.breakpoints.value_range()
+
+    def expanded_breakpoints(self) -> List[List[float]]:
+        """Expanded [[t, v], ...] list (built on request, for legacy consumers)."""
+        return self.breakpoints.to_list()
+
+    # =========================================================================
+    # LAZY ARRAY VIEWS (batch evaluation / integration)
+    # =========================================================================
+
+    def _compile(self) -> Dict[str, Any]:
+        if self._compiled is None:
+            points = self.breakpoints
+            n_cycles, m = points.n_cycles, points.pattern_size
+            starts = np.array(points._starts, dtype=np.float64)
+            durations = np.array(points._durations, dtype=np.float64)
+            x = np.array(points._x, dtype=np.float64)
+            grid = starts[:, None] + (x[None, :] * durations[:, None])
+            grid[1:, 0] += points._discontinuity
+            if points._time_offset > 0:
+                grid[0, 0] += points._discontinuity
+            times = grid.ravel()
+            values = np.tile(np.array(points._y, dtype=np.float64), n_cycles)
+            array_context = {
+                key: np.fromiter(value, dtype=np.float64, count=len(value))
+                if isinstance(value, Sequence) else value
+                for key, value in self.context.items()
+            }
+            self._compiled = {
+                'times': times,
+                'values': values,
+                'array_context': array_context,
+            }
+        return self._compiled
+
+    @property
+    def _times(self) -> np.ndarray:
+        return self._compile()['times']
+
+    @property
+    def _values(self) -> np.ndarray:
+        return self._compile()['values']
+
+    @property
+    def _array_context(self) -> Dict[str, Any]:
+        return self._compile()['array_context']
+
+    @property
+    def _prefix(self) -> np.ndarray:
+        compiled = self._compile()
+        if 'prefix' not in compiled:
+            times = compiled['times']
+            if len(times) < 2:
+                areas = np.empty(0, dtype=np.float64)
+            else:
+                areas = self.strategy.integrate_segment_many(
+                    np.arange(len(times) - 1), times[1:], times, compiled['values'],
+                    self.breakpoints, **compiled['array_context']
+                )
+            compiled['prefix'] = np.concatenate(([0.0], np.cumsum(areas)))
+        return compiled['prefix']
+
+    @property
+    def _prefix_list(self) -> List[float]:
+        compiled = self._compile()
+        if 'prefix_list' not in compiled:
+            compiled['prefix_list'] = self._prefix.tolist()
+        return compiled['prefix_list']
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"start={self.start_time:.3f}, "
+            f"end={self.end_time:.3f}, "
+            f"cycles={self.breakpoints.n_cycles}, "
+            f"strategy={self.strategy.__class__.__name__})"
+        )
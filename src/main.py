@@ -8,16 +8,50 @@
 
 from shared.logger import configure_clip_logger, get_clip_log_path
 from engine.generator import Generator
+from rendering.compact_score import parse_precision
+from rendering.render_scheduler import RenderScheduler, estimate_render_cost
 from rendering.score_visualizer import ScoreVisualizer
 
 
+def render_scores(generator, scores, options, jobs):
+    """
+    Renderizza gli score generati con RenderScheduler.
+
+    Raises:
+        RuntimeError: se il rendering di almeno uno stem fallisce
+    """
+    import os
+
+    search_paths = {'INCDIR': os.path.dirname(options['orchestra']) or '.'}
+    if options['ss_dir']:
+        search_paths['SSDIR'] = options['ss_dir']
+    scheduler = RenderScheduler(
+        orchestra=options['orchestra'],
+        output_dir=options['output_dir'],
+        log_dir=options['log_dir'],
+        csound=options['csound'],
+        jobs=jobs,
+        search_paths=search_paths
+    )
+    render_jobs = [
+        scheduler.job(path, cost=estimate_render_cost(generator.stem_elements[path])
+                      if path in generator.stem_elements else 0.0)
+        for path in scores
+    ]
+    failed = [result for result in scheduler.render(render_jobs) if not result.ok]
+    if failed:
+        raise RuntimeError(
+            f"Rendering fallito per {len(failed)} stem: "
+            + ', '.join(f"{r.job.stem} (log {r.job.log_path})" for r in failed)
+        )
+
 
 def main():
     import sys
     import os
 
     if len(sys.argv) < 2:
-        print("Uso: python main.py <file.yml> [output.sco] [--visualize] [--show-static] [--per-stream]")
+        print("Uso: python main.py <file.yml> [output.sco] [--visualize] [--show-static] [--per-stream] [--engine NAME] [--streaming] [--jobs N] [--from T0] [--to T1] [--compact] [--precision COL=N,...] [--stable-tables] [--render] [--csound BIN] [--orc FILE] [--sf-dir DIR] [--ss-dir DIR] [--log-dir DIR]")
         sys.exit(1)
 
     yaml_file = sys.argv[1]
@@ -41,6 +75,84 @@ def main():
         if idx + 1 < len(sys.argv):
             aif_dir = sys.argv[idx + 1]
 
+    # Opzioni del Generator: solo quelle esplicitamente richieste da CLI
+    generator_options = {}
+
+    # --engine NAME (default: motore di default di Stream)
+    if '--engine' in sys.argv:
+        idx = sys.argv.index('--engine')
+        if idx + 1 < len(sys.argv):
+            generator_options['engine'] = sys.argv[idx + 1]
+
+    # --jobs N / -j N: generazione parallela degli stream su N processi
+    for flag in ('--jobs', '-j'):
+        if flag in sys.argv:
+            idx = sys.argv.index(flag)
+            if idx + 1 < len(sys.argv):
+                generator_options['jobs'] = int(sys.argv[idx + 1])
+
+    # --from T0 / --to T1: genera solo l'estratto [T0, T1) della partitura,
+    # con onset spostati perche' Csound renderizzi solo quel tratto
+    time_from = None
+    time_to = None
+    if '--from' in sys.argv:
+        idx = sys.argv.index('--from')
+        if idx + 1 < len(sys.argv):
+            time_from = float(sys.argv[idx + 1])
+    if '--to' in sys.argv:
+        idx = sys.argv.index('--to')
+        if idx + 1 < len(sys.argv):
+            time_to = float(sys.argv[idx + 1])
+    if time_from is not None or time_to is not None:
+        generator_options['time_window'] = (
+            0.0 if time_from is None else time_from,
+            float('inf') if time_to is None else time_to
+        )
+        # Un estratto non e' la build completa: non deve aggiornare la cache
+        if use_cache:
+            print("--cache ignorato: --from/--to genera solo un estratto")
+            use_cache = False
+
+    # --compact: codifica compatta dei grani (carry, onset relativi) + report.
+    # --precision onset=5,pan=1: cifre decimali per colonna (implica --compact)
+    if '--compact' in sys.argv:
+        generator_options['compact_score'] = True
+    if '--precision' in sys.argv:
+        idx = sys.argv.index('--precision')
+        if idx + 1 < len(sys.argv):
+            generator_options['compact_score'] = True
+            generator_options['score_precision'] = parse_precision(sys.argv[idx + 1])
+
+    # --stable-tables: numeri delle ftable derivati dal contenuto, stabili
+    # quando si aggiungono/mutano altri stream
+    if '--stable-tables' in sys.argv:
+        generator_options['stable_tables'] = True
+
+    # --render: dopo la generazione renderizza gli score con csound, uno
+    # processo per stem su --jobs worker (longest-first), log in --log-dir
+    do_render = '--render' in sys.argv
+    render_options = {
+        'csound': 'csound',
+        'orchestra': os.path.join('csound', 'main.orc'),
+        'output_dir': aif_dir or 'output',
+        'log_dir': 'logs',
+        'ss_dir': None,
+    }
+    for flag, key in (('--csound', 'csound'), ('--orc', 'orchestra'), ('--sf-dir', 'output_dir'),
+                      ('--log-dir', 'log_dir'), ('--ss-dir', 'ss_dir')):
+        if flag in sys.argv:
+            idx = sys.argv.index(flag)
+            if idx + 1 < len(sys.argv):
+                render_options[key] = sys.argv[idx + 1]
+
+    # --streaming: grani generati e scritti a blocchi (memoria limitata).
+    # La visualizzazione ha bisogno di tutti i grani in memoria.
+    if '--streaming' in sys.argv:
+        if do_visualize:
+            print("--streaming ignorato: --visualize richiede i grani in memoria")
+        else:
+            generator_options['streaming'] = True
+
     yaml_basename = os.path.splitext(os.path.basename(yaml_file))[0]
     configure_clip_logger(
         console_enabled=False,
@@ -51,7 +163,7 @@ def main():
     )
 
     try:
-        generator = Generator(yaml_file)
+        generator = Generator(yaml_file, **generator_options)
 
         print(f"Caricamento {yaml_file}...")
         generator.load_yaml()
@@ -85,6 +197,10 @@ def main():
             print(f"Scrittura score...")
             generator.generate_score_file(output_file)
             print("\n Generazione completata!")
+            generated = [output_file]
+
+        if do_render:
+            render_scores(generator, generated, render_options, generator_options.get('jobs', 1))
 
         if do_visualize:
             print("\nGenerazione partitura grafica...")
@@ -7,6 +7,7 @@ from typing import Optional, Any, Union
 from shared.probability_gate import *
 from enum import Enum
 from envelopes.envelope import Envelope, create_scaled_envelope
+from shared.rng import SeededRandom
 
 class DephaseMode(Enum):
     """Stati semantici di dephase."""
@@ -22,7 +23,8 @@ class GateFactory:
     Factory specializzata per creare ProbabilityGate.
     TOTALMENTE isolata dal sistema Parameter.
     """
-        
+
+
     @staticmethod
     def _is_envelope_like(obj):
         """
@@ -54,8 +56,18 @@ class GateFactory:
         has_explicit_range: bool = False,
         range_always_active: bool = False,
         duration: float = 1.0,       
-        time_mode: str = 'absolute'         
+        time_mode: str = 'absolute',
+        rng: Optional[SeededRandom] = None,
+        shared: Optional[dict] = None
     ) -> ProbabilityGate:
+        """
+        rng: sorgente casuale per i gate stocastici (RandomGate, EnvelopeGate).
+        None = modulo random globale.
+        shared: cache dello stream (StreamConfig.gate_cache) per il dephase
+        envelope globale: i gate dello stesso stream ricevono lo stesso
+        envelope e ne condividono la valutazione batch. None = nessuna
+        condivisione.
+        """
 
         if param_key is None:
             return NeverGate()
@@ -67,30 +79,54 @@ class GateFactory:
         if mode == DephaseMode.DISABLED:
             return AlwaysGate() if has_explicit_range else NeverGate()
         elif mode == DephaseMode.IMPLICIT:
-            return GateFactory._create_probability_gate(default_prob)
+            return GateFactory._create_probability_gate(default_prob, rng)
         elif mode == DephaseMode.GLOBAL:
-            return GateFactory._create_probability_gate(float(dephase))
+            return GateFactory._create_probability_gate(float(dephase), rng)
         elif mode == DephaseMode.GLOBAL_ENV:
-            # Crea Envelope dai dati grezzi
-            envelope = create_scaled_envelope(dephase, duration, time_mode)
-            return EnvelopeGate(envelope)
+            # Envelope globale: uno per stream, condiviso tra i gate
+            probability = GateFactory._shared_probability(dephase, duration, time_mode, shared)
+            return EnvelopeGate(probability.envelope, rng, probability=probability)
         elif mode == DephaseMode.SPECIFIC:
             if param_key in dephase:
                 raw_value = dephase[param_key]
                 if raw_value is None:
-                    return GateFactory._create_probability_gate(default_prob)
+                    return GateFactory._create_probability_gate(default_prob, rng)
                 elif GateFactory._is_envelope_like(raw_value):
                     # Valore envelope per questo parametro specifico
                     envelope = create_scaled_envelope(raw_value, duration, time_mode)
-                    return EnvelopeGate(envelope)
+                    return EnvelopeGate(envelope, rng)
                 else:
-                    return GateFactory._parse_raw_value(raw_value, duration, time_mode)
+                    return GateFactory._parse_raw_value(raw_value, duration, time_mode, rng)
             else:
-                return GateFactory._create_probability_gate(default_prob)        
+                return GateFactory._create_probability_gate(default_prob, rng)        
         return NeverGate()
 
     @staticmethod
-    def _create_probability_gate(probability: float) -> ProbabilityGate:
+    def _shared_probability(
+        dephase,
+        duration: float,
+        time_mode: str,
+        shared: Optional[dict] = None
+    ) -> EnvelopeProbability:
+        """
+        EnvelopeProbability del dephase globale, riusata tramite la cache
+        dello stream se lo stesso oggetto dephase e' gia' stato scalato con
+        la stessa duration e time_mode.
+        """
+        key = (duration, time_mode)
+        cached = None if shared is None else shared.get(key)
+        if cached is not None and cached[0] is dephase:
+            return cached[1]
+        probability = EnvelopeProbability(create_scaled_envelope(dephase, duration, time_mode))
+        if shared is not None:
+            shared[key] = (dephase, probability)
+        return probability
+
+    @staticmethod
+    def _create_probability_gate(
+        probability: float,
+        rng: Optional[SeededRandom] = None
+    ) -> ProbabilityGate:
         """
         Helper per creare gate da valore numerico.
         
@@ -101,10 +137,15 @@ class GateFactory:
         elif probability >= 100:
             return AlwaysGate()
         else:
-            return RandomGate(probability)
+            return RandomGate(probability, rng)
 
     @staticmethod
-    def _parse_raw_value(raw_value: Any, duration: float, time_mode: str) -> ProbabilityGate:
+    def _parse_raw_value(
+        raw_value: Any,
+        duration: float,
+        time_mode: str,
+        rng: Optional[SeededRandom] = None
+    ) -> ProbabilityGate:
         # Numero
         if isinstance(raw_value, (int, float)):
             prob = float(raw_value)
@@ -113,13 +154,13 @@ class GateFactory:
             elif prob >= 100:
                 return AlwaysGate()
             else:
-                return RandomGate(prob)
+                return RandomGate(prob, rng)
         
         # Envelope (con gestione errori)
         if isinstance(raw_value, (list, dict)):
             try:
                 envelope = create_scaled_envelope(raw_value, duration, time_mode)
-                return EnvelopeGate(envelope)
+                return EnvelopeGate(envelope, rng)
             except Exception as e:
                 # Envelope malformato - fallback con logging
                 import logging
@@ -11,13 +11,17 @@ usare catene di if/elif, garantendo estensibilità e pulizia.
 """
 
 import random
-from typing import Union, Optional, Callable, Dict
+from typing import Union, Optional, Callable, Dict, Tuple
+
+import numpy as np
+
 from envelopes.envelope import Envelope
 from parameters.parameter_definitions import ParameterBounds
-from shared.logger import log_clip_warning
+from shared.logger import log_clip_warning, log_clip_summary
 from shared.probability_gate import *
 from shared.distribution_strategy import DistributionFactory, DistributionStrategy
 from strategies.variation_registry import VariationFactory
+from strategies.variation_strategy import AdditiveVariation
 # Definisco un tipo alias per chiarezza: l'input può essere un numero o un Envelope
 ParamInput = Union[float, int, Envelope]
 
@@ -48,19 +52,44 @@ class Parameter:
         self._bounds = bounds
         self._mod_range = mod_range
         self._probability_gate = NeverGate()
+        self._cursors = {}
+        self._evaluator: Callable[[float], float] = self._evaluate
+        self._kind = 'generic'
 
         self._distribution = DistributionFactory.create(distribution_mode)                
         self._variation_strategy = VariationFactory.create(bounds.variation_mode)
         
     def set_probability_gate(self, gate: ProbabilityGate):
-        """Setter per dependency injection."""
+        """
+        Setter per dependency injection.
+        
+        Annulla un'eventuale compile(): il percorso specializzato dipende
+        dal gate.
+        """
         self._probability_gate = gate
+        self._evaluator = self._evaluate
+        self._kind = 'generic'
+
+    def set_rng(self, rng):
+        """
+        Setter per dependency injection della sorgente casuale.
+
+        rng (SeededRandom) alimenta la distribuzione della variazione;
+        None ripristina il modulo random globale.
+        """
+        self._distribution.rng = rng
     
     def get_value(self, time: float) -> float:
         """
         Calcola il valore finale del parametro al tempo specificato.
         Questo è l'unico metodo che il mondo esterno deve chiamare.
+        
+        Delega al percorso scelto da compile() (di default _evaluate).
         """
+        return self._evaluator(time)
+
+    def _evaluate(self, time: float) -> float:
+        """Percorso generico: envelope, range, gate, variazione, clamp."""
         
         # 1. Valuta il valore base (Base Signal)
         base_val = self._evaluate_input(self._value, time)
@@ -81,6 +110,114 @@ class Parameter:
         # 5. Safety Clamp e Ritorno
         return self._clamp(final_val, time)
 
+    def get_values(
+        self,
+        times: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        log_clips: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Versione batch di get_value(): stessi passi, ciascuno su array.
+        
+        1. Envelope valutato su tutti i tempi (evaluate_many)
+        2. Maschera del gate in una chiamata (should_apply_many)
+        3. Variazione solo sui tempi col gate aperto (apply_many, un
+           campione batch dalla distribuzione)
+        4. Clamp con np.clip; i clip vengono loggati in un'unica riga
+        
+        Args:
+            times: array dei tempi (secondi dall'inizio dello stream)
+            rng: Generator NumPy per gate e variazione
+                 (None = sorgenti casuali dei componenti)
+            log_clips: False per valutazioni provvisorie (es. iterazioni
+                       dello scheduler degli onset), che non vanno loggate
+        
+        Returns:
+            (values, clip_mask): valori finali float64 e maschera booleana
+            dei valori tagliati dai bounds
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if self._kind == 'constant':
+            return np.full(len(times), self._constant), np.zeros(len(times), dtype=bool)
+
+        values = self._evaluate_input_many(self._value, times)
+
+        gate_mask = self._probability_gate.should_apply_many(times, rng)
+        if gate_mask.any():
+            current_range = self._calculate_range_many(times[gate_mask])
+            values[gate_mask] = self._variation_strategy.apply_many(
+                values[gate_mask],
+                current_range,
+                self._distribution,
+                rng
+            )
+
+        return self._clamp_many(values, times, log_clips)
+
+    # =========================================================================
+    # PERCORSI SPECIALIZZATI (compile)
+    # =========================================================================
+
+    def compile(self) -> str:
+        """
+        Specializza get_value() sulla forma effettiva del parametro.
+        
+        Chiamato da ParameterOrchestrator dopo l'iniezione del gate. I
+        percorsi producono gli stessi valori (e gli stessi log di clip) del
+        percorso generico, saltando i passi che non possono avere effetto:
+        
+        - 'constant': valore fisso nei bounds, NeverGate → float in cache
+        - 'envelope': Envelope, NeverGate → cursore (+ clamp solo se il
+          range Y dell'envelope esce dai bounds)
+        - 'always_additive': AlwaysGate + variazione additiva → nessuna
+          chiamata al gate, campione diretto dalla distribuzione
+        - 'generic': tutti gli altri casi
+        
+        Returns:
+            Nome del percorso scelto
+        """
+        self._evaluator, self._kind = self._select_evaluator()
+        return self._kind
+
+    @property
+    def is_time_invariant(self) -> bool:
+        """True se compile() ha stabilito che il valore non dipende dal tempo."""
+        return self._kind == 'constant'
+
+    def _select_evaluator(self):
+        gate = self._probability_gate
+
+        if isinstance(gate, NeverGate):
+            if isinstance(self._value, Envelope):
+                if self._within_bounds(*self._value.value_range()):
+                    return self._cursor(self._value).evaluate, 'envelope'
+                return self._evaluate_envelope_clamped, 'envelope'
+            constant = self._evaluate_input(self._value, 0.0)
+            if self._within_bounds(constant, constant):
+                self._constant = constant
+                return self._evaluate_constant, 'constant'
+
+        elif isinstance(gate, AlwaysGate) and isinstance(self._variation_strategy, AdditiveVariation):
+            return self._evaluate_always_additive, 'always_additive'
+
+        return self._evaluate, 'generic'
+
+    def _within_bounds(self, low: float, high: float) -> bool:
+        return self._bounds.min_val <= low and high <= self._bounds.max_val
+
+    def _evaluate_constant(self, time: float) -> float:
+        return self._constant
+
+    def _evaluate_envelope_clamped(self, time: float) -> float:
+        return self._clamp(self._cursor(self._value).evaluate(time), time)
+
+    def _evaluate_always_additive(self, time: float) -> float:
+        base_val = self._evaluate_input(self._value, time)
+        current_range = self._calculate_range(time)
+        if current_range > 0:
+            base_val = self._distribution.sample(base_val, current_range)
+        return self._clamp(base_val, time)
+
     # =========================================================================
     # STRATEGIE DI VARIAZIONE (Private)
     # =========================================================================
@@ -126,9 +263,30 @@ class Parameter:
         if param is None:
             return 0.0
         if isinstance(param, Envelope):
-            return param.evaluate(time)
+            return self._cursor(param).evaluate(time)
         return float(param)
 
+    def _evaluate_input_many(self, param: Optional[ParamInput], times: np.ndarray) -> np.ndarray:
+        """Versione batch di _evaluate_input(): array nuovo, modificabile."""
+        if param is None:
+            return np.zeros(len(times))
+        if isinstance(param, Envelope):
+            return param.evaluate_many(times)
+        return np.full(len(times), float(param))
+
+    def _cursor(self, envelope: Envelope):
+        """
+        Cursore (creato al primo uso) per un envelope del parametro.
+        
+        get_value() viene chiamato a tempi crescenti durante la generazione:
+        il cursore evita di ripetere la ricerca del tratto a ogni grano.
+        """
+        cursor = self._cursors.get(id(envelope))
+        if cursor is None or cursor.envelope is not envelope:
+            cursor = envelope.cursor()
+            self._cursors[id(envelope)] = cursor
+        return cursor
+
     def _calculate_range(self, time: float) -> float:
         """Calcola l'ampiezza della variazione."""
         # Scenario B: Se l'utente non ha messo range, usa il default (Jitter implicito)
@@ -140,6 +298,14 @@ class Parameter:
         # Limita il range stesso ai bounds di validità definiti per il range
         return max(self._bounds.min_range, min(self._bounds.max_range, val))
 
+    def _calculate_range_many(self, times: np.ndarray) -> np.ndarray:
+        """Versione batch di _calculate_range()."""
+        if self._mod_range is None:
+            return np.full(len(times), float(self._bounds.default_jitter))
+        
+        values = self._evaluate_input_many(self._mod_range, times)
+        return np.clip(values, self._bounds.min_range, self._bounds.max_range)
+
     def _clamp(self, value: float, time: float) -> float:
         """Applica i limiti di sicurezza (Min/Max) e logga se taglia."""
         clamped = max(self._bounds.min_val, min(self._bounds.max_val, value))
@@ -159,6 +325,30 @@ class Parameter:
         
         return clamped
 
+    def _clamp_many(
+        self,
+        values: np.ndarray,
+        times: np.ndarray,
+        log_clips: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Versione batch di _clamp(): un solo log riassuntivo per batch."""
+        clamped = np.clip(values, self._bounds.min_val, self._bounds.max_val)
+        clip_mask = clamped != values
+        
+        if log_clips and clip_mask.any():
+            log_clip_summary(
+                stream_id=self.owner_id,
+                param_name=self.name,
+                times=times[clip_mask].tolist(),
+                raw_values=values[clip_mask].tolist(),
+                clipped_values=clamped[clip_mask].tolist(),
+                min_val=self._bounds.min_val,
+                max_val=self._bounds.max_val,
+                is_envelope=isinstance(self._value, Envelope)
+            )
+        
+        return clamped, clip_mask
+
     @property
     def value(self):
         """
@@ -64,6 +64,11 @@ GRANULAR_PARAMETERS: Dict[str, ParameterBounds] = {
         max_val=4000.0,
     ),
     
+    'integral_density': ParameterBounds(
+        min_val=0.01,
+        max_val=4000.0,
+    ),
+    
     'fill_factor': ParameterBounds(
         min_val=0.001,
         max_val=50.0,
@@ -202,6 +207,11 @@ GRANULAR_PARAMETERS: Dict[str, ParameterBounds] = {
         min_val=0.0,
         max_val=1.0
     ),
+
+    'voice_pan_spread': ParameterBounds(
+        min_val=-360.0, # Negativo: ordine delle voci invertito
+        max_val=360.0
+    ),
 }
 
 def get_parameter_definition(param_name: str) -> ParameterBounds:
@@ -13,6 +13,7 @@ from parameters.parameter_schema import ParameterSpec
 from parameters.parameter_definitions import DEFAULT_PROB
 from parameters.exclusive_selector import ExclusiveGroupSelector
 from core.stream_config import StreamConfig
+from shared.rng import SeededRandom, child_rng
 
 class ParameterOrchestrator:
     """
@@ -25,6 +26,7 @@ class ParameterOrchestrator:
     ):
         self._param_factory = ParameterFactory(config)
         self._config = config
+        self._rng: Optional[SeededRandom] = getattr(config, 'rng', None)
     
 
     def create_all_parameters(
@@ -67,6 +69,9 @@ class ParameterOrchestrator:
         """
         # 1. Crea il Parameter base (SENZA probabilità)
         param = self._param_factory.create_smart_parameter(param_spec, yaml_data)
+        param_rng = self._parameter_rng(param_spec.name)
+        if param_rng is not None:
+            param.set_rng(param_rng.child('variation'))
 
         # Controlla se range è esplicitato
         has_explicit_range = False
@@ -80,12 +85,21 @@ class ParameterOrchestrator:
             has_explicit_range=has_explicit_range,
             range_always_active=self._config.range_always_active,
             duration=self._config.context.duration,
-            time_mode=self._config.time_mode
+            time_mode=self._config.time_mode,
+            rng=child_rng(param_rng, 'gate'),
+            shared=getattr(self._config, 'gate_cache', None)
         )        
         # 3. Inietta il gate nel Parameter (modifica la classe Parameter)
         param.set_probability_gate(gate)
+
+        # 4. Forma definitiva: specializza get_value()
+        param.compile()
         
         return param
+
+    def _parameter_rng(self, name: str) -> Optional[SeededRandom]:
+        """Sotto-flusso dedicato al parametro (None senza seed)."""
+        return child_rng(self._rng, name)
     
     def create_constant_parameter(self, name: str, value: float) -> Parameter:
         """
@@ -93,4 +107,9 @@ class ParameterOrchestrator:
 
         Il controller parla solo con l'orchestrator, mai con la factory diretta.
         """
-        return self._param_factory.create_constant_parameter(name, value)
\ No newline at end of file
+        param = self._param_factory.create_constant_parameter(name, value)
+        param_rng = self._parameter_rng(name)
+        if param_rng is not None:
+            param.set_rng(param_rng.child('variation'))
+        param.compile()
+        return param
\ No newline at end of file
@@ -186,8 +186,8 @@ PITCH_PARAMETER_SCHEMA: List[ParameterSpec] = [
 # DENSITY PARAMETER SCHEMA
 # =============================================================================
 # Parametri gestiti da DensityController.
-# NOTA: 'fill_factor' e 'density' sono mutuamente esclusivi.
-#       fill_factor ha priorità. La logica di selezione resta nel Controller.
+# NOTA: 'fill_factor', 'density' e 'integral_density' sono mutuamente
+#       esclusivi. fill_factor ha priorità. La logica di selezione resta nel Controller.
 # =============================================================================
 
 DENSITY_PARAMETER_SCHEMA: List[ParameterSpec] = [
@@ -203,7 +203,14 @@ DENSITY_PARAMETER_SCHEMA: List[ParameterSpec] = [
         yaml_path='density',
         default=None,  # None = non presente di default
         exclusive_group='density_mode',  # <--- STESSO GRUPPO
-        group_priority=2  # <--- PRIORITÀ PIÙ BASSA
+        group_priority=2
+    ),
+    ParameterSpec(
+        name='integral_density',
+        yaml_path='integral_density',
+        default=None,
+        exclusive_group='density_mode',
+        group_priority=3  # <--- PRIORITÀ PIÙ BASSA
     ),
     ParameterSpec(
         name='distribution',
@@ -219,6 +226,50 @@ DENSITY_PARAMETER_SCHEMA: List[ParameterSpec] = [
 ]
 
 
+# =============================================================================
+# VOICE PARAMETER SCHEMA
+# =============================================================================
+# Parametri gestiti da VoiceManager (blocco YAML 'voices').
+# NOTA: gli offset sono per passo di voce: la voce v riceve v × offset,
+#       la voce 0 resta il riferimento.
+# =============================================================================
+
+VOICE_PARAMETER_SCHEMA: List[ParameterSpec] = [
+    ParameterSpec(
+        name='num_voices',
+        yaml_path='num_voices',
+        default=1,
+        range_path='num_voices_range'
+    ),
+    ParameterSpec(
+        name='voice_pitch_offset',
+        yaml_path='pitch_offset',
+        default=0.0
+    ),
+    ParameterSpec(
+        name='voice_pointer_offset',
+        yaml_path='pointer_offset',
+        default=0.0
+    ),
+    ParameterSpec(
+        name='voice_pointer_range',
+        yaml_path='pointer_range',
+        default=0.0
+    ),
+    ParameterSpec(
+        name='voice_pan_spread',
+        yaml_path='pan_spread',
+        default=0.0
+    ),
+    ParameterSpec(
+        name='voice_pan_strategy',
+        yaml_path='pan_strategy',
+        default='linear',
+        is_smart=False
+    ),
+]
+
+
 # =============================================================================
 # REGISTRY COMPLETO: Tutti gli schema indicizzati
 # =============================================================================
@@ -228,6 +279,7 @@ ALL_SCHEMAS = {
     'pointer': POINTER_PARAMETER_SCHEMA,
     'pitch': PITCH_PARAMETER_SCHEMA,
     'density': DENSITY_PARAMETER_SCHEMA,
+    'voice': VOICE_PARAMETER_SCHEMA,
 }
 
 
@@ -240,7 +292,7 @@ def get_schema(schema_name: str) -> List[ParameterSpec]:
     Recupera uno schema per nome.
     
     Args:
-        schema_name: 'stream', 'pointer', 'pitch', 'density'
+        schema_name: 'stream', 'pointer', 'pitch', 'density', 'voice'
         
     Raises:
         KeyError: Se lo schema non esiste.
@@ -199,6 +199,12 @@ class GranularParser:
         
         # Caso 2: Envelope
         if isinstance(param, Envelope):
+            # Range Y gia' nei bounds: nessun breakpoint da visitare
+            # (evita di materializzare gli envelope compatti periodici)
+            low, high = param.value_range()
+            if min_bound <= low and high <= max_bound:
+                return param
+
             needs_fixing = False
             errors = []
             fixed_points = []
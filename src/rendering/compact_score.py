@@ -0,0 +1,248 @@
+"""
+CompactScoreEncoder: codifica compatta degli eventi Grain nello score Csound.
+Opt-in (ScoreWriter con encoder), il formato di default resta quello di
+Grain.to_score_line.
+
+Riduzioni rispetto alla linea verbosa:
+- numero di strumento al posto del nome:  i1 invece di i "Grain"
+- carry Csound '.' per i p-field uguali al grano precedente (p3..p9):
+  tabelle, volume e pan costanti costano 2 byte invece di 5-8
+- onset relativi: '+' se il grano parte alla fine del precedente
+  (p2 + p3 precedenti), '^+delta' se piu' corto dell'onset assoluto
+- precisione configurabile per colonna, zeri finali rimossi
+
+Gli onset relativi sono calcolati in aritmetica intera sulle cifre gia'
+arrotondate: la catena di '^+' ricostruisce esattamente l'onset assoluto
+alla precisione scelta, senza deriva.
+
+Ogni blocco codificato riparte da una linea completa, quindi i blocchi
+(voci, chunk in streaming) sono indipendenti dal contenuto circostante.
+"""
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.grain_block import FLOAT_FIELDS, INT_FIELDS, GrainBlock
+
+# 'instr Grain' e' il primo strumento di csound/main.orc: Csound numera
+# gli strumenti con nome nell'ordine di definizione, partendo da 1
+GRAIN_INSTRUMENT = 1
+
+# Cifre decimali per colonna (default = formato verboso)
+DEFAULT_PRECISION: Dict[str, int] = {
+    'onset': 6,
+    'duration': 6,
+    'pointer_pos': 6,
+    'pitch_ratio': 6,
+    'volume': 2,
+    'pan': 3,
+}
+
+# Linea verbosa: 8 p-field numerici dopo il nome dello strumento
+_VERBOSE_NUMERIC_FIELDS = len(FLOAT_FIELDS) + len(INT_FIELDS)
+
+
+def parse_precision(spec: str) -> Dict[str, int]:
+    """
+    Converte 'colonna=cifre,...' (CLI --precision) in un dizionario.
+
+    Raises:
+        ValueError: colonna sconosciuta o cifre non intere >= 0
+    """
+    precision = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, sep, digits = item.partition('=')
+        name = name.strip()
+        if not sep or name not in DEFAULT_PRECISION:
+            raise ValueError(
+                f"Precisione non valida: '{item}' "
+                f"(atteso colonna=cifre, colonne: {list(DEFAULT_PRECISION)})"
+            )
+        try:
+            precision[name] = int(digits)
+        except ValueError:
+            raise ValueError(f"Precisione non valida per '{name}': '{digits}'") from None
+    return precision
+
+
+class CompactScoreEncoder:
+    """
+    Codifica GrainBlock in linee di score compatte e ne raccoglie le
+    statistiche per il report (dimensione e p-field da convertire).
+    """
+
+    def __init__(
+        self,
+        precision: Optional[Dict[str, int]] = None,
+        instrument: int = GRAIN_INSTRUMENT,
+        carry: bool = True,
+        relative_onsets: bool = True
+    ):
+        """
+        Args:
+            precision: cifre decimali per colonna (sovrascrive DEFAULT_PRECISION)
+            instrument: numero dello strumento Grain nell'orchestra
+            carry: usa '.' per i p-field ripetuti
+            relative_onsets: usa '+' / '^+delta' per p2
+
+        Raises:
+            ValueError: colonna sconosciuta o precisione negativa
+        """
+        precision = dict(precision or {})
+        unknown = set(precision) - set(DEFAULT_PRECISION)
+        if unknown:
+            raise ValueError(f"Colonne di precisione sconosciute: {sorted(unknown)}")
+        self.precision = {**DEFAULT_PRECISION, **precision}
+        for name, digits in self.precision.items():
+            if not isinstance(digits, int) or digits < 0:
+                raise ValueError(f"Precisione per '{name}' deve essere un intero >= 0, ricevuto: {digits}")
+        self.instrument = instrument
+        self.carry = carry
+        self.relative_onsets = relative_onsets
+        self._line_format = f'i{instrument} ' + ' '.join(['%s'] * _VERBOSE_NUMERIC_FIELDS) + '\n'
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Azzera le statistiche (una volta per file .sco)."""
+        self.stats = {
+            'grains': 0,
+            'compact_bytes': 0,
+            'verbose_bytes': 0,
+            'carried': 0,
+            'contiguous_onsets': 0,
+            'relative_onsets': 0,
+        }
+
+    # =========================================================================
+    # CODIFICA
+    # =========================================================================
+
+    def encode(self, block: GrainBlock) -> str:
+        """Linee di score compatte di un blocco (ordinato per onset)."""
+        n = len(block)
+        if not n:
+            return ''
+
+        fixed = {name: self._format_fixed(getattr(block, name), self.precision[name])
+                 for name in FLOAT_FIELDS}
+        columns = [self._onset_tokens(fixed['onset'], fixed['duration'])]
+        columns += [self._trim(fixed[name], self.precision[name]) for name in FLOAT_FIELDS[1:]]
+        columns += [getattr(block, name).astype(str) for name in INT_FIELDS]
+        if self.carry:
+            columns[1:] = [self._carry(tokens) for tokens in columns[1:]]
+
+        values = np.column_stack(columns)
+        text = (self._line_format * n) % tuple(values.ravel().tolist())
+
+        self.stats['grains'] += n
+        self.stats['compact_bytes'] += len(text)
+        self.stats['verbose_bytes'] += len(block.to_score_text())
+        return text
+
+    @staticmethod
+    def _format_fixed(values: np.ndarray, digits: int) -> np.ndarray:
+        """Formattazione '%.Nf' di una colonna intera con un solo '%'."""
+        text = ' '.join([f'%.{digits}f'] * len(values)) % tuple(values.tolist())
+        return np.array(text.split(' '))
+
+    @staticmethod
+    def _trim(tokens: np.ndarray, digits: int) -> np.ndarray:
+        """Rimuove gli zeri decimali finali ('1.500000' -> '1.5', '-0.000' -> '0')."""
+        if digits == 0:
+            return tokens
+        tokens = np.char.rstrip(np.char.rstrip(tokens, '0'), '.')
+        return np.where(tokens == '-0', '0', tokens)
+
+    def _carry(self, tokens: np.ndarray) -> np.ndarray:
+        """'.' dove il token e' uguale a quello del grano precedente."""
+        repeated = np.flatnonzero(tokens[1:] == tokens[:-1]) + 1
+        if not len(repeated):
+            return tokens
+        tokens = tokens.astype(object)
+        tokens[repeated] = '.'
+        self.stats['carried'] += len(repeated)
+        return tokens
+
+    def _onset_tokens(self, onset_fixed: np.ndarray, duration_fixed: np.ndarray) -> np.ndarray:
+        """
+        p2 di ogni grano: assoluto, '+' (contiguo al precedente) o
+        '^+delta', scegliendo il piu' corto. Il primo grano e' sempre assoluto.
+        """
+        digits = self.precision['onset']
+        absolute = self._trim(onset_fixed, digits)
+        if not self.relative_onsets or len(absolute) < 2:
+            return absolute
+
+        # Onset in unita' intere: i delta sono esatti alla precisione scelta
+        onset_units = self._to_units(onset_fixed)
+        delta_units = np.diff(onset_units)
+        deltas = self._trim(self._format_fixed(delta_units / 10 ** digits, digits), digits)
+        relative = np.char.add(np.where(delta_units >= 0, '^+', '^'), deltas)
+
+        # '+' = p2 + p3 del grano precedente, confrontati alla precisione comune
+        scale = max(digits, self.precision['duration'])
+        end_units = (onset_units[:-1] * 10 ** (scale - digits)
+                     + self._to_units(duration_fixed[:-1]) * 10 ** (scale - self.precision['duration']))
+        contiguous = np.flatnonzero(onset_units[1:] * 10 ** (scale - digits) == end_units) + 1
+
+        shorter = np.flatnonzero(np.char.str_len(relative) < np.char.str_len(absolute[1:])) + 1
+        shorter = np.setdiff1d(shorter, contiguous, assume_unique=True)
+
+        tokens = absolute.astype(object)
+        tokens[shorter] = relative[shorter - 1]
+        tokens[contiguous] = '+'
+        self.stats['relative_onsets'] += len(shorter)
+        self.stats['contiguous_onsets'] += len(contiguous)
+        return tokens
+
+    @staticmethod
+    def _to_units(fixed: np.ndarray) -> np.ndarray:
+        """Token '%.Nf' -> intero in unita' di 10^-N (esatto, nessun float)."""
+        return np.char.replace(fixed, '.', '').astype(np.int64)
+
+    # =========================================================================
+    # REPORT
+    # =========================================================================
+
+    @staticmethod
+    def report_path(score_path: str) -> str:
+        """Path del report accanto allo score: out.sco -> out.score_report.txt"""
+        return os.path.splitext(score_path)[0] + '.score_report.txt'
+
+    def write_report(self, score_path: str) -> str:
+        """
+        Scrive il report di dimensione e costo di parsing accanto allo score.
+
+        Il costo di parsing e' stimato dai p-field numerici che Csound deve
+        convertire: '.' e '+' vengono risolti senza conversione.
+
+        Returns:
+            str: path del report
+        """
+        stats = self.stats
+        score_bytes = os.path.getsize(score_path)
+        saved = stats['verbose_bytes'] - stats['compact_bytes']
+        verbose_fields = stats['grains'] * _VERBOSE_NUMERIC_FIELDS
+        numeric_fields = verbose_fields - stats['carried'] - stats['contiguous_onsets']
+        path = self.report_path(score_path)
+        with open(path, 'w') as f:
+            f.write(f"Score compatto: {score_path}\n")
+            f.write(f"Precisione: {self.precision}\n")
+            f.write(f"Grani: {stats['grains']}\n")
+            f.write(f"Dimensione file: {score_bytes} byte\n")
+            f.write(f"Eventi grani: {stats['compact_bytes']} byte "
+                    f"(verboso: {stats['verbose_bytes']} byte, "
+                    f"{self._percent(saved, stats['verbose_bytes'])} risparmiato)\n")
+            f.write(f"Dimensione file verbosa stimata: {score_bytes + saved} byte\n")
+            f.write(f"p-field in carry '.': {stats['carried']}\n")
+            f.write(f"Onset contigui '+': {stats['contiguous_onsets']}\n")
+            f.write(f"Onset relativi '^+': {stats['relative_onsets']}\n")
+            f.write(f"p-field numerici da convertire: {numeric_fields} "
+                    f"(verboso: {verbose_fields}, "
+                    f"{self._percent(verbose_fields - numeric_fields, verbose_fields)} in meno)\n")
+        return path
+
+    @staticmethod
+    def _percent(part: int, total: int) -> str:
+        return f"{100.0 * part / total:.1f}%" if total else "0.0%"
@@ -1,50 +1,99 @@
 """
 FtableManager: gestione centralizzata delle function tables Csound.
 Separato dalla logica di orchestrazione.
+
+Riferimenti per owner (stream_id / cartridge_id): ogni registrazione con
+owner ricorda quale elemento usa la tabella, cosi' uno score per-stem
+scrive solo le tabelle dei propri elementi (Csound non carica con GEN01
+i sample che lo stem non suona). La numerazione resta globale e stabile.
+
+Numerazione:
+- 'sequential' (default): numeri progressivi da start_num in ordine di
+  registrazione
+- 'stable': numero derivato dal contenuto (hash SHA-256 di tipo + path del
+  sample o nome della window) in un intervallo riservato per tipo.
+  Aggiungere, mutare o mettere in solo uno stream non sposta le tabelle
+  degli altri: con il pruning per owner gli stem invariati restano
+  identici byte per byte. Il numero dipende solo dalla chiave: una
+  collisione (rara) solleva ValueError invece di spostare una tabella
+  in base all'ordine di registrazione.
 """
-from typing import Dict, Tuple, Optional
+import hashlib
+from typing import Dict, Iterable, Set, Tuple, Optional
 from controllers.window_registry import WindowRegistry
 
+TABLE_NUMBERING_MODES = ('sequential', 'stable')
+
+# Intervalli [min, max) della numerazione stable, disgiunti per tipo
+STABLE_TABLE_RANGES: Dict[str, Tuple[int, int]] = {
+    'window': (100, 1000),
+    'sample': (1000, 100000),
+}
+
+
 class FtableManager:
     """
     Gestisce allocazione e deduplicazione function tables.
     """
     
-    def __init__(self, start_num: int = 1):
+    def __init__(self, start_num: int = 1, numbering: str = 'sequential'):
         """
         Args:
-            start_num: primo numero tabella disponibile
+            start_num: primo numero tabella disponibile (numerazione sequential)
+            numbering: 'sequential' o 'stable' (vedi docstring del modulo)
+        
+        Raises:
+            ValueError: se numbering non e' riconosciuto
         """
+        if numbering not in TABLE_NUMBERING_MODES:
+            raise ValueError(
+                f"Numerazione ftable '{numbering}' non valida. "
+                f"Validi: {', '.join(TABLE_NUMBERING_MODES)}"
+            )
+        self.numbering = numbering
         self.tables: Dict[int, Tuple[str, str]] = {}  
         self.next_num = start_num
         self._sample_cache: Dict[str, int] = {}  
         self._window_cache: Dict[str, int] = {}
+        self._references: Dict[str, Set[int]] = {}
     
-    def register_sample(self, sample_path: str) -> int:
+    def register_sample(self, sample_path: str, owner: Optional[str] = None) -> int:
         """
         Registra sample (con deduplicazione).
         
+        Args:
+            sample_path: path del file audio
+            owner: id dello stream/cartridge che usa la tabella
+        
         Returns:
             int: numero tabella
         """
         if sample_path in self._sample_cache:
-            return self._sample_cache[sample_path]
+            num = self._sample_cache[sample_path]
+            self._add_reference(owner, num)
+            return num
         
-        num = self.next_num
-        self.next_num += 1
+        num = self._allocate('sample', sample_path)
         self.tables[num] = ('sample', sample_path)
         self._sample_cache[sample_path] = num
+        self._add_reference(owner, num)
         return num
     
-    def register_window(self, window_name: str) -> int:
+    def register_window(self, window_name: str, owner: Optional[str] = None) -> int:
         """
         Registra window (con deduplicazione).
         
+        Args:
+            window_name: nome della finestra nel WindowRegistry
+            owner: id dello stream che usa la tabella
+        
         Returns:
             int: numero tabella
         """
         if window_name in self._window_cache:
-            return self._window_cache[window_name]
+            num = self._window_cache[window_name]
+            self._add_reference(owner, num)
+            return num
         
         # Valida che la window esista nel registro
         if WindowRegistry.get(window_name) is None:
@@ -53,11 +102,42 @@ class FtableManager:
                 f"Validi: {', '.join(WindowRegistry.all_names())}"
             )
         
-        num = self.next_num
-        self.next_num += 1
+        num = self._allocate('window', window_name)
         self.tables[num] = ('window', window_name)
         self._window_cache[window_name] = num
+        self._add_reference(owner, num)
+        return num
+
+    def _allocate(self, ftype: str, key: str) -> int:
+        """Numero per una nuova tabella secondo la numerazione scelta."""
+        if self.numbering == 'sequential':
+            num = self.next_num
+            self.next_num += 1
+            return num
+        return self._stable_table_num(ftype, key)
+
+    def _stable_table_num(self, ftype: str, key: str) -> int:
+        """
+        Numero derivato da hash(tipo, chiave) nell'intervallo del tipo.
+        
+        Raises:
+            ValueError: se il numero e' gia' di un'altra chiave (collisione)
+        """
+        low, high = STABLE_TABLE_RANGES[ftype]
+        digest = hashlib.sha256(f"{ftype}:{key}".encode('utf-8')).hexdigest()
+        num = low + int(digest[:16], 16) % (high - low)
+        if num in self.tables:
+            other = self.tables[num][1]
+            raise ValueError(
+                f"Collisione ftable stable {num}: '{key}' e '{other}'. "
+                f"Rinominare uno dei due file o usare la numerazione 'sequential'."
+            )
         return num
+
+    def _add_reference(self, owner: Optional[str], num: int) -> None:
+        """Ricorda che owner usa la tabella num (None = nessun owner)."""
+        if owner is not None:
+            self._references.setdefault(owner, set()).add(num)
     
     # =========================================================================
     # AGGIUNTE CONSIGLIATE
@@ -81,14 +161,29 @@ class FtableManager:
         """
         return self._window_cache.get(window_name)
     
-    def get_all_tables(self) -> Dict[int, Tuple[str, str]]:
+    def get_table_nums(self, owner: str) -> Set[int]:
+        """Numeri delle tabelle usate da owner (vuoto se sconosciuto)."""
+        return set(self._references.get(owner, ()))
+    
+    def get_all_tables(self, owners: Optional[Iterable[str]] = None) -> Dict[int, Tuple[str, str]]:
         """
-        Ritorna copia di tutte le tabelle registrate.
+        Ritorna copia delle tabelle registrate.
+        
+        Args:
+            owners: se indicato, solo le tabelle usate da questi owner
+                    piu' quelle registrate senza owner (sempre incluse)
         
         Returns:
             dict: {table_num: (ftype, key)}
         """
-        return dict(self.tables)
+        if owners is None:
+            return dict(self.tables)
+        owned = set().union(*self._references.values())
+        wanted = set().union(*(self._references.get(owner, ()) for owner in owners))
+        return {
+            num: table for num, table in self.tables.items()
+            if num in wanted or num not in owned
+        }
     
     def __repr__(self) -> str:
         """Rappresentazione per debugging."""
@@ -96,19 +191,26 @@ class FtableManager:
         n_windows = len(self._window_cache)
         return (f"FtableManager(tables={len(self.tables)}, "
                 f"samples={n_samples}, windows={n_windows}, "
-                f"next_num={self.next_num})")
+                f"next_num={self.next_num}, numbering={self.numbering})")
     
     # =========================================================================
     # SCRITTURA FILE SCORE
     # =========================================================================
     
-    def write_to_file(self, f) -> None:
-        """Scrive tutte le ftables nel file score Csound."""
+    def write_to_file(self, f, owners: Optional[Iterable[str]] = None) -> None:
+        """
+        Scrive le ftables nel file score Csound.
+        
+        Args:
+            f: file handle aperto in scrittura
+            owners: se indicato, solo le tabelle di questi owner
+                    (vedi get_all_tables); None = tutte
+        """
         f.write("; " + "="*77 + "\n")
         f.write("; FUNCTION TABLES\n")
         f.write("; " + "="*77 + "\n\n")
         
-        for num, (ftype, key) in sorted(self.tables.items()):
+        for num, (ftype, key) in sorted(self.get_all_tables(owners).items()):
             if ftype == 'sample':
                 f.write(f'; Sample: {key}\n')
                 f.write(f'f {num} 0 0 1 "{key}" 0 0 1\n\n')
@@ -0,0 +1,191 @@
+"""
+RenderScheduler: rendering Csound degli score (stem) su un pool di processi.
+Separato dalla logica di generazione.
+
+Ogni stem e' un processo csound indipendente: i worker sono thread che
+attendono il proprio subprocess, il lavoro vero gira nei processi Csound.
+
+Scheduling longest-first (LPT): gli stem vengono avviati in ordine di costo
+decrescente, cosi' lo stem piu' lungo non parte per ultimo lasciando gli
+altri core inattivi. Il costo e' stimato da estimate_render_cost():
+numero di grani x durata media = somma delle durate dei grani.
+
+Output di ogni processo (stdout + stderr) scritto in streaming nel log dello
+stem: {log_dir}/{stem}.log. Il binario csound e' iniettabile (test, wrapper).
+"""
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_CSOUND = 'csound'
+DEFAULT_MESSAGE_LEVEL = 134
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """Uno stem da renderizzare."""
+    stem: str
+    score_path: str
+    output_path: str
+    log_path: str
+    cost: float = 0.0
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """Esito del rendering di uno stem."""
+    job: RenderJob
+    returncode: int
+    wall_time: float
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def estimate_render_cost(element) -> float:
+    """
+    Costo di rendering di uno stream/cartridge: grani x durata media,
+    cioe' la somma delle durate dei grani (secondi di grano da sintetizzare).
+
+    Senza grani in memoria (modalita' streaming, cartridge) il costo e' la
+    durata dell'elemento.
+    """
+    voices = getattr(element, 'voices', None) or []
+    total = sum(float(np.sum(voice.duration)) for voice in voices if len(voice))
+    if total > 0.0:
+        return total
+    return float(getattr(element, 'duration', 0.0) or 0.0)
+
+
+class RenderScheduler:
+    """
+    Lancia csound per ogni stem su un pool di jobs worker.
+
+    Responsabilita:
+    - Costruire la command line csound di uno stem
+    - Ordinare gli stem per costo decrescente
+    - Eseguire i processi in parallelo con log per stem
+    - Riportare il tempo wall di ogni stem
+    """
+
+    def __init__(
+        self,
+        orchestra: str,
+        output_dir: str = 'output',
+        log_dir: str = 'logs',
+        csound: str = DEFAULT_CSOUND,
+        jobs: int = 1,
+        search_paths: Optional[Dict[str, str]] = None,
+        message_level: int = DEFAULT_MESSAGE_LEVEL,
+        output_ext: str = '.aif'
+    ):
+        """
+        Args:
+            orchestra: file .orc
+            output_dir: directory dei file audio renderizzati
+            log_dir: directory dei log per stem
+            csound: binario csound (path o nome nel PATH)
+            jobs: processi csound in parallelo
+            search_paths: variabili di ricerca Csound aggiunte con
+                          --env:NOME+=path (es. {'SSDIR': 'refs'})
+            message_level: flag -m di csound
+            output_ext: estensione dei file audio (determina il formato)
+
+        Raises:
+            ValueError: se jobs < 1
+        """
+        if not isinstance(jobs, int) or jobs < 1:
+            raise ValueError(f"jobs deve essere un intero >= 1, ricevuto: {jobs}")
+        self.orchestra = orchestra
+        self.output_dir = output_dir
+        self.log_dir = log_dir
+        self.csound = csound
+        self.jobs = jobs
+        self.search_paths = dict(search_paths or {})
+        self.message_level = message_level
+        self.output_ext = output_ext
+
+    # =========================================================================
+    # JOB
+    # =========================================================================
+
+    def job(self, score_path: str, cost: float = 0.0) -> RenderJob:
+        """RenderJob per uno score: stem = nome del file senza estensione."""
+        stem = os.path.splitext(os.path.basename(score_path))[0]
+        return RenderJob(
+            stem=stem,
+            score_path=score_path,
+            output_path=os.path.join(self.output_dir, stem + self.output_ext),
+            log_path=os.path.join(self.log_dir, stem + '.log'),
+            cost=cost
+        )
+
+    def build_command(self, job: RenderJob) -> List[str]:
+        """Command line csound di uno stem."""
+        command = [self.csound]
+        command += [f'--env:{name}+={os.path.abspath(path)}'
+                    for name, path in self.search_paths.items()]
+        command += ['-m', str(self.message_level), self.orchestra, job.score_path, '-o', job.output_path]
+        return command
+
+    @staticmethod
+    def schedule(jobs: Sequence[RenderJob]) -> List[RenderJob]:
+        """Ordine di avvio: costo decrescente (a parita', ordine originale)."""
+        return sorted(jobs, key=lambda job: -job.cost)
+
+    # =========================================================================
+    # ESECUZIONE
+    # =========================================================================
+
+    def render(self, jobs: Sequence[RenderJob]) -> List[RenderResult]:
+        """
+        Renderizza tutti gli stem e stampa il tempo di ciascuno.
+
+        Returns:
+            List[RenderResult]: esiti nell'ordine dei jobs ricevuti
+        """
+        if not jobs:
+            return []
+        os.makedirs(self.output_dir, exist_ok=True)
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        ordered = self.schedule(jobs)
+        workers = min(self.jobs, len(ordered))
+        print(f"Rendering Csound: {len(ordered)} stem su {workers} processi...")
+
+        start = time.perf_counter()
+        results: Dict[str, RenderResult] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._run, job) for job in ordered]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.job.score_path] = result
+                mark = '✓' if result.ok else f'✗ (exit {result.returncode})'
+                print(f"  {mark} {result.job.stem}: {result.wall_time:.2f}s "
+                      f"(costo {result.job.cost:.1f}, log {result.job.log_path})", flush=True)
+        wall = time.perf_counter() - start
+
+        ordered_results = [results[job.score_path] for job in jobs]
+        cpu = sum(result.wall_time for result in ordered_results)
+        print(f"  Rendering completato in {wall:.2f}s (somma stem {cpu:.2f}s)")
+        return ordered_results
+
+    def _run(self, job: RenderJob) -> RenderResult:
+        """Esegue csound per uno stem, con stdout/stderr nel log dello stem."""
+        command = self.build_command(job)
+        start = time.perf_counter()
+        with open(job.log_path, 'w') as log:
+            log.write(' '.join(command) + '\n\n')
+            log.flush()
+            try:
+                returncode = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT).returncode
+            except OSError as e:
+                log.write(f"Impossibile avviare csound: {e}\n")
+                returncode = -1
+        return RenderResult(job=job, returncode=returncode, wall_time=time.perf_counter() - start)
@@ -4,12 +4,14 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.collections import PatchCollection
+from matplotlib.collections import PatchCollection, PolyCollection
 from matplotlib.backends.backend_pdf import PdfPages
 import numpy as np
 import soundfile as sf
 from math import ceil
 
+from core.grain_block import GrainBlock
+
 # Path samples (stesso del progetto)
 PATHSAMPLES = './refs/'
 
@@ -593,75 +595,50 @@ class ScoreVisualizer:
     def _draw_grains_full(self, ax, stream, sample_duration, page_start, page_end):
         """Disegna grani con coordinate Y assolute nel sample."""
         
-        all_grains = [grain for voice_grains in stream.voices for grain in voice_grains]
+        cols = self._grain_columns(stream)
+        onset = cols['onset']
+        duration = cols['duration']
 
-        # Filtra grani visibili
-        visible_grains = [
-            g for g in all_grains
-            if g.onset < page_end and (g.onset + g.duration) > page_start
-        ]
-        
-        if not visible_grains:
+        # Filtra grani visibili (maschera su colonne intere)
+        visible = (onset < page_end) & ((onset + duration) > page_start)
+        if not np.any(visible):
             return
         
-        polygons = []
-        #rectangles = []
-        colors = []
-        
-        for grain in visible_grains:
-            # X: tempo partitura
-            x = grain.onset
-            width = grain.duration
-            
-            # Y: posizione assoluta nel sample (in secondi)
-            pointer_y = grain.pointer_pos
-            
-            # Altezza: sample consumato (in secondi)
-            # Considerando durata
-            height = grain.duration # * abs(grain.pitch_ratio)
+        # X: tempo partitura
+        x = onset[visible]
+        width = duration[visible]
+        # Y: posizione assoluta nel sample (in secondi)
+        pointer_y = cols['pointer_pos'][visible]
+        pitch_ratio = cols['pitch_ratio'][visible]
+        # Altezza: sample consumato (in secondi)
+        # Considerando durata
+        height = width # * abs(pitch_ratio)
+        # Dimensione punta freccia (% della larghezza)
+        arrow_head_width = width * 0.5  # 30% della larghezza del grano
 
-            # Dimensione punta freccia (% della larghezza)
-            arrow_head_width = width * 0.5  # 30% della larghezza del grano
+        # Direzione: freccia GIU' (reverse) o SU (forward)
+        reverse = pitch_ratio < 0
+        y_base = pointer_y
+        y_tip = np.where(reverse, pointer_y - height, pointer_y + height)
+        y_shoulder = np.where(reverse, y_tip + arrow_head_width, y_tip - arrow_head_width)
 
-            # Direzione
-            if grain.pitch_ratio < 0:
-                y_top = pointer_y
-                y_bottom = pointer_y - height
+        # 5 punti: rettangolo con punta triangolare (n_grani, 5, 2)
+        vertices = np.stack([
+            np.column_stack([x, y_base]),                  # base sinistra
+            np.column_stack([x + width, y_base]),          # base destra
+            np.column_stack([x + width, y_shoulder]),      # prima della punta destra
+            np.column_stack([x + width / 2, y_tip]),       # punta centrale
+            np.column_stack([x, y_shoulder]),              # prima della punta sinistra
+        ], axis=1)
 
-                # 7 punti: rettangolo con punta triangolare in basso
-                vertices = [
-                    (x, y_top),                           # alto sinistra
-                    (x + width, y_top),                   # alto destra
-                    (x + width, y_bottom + arrow_head_width),  # prima della punta destra
-                    (x + width/2, y_bottom),              # punta centrale (GIÙ)
-                    (x, y_bottom + arrow_head_width),     # prima della punta sinistra
-                ]
-            else:
-                # FRECCIA SU (forward)
-                y_bottom = pointer_y
-                y_top = pointer_y + height
-                
-                # 7 punti: rettangolo con punta triangolare in alto
-                vertices = [
-                    (x, y_bottom),                        # basso sinistra
-                    (x + width, y_bottom),                # basso destra
-                    (x + width, y_top - arrow_head_width),  # prima della punta destra
-                    (x + width/2, y_top),                 # punta centrale (SU)
-                    (x, y_top - arrow_head_width),        # prima della punta sinistra
-                ]
-            
-            # Crea poligono
-            poly = mpatches.Polygon(vertices, closed=True)
-            polygons.append(poly)
-            
-            # Colore
-            color = list(self._pitch_to_color(abs(grain.pitch_ratio)))
-            color[3] = self._volume_to_alpha(grain.volume)
-            colors.append(color)
+        # Colore: pitch → colormap, volume → alpha
+        colors = np.array(self._pitch_to_color(np.abs(pitch_ratio)), dtype=float)
+        colors[:, 3] = self._volume_to_alpha(cols['volume'][visible])
         
         # Collection
-        collection = PatchCollection(
-            polygons,
+        collection = PolyCollection(
+            vertices,
+            closed=True,
             facecolors=colors,
             edgecolors='black',
             linewidths=0.02,
@@ -670,6 +647,29 @@ class ScoreVisualizer:
         )
         ax.add_collection(collection)
 
+    @staticmethod
+    def _grain_columns(stream) -> dict:
+        """
+        Colonne dei grani di tutte le voci concatenate.
+
+        Usa direttamente le colonne dei GrainBlock; per voci in formato
+        List[Grain] (legacy) estrae gli attributi grano per grano.
+        """
+        names = ('onset', 'duration', 'pointer_pos', 'pitch_ratio', 'volume')
+        parts = {name: [] for name in names}
+        for voice_grains in stream.voices:
+            for name in names:
+                if isinstance(voice_grains, GrainBlock):
+                    parts[name].append(getattr(voice_grains, name))
+                else:
+                    parts[name].append(np.array(
+                        [getattr(g, name) for g in voice_grains], dtype=float
+                    ))
+        return {
+            name: np.concatenate(chunks) if chunks else np.empty(0)
+            for name, chunks in parts.items()
+        }
+
     def _draw_stream_label_full(self, ax, stream, page_start, sample_duration):
         """Label stream nell'angolo in alto a sinistra del subplot."""
         label_x = max(stream.onset, page_start) + 0.5        
@@ -2,14 +2,34 @@
 """
 ScoreWriter: gestione scrittura file .sco Csound.
 Separato dalla logica di orchestrazione.
+
+Modalita' incrementale: gli stream non ancora generati (stream.generated
+False) vengono consumati con Stream.iter_grain_blocks() e scritti blocco
+per blocco, senza mai materializzare tutti i grani in memoria.
+
+Estratti (Generator con time_window): advance > 0 scrive un advance
+statement Csound all'inizio degli eventi.
+
+Gli eventi dei grani sono formattati per blocco (GrainBlock.to_score_text)
+e scritti con una sola write per blocco su un file con buffer ampio.
+
+Codifica compatta (opt-in, encoder = CompactScoreEncoder): i grani usano
+numero di strumento, carry '.' e onset relativi; accanto allo score viene
+scritto il report di dimensione e costo di parsing.
 """
-from typing import List
+from typing import Dict, List, Optional
+from core.grain_block import GrainBlock
 from core.stream import Stream
+from engine.grain_engine import DEFAULT_CHUNK_SIZE
 from core.cartridge import Cartridge
+from rendering.compact_score import CompactScoreEncoder
 from rendering.ftable_manager import FtableManager
 from envelopes.envelope import Envelope
 from parameters.parameter import Parameter
 
+# Buffer del file .sco: poche syscall anche con milioni di grani
+SCORE_BUFFER_SIZE = 1 << 20
+
 
 class ScoreWriter:
     """
@@ -21,14 +41,26 @@ class ScoreWriter:
     - Scrivere eventi grani (Stream)
     - Scrivere eventi cartridges (TapeRecorder)
     - Gestire commenti e statistiche
+    - Scrivere in streaming gli stream non ancora generati
     """
     
-    def __init__(self, ftable_manager: FtableManager):
+    def __init__(
+        self,
+        ftable_manager: FtableManager,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        encoder: Optional[CompactScoreEncoder] = None
+    ):
         """
         Args:
             ftable_manager: manager delle function tables
+            chunk_size: grani per blocco nella scrittura incrementale
+            encoder: codifica compatta dei grani (None = formato verboso)
         """
         self.ftable_manager = ftable_manager
+        self.chunk_size = chunk_size
+        self.encoder = encoder
+        self.advance = 0.0  # secondi di score eseguiti senza audio (a 0 0 advance)
+        self._streamed_grain_counts: Dict[int, int] = {}
     
     def write_score(
         self, 
@@ -46,13 +78,18 @@ class ScoreWriter:
             cartridges: lista cartridges tape recorder
             yaml_source: path file YAML sorgente (per header)
         """
-        with open(filepath, 'w') as f:
+        self._streamed_grain_counts = {}
+        if self.encoder is not None:
+            self.encoder.reset_stats()
+        with open(filepath, 'w', buffering=SCORE_BUFFER_SIZE) as f:
             self._write_header(f, yaml_source)
-            self.ftable_manager.write_to_file(f)
+            self.ftable_manager.write_to_file(f, owners=self._table_owners(streams, cartridges))
             self._write_events(f, streams, cartridges)
             self._write_footer(f)
         
         self._print_generation_summary(filepath, streams, cartridges)
+        if self.encoder is not None and streams:
+            print(f"  - report score compatto: {self.encoder.write_report(filepath)}")
     
     # =========================================================================
     # SEZIONI PRINCIPALI
@@ -64,16 +101,31 @@ class ScoreWriter:
         f.write("; CSOUND SCORE\n")
         if yaml_source:
             f.write(f"; Generated from: {yaml_source}\n")
+        if self.encoder is not None:
+            f.write(f"; Compact encoding: i{self.encoder.instrument} = instr Grain, "
+                    f"'.' = carry, '+' / '^+' = onset relativi\n")
         f.write("; " + "="*77 + "\n\n")
     
     def _write_events(self, f, streams: List[Stream], cartridges: List[Cartridge]):
         """Scrive tutti gli eventi (grani + cartridges)."""
+        if self.advance > 0:
+            self._write_advance(f)
+
         if streams:
             self._write_granular_streams(f, streams)
         
         if cartridges:
             self._write_tape_recorder_cartridges(f, cartridges)
     
+    def _write_advance(self, f):
+        """
+        Advance statement: i primi self.advance secondi vengono eseguiti
+        senza produrre audio. I grani gia' in corso all'inizio dell'estratto
+        suonano dal punto giusto (finestra e pointer gia' avanzati).
+        """
+        f.write(f"; Estratto: advance di {self.advance:.6f}s senza audio\n")
+        f.write(f"a 0 0 {self.advance:.6f}\n\n")
+
     def _write_footer(self, f):
         """Scrive chiusura file score."""
         f.write("\n; " + "="*77 + "\n")
@@ -105,19 +157,49 @@ class ScoreWriter:
         # Header stream
         f.write(f'; Stream: {stream.stream_id}\n')
         self._write_stream_metadata(f, stream)
+
+        if not stream.generated:
+            self._write_streamed_grains(f, stream)
+            return
         
         # Eventi grani per voice
         for voice_index, voice_grains in enumerate(stream.voices):
             if voice_grains:  # Solo se la voice ha grani
                 f.write(f';   Voice {voice_index} ({len(voice_grains)} grains)\n')
-                
-                for grain in voice_grains:
-                    f.write(grain.to_score_line())
-                
+                f.write(self._format_grains(voice_grains))
                 f.write('\n')  # Separatore tra voices
         
         f.write('\n')  # Separatore tra streams
+
+    def _write_streamed_grains(self, f, stream: Stream):
+        """
+        Scrittura incrementale: genera e scrive un blocco alla volta.
+        
+        Il conteggio dei grani e' noto solo alla fine, quindi viene scritto
+        in coda alla sezione invece che nei metadati. Con piu' voci i blocchi
+        contengono i grani di tutte le voci, fusi in ordine di onset.
+        """
+        if stream.max_voices > 1:
+            f.write(f';   Voices 0-{stream.max_voices - 1} (streamed, merged by onset)\n')
+        else:
+            f.write(';   Voice 0 (streamed)\n')
+        total_grains = 0
+        for block in stream.iter_grain_blocks(self.chunk_size):
+            f.write(self._format_grains(block))
+            total_grains += len(block)
+        f.write(f';   Streamed grains: {total_grains}\n\n')
+        self._streamed_grain_counts[id(stream)] = total_grains
+        
+        f.write('\n')  # Separatore tra streams
     
+    def _format_grains(self, voice_grains) -> str:
+        """Linee di score di un blocco: bulk per GrainBlock, per grano per le liste."""
+        if isinstance(voice_grains, GrainBlock):
+            if self.encoder is not None:
+                return self.encoder.encode(voice_grains)
+            return voice_grains.to_score_text()
+        return ''.join(grain.to_score_line() for grain in voice_grains)
+
     def _write_stream_metadata(self, f, stream: Stream):
         """
         Scrive metadati dello stream come commenti.
@@ -133,6 +215,9 @@ class ScoreWriter:
                 
         # Statistiche
         f.write(f'; Num voices: {self._format_param(stream.num_voices)}\n')
+        if not stream.generated:
+            f.write('; Total grains: streamed (see end of section)\n\n')
+            return
         total_grains = sum(len(voice_grains) for voice_grains in stream.voices)
         f.write(f'; Total grains: {total_grains}\n\n')
     
@@ -220,19 +305,28 @@ class ScoreWriter:
         """Stampa riepilogo generazione score."""
         print(f"✓ Score generato: {filepath}")
         
-        # Function tables
-        num_tables = len(self.ftable_manager.get_all_tables())
+        # Function tables (solo quelle scritte in questo file)
+        num_tables = len(self.ftable_manager.get_all_tables(self._table_owners(streams, cartridges)))
         print(f"  - {num_tables} function tables")
         
         # Streams e grani
         if streams:
-            total_grains = sum(
-                sum(len(voice_grains) for voice_grains in stream.voices)
-                for stream in streams
-            )
+            total_grains = sum(self._count_grains(stream) for stream in streams)
             print(f"  - {len(streams)} streams granulari")
             print(f"  - {total_grains} grani totali")
         
         # cartridges
         if cartridges:
-            print(f"  - {len(cartridges)} cartridges tape recorder")
\ No newline at end of file
+            print(f"  - {len(cartridges)} cartridges tape recorder")
+
+    @staticmethod
+    def _table_owners(streams: List[Stream], cartridges: List[Cartridge]) -> List[str]:
+        """Owner delle ftable del file: solo le loro tabelle vengono scritte."""
+        return ([stream.table_owner for stream in streams]
+                + [cartridge.cartridge_id for cartridge in cartridges])
+
+    def _count_grains(self, stream: Stream) -> int:
+        """Grani dello stream: memorizzati nelle voices o contati in streaming."""
+        if id(stream) in self._streamed_grain_counts:
+            return self._streamed_grain_counts[id(stream)]
+        return sum(len(voice_grains) for voice_grains in stream.voices)
@@ -3,11 +3,21 @@ distribution_strategy.py - Strategy Pattern per distribuzioni statistiche.
 
 Implementa diverse distribuzioni di probabilità per la generazione 
 di valori stocastici nei parametri granulari.
+
+Ogni distribuzione espone sample() (un valore) e sample_many() (array):
+- 'uniform', 'gaussian': sample() storico sul modulo random / SeededRandom,
+  sample_many() con una sola chiamata NumPy
+- 'triangular', 'truncated_gaussian', 'beta', 'cauchy': nate in forma
+  batch (BatchDistribution), sample() delega a sample_many()
 """
 
 import random
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Optional, Tuple
+
+import numpy as np
+
+from shared.rng import SeededRandom, batch_generator
 
 
 class DistributionStrategy(ABC):
@@ -16,8 +26,16 @@ class DistributionStrategy(ABC):
     
     Ogni strategia implementa un metodo sample() che genera
     un valore random secondo una specifica distribuzione.
+    
+    rng: sorgente casuale del parametro proprietario (SeededRandom).
+    None = modulo random globale. DistributionFactory costruisce le
+    strategie senza argomenti e assegna rng dopo: le sottoclassi che
+    ridefiniscono __init__ non devono accettarlo.
     """
     
+    def __init__(self, rng: Optional[SeededRandom] = None):
+        self.rng = rng
+    
     @abstractmethod
     def sample(self, center: float, spread: float) -> float:        # pragma: no cover
         """
@@ -31,6 +49,31 @@ class DistributionStrategy(ABC):
             Valore generato secondo la distribuzione
         """
         pass
+
+    def sample_many(
+        self,
+        centers: np.ndarray,
+        spreads: np.ndarray,
+        rng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Versione batch di sample(): un campione per coppia (center, spread).
+        
+        Default: sample() per elemento, con la sorgente self.rng
+        (rng ignorato). Le distribuzioni array-native lo sovrascrivono.
+        
+        Args:
+            centers: array dei valori centrali
+            spreads: array delle ampiezze (stessa lunghezza)
+            rng: Generator NumPy per il batch
+        
+        Returns:
+            Array float64 dei campioni
+        """
+        return np.fromiter(
+            (self.sample(c, s) for c, s in zip(centers.tolist(), spreads.tolist())),
+            dtype=np.float64, count=len(centers)
+        )
     
     @property
     @abstractmethod
@@ -72,7 +115,21 @@ class UniformDistribution(DistributionStrategy):
         if spread <= 0:
             return center
         
-        return center + random.uniform(-0.5, 0.5) * spread
+        return center + (self.rng or random).uniform(-0.5, 0.5) * spread
+    
+    def sample_many(self, centers, spreads, rng=None) -> np.ndarray:
+        """
+        Versione batch: un'estrazione uniforme per ogni spread > 0.
+        
+        Con seed, stessa sequenza di sample() chiamato elemento per elemento.
+        """
+        result = np.array(centers, dtype=np.float64)
+        active = spreads > 0
+        n_active = int(active.sum())
+        if n_active:
+            draws = (rng or batch_generator(self.rng)).uniform(-0.5, 0.5, n_active)
+            result[active] += draws * spreads[active]
+        return result
     
     @property
     def name(self) -> str:
@@ -111,7 +168,19 @@ class GaussianDistribution(DistributionStrategy):
         if spread <= 0:
             return center
         
-        return random.gauss(center, spread)
+        return (self.rng or random).gauss(center, spread)
+    
+    def sample_many(self, centers, spreads, rng=None) -> np.ndarray:
+        """
+        Versione batch: normal(center, spread) per ogni spread > 0.
+        
+        Con seed, stessa sequenza di sample() chiamato elemento per elemento.
+        """
+        result = np.array(centers, dtype=np.float64)
+        active = spreads > 0
+        if active.any():
+            result[active] = (rng or batch_generator(self.rng)).normal(result[active], spreads[active])
+        return result
     
     @property
     def name(self) -> str:
@@ -128,6 +197,141 @@ class GaussianDistribution(DistributionStrategy):
         return (center - three_sigma, center + three_sigma)
 
 
+# =============================================================================
+# DISTRIBUZIONI BATCH
+# =============================================================================
+
+class BatchDistribution(DistributionStrategy):
+    """
+    Base per distribuzioni implementate direttamente in forma batch.
+    
+    Le sottoclassi definiscono _draw(): n campioni standardizzati
+    (center=0, spread=1). Il campione finale e' center + spread * draw;
+    spread <= 0 restituisce center senza estrazioni, come le altre
+    distribuzioni. sample() e' sample_many() su un elemento.
+    """
+    
+    @abstractmethod
+    def _draw(self, generator: np.random.Generator, n: int) -> np.ndarray:        # pragma: no cover
+        """n campioni standardizzati."""
+        pass
+    
+    def sample(self, center: float, spread: float) -> float:
+        if spread <= 0:
+            return center
+        return float(self.sample_many(np.array([center]), np.array([spread]))[0])
+    
+    def sample_many(self, centers, spreads, rng=None) -> np.ndarray:
+        result = np.array(centers, dtype=np.float64)
+        active = spreads > 0
+        n_active = int(active.sum())
+        if n_active:
+            draws = self._draw(rng or batch_generator(self.rng), n_active)
+            result[active] += draws * spreads[active]
+        return result
+
+
+class TriangularDistribution(BatchDistribution):
+    """
+    Distribuzione triangolare simmetrica: moda in center.
+    
+    Stesso supporto di UniformDistribution ([center ± spread/2]) ma con
+    valori che si addensano verso il centro (somma di due uniformi).
+    
+    Campionamento per inversione della CDF.
+    """
+    
+    def _draw(self, generator: np.random.Generator, n: int) -> np.ndarray:
+        u = generator.random(n)
+        return np.where(u < 0.5, np.sqrt(u * 0.5) - 0.5, 0.5 - np.sqrt((1.0 - u) * 0.5))
+    
+    @property
+    def name(self) -> str:
+        return "triangular"
+    
+    def get_bounds(self, center: float, spread: float) -> Tuple[float, float]:
+        """Bounds: [center - spread/2, center + spread/2]"""
+        half_spread = spread / 2
+        return (center - half_spread, center + half_spread)
+
+
+class TruncatedGaussianDistribution(BatchDistribution):
+    """
+    Gaussiana (μ=center, σ=spread) troncata a ±TRUNCATION·σ.
+    
+    Come GaussianDistribution, ma senza code: nessun valore oltre
+    TRUNCATION deviazioni standard (quindi meno clip ai bounds).
+    
+    Campionamento per rigetto: i valori fuori soglia vengono riestratti
+    in blocco (accettazione ~95% con TRUNCATION=2).
+    """
+    
+    TRUNCATION = 2.0
+    
+    def _draw(self, generator: np.random.Generator, n: int) -> np.ndarray:
+        draws = generator.standard_normal(n)
+        rejected = np.abs(draws) > self.TRUNCATION
+        while rejected.any():
+            draws[rejected] = generator.standard_normal(int(rejected.sum()))
+            rejected = np.abs(draws) > self.TRUNCATION
+        return draws
+    
+    @property
+    def name(self) -> str:
+        return "truncated_gaussian"
+    
+    def get_bounds(self, center: float, spread: float) -> Tuple[float, float]:
+        """Bounds: [μ - TRUNCATION·σ, μ + TRUNCATION·σ]"""
+        limit = spread * self.TRUNCATION
+        return (center - limit, center + limit)
+
+
+class BetaDistribution(BatchDistribution):
+    """
+    Distribuzione beta simmetrica Beta(ALPHA, ALPHA) su [center ± spread/2].
+    
+    ALPHA regola la forma: 1 = uniforme, >1 concentrata al centro,
+    <1 concentrata ai bordi (valori "polarizzati").
+    """
+    
+    ALPHA = 2.0
+    
+    def _draw(self, generator: np.random.Generator, n: int) -> np.ndarray:
+        return generator.beta(self.ALPHA, self.ALPHA, n) - 0.5
+    
+    @property
+    def name(self) -> str:
+        return "beta"
+    
+    def get_bounds(self, center: float, spread: float) -> Tuple[float, float]:
+        """Bounds: [center - spread/2, center + spread/2]"""
+        half_spread = spread / 2
+        return (center - half_spread, center + half_spread)
+
+
+class ClippedCauchyDistribution(BatchDistribution):
+    """
+    Cauchy (x0=center, γ=spread) limitata a ±CLIP·γ.
+    
+    Code molto pesanti: quasi tutti i valori vicini al centro, con salti
+    occasionali ampi. Il clip evita valori arbitrariamente grandi.
+    """
+    
+    CLIP = 10.0
+    
+    def _draw(self, generator: np.random.Generator, n: int) -> np.ndarray:
+        return np.clip(generator.standard_cauchy(n), -self.CLIP, self.CLIP)
+    
+    @property
+    def name(self) -> str:
+        return "cauchy"
+    
+    def get_bounds(self, center: float, spread: float) -> Tuple[float, float]:
+        """Bounds: [x0 - CLIP·γ, x0 + CLIP·γ]"""
+        limit = spread * self.CLIP
+        return (center - limit, center + limit)
+
+
 class DistributionFactory:
     """
     Factory per creare istanze di DistributionStrategy.
@@ -138,15 +342,20 @@ class DistributionFactory:
     _registry = {
         'uniform': UniformDistribution,
         'gaussian': GaussianDistribution,
+        'triangular': TriangularDistribution,
+        'truncated_gaussian': TruncatedGaussianDistribution,
+        'beta': BetaDistribution,
+        'cauchy': ClippedCauchyDistribution,
     }
     
     @classmethod
-    def create(cls, mode: str) -> DistributionStrategy:
+    def create(cls, mode: str, rng: Optional[SeededRandom] = None) -> DistributionStrategy:
         """
         Crea una strategia di distribuzione.
         
         Args:
-            mode: Nome della distribuzione ('uniform', 'gaussian')
+            mode: Nome della distribuzione (chiave del registry, es. 'uniform')
+            rng: sorgente casuale (None = modulo random globale)
         
         Returns:
             Istanza di DistributionStrategy
@@ -161,8 +370,9 @@ class DistributionFactory:
                 f"Modalità valide: {valid_modes}"
             )
         
-        strategy_class = cls._registry[mode]
-        return strategy_class()
+        strategy = cls._registry[mode]()
+        strategy.rng = rng
+        return strategy
     
     @classmethod
     def register(cls, name: str, strategy_class: type):
@@ -170,7 +380,7 @@ class DistributionFactory:
         Registra una nuova distribuzione (estensibilità futura).
         
         Esempio:
-            DistributionFactory.register('triangular', TriangularDistribution)
+            DistributionFactory.register('laplace', LaplaceDistribution)
         """
         if not issubclass(strategy_class, DistributionStrategy):
             raise TypeError(
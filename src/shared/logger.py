@@ -189,6 +189,43 @@ def log_clip_warning(stream_id, param_name, time, raw_value, clipped_value,
     )
     
 
+def log_clip_summary(stream_id, param_name, times, raw_values, clipped_values,
+                     min_val, max_val, is_envelope=False):
+    """
+    Logga in una sola riga i valori clippati di una valutazione batch.
+    
+    Versione riassuntiva di log_clip_warning per Parameter.get_values():
+    numero di clip per bound, intervallo temporale e deviazione massima.
+    
+    Args:
+        stream_id: ID dello stream
+        param_name: nome del parametro
+        times: tempi dei soli valori clippati
+        raw_values: valori originali (stessa lunghezza di times)
+        clipped_values: valori dopo il clip
+        min_val: limite minimo
+        max_val: limite massimo
+        is_envelope: True se il valore viene da un Envelope
+    """
+    logger = get_clip_logger()
+    
+    if logger is None or len(times) == 0:
+        return
+    
+    deviations = [raw - clipped for raw, clipped in zip(raw_values, clipped_values)]
+    worst = max(range(len(deviations)), key=lambda i: abs(deviations[i]))
+    n_min = sum(1 for raw in raw_values if raw < min_val)
+    source_type = "ENV" if is_envelope else "FIX"
+    
+    logger.warning(
+        f"[{stream_id}] {param_name:<20} | "
+        f"{len(times)} clip in t=[{min(times):.3f}, {max(times):.3f}]s | "
+        f"MIN={min_val:.4f} x{n_min}, MAX={max_val:.4f} x{len(times) - n_min} | "
+        f"Δmax={deviations[worst]:>+10.6f} @ t={times[worst]:.3f}s | "
+        f"({source_type})"
+    )
+
+
 def log_config_warning(stream_id: str, param_name: str, 
                     raw_value: float, clipped_value: float,
                     min_val: float, max_val: float,
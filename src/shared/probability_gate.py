@@ -1,12 +1,20 @@
 """
 probability_gate.py - Pattern Gateway per la gestione delle probabilità.
 Isola completamente la logica di dephase da Parameter e ParameterFactory.
+
+should_apply_many() decide un intero array di tempi in una chiamata:
+NeverGate/AlwaysGate restituiscono maschere costanti, RandomGate ed
+EnvelopeGate estraggono un solo array di uniformi.
 """
 
 from abc import ABC, abstractmethod
 from typing import Optional, Union
 import random
+
+import numpy as np
+
 from envelopes.envelope import Envelope
+from shared.rng import SeededRandom, batch_generator
 
 class ProbabilityGate(ABC):
     """
@@ -17,6 +25,27 @@ class ProbabilityGate(ABC):
     def should_apply(self, time: float) -> bool:
         """Decide se applicare una variazione al tempo specificato."""
         pass
+
+    def should_apply_many(
+        self,
+        times: np.ndarray,
+        rng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Versione batch di should_apply(): maschera booleana per ogni tempo.
+        
+        Args:
+            times: array dei tempi
+            rng: Generator NumPy per le estrazioni
+                 (None = sorgente del gate, vedi batch_generator)
+        
+        Default: should_apply() per elemento, con la sorgente del gate
+        (rng ignorato). I gate del modulo lo sovrascrivono.
+        """
+        return np.fromiter(
+            (self.should_apply(t) for t in np.asarray(times, dtype=np.float64).tolist()),
+            dtype=bool, count=len(times)
+        )
     
     @abstractmethod
     def get_probability_value(self, time: float) -> float:
@@ -35,6 +64,9 @@ class NeverGate(ProbabilityGate):
     
     def should_apply(self, time: float) -> bool:
         return False
+
+    def should_apply_many(self, times, rng=None) -> np.ndarray:
+        return np.zeros(len(times), dtype=bool)
     
     def get_probability_value(self, time: float) -> float:
         return 0.0
@@ -49,6 +81,9 @@ class AlwaysGate(ProbabilityGate):
     
     def should_apply(self, time: float) -> bool:
         return True
+
+    def should_apply_many(self, times, rng=None) -> np.ndarray:
+        return np.ones(len(times), dtype=bool)
     
     def get_probability_value(self, time: float) -> float:
         return 100.0
@@ -61,11 +96,16 @@ class AlwaysGate(ProbabilityGate):
 class RandomGate(ProbabilityGate):
     """Gate con probabilità costante."""
     
-    def __init__(self, probability: float):
+    def __init__(self, probability: float, rng: Optional[SeededRandom] = None):
         self._probability = min(100.0, max(0.0, probability))
+        self._rng = rng
     
     def should_apply(self, time: float) -> bool:
-        return random.uniform(0, 100) < self._probability
+        return (self._rng or random).uniform(0, 100) < self._probability
+
+    def should_apply_many(self, times, rng=None) -> np.ndarray:
+        draws = (rng or batch_generator(self._rng)).uniform(0, 100, len(times))
+        return draws < self._probability
     
     def get_probability_value(self, time: float) -> float:
         return self._probability
@@ -75,18 +115,60 @@ class RandomGate(ProbabilityGate):
         return f"random({self._probability}%)"
 
 
+class EnvelopeProbability:
+    """
+    Valutazione batch di un envelope di probabilità, condivisibile tra gate.
+    
+    Ricorda l'ultimo array di tempi richiesto: con un dephase envelope
+    globale tutti i gate dello stream condividono la stessa istanza e,
+    interrogati sullo stesso array (blocco del motore vettoriale), valutano
+    l'envelope una volta sola. Il confronto e' per identita': un array
+    modificato sul posto va passato come copia.
+    """
+    
+    __slots__ = ('envelope', '_times', '_values')
+    
+    def __init__(self, envelope: Envelope):
+        self.envelope = envelope
+        self._times = None
+        self._values = None
+    
+    def evaluate_many(self, times: np.ndarray) -> np.ndarray:
+        if times is not self._times:
+            self._values = self.envelope.evaluate_many(times)
+            self._times = times
+        return self._values
+
+
 class EnvelopeGate(ProbabilityGate):
     """Gate con probabilità variabile nel tempo (envelope)."""
     
-    def __init__(self, envelope: Envelope):
+    def __init__(
+        self,
+        envelope: Envelope,
+        rng: Optional[SeededRandom] = None,
+        probability: Optional[EnvelopeProbability] = None
+    ):
+        """
+        probability: valutazione batch condivisa con altri gate sullo
+        stesso envelope (None = propria).
+        """
         self._envelope = envelope
+        self._cursor = envelope.cursor()
+        self._rng = rng
+        self._probability = probability or EnvelopeProbability(envelope)
     
     def should_apply(self, time: float) -> bool:
-        prob = self._envelope.evaluate(time)
-        return random.uniform(0, 100) < prob
+        prob = self._cursor.evaluate(time)
+        return (self._rng or random).uniform(0, 100) < prob
+
+    def should_apply_many(self, times, rng=None) -> np.ndarray:
+        times = np.asarray(times, dtype=np.float64)
+        draws = (rng or batch_generator(self._rng)).uniform(0, 100, len(times))
+        return draws < self._probability.evaluate_many(times)
     
     def get_probability_value(self, time: float) -> float:
-        return self._envelope.evaluate(time)
+        return self._cursor.evaluate(time)
     
     @property
     def mode(self) -> str:
@@ -0,0 +1,117 @@
+"""
+rng.py - Gerarchia deterministica di generatori casuali (NumPy Generator).
+
+Un seed globale (chiave YAML 'seed' al livello radice) genera un albero di
+sotto-flussi indipendenti:
+
+    seed globale
+    └── stream 'texture1'
+        ├── volume
+        │   ├── variation   (DistributionStrategy / VariationStrategy)
+        │   └── gate        (RandomGate / EnvelopeGate)
+        ├── density.truax   (DensityController)
+        └── grain_envelope  (WindowController)
+
+Ogni nodo deriva il proprio SeedSequence dal percorso di nomi (hash stabile
+crc32), non dall'ordine di creazione: aggiungere, togliere o riordinare
+stream e parametri non cambia le sequenze degli altri, e processi worker
+diversi ricostruiscono esattamente gli stessi flussi.
+
+SeededRandom espone la stessa API del modulo random usata nel progetto
+(random, uniform, gauss, choice): i componenti usano (self._rng or random),
+quindi senza seed ricadono sul modulo random globale (comportamento storico,
+non riproducibile). I metodi batch (*_many) usano batch_generator(self._rng).
+"""
+
+import random
+import zlib
+from typing import Optional, Sequence, Any
+
+import numpy as np
+
+
+def stable_key(name: Any) -> int:
+    """Hash stabile tra processi ed esecuzioni (hash() di Python e' salato)."""
+    return zlib.crc32(str(name).encode('utf-8'))
+
+
+class SeededRandom:
+    """
+    Nodo della gerarchia di seed.
+
+    Il np.random.Generator viene creato al primo utilizzo: i nodi intermedi
+    (stream, parametro) servono solo a derivare i figli e non allocano stato.
+    """
+
+    __slots__ = ('_sequence', '_generator', 'path')
+
+    def __init__(self, sequence: np.random.SeedSequence, path: str = ''):
+        self._sequence = sequence
+        self._generator: Optional[np.random.Generator] = None
+        self.path = path
+
+    @classmethod
+    def from_seed(cls, seed: int) -> 'SeededRandom':
+        """
+        Crea la radice della gerarchia.
+
+        Raises:
+            ValueError: se seed non e' un intero >= 0
+        """
+        if isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+            raise ValueError(f"seed deve essere un intero >= 0, ricevuto: {seed!r}")
+        return cls(np.random.SeedSequence(seed))
+
+    def child(self, name: str) -> 'SeededRandom':
+        """Sotto-flusso indipendente identificato da name."""
+        sequence = np.random.SeedSequence(
+            entropy=self._sequence.entropy,
+            spawn_key=self._sequence.spawn_key + (stable_key(name),)
+        )
+        return SeededRandom(sequence, f"{self.path}/{name}" if self.path else str(name))
+
+    @property
+    def generator(self) -> np.random.Generator:
+        """Generator NumPy del nodo (per i consumer array-nativi)."""
+        if self._generator is None:
+            self._generator = np.random.Generator(np.random.PCG64(self._sequence))
+        return self._generator
+
+    # =========================================================================
+    # API COMPATIBILE CON IL MODULO random
+    # =========================================================================
+
+    def random(self) -> float:
+        return float(self.generator.random())
+
+    def uniform(self, a: float, b: float) -> float:
+        return float(self.generator.uniform(a, b))
+
+    def gauss(self, mu: float, sigma: float) -> float:
+        return float(self.generator.normal(mu, sigma))
+
+    def choice(self, seq: Sequence) -> Any:
+        if not len(seq):
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.generator.integers(len(seq)))]
+
+    def __repr__(self) -> str:
+        return f"SeededRandom(entropy={self._sequence.entropy}, path='{self.path}')"
+
+
+def child_rng(rng: Optional[SeededRandom], name: str) -> Optional[SeededRandom]:
+    """rng.child(name), propagando None (nessun seed configurato)."""
+    return None if rng is None else rng.child(name)
+
+
+def batch_generator(rng: Optional[SeededRandom]) -> np.random.Generator:
+    """
+    Generator NumPy per i metodi batch di un componente.
+    
+    Con seed: il Generator del nodo (stessa sequenza dei metodi scalari,
+    un'estrazione dopo l'altra). Senza seed: un Generator derivato dal
+    modulo random globale, cosi' random.seed() resta efficace.
+    """
+    if rng is not None:
+        return rng.generator
+    return np.random.default_rng(random.getrandbits(64))
@@ -1,6 +1,7 @@
 import random
+import numpy as np
 import soundfile as sf
-from typing import Any
+from typing import Any, Callable
 # Path per i sample audio
 PATHSAMPLES = './refs/'
 
@@ -35,4 +36,15 @@ def get_nested(data: dict, path: str, default: Any) -> Any:
         else:
             return default
     
-    return current
\ No newline at end of file
+    return current
+
+
+def evaluate_per_element(func: Callable[[float], float], times) -> np.ndarray:
+    """
+    Valuta func(t) per ogni tempo e restituisce un array float64.
+
+    Fallback dei metodi batch (*_many) per i componenti che non hanno
+    ancora un'implementazione array-nativa.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    return np.fromiter((func(t) for t in times.tolist()), dtype=np.float64, count=len(times))
@@ -6,9 +6,11 @@ Ogni strategia incapsula completamente il calcolo di un valore.
 
 from abc import ABC, abstractmethod
 from typing import Optional, Union
+import numpy as np
 from parameters.parameter import Parameter
 from envelopes.envelope import Envelope
 from parameters.parameter_definitions import get_parameter_definition
+from shared.utils import evaluate_per_element
 # =============================================================================
 # STRATEGIE PITCH
 # =============================================================================
@@ -20,6 +22,24 @@ class PitchStrategy(ABC):
     def calculate(self, elapsed_time: float) -> float:
         """Calcola il pitch ratio finale."""
         pass
+
+    def calculate_many(
+        self,
+        elapsed_times: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        log_clips: bool = True
+    ) -> np.ndarray:
+        """
+        Versione batch di calculate() su un array di tempi.
+
+        Args:
+            elapsed_times: array dei tempi
+            rng: Generator NumPy per le componenti stocastiche del parametro
+            log_clips: False per valutazioni provvisorie (nessun log di clip)
+
+        Default: calculate() elemento per elemento.
+        """
+        return evaluate_per_element(self.calculate, elapsed_times)
     
     @property
     @abstractmethod
@@ -43,6 +63,10 @@ class SemitonesStrategy(PitchStrategy):
     def calculate(self, elapsed_time: float) -> float:
         semitones = self._param.get_value(elapsed_time)
         return 2 ** (semitones / 12.0)
+
+    def calculate_many(self, elapsed_times, rng=None, log_clips=True) -> np.ndarray:
+        semitones = self._param.get_values(elapsed_times, rng, log_clips)[0]
+        return np.exp2(semitones / 12.0)
     
     @property
     def name(self) -> str:
@@ -61,6 +85,9 @@ class RatioStrategy(PitchStrategy):
     
     def calculate(self, elapsed_time: float) -> float:
         return self._param.get_value(elapsed_time)
+
+    def calculate_many(self, elapsed_times, rng=None, log_clips=True) -> np.ndarray:
+        return self._param.get_values(elapsed_times, rng, log_clips)[0]
     
     @property
     def name(self) -> str:
@@ -89,6 +116,34 @@ class DensityStrategy(ABC):
         """
         pass
     
+    def calculate_density_many(
+        self,
+        elapsed_times: np.ndarray,
+        rng: Optional[np.random.Generator] = None,
+        log_clips: bool = True,
+        **context
+    ) -> np.ndarray:
+        """
+        Versione batch di calculate_density().
+        
+        Args:
+            elapsed_times: array dei tempi
+            rng: Generator NumPy per le componenti stocastiche dei parametri
+            log_clips: False per valutazioni provvisorie (nessun log di clip)
+            **context: array per grano (es. grain_duration), stessa
+                       lunghezza di elapsed_times
+        
+        Default: calculate_density() elemento per elemento.
+        """
+        n = len(elapsed_times)
+        return np.fromiter(
+            (self.calculate_density(float(elapsed_times[i]),
+                                    **{key: float(values[i]) for key, values in context.items()})
+             for i in range(n)),
+            dtype=np.float64,
+            count=n
+        )
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -118,6 +173,13 @@ class FillFactorStrategy(DensityStrategy):
         grain_duration = context['grain_duration']
         raw_density = fill_factor / grain_duration
         return max(self._density_bounds.min_val,min(self._density_bounds.max_val, raw_density))
+    
+    def calculate_density_many(self, elapsed_times, rng=None, log_clips=True, **context) -> np.ndarray:
+        if 'grain_duration' not in context:
+            raise ValueError(f"{self.__class__.__name__} requires 'grain_duration' in context")
+        fill_factor = self._fill_factor.get_values(elapsed_times, rng, log_clips)[0]
+        raw_density = fill_factor / context['grain_duration']
+        return np.clip(raw_density, self._density_bounds.min_val, self._density_bounds.max_val)
         
     @property
     def name(self) -> str:
@@ -132,6 +194,151 @@ class DirectDensityStrategy(DensityStrategy):
     def calculate_density(self, elapsed_time: float, **context) -> float:
         return self._density.get_value(elapsed_time)
     
+    def calculate_density_many(self, elapsed_times, rng=None, log_clips=True, **context) -> np.ndarray:
+        return self._density.get_values(elapsed_times, rng, log_clips)[0]
+    
+    @property
+    def name(self) -> str:
+        return "density"
+
+class IntegralDensityStrategy(DensityStrategy):
+    """
+    Strategia: onset dove il conteggio cumulativo dei grani
+    N(t) = integrale di density tra 0 e t raggiunge un intero (N(t_k) = k).
+
+    Il conteggio e la posizione dei grani sono esatti anche per envelope
+    che cambiano piu' in fretta dell'IOT. N(t) viene dall'integrale
+    dell'envelope (tabella cumulativa) e viene invertito con searchsorted
+    su una griglia, rifinita con passi di Newton.
+
+    Nota: la posizione usa il valore base di density (numero o Envelope);
+    range e gate di density non intervengono. Dopo l'ultimo breakpoint
+    l'envelope tiene l'ultimo valore, quindi N(t) cresce linearmente.
+    """
+
+    GRID_MIN_CELLS = 256
+    GRID_MAX_CELLS = 1 << 20
+    NEWTON_STEPS = 4
+
+    def __init__(self, density_param: Parameter, distribution_param: Parameter):
+        self._density = density_param
+        self._bounds = get_parameter_definition('integral_density')
+        value = density_param.value
+        self._envelope = value if isinstance(value, Envelope) else None
+        self._rate = None if self._envelope else self._clamp_rate(float(value))
+        self._grid = None
+
+    def _clamp_rate(self, rate):
+        return np.clip(rate, self._bounds.min_val, self._bounds.max_val)
+
+    def cumulative_count(self, times) -> np.ndarray:
+        """N(t): grani attesi in [0, t) per un array di tempi."""
+        times = np.asarray(times, dtype=np.float64)
+        if self._envelope is None:
+            return self._rate * times
+        return self._envelope.integrate_many(0.0, times)
+
+    def grain_count(self, duration: float) -> int:
+        """
+        Numero di onset in [0, duration): k tale che t_k < duration.
+
+        Un solo integrale sulla tabella cumulativa: O(log n) nei breakpoints.
+        Tolleranza 1e-9 come in calculate_density(): un integrale appena
+        sopra un intero (100 * 1.1 = 110.00000000000001) non aggiunge un
+        onset su duration.
+        """
+        if duration <= 0.0:
+            return 0
+        if self._envelope is None:
+            total = self._rate * duration
+        else:
+            total = self._envelope.integrate(0.0, duration)
+        return max(int(np.ceil(total - 1e-9)), 0)
+
+    def onset_times(self, duration: float) -> np.ndarray:
+        """Onset sincroni t_k < duration, k = 0, 1, ... (N(t_k) = k)."""
+        count = self.grain_count(duration)
+        onsets = self._invert(np.arange(count, dtype=np.float64))
+        # Errore di arrotondamento su N(duration) intero
+        return onsets[onsets < duration]
+
+    def next_onset(self, time: float) -> float:
+        """Primo onset sincrono t_k >= time: k = ceil(N(time))."""
+        return float(self._invert(np.array([float(self.grain_count(time))]))[0])
+
+    def calculate_density(self, elapsed_time: float, **context) -> float:
+        """
+        Densita' equivalente per la ricorrenza un passo alla volta:
+        1 / IOT, con IOT la distanza dal prossimo k intero di N(t).
+        """
+        current = float(self.cumulative_count(np.array([elapsed_time]))[0])
+        target = np.floor(current + 1e-9) + 1.0
+        next_onset = float(self._invert(np.array([target]))[0])
+        iot = next_onset - elapsed_time
+        if iot <= 0.0:
+            return self._bounds.max_val
+        return float(self._clamp_rate(1.0 / iot))
+
+    def calculate_density_many(self, elapsed_times, rng=None, log_clips=True, **context) -> np.ndarray:
+        elapsed_times = np.asarray(elapsed_times, dtype=np.float64)
+        targets = np.floor(self.cumulative_count(elapsed_times) + 1e-9) + 1.0
+        iot = self._invert(targets) - elapsed_times
+        with np.errstate(divide='ignore'):
+            density = np.where(iot > 0.0, 1.0 / np.maximum(iot, 1e-300), self._bounds.max_val)
+        return self._clamp_rate(density)
+
+    # -------------------------------------------------------------------------
+    # INVERSIONE DI N(t)
+    # -------------------------------------------------------------------------
+
+    def _invert(self, targets: np.ndarray) -> np.ndarray:
+        """Tempi t con N(t) = target (target >= 0, ordine qualsiasi)."""
+        if self._envelope is None:
+            return targets / self._rate
+
+        grid_times, grid_counts, end_rate = self._compiled_grid()
+        result = np.empty(len(targets))
+
+        # Oltre l'ultimo breakpoint: N(t) lineare con l'ultimo valore
+        after = targets > grid_counts[-1]
+        result[after] = grid_times[-1] + (targets[after] - grid_counts[-1]) / end_rate
+
+        inside = ~after
+        cells = np.searchsorted(grid_counts, targets[inside], side='left')
+        cells = np.clip(cells, 1, len(grid_times) - 1)
+        low_t, high_t = grid_times[cells - 1], grid_times[cells]
+        low_n, high_n = grid_counts[cells - 1], grid_counts[cells]
+        span = high_n - low_n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = np.where(span > 0.0, (targets[inside] - low_n) / span, 0.0)
+        times = low_t + frac * (high_t - low_t)
+
+        # Newton dentro la cella: N'(t) = density(t)
+        for _ in range(self.NEWTON_STEPS):
+            error = self.cumulative_count(times) - targets[inside]
+            slope = np.maximum(self._envelope.evaluate_many(times), self._bounds.min_val)
+            times = np.clip(times - error / slope, low_t, high_t)
+
+        result[inside] = times
+        return result
+
+    def _compiled_grid(self):
+        """
+        Griglia (tempi, N(tempi)) su [0, fine envelope], creata al primo uso.
+
+        Circa una cella per grano (con minimo e massimo), cosi' ogni
+        inversione parte da una cella che contiene al piu' pochi onset.
+        """
+        if self._grid is None:
+            end_time = max(self._envelope.segments[-1].end_time, 0.0)
+            total = self._envelope.integrate(0.0, end_time) if end_time > 0.0 else 0.0
+            cells = int(np.clip(np.ceil(total), self.GRID_MIN_CELLS, self.GRID_MAX_CELLS))
+            grid_times = np.linspace(0.0, end_time, cells + 1)
+            grid_counts = np.maximum.accumulate(self.cumulative_count(grid_times))
+            end_rate = max(float(self._envelope.evaluate(end_time)), self._bounds.min_val)
+            self._grid = (grid_times, grid_counts, end_rate)
+        return self._grid
+
     @property
     def name(self) -> str:
-        return "density"
\ No newline at end of file
+        return "integral_density"
@@ -19,6 +19,7 @@ PITCH_STRATEGIES: Dict[str, Type[PitchStrategy]] = {
 DENSITY_STRATEGIES: Dict[str, Type[DensityStrategy]] = {
     'fill_factor': FillFactorStrategy,
     'density': DirectDensityStrategy,
+    'integral_density': IntegralDensityStrategy,
 }
 
 
@@ -1,9 +1,11 @@
 # variation_strategy.py
 from abc import ABC, abstractmethod
 from shared.distribution_strategy import DistributionStrategy
-from typing import Any 
+from typing import Any, Optional
 import random 
 
+import numpy as np
+
 class VariationStrategy(ABC):
     """Strategia di applicazione randomness a un valore base."""
     
@@ -13,11 +15,34 @@ class VariationStrategy(ABC):
         """Applica variazione al valore base."""
         pass
 
+    def apply_many(self, base: np.ndarray, mod_range: np.ndarray,
+                   distribution: DistributionStrategy,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Versione batch di apply() su array (stessa lunghezza).
+        
+        Default: apply() per elemento (rng ignorato). Le strategie numeriche
+        sovrascrivono con operazioni NumPy.
+        """
+        return np.fromiter(
+            (self.apply(b, r, distribution) for b, r in zip(base.tolist(), mod_range.tolist())),
+            dtype=np.float64, count=len(base)
+        )
+
 class AdditiveVariation(VariationStrategy):
     def apply(self, base: float, mod_range: float, 
               distribution: DistributionStrategy) -> float:
         return distribution.sample(base, mod_range) if mod_range > 0 else base
 
+    def apply_many(self, base: np.ndarray, mod_range: np.ndarray,
+                   distribution: DistributionStrategy,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        result = np.array(base, dtype=np.float64)
+        active = mod_range > 0
+        if active.any():
+            result[active] = distribution.sample_many(base[active], mod_range[active], rng)
+        return result
+
 class QuantizedVariation(VariationStrategy):
     def apply(self, base: float, mod_range: float, 
               distribution: DistributionStrategy) -> float:
@@ -26,10 +51,26 @@ class QuantizedVariation(VariationStrategy):
             return base + round(raw_sample)
         return base
 
+    def apply_many(self, base: np.ndarray, mod_range: np.ndarray,
+                   distribution: DistributionStrategy,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        result = np.array(base, dtype=np.float64)
+        active = mod_range >= 1.0
+        if active.any():
+            # np.round arrotonda half-to-even come round()
+            raw_samples = distribution.sample_many(np.zeros(int(active.sum())), mod_range[active], rng)
+            result[active] += np.round(raw_samples)
+        return result
+
 class InvertVariation(VariationStrategy):
     def apply(self, base: float, mod_range: float, 
               distribution: DistributionStrategy) -> float:
         return 1.0 - base
+
+    def apply_many(self, base: np.ndarray, mod_range: np.ndarray,
+                   distribution: DistributionStrategy,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        return 1.0 - np.asarray(base, dtype=np.float64)
     
 class ChoiceVariation(VariationStrategy):
     """
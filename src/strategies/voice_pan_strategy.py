@@ -26,7 +26,9 @@ Coerente con: variation_strategy.py, variation_registry.py,
 
 import random
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from typing import Dict, Optional, Type
+
+from shared.rng import SeededRandom
 
 
 # =============================================================================
@@ -44,8 +46,13 @@ class VoicePanStrategy(ABC):
     Il valore restituito e' un OFFSET in gradi rispetto al pan base
     dello stream. Il VoiceManager somma questo offset al pan_base
     per ottenere il pan finale della voce.
+
+    rng: sorgente casuale delle strategy stocastiche, assegnata da
+    VoicePanStrategyFactory.create(). None = modulo random globale.
     """
 
+    rng: Optional[SeededRandom] = None
+
     @abstractmethod
     def get_pan_offset(
         self,
@@ -148,7 +155,7 @@ class RandomPanStrategy(VoicePanStrategy):
                 f"spread deve essere >= 0, ricevuto: {spread}"
             )
 
-        return random.uniform(-spread / 2.0, spread / 2.0)
+        return (self.rng or random).uniform(-spread / 2.0, spread / 2.0)
 
     @property
     def name(self) -> str:
@@ -246,13 +253,14 @@ class VoicePanStrategyFactory:
     """
 
     @staticmethod
-    def create(strategy_name: str) -> VoicePanStrategy:
+    def create(strategy_name: str, rng: Optional[SeededRandom] = None) -> VoicePanStrategy:
         """
         Crea e restituisce un'istanza della strategy specificata.
 
         Args:
             strategy_name: nome della strategy nel registry
                            ('linear', 'random', 'additive', o custom)
+            rng: sorgente casuale (None = modulo random globale)
 
         Returns:
             Istanza di VoicePanStrategy corrispondente al nome
@@ -269,4 +277,6 @@ class VoicePanStrategyFactory:
             )
 
         strategy_class = VOICE_PAN_STRATEGIES[strategy_name]
-        return strategy_class()
\ No newline at end of file
+        strategy = strategy_class()
+        strategy.rng = rng
+        return strategy
\ No newline at end of file
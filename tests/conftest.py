@@ -5,6 +5,7 @@ Fixtures e helpers condivisi tra tutte le test suite.
 Contenuto:
 - mock_config: StreamConfig/StreamContext mockato per i controller tests
   Usato da: test_density_controller, test_pitch_controller, test_pointer_controller
+- clip_log_dir: directory temporanea dei clip log (mai ./logs durante i test)
 """
 
 import pytest
@@ -13,6 +14,20 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 from core.stream_config import StreamConfig, StreamContext
+from shared import logger as clip_logger
+
+
+@pytest.fixture(scope='session', autouse=True)
+def clip_log_dir(tmp_path_factory):
+    """
+    I clip log scritti durante i test finiscono in una directory temporanea
+    invece che in ./logs dell'albero di lavoro.
+    """
+    log_dir = str(tmp_path_factory.mktemp('clip_logs'))
+    clip_logger.CLIP_LOG_CONFIG['log_dir'] = log_dir
+    clip_logger._clip_logger = None
+    clip_logger._clip_logger_initialized = False
+    return log_dir
 
 
 @pytest.fixture
@@ -35,6 +50,7 @@ def mock_config():
     config.distribution_mode = 'uniform'
     config.dephase = False
     config.range_always_active = False
+    config.rng = None
 
     return config
 
@@ -16,10 +16,14 @@ Coverage:
  10. Edge cases e error handling
  11. Integrazione con Envelope
  12. __repr__
+ 15. schedule_onsets - schedule a blocchi (predittore/correttore)
+ 16. Modalita' integral_density (inversione di N(t))
+ 17. seek / from_time - ripresa da checkpoint
 """
 
 import pytest
 import random as stdlib_random
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from controllers.density_controller import DensityController
 from parameters.parameter import Parameter
@@ -86,6 +90,27 @@ def _build_direct_density_params(density=20.0, distribution=0.0):
     }
 
 
+def _build_integral_density_params(density=20.0, distribution=0.0):
+    """Costruisce loaded_params per modalita' integral_density."""
+    return {
+        'fill_factor': None,
+        'density': None,
+        'integral_density': Parameter(
+            value=density,
+            name='integral_density',
+            bounds=get_parameter_definition('integral_density'),
+            owner_id='test'
+        ),
+        'distribution': Parameter(
+            value=distribution,
+            name='distribution',
+            bounds=get_parameter_definition('distribution'),
+            owner_id='test'
+        ),
+        'effective_density': 0.0,
+    }
+
+
 # =============================================================================
 # GRUPPO 1: INIZIALIZZAZIONE FILL_FACTOR
 # =============================================================================
@@ -740,4 +765,240 @@ class TestRealisticSequence:
 
         # Media vicina a avg_iot
         mean_interval = sum(intervals) / len(intervals)
-        assert mean_interval == pytest.approx(0.025, rel=0.1)
\ No newline at end of file
+        assert mean_interval == pytest.approx(0.025, rel=0.1)
+
+
+# =============================================================================
+# GRUPPO 15: SCHEDULE A BLOCCHI (schedule_onsets)
+# =============================================================================
+
+def _sequential_onsets(dc, duration, grain_dur):
+    """Riferimento: ricorrenza un passo alla volta con calculate_inter_onset."""
+    onsets = []
+    current = 0.0
+    while current < duration:
+        onsets.append(current)
+        dur = grain_dur if isinstance(grain_dur, float) else grain_dur.get_value(current)
+        current += dc.calculate_inter_onset(current, dur)
+    return np.array(onsets)
+
+
+def _collect(dc, duration, grain_dur, block_size=64):
+    blocks = list(dc.schedule_onsets(duration, grain_dur, block_size=block_size))
+    return (np.concatenate([b[0] for b in blocks]),
+            np.concatenate([b[1] for b in blocks]))
+
+
+class TestScheduleOnsets:
+    """schedule_onsets(): stessa ricorrenza di calculate_inter_onset, a blocchi."""
+
+    def test_sync_direct_density_matches_sequential(self, mock_config):
+        params = _build_direct_density_params(density=40.0)
+        dc = _make_density_controller(mock_config, params)
+
+        onsets, durations = _collect(dc, 2.0, 0.05)
+
+        np.testing.assert_allclose(onsets, _sequential_onsets(dc, 2.0, 0.05))
+        np.testing.assert_array_equal(durations, 0.05)
+
+    def test_sync_fill_factor_envelope_matches_sequential(self, mock_config):
+        """Envelope che cambia piu' in fretta del blocco: il correttore converge."""
+        from envelopes.envelope import Envelope
+
+        params = _build_fill_factor_params()
+        params['fill_factor'] = Parameter(
+            value=Envelope([[0, 1.0], [0.5, 8.0], [1.0, 0.5], [3.0, 4.0]]),
+            name='fill_factor',
+            bounds=get_parameter_definition('fill_factor'),
+            owner_id='test'
+        )
+        dc = _make_density_controller(mock_config, params)
+
+        onsets, _ = _collect(dc, 3.0, 0.05, block_size=32)
+
+        np.testing.assert_allclose(onsets, _sequential_onsets(dc, 3.0, 0.05))
+
+    def test_grain_duration_parameter(self, mock_config):
+        """Durata come Parameter: durate valutate sugli onset risolti."""
+        from envelopes.envelope import Envelope
+
+        params = _build_fill_factor_params(fill_factor=2.0)
+        dc = _make_density_controller(mock_config, params)
+        grain_dur = Parameter(
+            value=Envelope([[0, 0.02], [2.0, 0.2]]),
+            name='grain_duration',
+            bounds=get_parameter_definition('grain_duration'),
+            owner_id='test'
+        )
+
+        onsets, durations = _collect(dc, 2.0, grain_dur)
+
+        np.testing.assert_allclose(onsets, _sequential_onsets(dc, 2.0, grain_dur))
+        np.testing.assert_allclose(durations, [grain_dur.get_value(t) for t in onsets])
+
+    def test_onsets_stop_before_duration(self, mock_config):
+        params = _build_direct_density_params(density=10.0)
+        dc = _make_density_controller(mock_config, params)
+
+        onsets, _ = _collect(dc, 1.05, 0.05, block_size=4)
+
+        assert len(onsets) == 11
+        assert onsets[-1] < 1.05
+
+    def test_async_iot_bounds_and_mean(self, mock_config):
+        params = _build_direct_density_params(density=40.0, distribution=1.0)
+        dc = _make_density_controller(mock_config, params)
+
+        stdlib_random.seed(7)
+        onsets, _ = _collect(dc, 50.0, 0.05)
+        intervals = np.diff(onsets)
+
+        assert np.all(intervals >= 0.0)
+        assert np.all(intervals <= 2.0 * 0.025 + 1e-12)
+        assert intervals.mean() == pytest.approx(0.025, rel=0.05)
+
+    def test_async_reproducible_with_seed(self, mock_config):
+        params = _build_direct_density_params(density=40.0, distribution=0.5)
+        dc = _make_density_controller(mock_config, params)
+
+        stdlib_random.seed(3)
+        first, _ = _collect(dc, 5.0, 0.05)
+        stdlib_random.seed(3)
+        second, _ = _collect(dc, 5.0, 0.05)
+
+        np.testing.assert_array_equal(first, second)
+
+
+# =============================================================================
+# GRUPPO 16: MODALITA' INTEGRAL_DENSITY
+# =============================================================================
+
+class TestIntegralDensityMode:
+    """Onset da N(t) = k: conteggio esatto, jitter come perturbazione."""
+
+    ENVELOPE = [[0, 10.0], [0.5, 300.0], [1.0, 20.0], [4.0, 60.0]]
+
+    def _controller(self, mock_config, distribution=0.0):
+        from envelopes.envelope import Envelope
+
+        params = _build_integral_density_params(
+            density=Envelope(self.ENVELOPE), distribution=distribution
+        )
+        return _make_density_controller(mock_config, params)
+
+    def test_mode_and_property(self, mock_config):
+        dc = self._controller(mock_config)
+
+        assert dc.mode == 'integral_density'
+        assert dc.integral_density is not None
+        assert dc.density is None
+
+    def test_sync_schedule_is_lattice(self, mock_config):
+        dc = self._controller(mock_config)
+
+        onsets, durations = _collect(dc, 4.0, 0.05, block_size=100)
+
+        np.testing.assert_allclose(onsets, dc._strategy.onset_times(4.0))
+        np.testing.assert_array_equal(durations, 0.05)
+
+    def test_predict_grain_count_matches_schedule(self, mock_config):
+        dc = self._controller(mock_config)
+
+        onsets, _ = _collect(dc, 3.3, 0.05)
+
+        assert dc.predict_grain_count(3.3) == len(onsets)
+
+    def test_async_keeps_count_and_order(self, mock_config):
+        dc = self._controller(mock_config, distribution=1.0)
+
+        stdlib_random.seed(11)
+        onsets, _ = _collect(dc, 4.0, 0.05)
+        lattice = dc._strategy.onset_times(4.0)
+
+        assert len(onsets) == len(lattice)
+        assert np.all(np.diff(onsets) >= 0.0)
+        assert np.all((onsets >= 0.0) & (onsets < 4.0))
+        assert not np.allclose(onsets, lattice)
+
+    def test_scalar_inter_onset_follows_lattice(self, mock_config):
+        dc = self._controller(mock_config)
+
+        np.testing.assert_allclose(
+            _sequential_onsets(dc, 4.0, 0.05), dc._strategy.onset_times(4.0), atol=1e-9
+        )
+
+    def test_predict_grain_count_none_for_recurrence_modes(self, mock_config):
+        dc = _make_density_controller(mock_config, _build_direct_density_params())
+
+        assert dc.predict_grain_count(10.0) is None
+
+
+# =============================================================================
+# GRUPPO 17: SEEK E RIPRESA DA CHECKPOINT
+# =============================================================================
+
+class TestSeek:
+    """seek() e schedule_onsets(from_time=...): ripresa senza il prefisso."""
+
+    @staticmethod
+    def _seeded(mock_config, params, seed=5):
+        from shared.rng import SeededRandom
+
+        mock_config.rng = SeededRandom.from_seed(seed)
+        return _make_density_controller(mock_config, params)
+
+    def test_seek_sync_returns_next_onset(self, mock_config):
+        dc = _make_density_controller(mock_config, _build_direct_density_params(density=40.0))
+
+        onsets, _ = _collect(dc, 10.0, 0.05)
+
+        expected = onsets[np.searchsorted(onsets, 3.33)]
+        assert dc.seek(3.33, 0.05) == pytest.approx(expected)
+
+    def test_from_time_matches_full_tail_with_seed(self, mock_config):
+        params = _build_fill_factor_params(fill_factor=3.0, distribution=0.7)
+        full, _ = _collect(self._seeded(mock_config, params), 20.0, 0.05)
+
+        fresh = self._seeded(mock_config, _build_fill_factor_params(fill_factor=3.0, distribution=0.7))
+        blocks = list(fresh.schedule_onsets(20.0, 0.05, block_size=64, from_time=12.5))
+        tail = np.concatenate([b[0] for b in blocks])
+
+        np.testing.assert_array_equal(tail, full[full >= 12.5])
+
+    def test_resume_uses_checkpoint(self, mock_config):
+        dc = self._seeded(mock_config, _build_fill_factor_params(fill_factor=3.0, distribution=0.7))
+        full, _ = _collect(dc, 20.0, 0.05)
+
+        with patch.object(dc, '_solve_block', wraps=dc._solve_block) as solve:
+            blocks = list(dc.schedule_onsets(20.0, 0.05, block_size=64, from_time=18.0))
+
+        tail = np.concatenate([b[0] for b in blocks])
+        np.testing.assert_array_equal(tail, full[full >= 18.0])
+        assert solve.call_count <= 3
+
+    def test_rerun_from_zero_is_reproducible(self, mock_config):
+        dc = self._seeded(mock_config, _build_direct_density_params(density=40.0, distribution=1.0))
+
+        first, _ = _collect(dc, 5.0, 0.05)
+        second, _ = _collect(dc, 5.0, 0.05)
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_integral_seek_is_lattice_onset(self, mock_config):
+        dc = _make_density_controller(mock_config, _build_integral_density_params(density=25.0))
+
+        assert dc.seek(1.01, 0.05) == pytest.approx(26 / 25.0)
+
+    def test_integral_from_time_matches_full_tail(self, mock_config):
+        from envelopes.envelope import Envelope
+
+        def make():
+            return self._seeded(mock_config, _build_integral_density_params(
+                density=Envelope([[0, 10.0], [5, 200.0]]), distribution=1.0
+            ))
+
+        full, _ = _collect(make(), 5.0, 0.05)
+        blocks = list(make().schedule_onsets(5.0, 0.05, from_time=2.0))
+        tail = np.concatenate([b[0] for b in blocks])
+
+        np.testing.assert_array_equal(tail, full[full >= 2.0])
@@ -20,6 +20,7 @@ Coverage:
 
 import pytest
 import math
+import numpy as np
 from unittest.mock import Mock, patch
 from controllers.pitch_controller import PitchController
 from parameters.parameter import Parameter
@@ -659,4 +660,29 @@ class TestRealisticSequence:
             if reverse:
                 assert result == pytest.approx(-1.5)
             else:
-                assert result == pytest.approx(1.5)
\ No newline at end of file
+                assert result == pytest.approx(1.5)
+
+# =============================================================================
+# GRUPPO: CALCOLO BATCH
+# =============================================================================
+
+class TestCalculateMany:
+    """Test calculate_many() (motore vettoriale)."""
+
+    def test_matches_scalar_calculate(self, mock_config):
+        params = _build_semitones_params(semitones=7.0)
+        pc = _make_pitch_controller(mock_config, params)
+        times = np.linspace(0.0, 5.0, 11)
+
+        result = pc.calculate_many(times)
+
+        expected = [pc.calculate(t) for t in times]
+        np.testing.assert_allclose(result, expected)
+
+    def test_reverse_mask_negates(self, mock_config):
+        params = _build_ratio_params(ratio=2.0)
+        pc = _make_pitch_controller(mock_config, params)
+
+        result = pc.calculate_many(np.zeros(3), grain_reverse=np.array([True, False, True]))
+
+        np.testing.assert_allclose(result, [-2.0, 2.0, -2.0])
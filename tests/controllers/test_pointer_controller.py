@@ -15,6 +15,7 @@ Test Coverage:
 """
 
 import pytest
+import numpy as np
 from unittest.mock import Mock, patch, call
 from controllers.pointer_controller import PointerController
 from core.stream_config import StreamConfig, StreamContext
@@ -450,6 +451,8 @@ class TestDirectionAwareReset:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -524,6 +527,8 @@ class TestDirectionAwareReset:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -596,6 +601,8 @@ class TestDirectionAwareReset:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -670,6 +677,8 @@ class TestDirectionReversal:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -740,6 +749,8 @@ class TestDirectionReversal:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -807,6 +818,8 @@ class TestDirectionReversal:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -878,6 +891,8 @@ class TestDynamicLoops:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -943,6 +958,8 @@ class TestDynamicLoops:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -1208,6 +1225,8 @@ class TestIntegration:
             mock_orch.create_all_parameters.return_value = mock_params
             
             config = Mock(spec=StreamConfig)
+            
+            config.rng = None
             config.context = Mock(spec=StreamContext)
             config.context.stream_id = "test"
             config.context.sample_dur_sec = 10.0
@@ -1247,6 +1266,8 @@ def mock_config():
     context.sample_dur_sec = 10.0
 
     config = Mock(spec=StreamConfig)
+
+    config.rng = None
     config.context = context
     config.time_mode = 'absolute'
 
@@ -1739,6 +1760,8 @@ class TestLinearPositionWithEnvelope:
 
         # Crea un mock Envelope che ha integrate() e value
         mock_envelope = Mock(spec=Envelope)
+        # Il controller integra tramite envelope.cursor(): stessa interfaccia
+        mock_envelope.cursor.return_value = mock_envelope
         mock_envelope.breakpoints = [[0, 2.0], [10, 2.0]]  # costante a 2.0
 
         # integrate(0, t) per speed costante 2.0 = 2.0 * t
@@ -1768,6 +1791,8 @@ class TestLinearPositionWithEnvelope:
         mock_config.context.sample_dur_sec = 20.0
 
         mock_envelope = Mock(spec=Envelope)
+        # Il controller integra tramite envelope.cursor(): stessa interfaccia
+        mock_envelope.cursor.return_value = mock_envelope
         mock_envelope.breakpoints = [[0, 0.0], [10, 10.0]]  # rampa 0->10
 
         # integrate(0, t) per rampa lineare 0->t = area triangolo = t^2/2
@@ -1794,6 +1819,25 @@ class TestLinearPositionWithEnvelope:
         pos = pointer.calculate(4.0)
         assert pos == pytest.approx(8.0)
 
+    def test_real_envelope_integrated_through_cursor(self, mock_config):
+        """Envelope reale: stesso risultato di integrate(), un solo cursore riusato."""
+        mock_config.context.sample_dur_sec = 100.0
+        envelope = Envelope([[0, 0.5], [2, 2.0], [3, 1.0], [6, 1.5]])
+
+        real = _build_real_params(start=0.0, speed=1.0)
+        real['pointer_speed_ratio'] = Mock()
+        real['pointer_speed_ratio'].value = envelope
+
+        pointer = _make_pointer(
+            mock_config, real,
+            {'start': 0.0, 'speed_ratio': 1.0}
+        )
+
+        times = [0.0, 0.5, 1.9, 2.0, 2.7, 4.0, 7.0, 1.0]
+        positions = [pointer._calculate_linear_position(t) for t in times]
+        assert positions == [envelope.integrate(0, t) for t in times]
+        assert pointer._speed_cursor.envelope is envelope
+
     def test_scalar_speed_uses_multiplication(self, mock_config):
         """Speed scalare usa moltiplicazione diretta, non integrate."""
         mock_config.context.sample_dur_sec = 10.0
@@ -2384,4 +2428,262 @@ class TestPointerControllerMissingLines:
             assert pointer._drift_prev_elapsed is None
             assert pointer._drift_log_interval == pytest.approx(5.0)
             assert pointer._drift_last_logged == pytest.approx(-999.0)
-            assert pointer._drift_first_warning_emitted is False
\ No newline at end of file
+            assert pointer._drift_first_warning_emitted is False
+
+# =============================================================================
+# GRUPPO: CALCOLO BATCH
+# =============================================================================
+
+class TestCalculateMany:
+    """Test calculate_many() (motore vettoriale)."""
+
+    def test_matches_scalar_sequence_with_loop(self, mock_config):
+        """Stesso phase accumulator della sequenza scalare."""
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 0.0, 'speed_ratio': 1.5, 'loop_start': 2.0, 'loop_end': 4.0}
+        times = np.arange(0.0, 6.0, 0.05)
+        durations = np.full(len(times), 0.05)
+        reverse = (np.arange(len(times)) % 3) == 0
+
+        scalar = _make_pointer(mock_config, _build_real_params(start=0.0, speed=1.5, loop_start=2.0, loop_end=4.0), raw)
+        expected = [scalar.calculate(t, d, r) for t, d, r in zip(times, durations, reverse)]
+
+        batch = _make_pointer(mock_config, _build_real_params(start=0.0, speed=1.5, loop_start=2.0, loop_end=4.0), raw)
+        result = batch.calculate_many(times, durations, reverse)
+
+        np.testing.assert_allclose(result, expected)
+
+    def test_defaults_no_duration_no_reverse(self, mock_config):
+        mock_config.context.sample_dur_sec = 10.0
+        pointer = _make_pointer(mock_config, _build_real_params(start=3.0, speed=0.0), {'start': 3.0, 'speed_ratio': 0.0})
+
+        np.testing.assert_allclose(pointer.calculate_many(np.array([0.0, 1.0])), [3.0, 3.0])
+
+    def test_get_speeds(self, mock_config):
+        pointer = _make_pointer(mock_config, _build_real_params(speed=-0.5), {'speed_ratio': -0.5})
+
+        np.testing.assert_allclose(pointer.get_speeds(np.array([0.0, 2.0])), [-0.5, -0.5])
+
+    def test_get_speeds_envelope_matches_scalar(self, mock_config):
+        speed = Envelope([[0, -1.0], [10, 2.0]])
+        pointer = _make_pointer(mock_config, _build_real_params(speed=speed), {'speed_ratio': [[0, -1.0], [10, 2.0]]})
+        times = np.linspace(0.0, 12.0, 37)
+
+        np.testing.assert_allclose(pointer.get_speeds(times), [pointer.get_speed(t) for t in times])
+
+    @staticmethod
+    def _assert_close_mod(result, expected, period):
+        """Uguaglianza a meno di un giro di loop (grani esattamente sul bordo)."""
+        diff = np.abs(result - expected)
+        np.testing.assert_allclose(np.minimum(diff, np.abs(diff - period)), 0.0, atol=1e-9)
+
+    @staticmethod
+    def _scalar_and_batch(mock_config, raw, times, chunk=None, **params):
+        scalar = _make_pointer(mock_config, _build_real_params(**params), raw)
+        expected = np.array([scalar.calculate(t) for t in times])
+        batch = _make_pointer(mock_config, _build_real_params(**params), raw)
+        if chunk is None:
+            result = batch.calculate_many(times)
+        else:
+            result = np.concatenate([
+                batch.calculate_many(times[i:i + chunk]) for i in range(0, len(times), chunk)
+            ])
+        return expected, result, scalar, batch
+
+    @pytest.mark.parametrize("speed", [1.5, -0.7, 3.3, 0.0])
+    def test_static_loop_closed_form(self, mock_config, speed):
+        """Loop costante: entrata e wrap in forma chiusa, anche all'indietro."""
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 1.0, 'speed_ratio': speed, 'loop_start': 2.0, 'loop_end': 4.5}
+        times = np.linspace(0.0, 20.0, 733)
+
+        expected, result, scalar, batch = self._scalar_and_batch(
+            mock_config, raw, times, start=1.0, speed=speed, loop_start=2.0, loop_end=4.5
+        )
+
+        self._assert_close_mod(result, expected, 2.5)
+        assert batch.in_loop == scalar.in_loop
+
+    def test_chunks_continue_state(self, mock_config):
+        """Chunk successivi proseguono lo stesso phase accumulator."""
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 0.0, 'speed_ratio': 1.2, 'loop_start': 3.0, 'loop_dur': 1.5}
+        times = np.linspace(0.0, 15.0, 500)
+
+        expected, result, scalar, batch = self._scalar_and_batch(
+            mock_config, raw, times, chunk=37, start=0.0, speed=1.2, loop_start=3.0, loop_dur=1.5
+        )
+
+        self._assert_close_mod(result, expected, 1.5)
+        self._assert_close_mod(batch._loop_absolute_pos, scalar._loop_absolute_pos, 1.5)
+
+    def test_speed_envelope(self, mock_config):
+        mock_config.context.sample_dur_sec = 10.0
+        speed = Envelope([[0, 0.5], [5, 3.0], [10, -1.0]])
+        raw = {'start': 0.0, 'speed_ratio': speed, 'loop_start': 2.0, 'loop_end': 5.0}
+        times = np.linspace(0.0, 10.0, 400)
+
+        expected, result, _, _ = self._scalar_and_batch(
+            mock_config, raw, times, start=0.0, speed=speed, loop_start=2.0, loop_end=5.0
+        )
+
+        self._assert_close_mod(result, expected, 3.0)
+
+    def test_never_enters_loop(self, mock_config):
+        """Loop fuori dal percorso lineare: solo fase pre-loop."""
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 0.0, 'speed_ratio': 0.1, 'loop_start': 6.0, 'loop_end': 8.0}
+        times = np.linspace(0.0, 20.0, 50)
+
+        expected, result, _, batch = self._scalar_and_batch(
+            mock_config, raw, times, start=0.0, speed=0.1, loop_start=6.0, loop_end=8.0
+        )
+
+        np.testing.assert_allclose(result, expected)
+        assert not batch.in_loop
+
+    @pytest.mark.parametrize("speed", [1.0, 0.2, -0.5])
+    def test_dynamic_loop_segmented_scan(self, mock_config, speed):
+        """Loop con envelope: passi solo dove i bounds cambiano."""
+        mock_config.context.sample_dur_sec = 10.0
+        loop_start = Envelope({'type': 'step', 'points': [[0, 1.0], [3, 4.0], [6, 2.0]]})
+        raw = {'start': 0.0, 'speed_ratio': speed, 'loop_start': loop_start, 'loop_dur': 1.0}
+        times = np.linspace(0.0, 9.0, 300)
+
+        expected, result, _, _ = self._scalar_and_batch(
+            mock_config, raw, times, chunk=64, start=0.0, speed=speed,
+            loop_start=loop_start, loop_dur=1.0
+        )
+
+        np.testing.assert_allclose(result, expected, atol=1e-9)
+
+    def test_continuous_dynamic_loop(self, mock_config):
+        mock_config.context.sample_dur_sec = 10.0
+        loop_start = Envelope([[0, 1.0], [8, 6.0]])
+        loop_dur = Envelope([[0, 0.5], [8, 2.0]])
+        raw = {'start': 0.0, 'speed_ratio': 0.8, 'loop_start': loop_start, 'loop_dur': loop_dur}
+        times = np.linspace(0.0, 8.0, 250)
+
+        expected, result, _, _ = self._scalar_and_batch(
+            mock_config, raw, times, start=0.0, speed=0.8,
+            loop_start=loop_start, loop_dur=loop_dur
+        )
+
+        np.testing.assert_allclose(result, expected, atol=1e-9)
+
+    def test_static_loop_no_per_grain_steps(self, mock_config):
+        """Con bounds costanti _advance_in_loop non viene mai chiamato."""
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 0.0, 'speed_ratio': 1.0, 'loop_start': 2.0, 'loop_end': 4.0}
+        pointer = _make_pointer(mock_config, _build_real_params(loop_start=2.0, loop_end=4.0), raw)
+
+        with patch.object(pointer, '_advance_in_loop') as step:
+            pointer.calculate_many(np.linspace(0.0, 30.0, 1000))
+
+        step.assert_not_called()
+
+    @pytest.mark.parametrize("loop_start, loop_dur", [(2.5, 0.3), (2.0, 0.5), (1.1, 0.7)])
+    def test_static_loop_dur_no_per_grain_steps(self, mock_config, loop_start, loop_dur):
+        """loop_end = start + dur puo' differire di un ulp da dur: nessun passo."""
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 0.0, 'speed_ratio': 1.0, 'loop_start': loop_start, 'loop_dur': loop_dur}
+        times = np.linspace(0.0, 30.0, 3000)
+
+        expected, _, _, _ = self._scalar_and_batch(
+            mock_config, raw, times, start=0.0, speed=1.0, loop_start=loop_start, loop_dur=loop_dur
+        )
+        pointer = _make_pointer(
+            mock_config, _build_real_params(loop_start=loop_start, loop_dur=loop_dur), raw
+        )
+        with patch.object(pointer, '_advance_in_loop', wraps=pointer._advance_in_loop) as step:
+            result = pointer.calculate_many(times)
+
+        step.assert_not_called()
+        np.testing.assert_allclose(result, expected, atol=1e-9)
+
+
+# =============================================================================
+# GRUPPO: SEEK
+# =============================================================================
+
+def _compiled_params(**kwargs):
+    params = _build_real_params(**kwargs)
+    for param in params.values():
+        if isinstance(param, Parameter):
+            param.compile()
+    return params
+
+
+class TestSeek:
+    """seek(): stato del loop a un tempo arbitrario senza simulare il prefisso."""
+
+    RAW = {'start': 0.5, 'speed_ratio': 1.3, 'loop_start': 2.0, 'loop_end': 4.5}
+    PARAMS = dict(start=0.5, speed=1.3, loop_start=2.0, loop_end=4.5)
+
+    def _pointer(self, mock_config):
+        mock_config.context.sample_dur_sec = 10.0
+        return _make_pointer(mock_config, _compiled_params(**self.PARAMS), self.RAW)
+
+    def _full_run(self, mock_config, times):
+        return self._pointer(mock_config).calculate_many(times)
+
+    def test_no_loop_is_stateless(self, mock_config):
+        mock_config.context.sample_dur_sec = 10.0
+        raw = {'start': 1.0, 'speed_ratio': 0.7}
+        pointer = _make_pointer(mock_config, _compiled_params(start=1.0, speed=0.7), raw)
+
+        pointer.seek(42.0)
+
+        assert pointer.calculate(43.0) == pytest.approx((1.0 + 43.0 * 0.7) % 10.0)
+
+    @pytest.mark.parametrize("seek_time", [0.3, 1.5, 7.77, 25.0])
+    def test_static_loop_without_checkpoints(self, mock_config, seek_time):
+        times = np.linspace(0.0, 30.0, 1201)
+        full = self._full_run(mock_config, times)
+
+        pointer = self._pointer(mock_config)
+        pointer.seek(seek_time)
+        tail = times > seek_time
+        result = pointer.calculate_many(times[tail])
+
+        TestCalculateMany._assert_close_mod(result, full[tail], 2.5)
+
+    def test_static_loop_checkpoint_closed_form(self, mock_config):
+        """Checkpoint dentro un loop costante: nessuna griglia di grani virtuali."""
+        times = np.linspace(0.0, 30.0, 1201)
+        pointer = self._pointer(mock_config)
+        full = pointer.calculate_many(times)
+
+        with patch.object(pointer, '_seek_grid') as grid:
+            pointer.seek(12.0)
+        grid.assert_not_called()
+
+        tail = times > 12.0
+        TestCalculateMany._assert_close_mod(pointer.calculate_many(times[tail]), full[tail], 2.5)
+
+    def test_seek_backwards_restores_earlier_state(self, mock_config):
+        times = np.linspace(0.0, 30.0, 1201)
+        pointer = self._pointer(mock_config)
+        full = pointer.calculate_many(times)
+
+        pointer.seek(0.0)
+        result = pointer.calculate_many(times[1:])
+
+        TestCalculateMany._assert_close_mod(result, full[1:], 2.5)
+
+    def test_dynamic_loop_state_inside_window(self, mock_config):
+        """Loop mobile: dopo seek il pointer e' dentro la finestra corrente."""
+        mock_config.context.sample_dur_sec = 10.0
+        loop_start = Envelope([[0, 1.0], [20, 7.0]])
+        raw = {'start': 0.0, 'speed_ratio': 0.5, 'loop_start': loop_start, 'loop_dur': 1.0}
+        pointer = _make_pointer(
+            mock_config,
+            _compiled_params(start=0.0, speed=0.5, loop_start=loop_start, loop_dur=1.0),
+            raw
+        )
+
+        pointer.seek(13.0)
+
+        assert pointer.in_loop
+        current_start = loop_start.evaluate(13.0)
+        assert current_start <= pointer._loop_absolute_pos < current_start + 1.0
@@ -0,0 +1,189 @@
+"""
+test_voice_manager.py
+
+Test suite per VoiceManager.
+
+Coverage:
+  1. Inizializzazione e max_voices (valore, envelope, bounds)
+  2. Attivazione delle voci (scalare e batch)
+  3. Offset di pitch (scalare e batch)
+  4. Offset e micro-jitter del pointer
+  5. Offset di pan da VoicePanStrategy
+  6. Equivalenza interfaccia scalare / batch
+"""
+
+import random
+
+import pytest
+import numpy as np
+
+from controllers.voice_manager import VoiceManager
+from shared.rng import SeededRandom
+
+
+def _make_voice_manager(mock_config, **params):
+    return VoiceManager(params, mock_config)
+
+
+# =============================================================================
+# 1. INIZIALIZZAZIONE
+# =============================================================================
+
+class TestInit:
+
+    def test_default_single_voice(self, mock_config):
+        vm = _make_voice_manager(mock_config)
+        assert vm.max_voices == 1
+        assert vm.num_voices.get_value(0.0) == 1
+
+    def test_constant_num_voices(self, mock_config):
+        assert _make_voice_manager(mock_config, num_voices=4).max_voices == 4
+
+    def test_envelope_allocates_maximum(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=[[0, 1], [10, 6]])
+        assert vm.max_voices == 6
+
+    def test_out_of_bounds_raises(self, mock_config):
+        with pytest.raises(ValueError, match="num_voices"):
+            _make_voice_manager(mock_config, num_voices=500)
+
+    def test_invalid_pan_strategy_raises(self, mock_config):
+        with pytest.raises(ValueError):
+            _make_voice_manager(mock_config, num_voices=2, pan_strategy='spiral')
+
+    def test_repr(self, mock_config):
+        assert 'max_voices=3' in repr(_make_voice_manager(mock_config, num_voices=3))
+
+
+# =============================================================================
+# 2. ATTIVAZIONE
+# =============================================================================
+
+class TestActivation:
+
+    def test_voice_zero_always_active(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=[[0, 1], [10, 4]])
+        assert vm.is_voice_active(0, 0.0)
+
+    def test_dynamic_activation(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=[[0, 1], [10, 4]])
+        assert not vm.is_voice_active(3, 0.0)
+        assert vm.is_voice_active(3, 10.0)
+
+    def test_active_many_constant(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=3)
+        mask = vm.active_many(np.array([0, 1, 2]), np.zeros(3))
+        assert mask.tolist() == [True, True, True]
+
+    @pytest.mark.parametrize("num_voices, expected", [
+        (2.5, 2), (3.5, 4), ([[0, 1], [10, 2.5]], 2), ([[0, 1], [10, 3.5]], 4)
+    ])
+    def test_allocated_voices_all_sound(self, mock_config, num_voices, expected):
+        """max_voices arrotonda come is_voice_active / active_many."""
+        vm = _make_voice_manager(mock_config, num_voices=num_voices)
+        assert vm.max_voices == expected
+        last = vm.max_voices - 1
+        assert vm.is_voice_active(last, 10.0)
+        assert vm.active_many(np.array([last]), np.array([10.0])).tolist() == [True]
+
+    def test_active_many_matches_scalar(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=[[0, 1], [10, 4]])
+        voices = np.tile(np.arange(4), 5)
+        times = np.repeat(np.linspace(0.0, 10.0, 5), 4)
+        expected = [vm.is_voice_active(int(v), t) for v, t in zip(voices, times)]
+        assert vm.active_many(voices, times).tolist() == expected
+
+
+# =============================================================================
+# 3. PITCH
+# =============================================================================
+
+class TestPitchOffset:
+
+    def test_voice_zero_unchanged(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=3, pitch_offset=7)
+        assert vm.get_voice_pitch_multiplier(0, 0.0) == 1.0
+
+    def test_octave_per_voice(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=3, pitch_offset=12)
+        assert vm.get_voice_pitch_multiplier(2, 0.0) == pytest.approx(4.0)
+
+    def test_batch_matches_scalar(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=4, pitch_offset=[[0, 0], [10, 7]])
+        voices = np.array([0, 1, 2, 3])
+        times = np.array([0.0, 2.5, 5.0, 10.0])
+        expected = [vm.get_voice_pitch_multiplier(int(v), t) for v, t in zip(voices, times)]
+        np.testing.assert_allclose(vm.pitch_multipliers_many(voices, times), expected)
+
+
+# =============================================================================
+# 4. POINTER
+# =============================================================================
+
+class TestPointerOffset:
+
+    def test_offset_scaled_by_sample_duration(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=3, pointer_offset=0.1)
+        assert vm.get_voice_pointer_offset(2, 0.0) == pytest.approx(2.0)
+
+    def test_no_jitter_without_range(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=3, pointer_offset=0.1)
+        np.testing.assert_allclose(
+            vm.pointer_offsets_many(np.array([0, 1, 2]), np.zeros(3)),
+            [0.0, 1.0, 2.0]
+        )
+
+    def test_jitter_within_range(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=2, pointer_range=0.02)
+        offsets = vm.pointer_offsets_many(np.ones(500, dtype=int), np.zeros(500))
+        assert offsets.std() > 0
+        assert np.all(np.abs(offsets) <= 0.1)
+
+    def test_voice_zero_never_jittered(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=2, pointer_range=0.02)
+        assert vm.get_voice_pointer_jitter(0, 0.0) == 0.0
+        assert np.all(vm.pointer_offsets_many(np.zeros(50, dtype=int), np.zeros(50)) == 0.0)
+
+    def test_jitter_reproducible_with_rng(self, mock_config):
+        mock_config.rng = SeededRandom.from_seed(4)
+        a = _make_voice_manager(mock_config, num_voices=2, pointer_range=0.02)
+        b = _make_voice_manager(mock_config, num_voices=2, pointer_range=0.02)
+        voices = np.ones(20, dtype=int)
+        np.testing.assert_array_equal(
+            a.pointer_offsets_many(voices, np.zeros(20)),
+            b.pointer_offsets_many(voices, np.zeros(20))
+        )
+
+
+# =============================================================================
+# 5. PAN
+# =============================================================================
+
+class TestPanOffset:
+
+    def test_linear_spread(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=3, pan_spread=90)
+        offsets = [vm.get_voice_pan_offset(v) for v in range(3)]
+        assert offsets == pytest.approx([-45.0, 0.0, 45.0])
+
+    def test_single_voice_not_spread(self, mock_config):
+        vm = _make_voice_manager(mock_config, pan_spread=90, pan_strategy='additive')
+        assert vm.get_voice_pan_offset(0) == 0.0
+
+    def test_batch_lookup(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=4, pan_spread=120)
+        voices = np.array([3, 0, 1, 3])
+        expected = [vm.get_voice_pan_offset(int(v)) for v in voices]
+        np.testing.assert_allclose(vm.pan_offsets_many(voices), expected)
+
+    def test_random_pan_reproducible_with_rng(self, mock_config):
+        mock_config.rng = SeededRandom.from_seed(4)
+        a = _make_voice_manager(mock_config, num_voices=4, pan_spread=90, pan_strategy='random')
+        random.seed(1)
+        b = _make_voice_manager(mock_config, num_voices=4, pan_spread=90, pan_strategy='random')
+        np.testing.assert_array_equal(a.pan_offsets_many(np.arange(4)), b.pan_offsets_many(np.arange(4)))
+        assert np.unique(a.pan_offsets_many(np.arange(4))).size == 4
+
+    def test_no_spread_no_offset(self, mock_config):
+        vm = _make_voice_manager(mock_config, num_voices=4)
+        assert np.all(vm.pan_offsets_many(np.arange(4)) == 0.0)
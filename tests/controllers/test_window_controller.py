@@ -13,6 +13,7 @@ Coverage:
 import pytest
 from unittest.mock import Mock, patch
 import random as random_module
+import numpy as np
 
 from controllers.window_registry import WindowRegistry, WindowSpec
 from shared.probability_gate import (
@@ -706,4 +707,58 @@ class TestIntegration:
             {'envelope': 'hanning', 'envelope_range': 0.7},
             config=default_config
         )
-        assert ctrl._range == 0.7
\ No newline at end of file
+        assert ctrl._range == 0.7
+
+# =============================================================================
+# 15. TEST SELEZIONE BATCH
+# =============================================================================
+
+class TestSelectWindows:
+
+    def test_range_zero_all_base_window(self, default_config):
+        ctrl = WindowController({'envelope': ['hanning', 'bartlett']}, config=default_config)
+        windows, indices = ctrl.select_windows(np.linspace(0, 1, 20))
+        assert windows == ['hanning', 'bartlett']
+        assert indices.tolist() == [0] * 20
+
+    def test_indices_point_into_windows(self, config_dephase_disabled):
+        ctrl = WindowController(
+            {'envelope': ['hanning', 'bartlett', 'kaiser'], 'envelope_range': 1.0},
+            config=config_dephase_disabled
+        )
+        random_module.seed(3)
+        windows, indices = ctrl.select_windows(np.zeros(500))
+        assert set(indices.tolist()) == {0, 1, 2}
+        assert windows is ctrl._windows
+
+    def test_closed_gate_keeps_base_window(self, default_config):
+        ctrl = WindowController(
+            {'envelope': ['hanning', 'bartlett'], 'envelope_range': 1.0},
+            config=default_config
+        )
+        ctrl._gate = NeverGate()
+        _, indices = ctrl.select_windows(np.linspace(0, 1, 50))
+        assert indices.tolist() == [0] * 50
+
+    def test_gate_decided_in_one_call(self, config_dephase_disabled):
+        ctrl = WindowController(
+            {'envelope': ['hanning', 'bartlett', 'kaiser'], 'envelope_range': 1.0},
+            config=config_dephase_disabled
+        )
+        with patch.object(type(ctrl._gate), 'should_apply', side_effect=AssertionError):
+            _, indices = ctrl.select_windows(np.zeros(100))
+        assert len(indices) == 100
+
+    def test_seeded_reproducible(self, config_dephase_disabled):
+        from dataclasses import replace
+        from shared.rng import SeededRandom
+
+        def run():
+            config = replace(config_dephase_disabled, rng=SeededRandom.from_seed(2))
+            ctrl = WindowController(
+                {'envelope': ['hanning', 'bartlett', 'kaiser'], 'envelope_range': 1.0},
+                config=config
+            )
+            return ctrl.select_windows(np.zeros(100))[1].tolist()
+
+        assert run() == run()
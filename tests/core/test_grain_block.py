@@ -0,0 +1,167 @@
+"""
+Test per il modulo grain_block.py
+Testa GrainBlock: storage colonnare, viste Grain lazy e compatibilita'
+con il vecchio formato List[Grain].
+"""
+
+import pytest
+import numpy as np
+from core.grain import Grain
+from core.grain_block import GrainBlock, GRAIN_FIELDS
+
+
+@pytest.fixture
+def grains():
+    """Tre grani di esempio."""
+    return [
+        Grain(0.0, 0.05, 1.0, 1.0, -6.0, 0.0, 1, 2),
+        Grain(0.1, 0.06, 1.1, -1.0, -7.5, 45.0, 1, 3),
+        Grain(0.2, 0.07, 1.2, 2.0, -9.0, -30.0, 1, 2),
+    ]
+
+
+@pytest.fixture
+def block(grains):
+    return GrainBlock.from_grains(grains)
+
+
+class TestGrainBlockConstruction:
+
+    def test_from_grains_columns(self, block):
+        np.testing.assert_array_equal(block.onset, [0.0, 0.1, 0.2])
+        np.testing.assert_array_equal(block.envelope_table, [2, 3, 2])
+
+    def test_column_dtypes(self, block):
+        assert block.onset.dtype == np.float64
+        assert block.pan.dtype == np.float64
+        assert block.sample_table.dtype == np.int32
+        assert block.envelope_table.dtype == np.int32
+
+    def test_scalar_table_broadcast(self):
+        b = GrainBlock(
+            onset=[0.0, 1.0], duration=[0.1, 0.1], pointer_pos=[0, 0],
+            pitch_ratio=[1, 1], volume=[0, 0], pan=[0, 0],
+            sample_table=4, envelope_table=7
+        )
+        np.testing.assert_array_equal(b.sample_table, [4, 4])
+        np.testing.assert_array_equal(b.envelope_table, [7, 7])
+
+    def test_empty(self):
+        b = GrainBlock.empty()
+        assert len(b) == 0
+        assert list(b) == []
+
+    def test_from_columns_missing_raises(self):
+        with pytest.raises(KeyError, match="Colonne mancanti"):
+            GrainBlock.from_columns({'onset': [0.0]})
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError, match="length"):
+            GrainBlock(
+                onset=[0.0, 1.0], duration=[0.1], pointer_pos=[0, 0],
+                pitch_ratio=[1, 1], volume=[0, 0], pan=[0, 0],
+                sample_table=1, envelope_table=1
+            )
+
+    def test_float_table_raises(self):
+        with pytest.raises(TypeError, match="sample_table"):
+            GrainBlock(
+                onset=[0.0], duration=[0.1], pointer_pos=[0],
+                pitch_ratio=[1], volume=[0], pan=[0],
+                sample_table=[1.5], envelope_table=[1]
+            )
+
+    def test_non_numeric_column_raises(self):
+        with pytest.raises(TypeError, match="onset"):
+            GrainBlock(
+                onset=['a'], duration=[0.1], pointer_pos=[0],
+                pitch_ratio=[1], volume=[0], pan=[0],
+                sample_table=1, envelope_table=1
+            )
+
+    def test_concatenate(self, block):
+        joined = GrainBlock.concatenate([block, GrainBlock.empty(), block])
+        assert len(joined) == 6
+        np.testing.assert_array_equal(joined.onset[3:], block.onset)
+
+
+class TestGrainBlockImmutability:
+
+    def test_columns_read_only(self, block):
+        with pytest.raises(ValueError):
+            block.onset[0] = 5.0
+
+    def test_attributes_read_only(self, block):
+        with pytest.raises(AttributeError):
+            block.onset = np.zeros(3)
+
+    @pytest.mark.parametrize("make", [lambda b: b, lambda b: GrainBlock.empty()])
+    def test_pickle_roundtrip(self, block, make):
+        import pickle
+        original = make(block)
+        restored = pickle.loads(pickle.dumps(original))
+        assert restored == original
+        assert not restored.onset.flags.writeable
+
+
+class TestGrainBlockGrainView:
+
+    def test_index_returns_grain(self, block, grains):
+        assert isinstance(block[1], Grain)
+        assert block[1] == grains[1]
+
+    def test_negative_index(self, block, grains):
+        assert block[-1] == grains[-1]
+
+    def test_index_out_of_range(self, block):
+        with pytest.raises(IndexError):
+            block[3]
+
+    def test_slice_returns_block(self, block):
+        sub = block[1:]
+        assert isinstance(sub, GrainBlock)
+        assert len(sub) == 2
+
+    def test_mask_returns_block(self, block):
+        sub = block[block.pitch_ratio > 0]
+        np.testing.assert_array_equal(sub.onset, [0.0, 0.2])
+
+    def test_iteration_yields_python_types(self, block):
+        for g in block:
+            assert type(g.onset) is float
+            assert type(g.sample_table) is int
+
+    def test_score_line_identical(self, block, grains):
+        assert [g.to_score_line() for g in block] == [g.to_score_line() for g in grains]
+
+    def test_score_text_identical(self, block, grains):
+        assert block.to_score_text() == ''.join(g.to_score_line() for g in grains)
+
+    def test_score_text_rounding_edge_cases(self):
+        grains = [
+            Grain(1e6 + 0.0000005, 0.0, -0.0, -0.0000004, -0.005, 0.0005, 0, 2147483647),
+            Grain(123.4567895, 1e-9, 4.9999999, 2.5, 0.125, -179.9995, 99999, 1),
+        ]
+        block = GrainBlock.from_grains(grains)
+        assert block.to_score_text() == ''.join(g.to_score_line() for g in grains)
+
+    def test_score_text_empty(self):
+        assert GrainBlock.empty().to_score_text() == ''
+
+    def test_equality_with_list(self, block, grains):
+        assert block == grains
+        assert block != grains[:2]
+
+    def test_equality_between_blocks(self, block, grains):
+        assert block == GrainBlock.from_grains(grains)
+
+
+class TestGrainBlockMemory:
+
+    def test_nbytes_per_grain(self, block):
+        assert block.nbytes == len(block) * (6 * 8 + 2 * 4)
+
+    def test_columns_dict(self, block):
+        cols = block.columns()
+        assert tuple(cols.keys()) == GRAIN_FIELDS
+        assert cols['onset'] is block.onset
@@ -94,6 +94,8 @@ def _make_mock_voice_manager(max_voices=1):
     vm.get_voice_pitch_multiplier = Mock(return_value=1.0)
     vm.get_voice_pointer_offset = Mock(return_value=0.0)
     vm.get_voice_pointer_range = Mock(return_value=0.0)
+    vm.get_voice_pointer_jitter = Mock(return_value=0.0)
+    vm.get_voice_pan_offset = Mock(return_value=0.0)
     vm.num_voices_value = max_voices
     vm.voice_pitch_offset_value = 0.0
     vm.voice_pointer_offset_value = 0.0
@@ -179,12 +181,16 @@ def stream_factory():
 
         # Reverse mode
         s.grain_reverse_mode = reverse_mode
+        s.engine = None
+        s.time_invariant_parameters = {}
 
         # Controller mock
         s._pointer = _make_mock_pointer()
         s._pitch = _make_mock_pitch()
         s._density = _make_mock_density(inter_onset)
         s._voice_manager = _make_mock_voice_manager(max_voices)
+        s._voice_densities = [s._density] * max_voices
+        s._voice_pointers = [s._pointer] * max_voices
         s._window_controller = _make_mock_window_controller()
 
         # Csound references
@@ -516,7 +522,9 @@ class TestStreamInit:
                 patch('core.stream.PointerController'), \
                 patch('core.stream.PitchController'), \
                 patch('core.stream.DensityController'), \
-                patch('core.stream.WindowController'):
+                patch('core.stream.WindowController'), \
+                patch('core.stream.VoiceManager') as MockVM:
+                MockVM.return_value.max_voices = 1
                 MockSCtx.from_yaml.return_value = Mock()
                 MockSC.from_yaml.return_value = Mock()
 
@@ -538,6 +546,7 @@ class TestStreamInit:
             assert s.generated is False
             assert s.sample_table_num is None
             assert s.envelope_table_num is None
+            assert s.table_owner == 'test_stream'
 # =============================================================================
 # 6. TEST generate_grains - LOOP PRINCIPALE (1 VOCE)
 # =============================================================================
@@ -622,6 +631,18 @@ class TestGenerateGrainsSingleVoice:
 
         assert len(s.voices[0]) == 0
 
+    def test_voices_are_grain_blocks(self, stream_factory):
+        """L'output nativo e' un GrainBlock colonnare."""
+        from core.grain_block import GrainBlock
+        s = stream_factory(onset=2.0, duration=0.3, inter_onset=0.1)
+
+        s.generate_grains()
+
+        assert isinstance(s.voices[0], GrainBlock)
+        assert s.voices[0].onset[0] == pytest.approx(2.0)
+        assert s.voices[0].sample_table[0] == 1
+        assert s.voices[0].envelope_table[0] == 2
+
 
     # =============================================================================
 # 8. TEST generate_grains - STATO E RESET
@@ -1184,9 +1205,9 @@ class TestStreamParametrized:
 
     @pytest.mark.parametrize("max_voices", [1, 2, 5, 10])
     def test_voice_count(self, stream_factory, max_voices):
-        """Single voice stream: voices contiene sempre esattamente 1 lista."""
+        """voices contiene un GrainBlock per ogni voce allocata."""
         s = stream_factory(max_voices=max_voices, duration=0.3, inter_onset=0.1)
 
         s.generate_grains()
 
-        assert len(s.voices) == 1
\ No newline at end of file
+        assert len(s.voices) == max_voices
\ No newline at end of file
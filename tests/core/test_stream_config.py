@@ -269,17 +269,18 @@ class TestStreamConfigDefaults:
         assert config.time_mode == 'absolute'
         assert config.time_scale == 1.0
         assert config.context is None
+        assert config.rng is None
 
     def test_field_count(self):
-        """StreamConfig ha esattamente 6 campi."""
-        assert len(fields(StreamConfig)) == 6
+        """StreamConfig ha esattamente 8 campi."""
+        assert len(fields(StreamConfig)) == 8
 
     def test_field_names(self):
         """Nomi campi nell'ordine atteso."""
         names = [f.name for f in fields(StreamConfig)]
         expected = [
             'dephase', 'range_always_active', 'distribution_mode',
-            'time_mode', 'time_scale', 'context'
+            'time_mode', 'time_scale', 'context', 'rng', 'gate_cache'
         ]
         assert names == expected
 
@@ -389,6 +390,24 @@ class TestStreamConfigFromYaml:
         config = StreamConfig.from_yaml({}, context=stream_context)
         assert isinstance(config, StreamConfig)
 
+    def test_rng_injection(self, stream_context):
+        """rng arriva dal chiamante (Stream), mai dal YAML."""
+        from shared.rng import SeededRandom
+        rng = SeededRandom.from_seed(1)
+        config = StreamConfig.from_yaml({'rng': 'yaml'}, context=stream_context, rng=rng)
+        assert config.rng is rng
+
+    def test_gate_cache_per_config(self, stream_context):
+        """Ogni configurazione ha la propria cache dei gate, mai dal YAML."""
+        a = StreamConfig.from_yaml({'gate_cache': 'yaml'}, context=stream_context)
+        b = StreamConfig.from_yaml({}, context=stream_context)
+        assert a.gate_cache == {} and a.gate_cache is not b.gate_cache
+        assert a == b
+
+    def test_rng_default_none(self, stream_context):
+        config = StreamConfig.from_yaml({'rng': 'yaml'}, context=stream_context)
+        assert config.rng is None
+
 
 # =============================================================================
 # 8. STREAM CONFIG - ALLOW_NONE SEMANTICS
@@ -74,8 +74,8 @@ def gen():
     with patch('engine.generator.FtableManager') as MockFtm, \
          patch('engine.generator.ScoreWriter') as MockSw:
         mock_ftm = MockFtm.return_value
-        mock_ftm.register_sample = Mock(side_effect=lambda p: hash(p) % 1000)
-        mock_ftm.register_window = Mock(side_effect=lambda n: hash(n) % 1000)
+        mock_ftm.register_sample = Mock(side_effect=lambda p, owner=None: hash(p) % 1000)
+        mock_ftm.register_window = Mock(side_effect=lambda n, owner=None: hash(n) % 1000)
         mock_sw = MockSw.return_value
         g = Generator('test_config.yml')
     return g
@@ -136,6 +136,24 @@ class TestGeneratorInit:
             g = Generator('config.yml')
         MockSw.assert_called_once_with(MockFtm.return_value)
 
+    def test_init_verbose_score_by_default(self):
+        Generator = _get_generator_class()
+        with patch('engine.generator.FtableManager'):
+            g = Generator('config.yml')
+        assert g.score_writer.encoder is None
+
+    def test_init_compact_score_sets_encoder(self):
+        Generator = _get_generator_class()
+        with patch('engine.generator.FtableManager'):
+            g = Generator('config.yml', compact_score=True, score_precision={'onset': 4})
+        assert g.score_writer.encoder.precision['onset'] == 4
+
+    def test_init_invalid_score_precision_raises(self):
+        Generator = _get_generator_class()
+        with patch('engine.generator.FtableManager'):
+            with pytest.raises(ValueError, match="sconosciute"):
+                Generator('config.yml', compact_score=True, score_precision={'gain': 1})
+
     def test_init_ftable_manager_attribute(self):
         """ftable_manager e' l'istanza creata."""
         Generator = _get_generator_class()
@@ -696,7 +714,7 @@ class TestCreateStreams:
              patch.object(gen, '_register_stream_windows', return_value={}):
             gen._create_streams(stream_data)
 
-        gen.ftable_manager.register_sample.assert_called_once_with('audio.wav')
+        gen.ftable_manager.register_sample.assert_called_once_with('audio.wav', owner='s1')
 
     def test_assigns_sample_table_num(self, gen):
         """_create_streams assegna sample_table_num allo stream."""
@@ -721,7 +739,7 @@ class TestCreateStreams:
              patch.object(gen, '_register_stream_windows', return_value={'hanning': 5}) as mock_rw:
             gen._create_streams(stream_data)
 
-        mock_rw.assert_called_once_with(stream_data[0])
+        mock_rw.assert_called_once_with(stream_data[0], 's1')
 
     def test_assigns_window_table_map(self, gen):
         """_create_streams assegna window_table_map."""
@@ -746,6 +764,47 @@ class TestCreateStreams:
 
         mock_stream.generate_grains.assert_called_once()
 
+    def test_generate_grains_receives_engine(self, gen):
+        """Il motore globale del Generator viene passato a generate_grains()."""
+        mock_stream = make_mock_stream_for_generator()
+        stream_data = [{'stream_id': 's1', 'sample': 'a.wav', 'grain': {}}]
+        gen.engine = 'vectorized'
+
+        with patch('engine.generator.Stream', return_value=mock_stream), \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen._create_streams(stream_data)
+
+        mock_stream.generate_grains.assert_called_once_with(engine='vectorized')
+
+    def test_streaming_defers_generation(self, gen):
+        """In streaming i grani non vengono generati: il motore viene risolto."""
+        mock_stream = make_mock_stream_for_generator()
+        mock_stream.engine = None
+        stream_data = [{'stream_id': 's1', 'sample': 'a.wav', 'grain': {}}]
+        gen.streaming = True
+        gen.engine = 'vectorized'
+
+        with patch('engine.generator.Stream', return_value=mock_stream), \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen._create_streams(stream_data)
+
+        mock_stream.generate_grains.assert_not_called()
+        assert mock_stream.engine == 'vectorized'
+
+    def test_streaming_keeps_stream_engine(self, gen):
+        """La chiave YAML 'engine' dello stream non viene sovrascritta."""
+        mock_stream = make_mock_stream_for_generator()
+        mock_stream.engine = 'scalar'
+        stream_data = [{'stream_id': 's1', 'sample': 'a.wav', 'grain': {}}]
+        gen.streaming = True
+        gen.engine = 'vectorized'
+
+        with patch('engine.generator.Stream', return_value=mock_stream), \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen._create_streams(stream_data)
+
+        assert mock_stream.engine == 'scalar'
+
     def test_creates_multiple_streams(self, gen):
         """_create_streams crea piu' stream in sequenza."""
         streams_created = []
@@ -812,7 +871,7 @@ class TestCreatecartridges:
         with patch('engine.generator.Cartridge', return_value=mock_cartridge):
             gen._create_cartridges(cartridge_data)
 
-        gen.ftable_manager.register_sample.assert_called_once_with('my_tape.wav')
+        gen.ftable_manager.register_sample.assert_called_once_with('my_tape.wav', owner=mock_cartridge.cartridge_id)
 
     def test_assigns_sample_table_num(self, gen):
         """_create_cartridges assegna sample_table_num."""
@@ -895,7 +954,7 @@ class TestRegisterStreamWindows:
         with patch('engine.generator.WindowController') as MockWC:
             MockWC.parse_window_list.return_value = ['hanning', 'hamming']
             gen.ftable_manager.register_window = Mock(
-                side_effect=lambda n: {'hanning': 10, 'hamming': 11}[n]
+                side_effect=lambda n, owner: {'hanning': 10, 'hamming': 11}[n]
             )
             result = gen._register_stream_windows(stream_data)
 
@@ -957,13 +1016,24 @@ class TestRegisterStreamWindows:
         with patch('engine.generator.WindowController') as MockWC:
             MockWC.parse_window_list.return_value = all_windows
             gen.ftable_manager.register_window = Mock(
-                side_effect=lambda n: {'hanning': 10, 'hamming': 11, 'bartlett': 12}[n]
+                side_effect=lambda n, owner: {'hanning': 10, 'hamming': 11, 'bartlett': 12}[n]
             )
             result = gen._register_stream_windows(stream_data)
 
         assert len(result) == 3
         assert gen.ftable_manager.register_window.call_count == 3
 
+    def test_windows_registered_with_stream_owner(self, gen):
+        """Le finestre sono registrate come riferimenti dello stream."""
+        stream_data = {'stream_id': 's1', 'grain': {}}
+
+        with patch('engine.generator.WindowController') as MockWC:
+            MockWC.parse_window_list.return_value = ['hanning']
+            gen.ftable_manager.register_window = Mock(return_value=5)
+            gen._register_stream_windows(stream_data)
+
+        gen.ftable_manager.register_window.assert_called_once_with('hanning', owner='s1')
+
 
 # =============================================================================
 # 9. TEST generate_score_file()
@@ -1426,7 +1496,15 @@ class TestGenerateScoreFilesPerStream:
         result = gen.generate_score_files_per_stream()
         # Il path deve essere relativo alla dir corrente
         assert os.path.dirname(result[0]) == '.'
-        
+
+    def test_stem_elements_map_paths_to_elements(self, gen):
+        """stem_elements associa ogni .sco scritto al suo stream/cartridge."""
+        stream, cartridge = self._make_stream('s1'), self._make_cartridge('c1')
+        gen.streams = [stream]
+        gen.cartridges = [cartridge]
+        result = gen.generate_score_files_per_stream()
+        assert gen.stem_elements == {result[0]: stream, result[1]: cartridge}
+
 # =============================================================================
 # 11. TEST _stream_data_map
 # =============================================================================
@@ -1654,4 +1732,466 @@ class TestGenerateScoreFilesPerStreamWithCache:
 
         # Nessun cache_manager passato: nessun AttributeError atteso
         gen.generate_score_files_per_stream()
-        # Se arriviamo qui senza eccezioni, il test passa
\ No newline at end of file
+        # Se arriviamo qui senza eccezioni, il test passa
+
+# =============================================================================
+# 13. TEST GENERAZIONE PARALLELA (--jobs)
+# =============================================================================
+
+class _InlineFuture:
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+class _InlineExecutor:
+    """Sostituto sincrono di ProcessPoolExecutor per i test di wiring."""
+    instances = []
+
+    def __init__(self, max_workers=None, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.submitted = []
+        _InlineExecutor.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+        return _InlineFuture(fn(*args))
+
+
+def _fake_worker_stream(data, table, wmap, engine, rng, window):
+    """Job sostitutivo: mock dello Stream generato dal worker."""
+    stream = make_mock_stream_for_generator(stream_id=data['stream_id'], sample=data['sample'])
+    stream.sample_table_num = table
+    stream.window_table_map = wmap
+    return stream
+
+
+class TestParallelGeneration:
+
+    def test_init_jobs_default_one(self, gen):
+        assert gen.jobs == 1
+
+    @pytest.mark.parametrize("jobs", [0, -1, 2.5])
+    def test_init_invalid_jobs_raises(self, jobs):
+        Generator = _get_generator_class()
+        with patch('engine.generator.FtableManager'), \
+             patch('engine.generator.ScoreWriter'):
+            with pytest.raises(ValueError, match="jobs"):
+                Generator('config.yml', jobs=jobs)
+
+    def _run_parallel(self, gen, stream_data):
+        _InlineExecutor.instances = []
+        job = Mock(side_effect=_fake_worker_stream)
+        with patch('engine.generator.Stream', side_effect=AssertionError("Stream nel processo principale")), \
+             patch('engine.generator.ProcessPoolExecutor', _InlineExecutor), \
+             patch('engine.generator._generate_stream', job), \
+             patch.object(gen, '_register_stream_windows', return_value={'hanning': 2}):
+            gen._create_streams(stream_data)
+        return job
+
+    def test_workers_receive_preassigned_tables(self, gen):
+        gen.jobs = 2
+        gen.engine = 'vectorized'
+        stream_data = [
+            {'stream_id': 's1', 'sample': 'a.wav', 'grain': {}},
+            {'stream_id': 's2', 'sample': 'b.wav', 'grain': {}},
+        ]
+        job = self._run_parallel(gen, stream_data)
+
+        for data in stream_data:
+            job.assert_any_call(data, hash(data['sample']) % 1000, {'hanning': 2}, 'vectorized', None, None)
+
+    def test_stream_built_only_in_worker(self, gen):
+        """Il processo principale assegna le ftable senza costruire lo Stream."""
+        gen.jobs = 2
+        stream_data = [
+            {'stream_id': 's1', 'sample': 'a.wav', 'grain': {}},
+            {'stream_id': 's2', 'sample': 'b.wav', 'grain': {}},
+        ]
+        job = self._run_parallel(gen, stream_data)
+
+        assert job.call_count == 2
+        assert [call.kwargs.get('owner') for call in gen.ftable_manager.register_sample.call_args_list] == ['s1', 's2']
+
+    def test_results_in_order(self, gen):
+        gen.jobs = 4
+        stream_data = [
+            {'stream_id': 's1', 'sample': 'a.wav', 'grain': {}},
+            {'stream_id': 's2', 'sample': 'b.wav', 'grain': {}},
+        ]
+        self._run_parallel(gen, stream_data)
+
+        assert [s.stream_id for s in gen.streams] == ['s1', 's2']
+        assert [s.table_owner for s in gen.streams] == ['s1', 's2']
+        for data, stream in zip(stream_data, gen.streams):
+            assert stream.sample_table_num == hash(data['sample']) % 1000
+
+    def test_workers_capped_by_stream_count(self, gen):
+        gen.jobs = 8
+        stream_data = [
+            {'stream_id': 's1', 'sample': 'a.wav', 'grain': {}},
+            {'stream_id': 's2', 'sample': 'b.wav', 'grain': {}},
+        ]
+        self._run_parallel(gen, stream_data)
+        assert _InlineExecutor.instances[0].max_workers == 2
+
+    def test_workers_receive_score_time_window(self, gen):
+        gen.jobs = 2
+        gen.time_window = (5.0, 8.0)
+        gen.time_offset = 4.0
+        stream_data = [
+            {'stream_id': 's1', 'sample': 'a.wav', 'grain': {}},
+            {'stream_id': 's2', 'sample': 'b.wav', 'grain': {}},
+        ]
+        job = self._run_parallel(gen, stream_data)
+        assert {call.args[5] for call in job.call_args_list} == {(1.0, 4.0)}
+
+    def test_single_stream_stays_serial(self, gen):
+        gen.jobs = 4
+        mock_stream = make_mock_stream_for_generator()
+        stream_data = [{'stream_id': 's1', 'sample': 'a.wav', 'grain': {}}]
+
+        with patch('engine.generator.Stream', return_value=mock_stream), \
+             patch('engine.generator.ProcessPoolExecutor') as MockPool, \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen._create_streams(stream_data)
+
+        MockPool.assert_not_called()
+        mock_stream.generate_grains.assert_called_once()
+
+    def test_worker_job_returns_picklable_stream(self):
+        """Il worker restituisce lo Stream generato; le voci viaggiano come colonne."""
+        import pickle
+        from engine.generator import _generate_stream
+        stream_data = {
+            'stream_id': 'w1', 'onset': 0.0, 'duration': 0.5,
+            'sample': 'a.wav', 'density': 100, 'distribution': 0,
+            'voices': {'num_voices': 2},
+        }
+        with patch('core.stream.get_sample_duration', return_value=2.0):
+            stream = _generate_stream(stream_data, 7, {'hanning': 9}, 'vectorized')
+            restored = pickle.loads(pickle.dumps(stream))
+
+        assert restored.generated and restored.voices == stream.voices
+        assert restored.grains == stream.grains
+        assert set(restored.grains.sample_table.tolist()) == {7}
+        assert set(restored.grains.envelope_table.tolist()) == {9}
+
+    def test_worker_initializer_reseeds_and_configures_logger(self):
+        from engine.generator import _init_generation_worker
+        config = {
+            'enabled': True, 'console_enabled': False, 'file_enabled': True,
+            'log_dir': './logs', 'yaml_name': 'piece', 'log_transformations': False,
+        }
+        with patch('engine.generator.random.seed') as mock_seed, \
+             patch('engine.generator.logger.configure_clip_logger') as mock_cfg:
+            _init_generation_worker(config)
+
+        mock_seed.assert_called_once_with()
+        kwargs = mock_cfg.call_args.kwargs
+        assert kwargs['yaml_name'].startswith('piece_worker')
+        assert kwargs['file_enabled'] is True
+
+
+# =============================================================================
+# 14. TEST SEED GLOBALE (gerarchia SeededRandom)
+# =============================================================================
+
+class TestGlobalSeed:
+
+    def _create(self, gen, stream_data, seed=None):
+        gen.data = {'streams': stream_data} if seed is None else {'seed': seed, 'streams': stream_data}
+        received = []
+
+        def fake_stream(data, rng=None):
+            received.append((data['stream_id'], rng))
+            return make_mock_stream_for_generator(stream_id=data['stream_id'])
+
+        with patch('engine.generator.Stream', side_effect=fake_stream), \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen._create_streams(stream_data)
+        return received
+
+    @staticmethod
+    def _draws(rng):
+        return [rng.uniform(0, 1) for _ in range(3)]
+
+    def test_no_seed_stream_called_without_rng(self, gen):
+        stream_data = [{'stream_id': 's1', 'sample': 'a.wav', 'grain': {}}]
+        mock_stream = make_mock_stream_for_generator()
+        with patch('engine.generator.Stream', return_value=mock_stream) as MockStream, \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen.data = {'streams': stream_data}
+            gen._create_streams(stream_data)
+        MockStream.assert_called_once_with(stream_data[0])
+
+    def test_seed_passes_stream_rng(self, gen):
+        received = self._create(gen, [{'stream_id': 's1', 'sample': 'a.wav'}], seed=42)
+        (stream_id, rng), = received
+        assert rng.path == 's1'
+
+    def test_stream_rng_independent_of_order(self, gen):
+        a = {'stream_id': 'a', 'sample': 'a.wav'}
+        b = {'stream_id': 'b', 'sample': 'b.wav'}
+        forward = dict(self._create(gen, [a, b], seed=1))
+        gen.streams = []
+        backward = dict(self._create(gen, [b, a], seed=1))
+        assert self._draws(forward['a']) == self._draws(backward['a'])
+
+    def test_streams_get_distinct_substreams(self, gen):
+        received = self._create(gen, [
+            {'stream_id': 'a', 'sample': 'a.wav'},
+            {'stream_id': 'b', 'sample': 'b.wav'},
+        ], seed=1)
+        assert self._draws(received[0][1]) != self._draws(received[1][1])
+
+    def test_duplicate_stream_ids_distinct(self, gen):
+        received = self._create(gen, [
+            {'stream_id': 'texture1', 'sample': 'a.wav'},
+            {'stream_id': 'texture1', 'sample': 'a.wav'},
+        ], seed=1)
+        assert [rng.path for _, rng in received] == ['texture1', 'texture1#1']
+
+    def test_duplicate_stream_ids_own_separate_tables(self):
+        """Due stream 'texture1': ogni stem scrive solo le proprie ftable."""
+        from rendering.ftable_manager import FtableManager
+        Generator = _get_generator_class()
+        with patch('engine.generator.ScoreWriter'):
+            gen = Generator('test_config.yml')
+        gen.ftable_manager = FtableManager()
+        gen.data = {'streams': []}
+        stream_data = [
+            {'stream_id': 'texture1', 'sample': 'a.wav', 'grain': {'envelope': 'hanning'}},
+            {'stream_id': 'texture1', 'sample': 'b.wav', 'grain': {'envelope': 'hamming'}},
+        ]
+        streams = iter([make_mock_stream_for_generator(stream_id='texture1', sample=d['sample'])
+                        for d in stream_data])
+        with patch('engine.generator.Stream', side_effect=lambda d: next(streams)):
+            gen._create_streams(stream_data)
+
+        first, second = gen.streams
+        assert (first.table_owner, second.table_owner) == ('texture1', 'texture1#1')
+        tables = [gen.ftable_manager.get_all_tables([s.table_owner]) for s in gen.streams]
+        assert sorted(key for _, key in tables[0].values()) == ['a.wav', 'hanning']
+        assert sorted(key for _, key in tables[1].values()) == ['b.wav', 'hamming']
+
+    def test_invalid_global_seed_raises(self, gen):
+        with pytest.raises(ValueError, match="seed"):
+            self._create(gen, [{'stream_id': 's1', 'sample': 'a.wav'}], seed='abc')
+
+    def test_parallel_workers_receive_rng(self, gen):
+        gen.jobs = 2
+        stream_data = [
+            {'stream_id': 's1', 'sample': 'a.wav', 'grain': {}},
+            {'stream_id': 's2', 'sample': 'b.wav', 'grain': {}},
+        ]
+        gen.data = {'seed': 5, 'streams': stream_data}
+        _InlineExecutor.instances = []
+        job = Mock(side_effect=_fake_worker_stream)
+        with patch('engine.generator.ProcessPoolExecutor', _InlineExecutor), \
+             patch('engine.generator._generate_stream', job), \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen._create_streams(stream_data)
+
+        paths = [call.args[4].path for call in job.call_args_list]
+        assert paths == ['s1', 's2']
+
+    def test_parallel_matches_serial_with_seed(self):
+        """Con seed il worker riproduce esattamente la generazione seriale."""
+        import pickle
+        from engine.generator import _generate_stream
+        from core.stream import Stream
+        from shared.rng import SeededRandom
+        stream_data = {
+            'stream_id': 'w1', 'onset': 0.0, 'duration': 1.0, 'sample': 'a.wav',
+            'density': 100, 'distribution': 1, 'volume_range': 6,
+            'voices': {'num_voices': 3, 'pitch_offset': 5, 'pointer_range': 0.01},
+        }
+        rng_factory = lambda: SeededRandom.from_seed(9).child('w1')
+        with patch('core.stream.get_sample_duration', return_value=2.0):
+            worker = pickle.loads(pickle.dumps(
+                _generate_stream(stream_data, 1, {'hanning': 2}, 'scalar', rng_factory())
+            ))
+            stream = Stream(stream_data, rng=rng_factory())
+        stream.sample_table_num = 1
+        stream.window_table_map = {'hanning': 2}
+        stream.generate_grains(engine='scalar')
+        assert worker.voices == stream.voices
+
+
+# =============================================================================
+# 15. TEST FINESTRA TEMPORALE (--from / --to)
+# =============================================================================
+
+class TestTimeWindow:
+
+    @staticmethod
+    def _stream_data(stream_id, onset, duration, **extra):
+        data = {'stream_id': stream_id, 'onset': onset, 'duration': duration,
+                'sample': 'a.wav', 'density': 100, 'distribution': 0,
+                'grain': {'duration': 0.1}}
+        data.update(extra)
+        return data
+
+    def _create(self, gen, streams, cartridges=()):
+        gen.data = {'streams': streams, 'cartridges': list(cartridges)}
+        constructed = []
+
+        def fake_stream(data, rng=None):
+            constructed.append(data)
+            return make_mock_stream_for_generator(stream_id=data['stream_id'])
+
+        with patch('engine.generator.Stream', side_effect=fake_stream), \
+             patch('engine.generator.Cartridge', side_effect=lambda d: make_mock_cartridge_for_generator()) as MockCart, \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen.create_elements()
+        return constructed, [c.args[0] for c in MockCart.call_args_list]
+
+    @pytest.mark.parametrize("window", [(-1.0, 5.0), (5.0, 5.0), (6.0, 2.0)])
+    def test_invalid_window_raises(self, window):
+        Generator = _get_generator_class()
+        with patch('engine.generator.FtableManager'), \
+             patch('engine.generator.ScoreWriter'):
+            with pytest.raises(ValueError, match="Finestra"):
+                Generator('config.yml', time_window=window)
+
+    def test_streams_outside_window_not_constructed(self, gen):
+        gen.time_window = (10.0, 20.0)
+        constructed, _ = self._create(gen, [
+            self._stream_data('before', 0.0, 9.0),
+            self._stream_data('tail', 0.0, 9.95),
+            self._stream_data('inside', 12.0, 3.0),
+            self._stream_data('after', 20.0, 5.0),
+        ])
+        assert [d['stream_id'] for d in constructed] == ['tail', 'inside']
+
+    def test_cartridges_outside_window_not_constructed(self, gen):
+        gen.time_window = (10.0, 20.0)
+        _, cartridges = self._create(gen, [], [
+            {'cartridge_id': 'c1', 'onset': 0.0, 'duration': 10.0, 'sample': 't.wav'},
+            {'cartridge_id': 'c2', 'onset': 5.0, 'duration': 10.0, 'sample': 't.wav'},
+        ])
+        assert [d['cartridge_id'] for d in cartridges] == ['c2']
+
+    def test_onsets_shifted_by_lead(self, gen):
+        """Grani da 0.1s: lo score parte 0.1s prima di from."""
+        gen.time_window = (10.0, 20.0)
+        constructed, _ = self._create(gen, [
+            self._stream_data('a', 5.0, 10.0),
+            self._stream_data('b', 12.0, 3.0),
+        ])
+        assert gen.time_offset == pytest.approx(9.9)
+        assert gen.score_writer.advance == pytest.approx(0.1)
+        assert [d['onset'] for d in constructed] == pytest.approx([-4.9, 2.1])
+        assert gen._stream_data_map['a']['onset'] == pytest.approx(-4.9)
+
+    def test_cartridge_in_progress_sets_lead(self, gen):
+        gen.time_window = (10.0, 20.0)
+        _, cartridges = self._create(gen, [], [
+            {'cartridge_id': 'c1', 'onset': 7.0, 'duration': 10.0, 'sample': 't.wav'},
+        ])
+        assert gen.time_offset == pytest.approx(7.0)
+        assert cartridges[0]['onset'] == pytest.approx(0.0)
+
+    def test_streams_receive_window_in_shifted_time(self, gen):
+        gen.time_window = (10.0, 20.0)
+        mock_stream = make_mock_stream_for_generator()
+        gen.data = {'streams': [self._stream_data('a', 5.0, 10.0)]}
+        with patch('engine.generator.Stream', return_value=mock_stream), \
+             patch.object(gen, '_register_stream_windows', return_value={}):
+            gen.create_elements()
+        mock_stream.set_time_window.assert_called_once()
+        start, end = mock_stream.set_time_window.call_args.args
+        assert (start, end) == pytest.approx((0.1, 10.1))
+
+    @pytest.mark.parametrize("extra,expected", [
+        ({}, 0.1),
+        ({'grain': {'duration': [[0, 0.02], [1, 0.2]]}}, 10.0),
+        ({'grain': {'duration': 0.1, 'duration_range': 0.05}}, 10.0),
+        ({'dephase': 50}, 10.0),
+    ])
+    def test_stream_lookback_from_yaml(self, extra, expected):
+        Generator = _get_generator_class()
+        assert Generator._stream_lookback(self._stream_data('a', 0.0, 1.0, **extra)) == expected
+
+    def test_no_window_keeps_original_dicts(self, gen):
+        stream_data = [self._stream_data('a', 5.0, 10.0)]
+        constructed, _ = self._create(gen, stream_data)
+        assert constructed[0] is stream_data[0]
+        assert gen.time_offset == 0.0
+
+    def test_excerpt_end_to_end(self, tmp_path):
+        """Estratto reale: onset spostati, advance statement nello score."""
+        Generator = _get_generator_class()
+        config = tmp_path / 'piece.yml'
+        config.write_text(yaml.safe_dump({'streams': [
+            self._stream_data('a', 0.0, 30.0),
+            self._stream_data('far', 40.0, 5.0),
+        ]}))
+        gen = Generator(str(config), engine='vectorized', time_window=(20.0, 21.0))
+        gen.load_yaml()
+        with patch('core.stream.get_sample_duration', return_value=2.0):
+            streams, _ = gen.create_elements()
+        assert [s.stream_id for s in streams] == ['a']
+        grains = streams[0].grains
+        assert len(grains) > 100
+        assert all(onset + dur > 0.1 for onset, dur in zip(grains.onset, grains.duration))
+        assert grains.onset[0] >= 0.0
+        assert grains.onset[-1] < 1.1
+
+        score = tmp_path / 'piece.sco'
+        gen.generate_score_file(str(score))
+        assert 'a 0 0 0.100000\n' in score.read_text()
+
+
+# =============================================================================
+# 16. TEST NUMERAZIONE FTABLE STABILE
+# =============================================================================
+
+class TestStableTables:
+
+    def test_default_sequential_numbering(self):
+        Generator = _get_generator_class()
+        assert Generator('config.yml').ftable_manager.numbering == 'sequential'
+
+    def test_stable_tables_option(self):
+        Generator = _get_generator_class()
+        with patch('engine.generator.FtableManager') as MockFtm:
+            Generator('config.yml', stable_tables=True)
+        MockFtm.assert_called_once_with(start_num=1, numbering='stable')
+
+    @staticmethod
+    def _stems(tmp_path, name, streams, stable):
+        Generator = _get_generator_class()
+        config = tmp_path / f'{name}.yml'
+        config.write_text(yaml.safe_dump({'streams': streams}))
+        gen = Generator(str(config), stable_tables=stable)
+        gen.load_yaml()
+        with patch('core.stream.get_sample_duration', return_value=2.0):
+            gen.create_elements()
+        out = tmp_path / name
+        gen.generate_score_files_per_stream(output_dir=str(out), base_name='piece')
+        text = (out / 'piece_b.sco').read_text()
+        return text.replace(str(config), 'piece.yml')
+
+    @pytest.mark.parametrize("stable, identical", [(True, True), (False, False)])
+    def test_unchanged_stem_identical_after_adding_stream(self, tmp_path, stable, identical):
+        """Con numerazione stabile aggiungere uno stream non tocca gli altri stem."""
+        def stream(stream_id, sample, envelope):
+            return {'stream_id': stream_id, 'onset': 0.0, 'duration': 0.5,
+                    'sample': sample, 'density': 50, 'distribution': 0,
+                    'grain': {'duration': 0.05, 'envelope': envelope}}
+        b = stream('b', 'b.wav', 'hanning')
+        before = self._stems(tmp_path, 'before', [b], stable)
+        after = self._stems(tmp_path, 'after', [stream('a', 'a.wav', 'bartlett'), b], stable)
+        assert (before == after) is identical
@@ -0,0 +1,611 @@
+"""
+Test per il modulo grain_engine.py
+Testa registry/factory dei motori e l'equivalenza tra motore scalare
+e motore vettoriale su Stream reali (durata sample mockata).
+"""
+
+import random
+import pytest
+import numpy as np
+from unittest.mock import Mock, patch
+
+from core.grain_block import GrainBlock
+from core.stream import Stream
+from engine.grain_engine import (
+    GrainEngine,
+    ScalarGrainEngine,
+    VectorizedGrainEngine,
+    GrainEngineFactory,
+    GRAIN_ENGINES,
+    DEFAULT_ENGINE,
+    register_grain_engine,
+    parameter_values,
+)
+from controllers.density_controller import SCHEDULE_BLOCK_SIZE
+from shared.probability_gate import NeverGate, AlwaysGate
+
+
+def _stream_params(**overrides):
+    params = {
+        'stream_id': 'engine_test',
+        'onset': 1.0,
+        'duration': 2.0,
+        'sample': 'test.wav',
+        'density': 200,
+        'distribution': 0,
+        'grain': {'duration': 0.05},
+        'pointer': {'speed_ratio': 0.5},
+        'volume': [[0, -12], [2, -3]],
+        'pan': [[0, -45], [2, 45]],
+    }
+    params.update(overrides)
+    return params
+
+
+def _make_stream(**overrides):
+    with patch('core.stream.get_sample_duration', return_value=5.0):
+        stream = Stream(_stream_params(**overrides))
+    stream.sample_table_num = 1
+    stream.window_table_map = {'hanning': 2, 'hamming': 3, 'bartlett': 4}
+    return stream
+
+
+def _generate(engine, **overrides):
+    random.seed(7)
+    stream = _make_stream(**overrides)
+    stream.generate_grains(engine=engine)
+    return stream.grains
+
+
+# =============================================================================
+# REGISTRY / FACTORY
+# =============================================================================
+
+class TestGrainEngineFactory:
+
+    def test_builtin_engines_registered(self):
+        assert 'scalar' in GRAIN_ENGINES
+        assert 'vectorized' in GRAIN_ENGINES
+
+    def test_default_engine_is_scalar(self):
+        assert DEFAULT_ENGINE == 'scalar'
+
+    @pytest.mark.parametrize("name,cls", [
+        ('scalar', ScalarGrainEngine),
+        ('vectorized', VectorizedGrainEngine),
+    ])
+    def test_create(self, name, cls):
+        engine = GrainEngineFactory.create(name)
+        assert isinstance(engine, cls)
+        assert engine.name == name
+
+    def test_unknown_engine_raises(self):
+        with pytest.raises(ValueError, match="non trovato"):
+            GrainEngineFactory.create('quantum')
+
+    def test_available_lists_registry(self):
+        assert GrainEngineFactory.available() == list(GRAIN_ENGINES.keys())
+
+    def test_register_custom_engine(self):
+        class EmptyEngine(GrainEngine):
+            def iter_blocks(self, stream, chunk_size=None):
+                return iter(())
+
+            @property
+            def name(self):
+                return 'empty'
+
+        register_grain_engine('empty', EmptyEngine)
+        try:
+            assert isinstance(GrainEngineFactory.create('empty'), EmptyEngine)
+        finally:
+            del GRAIN_ENGINES['empty']
+
+
+# =============================================================================
+# SELEZIONE DEL MOTORE IN STREAM
+# =============================================================================
+
+class TestStreamEngineSelection:
+
+    def test_engine_key_absent_is_none(self):
+        assert _make_stream().engine is None
+
+    def test_engine_key_read_from_yaml(self):
+        assert _make_stream(engine='vectorized').engine == 'vectorized'
+
+    def test_unknown_engine_key_fails_at_init(self):
+        with pytest.raises(ValueError, match="non trovato"):
+            _make_stream(engine='quantum')
+
+    def test_global_engine_used_without_yaml_key(self):
+        stream = _make_stream()
+        with patch.object(VectorizedGrainEngine, 'generate', return_value=GrainBlock.empty()) as gen:
+            stream.generate_grains(engine='vectorized')
+        gen.assert_called_once_with(stream)
+
+    def test_yaml_key_overrides_global_engine(self):
+        stream = _make_stream(engine='scalar')
+        with patch.object(VectorizedGrainEngine, 'generate') as gen:
+            stream.generate_grains(engine='vectorized')
+        gen.assert_not_called()
+        assert len(stream.grains) > 0
+
+
+# =============================================================================
+# EQUIVALENZA SCALARE / VETTORIALE
+# =============================================================================
+
+class TestEngineEquivalence:
+
+    def test_deterministic_stream_identical(self):
+        """Senza componenti stocastiche i due motori producono gli stessi grani."""
+        scalar = _generate('scalar')
+        vectorized = _generate('vectorized')
+        assert len(scalar) == len(vectorized) > 0
+        for name, column in scalar.columns().items():
+            np.testing.assert_allclose(getattr(vectorized, name), column, err_msg=name)
+
+    def test_vectorized_returns_grain_block(self):
+        assert isinstance(_generate('vectorized'), GrainBlock)
+
+    def test_loop_pointer_identical(self):
+        overrides = {'pointer': {'speed_ratio': 1.0, 'loop_start': 1.0, 'loop_dur': 0.5}}
+        scalar = _generate('scalar', **overrides)
+        vectorized = _generate('vectorized', **overrides)
+        np.testing.assert_allclose(vectorized.pointer_pos, scalar.pointer_pos)
+
+    def test_forced_reverse_identical(self):
+        overrides = {'grain': {'duration': 0.05, 'reverse': None}}
+        scalar = _generate('scalar', **overrides)
+        vectorized = _generate('vectorized', **overrides)
+        assert np.all(vectorized.pitch_ratio < 0)
+        np.testing.assert_allclose(vectorized.pointer_pos, scalar.pointer_pos)
+        np.testing.assert_allclose(vectorized.pitch_ratio, scalar.pitch_ratio)
+
+    def test_stochastic_stream_statistically_equivalent(self):
+        """Con range e distribuzione asincrona le statistiche coincidono."""
+        overrides = {
+            'duration': 10.0,
+            'distribution': 1,
+            'volume': -6,
+            'volume_range': 6,
+            'pan_range': 90,
+            'grain': {'duration': 0.05, 'envelope': ['hanning', 'hamming'], 'envelope_range': 1},
+        }
+        scalar = _generate('scalar', **overrides)
+        vectorized = _generate('vectorized', **overrides)
+
+        assert len(vectorized) == pytest.approx(len(scalar), rel=0.1)
+        assert vectorized.volume.mean() == pytest.approx(scalar.volume.mean(), abs=0.3)
+        assert vectorized.volume.std() == pytest.approx(scalar.volume.std(), rel=0.1)
+        assert vectorized.pan.std() == pytest.approx(scalar.pan.std(), rel=0.1)
+        assert set(vectorized.envelope_table.tolist()) == {2, 3}
+
+    def test_zero_duration_stream_empty(self):
+        stream = _make_stream(duration=0.0)
+        stream.generate_grains(engine='vectorized')
+        assert len(stream.grains) == 0
+        assert stream.generated is True
+
+
+# =============================================================================
+# PARAMETRI INVARIANTI NEL TEMPO
+# =============================================================================
+
+class TestTimeInvariantHoisting:
+
+    def test_constant_parameters_reported(self):
+        invariant = _make_stream().time_invariant_parameters
+        assert invariant == {'grain_duration': 0.05, 'reverse': 0.0}
+
+    def test_envelope_and_stochastic_parameters_excluded(self):
+        stream = _make_stream(volume=-6, volume_range=6, dephase=50)
+        assert 'volume' not in stream.time_invariant_parameters
+        assert 'pan' not in stream.time_invariant_parameters
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_constant_duration_hoisted(self, engine):
+        stream = _make_stream()
+        with patch.object(stream.grain_duration, 'get_value',
+                          side_effect=AssertionError("durata valutata per grano")):
+            grains = GrainBlock.concatenate(stream.iter_grain_blocks(engine=engine))
+        assert len(grains) > 0
+        assert np.all(grains.duration == 0.05)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_varying_duration_evaluated_per_grain(self, engine):
+        grains = _generate(engine, grain={'duration': [[0, 0.02], [2, 0.08]]})
+        assert grains.duration.min() < grains.duration.max()
+
+
+# =============================================================================
+# HELPER BATCH
+# =============================================================================
+
+class TestParameterValues:
+
+    def test_static_parameter_evaluated_once(self):
+        param = Mock()
+        param.value = -6.0
+        param._probability_gate = NeverGate()
+        param.get_value.return_value = -6.0
+
+        result = parameter_values(param, np.linspace(0, 1, 50))
+
+        np.testing.assert_array_equal(result, np.full(50, -6.0))
+        param.get_value.assert_called_once()
+
+    def test_gated_parameter_evaluated_per_element(self):
+        param = Mock()
+        param.value = 0.0
+        param._probability_gate = AlwaysGate()
+        param.get_value.side_effect = lambda t: t * 2
+
+        result = parameter_values(param, np.array([0.0, 1.0, 2.0]))
+
+        np.testing.assert_array_equal(result, [0.0, 2.0, 4.0])
+        assert param.get_value.call_count == 3
+
+    def test_empty_times(self):
+        param = Mock()
+        param.value = 1.0
+        param._probability_gate = NeverGate()
+        assert len(parameter_values(param, np.array([]))) == 0
+
+    def test_parameter_uses_batch_get_values(self):
+        stream = _make_stream()
+        times = np.linspace(0, 1.9, 20)
+        with patch.object(type(stream.pan), 'get_value') as get_value:
+            result = parameter_values(stream.pan, times)
+        get_value.assert_not_called()
+        np.testing.assert_allclose(result, -45 + 45 * times)
+
+
+# =============================================================================
+# GENERAZIONE A BLOCCHI / STREAMING
+# =============================================================================
+
+class TestIterBlocks:
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_blocks_bounded_by_chunk_size(self, engine):
+        stream = _make_stream()
+        sizes = [len(b) for b in stream.iter_grain_blocks(chunk_size=64, engine=engine)]
+        assert all(size <= 64 for size in sizes)
+        assert all(size == 64 for size in sizes[:-1])
+        assert sum(sizes) == len(_generate(engine))
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_concatenated_blocks_equal_generate(self, engine):
+        expected = _generate(engine)
+        random.seed(7)
+        stream = _make_stream()
+        streamed = GrainBlock.concatenate(stream.iter_grain_blocks(chunk_size=50, engine=engine))
+        assert streamed == expected
+
+    def test_blocks_in_onset_order(self):
+        stream = _make_stream(distribution=1)
+        onsets = np.concatenate([b.onset for b in stream.iter_grain_blocks(chunk_size=32)])
+        assert np.all(np.diff(onsets) > 0)
+
+    def test_iter_grains_yields_grains(self):
+        from core.grain import Grain
+        stream = _make_stream()
+        grains = list(stream.iter_grains(chunk_size=100))
+        assert all(isinstance(g, Grain) for g in grains)
+        assert grains == _generate('scalar').to_grains()
+
+    def test_streaming_does_not_populate_stream(self):
+        stream = _make_stream()
+        for _ in stream.iter_grain_blocks(chunk_size=100):
+            pass
+        assert stream.voices == []
+        assert len(stream.grains) == 0
+        assert stream.generated is False
+
+    @pytest.mark.parametrize("chunk_size", [0, -5, 2.5, None])
+    def test_invalid_chunk_size_raises(self, chunk_size):
+        with pytest.raises(ValueError, match="chunk_size"):
+            _make_stream().iter_grain_blocks(chunk_size=chunk_size)
+
+    @pytest.mark.parametrize("window", [None, (4.0, 15.0)])
+    def test_chunks_smaller_than_schedule_block(self, window):
+        """chunk_size < SCHEDULE_BLOCK_SIZE: piu' tratti per blocco dello scheduler."""
+        def long_stream():
+            random.seed(7)
+            stream = _make_stream(duration=20.0, density=400)
+            if window is not None:
+                stream.set_time_window(*window)
+            return stream
+
+        expected = long_stream()
+        expected.generate_grains(engine='vectorized')
+        streamed = GrainBlock.concatenate(
+            long_stream().iter_grain_blocks(chunk_size=100, engine='vectorized')
+        )
+        assert len(streamed) == len(expected.grains) > SCHEDULE_BLOCK_SIZE
+        np.testing.assert_allclose(streamed.onset, expected.grains.onset)
+
+    def test_empty_stream_yields_nothing(self):
+        stream = _make_stream(duration=0.0)
+        assert list(stream.iter_grain_blocks(chunk_size=10, engine='vectorized')) == []
+
+
+# =============================================================================
+# RIPRODUCIBILITA' CON SEED
+# =============================================================================
+
+_STOCHASTIC = {
+    'duration': 3.0,
+    'distribution': 1,
+    'volume': -6,
+    'volume_range': 6,
+    'pan_range': 90,
+    'dephase': 50,
+    'grain': {'duration': 0.05, 'envelope': ['hanning', 'hamming'], 'envelope_range': 1},
+}
+
+
+def _seeded(engine, rng=None, **overrides):
+    params = dict(_STOCHASTIC, **overrides)
+    with patch('core.stream.get_sample_duration', return_value=5.0):
+        stream = Stream(_stream_params(**params), rng=rng)
+    stream.sample_table_num = 1
+    stream.window_table_map = {'hanning': 2, 'hamming': 3, 'bartlett': 4}
+    stream.generate_grains(engine=engine)
+    return stream.grains
+
+
+class TestSeededGeneration:
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_stream_seed_reproducible(self, engine):
+        assert _seeded(engine, seed=11) == _seeded(engine, seed=11)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_injected_rng_reproducible(self, engine):
+        from shared.rng import SeededRandom
+        a = _seeded(engine, rng=SeededRandom.from_seed(3).child('s'))
+        b = _seeded(engine, rng=SeededRandom.from_seed(3).child('s'))
+        assert a == b
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_random_voice_pan_reproducible(self, engine):
+        voices = {'num_voices': 3, 'pan_spread': 120, 'pan_strategy': 'random'}
+        a = _seeded(engine, seed=11, voices=voices)
+        random.seed(99)
+        b = _seeded(engine, seed=11, voices=voices)
+        assert a == b
+
+    def test_different_seeds_differ(self):
+        assert _seeded('scalar', seed=1) != _seeded('scalar', seed=2)
+
+    def test_seed_independent_of_global_random(self):
+        random.seed(1)
+        a = _seeded('scalar', seed=4)
+        random.seed(999)
+        b = _seeded('scalar', seed=4)
+        assert a == b
+
+    def test_stream_seed_overrides_injected_rng(self):
+        from shared.rng import SeededRandom
+        a = _seeded('scalar', rng=SeededRandom.from_seed(3), seed=8)
+        b = _seeded('scalar', seed=8)
+        assert a == b
+
+    def test_stochastic_columns_actually_vary(self):
+        grains = _seeded('scalar', seed=5)
+        assert grains.volume.std() > 0
+        assert grains.pan.std() > 0
+        assert set(grains.envelope_table.tolist()) == {2, 3}
+
+    def test_unseeded_stream_has_no_rng(self):
+        assert _make_stream().rng is None
+
+    def test_invalid_stream_seed_raises(self):
+        with pytest.raises(ValueError, match="seed"):
+            _make_stream(seed=-3)
+
+
+def _integral_stream(duration, distribution):
+    params = _stream_params(integral_density=100, onset=0.0, duration=duration,
+                            distribution=distribution)
+    del params['density']
+    with patch('core.stream.get_sample_duration', return_value=5.0):
+        stream = Stream(params)
+    stream.sample_table_num = 1
+    stream.window_table_map = {'hanning': 2, 'hamming': 3, 'bartlett': 4}
+    return stream
+
+
+class TestIntegralDensityCount:
+    """density * duration appena sopra un intero (100 * 1.1 = 110.00000000000001)."""
+
+    @pytest.mark.parametrize("duration", [1.1, 2.2])
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_sync_count_exact(self, engine, duration):
+        stream = _integral_stream(duration, 0)
+        stream.generate_grains(engine=engine)
+        assert len(stream.grains) == round(100 * duration)
+        assert stream.grains.onset.max() < duration - 1e-3
+
+    @pytest.mark.parametrize("duration", [1.1, 2.2])
+    def test_async_count_exact(self, duration):
+        random.seed(7)
+        stream = _integral_stream(duration, 1)
+        stream.generate_grains(engine='vectorized')
+        assert len(stream.grains) == round(100 * duration)
+
+
+# =============================================================================
+# FINESTRA TEMPORALE
+# =============================================================================
+
+def _windowed(engine, start, end, **overrides):
+    random.seed(7)
+    stream = _make_stream(**overrides)
+    stream.set_time_window(start, end)
+    stream.generate_grains(engine=engine)
+    return stream.grains
+
+
+class TestTimeWindow:
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {'pointer': {'speed_ratio': 1.0, 'loop_start': 1.0, 'loop_dur': 0.5}},
+        {'grain': {'duration': [[0, 0.02], [2, 0.3]]}},
+        {'density': [[0, 50], [2, 400]]},
+        {'pointer': {'speed_ratio': 1.0, 'loop_start': [[0, 0.5], [2, 2.0]],
+                     'loop_dur': [[0, 0.3], [2, 0.8]]}},
+        {'pointer': {'speed_ratio': 1.7, 'loop_start': [[0, 0.2], [2, 1.5]],
+                     'loop_dur': [[0, 0.1], [2, 0.4]]},
+         'grain': {'duration': [[0, 0.02], [2, 0.3]]},
+         'density': [[0, 50], [2, 400]]},
+        {'pointer': {'speed_ratio': 1.0, 'loop_start': [[0, 0.5], [2, 2.0]],
+                     'loop_dur': [[0, 0.3], [2, 0.8]]},
+         'voices': {'num_voices': 3, 'pointer_offset': 0.1}},
+    ])
+    def test_window_is_subset_of_full_generation(self, engine, overrides):
+        """Stessi grani della generazione completa, limitati alla finestra."""
+        full = _generate(engine, **overrides)
+        windowed = _windowed(engine, 1.7, 2.4, **overrides)
+        mask = (full.onset < 2.4) & (full.onset + full.duration > 1.7)
+        assert len(windowed) == mask.sum() > 0
+        for name, column in full.columns().items():
+            np.testing.assert_allclose(getattr(windowed, name), column[mask], err_msg=name)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_includes_grains_sounding_at_start(self, engine):
+        grains = _windowed(engine, 1.72, 2.0, density=20, grain={'duration': 0.2})
+        assert grains.onset[0] < 1.72 < grains.onset[0] + grains.duration[0]
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_window_outside_stream_empty(self, engine):
+        assert len(_windowed(engine, 5.0, 6.0)) == 0
+
+    def test_density_seek_skips_earlier_onsets(self):
+        stream = _make_stream()
+        stream.set_time_window(2.5, 2.6)
+        with patch.object(stream._density, 'seek', wraps=stream._density.seek) as seek:
+            stream.generate_grains(engine='scalar')
+        seek.assert_called_once()
+        assert 0 < len(stream.grains) < len(_generate('scalar')) / 10
+
+    def test_set_time_window_local_coordinates(self):
+        stream = _make_stream()
+        stream.set_time_window(1.5, 2.0)
+        assert stream.time_window == (0.5, 1.0)
+
+    def test_empty_window_raises(self):
+        with pytest.raises(ValueError, match="Finestra"):
+            _make_stream().set_time_window(2.0, 2.0)
+
+    def test_grain_lookback_constant_duration(self):
+        assert _make_stream().grain_lookback == 0.05
+
+    def test_grain_lookback_dynamic_duration_uses_bounds(self):
+        stream = _make_stream(grain={'duration': [[0, 0.02], [2, 0.08]]})
+        assert stream.grain_lookback == 10.0
+
+
+# =============================================================================
+# VOCI MULTIPLE
+# =============================================================================
+
+def _voices(engine, **voices):
+    random.seed(7)
+    stream = _make_stream(voices=voices)
+    stream.generate_grains(engine=engine)
+    return stream
+
+
+class TestMultiVoice:
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_single_voice_unchanged(self, engine):
+        assert _voices(engine, num_voices=1).grains == _generate(engine)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_one_block_per_voice(self, engine):
+        stream = _voices(engine, num_voices=3)
+        assert len(stream.voices) == stream.max_voices == 3
+        assert len(stream.grains) == sum(len(v) for v in stream.voices)
+        assert all(len(v) == len(stream.voices[0]) for v in stream.voices)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_pitch_offset_per_voice(self, engine):
+        voices = _voices(engine, num_voices=3, pitch_offset=12).voices
+        np.testing.assert_allclose(voices[1].pitch_ratio, voices[0].pitch_ratio * 2.0)
+        np.testing.assert_allclose(voices[2].pitch_ratio, voices[0].pitch_ratio * 4.0)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_linear_pan_spread(self, engine):
+        voices = _voices(engine, num_voices=3, pan_spread=60).voices
+        np.testing.assert_allclose(voices[0].pan, voices[1].pan - 30.0)
+        np.testing.assert_allclose(voices[2].pan, voices[1].pan + 30.0)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_pointer_offset_wraps(self, engine):
+        voices = _voices(engine, num_voices=2, pointer_offset=0.9).voices
+        np.testing.assert_allclose(voices[1].pointer_pos, (voices[0].pointer_pos + 4.5) % 5.0)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_dynamic_activation(self, engine):
+        voices = _voices(engine, num_voices=[[0, 1], [2, 3]]).voices
+        assert len(voices) == 3
+        assert len(voices[2]) < len(voices[1]) < len(voices[0])
+        assert voices[2].onset[0] > voices[1].onset[0]
+
+    def test_engines_equivalent(self):
+        params = dict(num_voices=[[0, 2], [2, 4]], pitch_offset=7, pointer_offset=0.1, pan_spread=90)
+        scalar = _voices('scalar', **params)
+        vectorized = _voices('vectorized', **params)
+        assert len(scalar.voices) == len(vectorized.voices)
+        for a, b in zip(scalar.voices, vectorized.voices):
+            assert len(a) == len(b)
+            for name in ('onset', 'duration', 'pointer_pos', 'pitch_ratio', 'volume', 'pan'):
+                np.testing.assert_allclose(getattr(a, name), getattr(b, name), atol=1e-9)
+
+    def test_vectorized_blocks_sorted_by_onset(self):
+        stream = _make_stream(voices={'num_voices': 4})
+        for block in VectorizedGrainEngine().iter_blocks(stream, chunk_size=64):
+            assert np.all(np.diff(block.onset) >= 0)
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    def test_seeded_jitter_reproducible(self, engine):
+        def run():
+            with patch('core.stream.get_sample_duration', return_value=5.0):
+                stream = Stream(_stream_params(seed=3, voices={'num_voices': 3, 'pointer_range': 0.02}))
+            stream.sample_table_num = 1
+            stream.window_table_map = {'hanning': 2}
+            stream.generate_grains(engine=engine)
+            return stream.grains
+        assert run() == run()
+
+    @pytest.mark.parametrize("engine", ['scalar', 'vectorized'])
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {'distribution': 1, 'seed': 5},
+        {'voices': {'num_voices': [[0, 1], [2, 4]], 'pitch_offset': 7}},
+    ])
+    def test_streaming_multi_voice_in_onset_order(self, engine, overrides):
+        """iter_grain_blocks con piu' voci: ordine di onset globale, stessi grani di generate."""
+        params = dict({'voices': {'num_voices': 3, 'pan_spread': 90}}, **overrides)
+        with patch('core.stream.get_sample_duration', return_value=5.0):
+            streamed_stream = Stream(_stream_params(**params))
+            generated_stream = Stream(_stream_params(**params))
+        for stream in (streamed_stream, generated_stream):
+            stream.sample_table_num = 1
+            stream.window_table_map = {'hanning': 2}
+        random.seed(7)
+        streamed = GrainBlock.concatenate(streamed_stream.iter_grain_blocks(chunk_size=40, engine=engine))
+        random.seed(7)
+        generated_stream.generate_grains(engine=engine)
+
+        assert np.all(np.diff(streamed.onset) >= 0)
+        assert len(streamed) == len(generated_stream.grains)
+        expected = np.sort(np.concatenate([v.onset for v in generated_stream.voices]))
+        np.testing.assert_allclose(streamed.onset, expected)
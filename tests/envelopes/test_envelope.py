@@ -8,16 +8,19 @@ Organizzazione:
 4. Test inizializzazione - formato misto
 5. Test evaluate() - vari tipi interpolazione
 6. Test integrate() - vari tipi interpolazione
+6b. Test integrate_many() - versione batch
 7. Test tipo interpolazione (linear, step, cubic)
 8. Test tangenti Fritsch-Carlson per cubic
 9. Test gestione errori
 10. Test type checker (is_envelope_like)
 11. Test backward compatibility
 12. Test casi edge
+15. Test envelope compatti periodici (rappresentazione lazy)
 """
 
 import pytest
 import math
+import numpy as np
 from typing import List
 from envelopes.envelope import Envelope
 from envelopes.envelope_interpolation import LinearInterpolation, StepInterpolation, CubicInterpolation
@@ -311,6 +314,35 @@ class TestEvaluate:
         assert env.evaluate(100) == pytest.approx(10.0)
 
 
+# =============================================================================
+# 5b. TEST EVALUATE_MANY() - VERSIONE BATCH
+# =============================================================================
+
+class TestEvaluateMany:
+    """Test evaluate_many(times)."""
+
+    @pytest.mark.parametrize("env_type", ['linear', 'step', 'cubic'])
+    def test_matches_evaluate(self, env_type):
+        env = Envelope({'type': env_type, 'points': [[0, 1], [0.5, 3], [1.2, 0], [2, 2]]})
+        times = np.linspace(-1, 3, 81)
+        expected = [env.evaluate(t) for t in times]
+        np.testing.assert_allclose(env.evaluate_many(times), expected, rtol=0, atol=1e-12)
+
+    def test_returns_ndarray(self):
+        env = Envelope([[0, 0], [1, 10]])
+        result = env.evaluate_many([0.5, 2.0])
+        assert isinstance(result, np.ndarray)
+        np.testing.assert_allclose(result, [5.0, 10.0])
+
+    def test_long_compact_envelope(self):
+        """Envelope compatto espanso a migliaia di breakpoint."""
+        env = Envelope([[[0, 0.6], [100, 0.1]], 10.0, 2000])
+        assert len(env.breakpoints) >= 4000
+        times = np.linspace(0, 12, 500)
+        expected = [env.evaluate(t) for t in times]
+        np.testing.assert_allclose(env.evaluate_many(times), expected, rtol=0, atol=1e-12)
+
+
 # =============================================================================
 # 6. TEST INTEGRATE() - VARI TIPI INTERPOLAZIONE
 # =============================================================================
@@ -392,6 +424,42 @@ class TestIntegrate:
         assert area_total == pytest.approx(15.0)
 
 
+# =============================================================================
+# 6b. TEST INTEGRATE_MANY() - VERSIONE BATCH
+# =============================================================================
+
+class TestIntegrateMany:
+    """Test integrate_many(from_time, times)."""
+
+    @pytest.mark.parametrize("env_type", ['linear', 'step', 'cubic'])
+    def test_matches_integrate(self, env_type):
+        env = Envelope({'type': env_type, 'points': [[0, 1], [0.5, 3], [1.2, 0], [2, 2]]})
+        times = np.linspace(0, 3, 31)
+        expected = [env.integrate(0, t) for t in times]
+        np.testing.assert_allclose(env.integrate_many(0, times), expected, atol=1e-12)
+
+    def test_returns_ndarray(self):
+        env = Envelope([[0, 0], [1, 10]])
+        result = env.integrate_many(0, [0.5, 1.0])
+        assert isinstance(result, np.ndarray)
+        np.testing.assert_allclose(result, [1.25, 5.0])
+
+    def test_long_compact_envelope(self):
+        """Envelope compatto espanso a migliaia di breakpoint."""
+        env = Envelope([[[0, 0.5], [50, 2.0], [100, 0.5]], 10.0, 500])
+        assert len(env.breakpoints) >= 1000
+        times = np.linspace(0, 12, 200)
+        expected = [env.integrate(0, t) for t in times]
+        np.testing.assert_allclose(env.integrate_many(0, times), expected, rtol=1e-12)
+
+    def test_compact_period_area(self):
+        """Ogni ciclo del pattern ha la stessa area."""
+        env = Envelope([[[0, 0], [100, 1]], 4.0, 4])
+        cycle = env.integrate(0, 1.0)
+        assert env.integrate(1.0, 2.0) == pytest.approx(cycle, abs=1e-9)
+        assert env.integrate(0, 4.0) == pytest.approx(4 * cycle, abs=1e-9)
+
+
 # =============================================================================
 # 7. TEST TIPO INTERPOLAZIONE
 # =============================================================================
@@ -736,3 +804,82 @@ class TestMathematicalProperties:
             assert abs(right - center) < 0.01
 
 
+
+
+
+# =============================================================================
+# 15. TEST ENVELOPE COMPATTI PERIODICI
+# =============================================================================
+
+def _expanded_reference(raw_points):
+    """Envelope costruito dai breakpoints espansi (NormalSegment)."""
+    from envelopes.envelope_builder import EnvelopeBuilder
+    env = Envelope(raw_points)
+    ref = Envelope.__new__(Envelope)
+    ref.type = env.type
+    ref.strategy = env.strategy
+    ref.segments = ref._parse_segments(EnvelopeBuilder.parse(raw_points))
+    return env, ref
+
+
+class TestPeriodicCompactEnvelope:
+
+    COMPACTS = [
+        [[[0, 0], [100, 1]], 0.4, 4],
+        [[[0, 0.6], [30, 1], [30, 0.2], [100, 0.1]], 2.0, 15, 'cubic'],
+        [[[0, 0.6], [30, 1], [30, 0.2], [100, 0.1]], 2.0, 15, 'linear', 'exponential'],
+        [[[0, 0.6], [50, 1], [100, 0.1]], 3.0, 20, 'step'],
+    ]
+
+    def test_uses_periodic_segment(self):
+        from envelopes.envelope_segment import PeriodicSegment
+        env = Envelope([[[0, 0], [100, 1]], 0.4, 4])
+        assert isinstance(env.segments[0], PeriodicSegment)
+
+    @pytest.mark.parametrize("compact", COMPACTS)
+    def test_breakpoints_identical(self, compact):
+        env, ref = _expanded_reference(compact)
+        assert env.breakpoints == ref.breakpoints
+
+    @pytest.mark.parametrize("compact", COMPACTS)
+    def test_evaluate_identical(self, compact):
+        env, ref = _expanded_reference(compact)
+        times = np.random.default_rng(0).uniform(-0.5, 3.5, 300)
+        assert [env.evaluate(t) for t in times.tolist()] == [ref.evaluate(t) for t in times.tolist()]
+        np.testing.assert_array_equal(env.evaluate_many(times), ref.evaluate_many(times))
+
+    @pytest.mark.parametrize("compact", COMPACTS)
+    def test_integrate_matches(self, compact):
+        env, ref = _expanded_reference(compact)
+        times = np.linspace(-0.5, 3.5, 41)
+        for t in times.tolist():
+            assert env.integrate(0, t) == pytest.approx(ref.integrate(0, t), abs=1e-12)
+        np.testing.assert_allclose(env.integrate_many(0.1, times),
+                                   ref.integrate_many(0.1, times), atol=1e-12)
+
+    def test_cubic_tangents_identical(self):
+        env, ref = _expanded_reference(self.COMPACTS[1])
+        assert list(env.segments[0].context['tangents']) == ref.segments[0].context['tangents']
+
+    def test_cursor_identical(self):
+        env, ref = _expanded_reference(self.COMPACTS[1])
+        cursor = env.cursor()
+        times = np.linspace(0, 2.5, 400).tolist()
+        assert [cursor.evaluate(t) for t in times] == [ref.evaluate(t) for t in times]
+
+    def test_scalar_evaluate_stays_lazy(self):
+        env = Envelope([[[0, 0], [100, 1]], 10.0, 10000])
+        env.evaluate(3.3)
+        assert env.segments[0]._compiled is None
+
+    def test_value_range(self):
+        env = Envelope([[[0, 0.6], [30, 1], [100, 0.1]], 2.0, 1000])
+        assert env.value_range() == (0.1, 1)
+
+    def test_value_range_standard_envelope(self):
+        assert Envelope([[0, 3], [1, -2], [2, 5]]).value_range() == (-2, 5)
+
+    def test_unrepresentable_compact_falls_back(self):
+        from envelopes.envelope_segment import PeriodicSegment
+        env = Envelope([[[0, 0], [120, 1]], 1.0, 4])
+        assert not isinstance(env.segments[0], PeriodicSegment)
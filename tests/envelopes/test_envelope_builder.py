@@ -17,6 +17,7 @@ Coverage:
 12. Test helper functions
 13. Test matematici (durate cicli, offset, simmetria)
 14. Test robustezza input malformati
+15. Test parse_periodic (rappresentazione lazy dei compatti)
 """
 
 import pytest
@@ -1050,4 +1051,43 @@ class TestLogTransformationsFlag:
             compact, expanded, 0.0, 0.4, None
         )
 
-        assert mock_logger.info.called
\ No newline at end of file
+        assert mock_logger.info.called
+
+
+# =============================================================================
+# 15. TEST PARSE_PERIODIC
+# =============================================================================
+
+class TestParsePeriodic:
+
+    @pytest.mark.parametrize("compact", [
+        [[[0, 0], [100, 1]], 0.4, 4],
+        [[[0, 0.6], [30, 1], [30, 0.2], [100, 0.1]], 2.0, 15, 'cubic'],
+        [[[10, 0.6], [90, 1]], 3.0, 7, 'linear', 'log'],
+        [[[0, 5]], 1.0, 3],
+    ])
+    def test_identical_to_expansion(self, compact):
+        points = EnvelopeBuilder.parse_periodic(compact)
+        assert points is not None
+        assert points.to_list() == EnvelopeBuilder.parse(compact)
+
+    def test_standard_format_returns_none(self):
+        assert EnvelopeBuilder.parse_periodic([[0, 0], [1, 1]]) is None
+
+    def test_mixed_format_returns_none(self):
+        assert EnvelopeBuilder.parse_periodic([[[[0, 0], [100, 1]], 0.4, 4], [1.0, 0]]) is None
+
+    def test_unsorted_pattern_returns_none(self):
+        assert EnvelopeBuilder.parse_periodic([[[50, 0], [10, 1]], 1.0, 4]) is None
+
+    def test_overlapping_cycles_return_none(self):
+        """Pattern oltre il 100% sovrappone i cicli: serve l'espansione ordinata."""
+        assert EnvelopeBuilder.parse_periodic([[[0, 0], [120, 1]], 1.0, 4]) is None
+
+    def test_vanishing_cycles_return_none(self):
+        compact = [[[0, 0.6], [30, 1], [30, 0.2], [100, 0.1]], 2.0, 50, 'linear', 'exponential']
+        assert EnvelopeBuilder.parse_periodic(compact) is None
+
+    def test_invalid_compact_still_raises(self):
+        with pytest.raises(ValueError):
+            EnvelopeBuilder.parse_periodic([[[0, 0], [100, 1]], 0.4, 0])
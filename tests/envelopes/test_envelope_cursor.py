@@ -0,0 +1,185 @@
+"""
+Test per il modulo envelope_cursor.py
+Testa EnvelopeCursor: valori identici (bit a bit) a Envelope.evaluate() e
+Envelope.integrate() per interrogazioni monotone e non, e la ricerca
+incrementale _MonotonicSearch rispetto a bisect.
+"""
+
+import pickle
+from bisect import bisect_left, bisect_right
+
+import pytest
+import numpy as np
+
+from envelopes.envelope import Envelope
+from envelopes.envelope_cursor import EnvelopeCursor, _MonotonicSearch
+from envelopes.envelope_interpolation import InterpolationStrategy
+from envelopes.envelope_segment import NormalSegment
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+JUMP_POINTS = [[0, 1], [0.5, 3], [0.5, 5], [1.2, 0], [2, 2], [2, 2], [3, 1]]
+
+
+@pytest.fixture(params=['linear', 'step', 'cubic'])
+def env_type(request):
+    return request.param
+
+
+@pytest.fixture
+def rising_times():
+    rng = np.random.default_rng(0)
+    return np.sort(rng.uniform(-1, 4, 300)).tolist() + [4.0, 5.0]
+
+
+# =============================================================================
+# 1. TEST _MONOTONICSEARCH
+# =============================================================================
+
+class TestMonotonicSearch:
+
+    TIMES = [0.0, 0.5, 0.5, 1.0, 2.0, 2.0, 3.0]
+    QUERIES = [-1.0, 0.0, 0.25, 0.5, 0.5, 0.75, 2.0, 2.5, 3.0, 9.0, 0.5, -2.0, 2.0]
+
+    @pytest.mark.parametrize("side,reference", [('left', bisect_left), ('right', bisect_right)])
+    def test_matches_bisect(self, side, reference):
+        search = _MonotonicSearch(self.TIMES, side)
+        for t in self.QUERIES:
+            assert search.position(t) == reference(self.TIMES, t), t
+
+    def test_reset(self):
+        search = _MonotonicSearch(self.TIMES, 'right')
+        search.position(2.5)
+        search.reset()
+        assert search._pos == 0
+        assert search.position(0.0) == 1
+
+
+# =============================================================================
+# 2. TEST EVALUATE
+# =============================================================================
+
+class TestCursorEvaluate:
+
+    def test_identical_to_envelope_rising(self, env_type, rising_times):
+        env = Envelope({'type': env_type, 'points': JUMP_POINTS})
+        cursor = env.cursor()
+        assert [cursor.evaluate(t) for t in rising_times] == [env.evaluate(t) for t in rising_times]
+
+    def test_identical_to_envelope_random_access(self, env_type):
+        env = Envelope({'type': env_type, 'points': JUMP_POINTS})
+        cursor = env.cursor()
+        times = np.random.default_rng(1).uniform(-1, 4, 200).tolist()
+        assert [cursor.evaluate(t) for t in times] == [env.evaluate(t) for t in times]
+
+    def test_breakpoint_times(self, env_type):
+        env = Envelope({'type': env_type, 'points': JUMP_POINTS})
+        cursor = env.cursor()
+        times = [p[0] for p in JUMP_POINTS]
+        assert [cursor.evaluate(t) for t in times] == [env.evaluate(t) for t in times]
+
+    def test_single_breakpoint(self, env_type):
+        env = Envelope({'type': env_type, 'points': [[0.5, 7.0]]})
+        cursor = env.cursor()
+        assert [cursor.evaluate(t) for t in (0.0, 0.5, 1.0)] == [7.0, 7.0, 7.0]
+
+    def test_compact_envelope(self):
+        env = Envelope([[[0, 0.6], [100, 0.1]], 10.0, 200])
+        cursor = env.cursor()
+        times = np.linspace(0, 11, 1000).tolist()
+        assert [cursor.evaluate(t) for t in times] == [env.evaluate(t) for t in times]
+
+    def test_custom_strategy_falls_back_to_evaluate(self):
+        """Strategie senza evaluate_at() ricadono su evaluate()."""
+        class ConstantStrategy(InterpolationStrategy):
+            def evaluate(self, t, breakpoints, **context):
+                return 42.0
+
+            def integrate(self, from_t, to_t, breakpoints, **context):
+                return 0.0
+
+        env = Envelope([[0, 0], [1, 1]])
+        env.segments = [NormalSegment([[0, 0], [1, 1]], ConstantStrategy())]
+        assert env.cursor().evaluate(0.5) == 42.0
+
+
+# =============================================================================
+# 3. TEST INTEGRATE
+# =============================================================================
+
+class TestCursorIntegrate:
+
+    def test_from_zero_identical_rising(self, env_type, rising_times):
+        env = Envelope({'type': env_type, 'points': JUMP_POINTS})
+        cursor = env.cursor()
+        assert ([cursor.integrate(0, t) for t in rising_times]
+                == [env.integrate(0, t) for t in rising_times])
+
+    def test_nonzero_origin_identical(self, env_type, rising_times):
+        env = Envelope({'type': env_type, 'points': JUMP_POINTS})
+        cursor = env.cursor()
+        assert ([cursor.integrate(0.7, t) for t in rising_times]
+                == [env.integrate(0.7, t) for t in rising_times])
+
+    def test_sliding_window_identical(self, env_type):
+        env = Envelope({'type': env_type, 'points': JUMP_POINTS})
+        cursor = env.cursor()
+        starts = np.linspace(-0.5, 3.5, 81).tolist()
+        assert ([cursor.integrate(t, t + 0.3) for t in starts]
+                == [env.integrate(t, t + 0.3) for t in starts])
+
+    def test_reversed_bounds_negative(self):
+        env = Envelope([[0, 0], [1, 10]])
+        cursor = env.cursor()
+        assert cursor.integrate(1, 0) == -5.0
+        assert cursor.integrate(0.5, 0.5) == 0.0
+
+    def test_envelope_starting_after_zero(self):
+        env = Envelope([[1.0, 2.0], [2.0, 4.0]])
+        cursor = env.cursor()
+        for t in (0.5, 1.0, 1.5, 3.0):
+            assert cursor.integrate(0, t) == env.integrate(0, t)
+
+
+# =============================================================================
+# 4. TEST STATO
+# =============================================================================
+
+class TestCursorState:
+
+    def test_envelope_property(self):
+        env = Envelope([[0, 0], [1, 1]])
+        assert env.cursor().envelope is env
+
+    def test_cursor_type(self):
+        assert isinstance(Envelope([[0, 0], [1, 1]]).cursor(), EnvelopeCursor)
+
+    def test_independent_cursors(self):
+        env = Envelope([[0, 0], [1, 10], [2, 0]])
+        a, b = env.cursor(), env.cursor()
+        a.evaluate(1.9)
+        assert b._eval_search._pos == 0
+        assert b.evaluate(0.5) == 5.0
+
+    def test_reset(self):
+        env = Envelope([[0, 0], [1, 10], [2, 0]])
+        cursor = env.cursor()
+        cursor.evaluate(1.5)
+        cursor.integrate(0, 1.5)
+        cursor.reset()
+        assert cursor._eval_search._pos == 0
+        assert cursor._to_search._pos == 0
+
+    def test_picklable(self):
+        env = Envelope([[0, 0], [1, 10], [2, 0]])
+        cursor = env.cursor()
+        cursor.evaluate(1.5)
+        restored = pickle.loads(pickle.dumps(cursor))
+        assert restored.evaluate(0.5) == 5.0
+        assert restored.integrate(0, 2) == 10.0
+
+    def test_repr(self):
+        assert 'linear' in repr(Envelope([[0, 0], [1, 1]]).cursor())
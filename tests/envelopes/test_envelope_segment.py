@@ -5,13 +5,20 @@ Test suite per Segment hierarchy.
 Organizzazione:
 1. Test NormalSegment - evaluate
 2. Test NormalSegment - integrate
+3. Test NormalSegment - tabella integrali cumulativi / integrate_many
 5. Test edge cases e validazione
 6. Test factory function
+7. Test PeriodicBreakpoints / PeriodicSegment
 """
 
 import pytest
-from envelopes.envelope_segment import Segment, NormalSegment
-from envelopes.envelope_interpolation import LinearInterpolation, StepInterpolation, CubicInterpolation
+import numpy as np
+from envelopes.envelope_segment import (
+    Segment, NormalSegment, PeriodicBreakpoints, PeriodicSegment
+)
+from envelopes.envelope_interpolation import (
+    InterpolationStrategy, LinearInterpolation, StepInterpolation, CubicInterpolation
+)
 
 
 # =============================================================================
@@ -167,6 +174,171 @@ class TestNormalSegmentIntegrate:
         assert area == pytest.approx(5.0)
 
 
+# =============================================================================
+# 3. TEST NORMALSEGMENT - TABELLA INTEGRALI CUMULATIVI
+# =============================================================================
+
+def _scan_integrate(seg, from_t, to_t):
+    """Riferimento: scansione completa della strategy (implementazione storica)."""
+    total = 0.0
+    if from_t < seg.start_time:
+        hold_end = min(to_t, seg.start_time)
+        total += seg.breakpoints[0][1] * (hold_end - from_t)
+        from_t = hold_end
+    if from_t < to_t and from_t < seg.end_time:
+        end = min(to_t, seg.end_time)
+        start = max(from_t, seg.start_time)
+        if end > start:
+            total += seg.strategy.integrate(start, end, seg.breakpoints, **seg.context)
+            from_t = end
+    if from_t < to_t and from_t >= seg.end_time:
+        total += seg.breakpoints[-1][1] * (to_t - from_t)
+    return total
+
+
+MULTI_BREAKPOINTS = [[0, 1], [0.3, 4], [0.3, -2], [0.9, 3], [1.4, 0.5], [2.0, 2]]
+
+
+class TestNormalSegmentPrefixTable:
+    """integrate() via tabella cumulativa + ricerca binaria."""
+
+    @pytest.mark.parametrize("strategy_cls", [LinearInterpolation, StepInterpolation, CubicInterpolation])
+    def test_prefix_table_values(self, strategy_cls):
+        context = {'tangents': [0.0] * len(MULTI_BREAKPOINTS)} if strategy_cls is CubicInterpolation else None
+        seg = NormalSegment(MULTI_BREAKPOINTS, strategy_cls(), context)
+        for i, (t, _) in enumerate(seg.breakpoints):
+            assert seg._prefix[i] == pytest.approx(_scan_integrate(seg, seg.start_time, t), abs=1e-12)
+
+    @pytest.mark.parametrize("strategy_cls", [LinearInterpolation, StepInterpolation, CubicInterpolation])
+    @pytest.mark.parametrize("from_t,to_t", [
+        (0.1, 0.2), (0.1, 1.7), (-0.5, 0.25), (0.3, 0.3001), (1.0, 3.0), (-1.0, 4.0), (0.0, 2.0),
+    ])
+    def test_matches_full_scan(self, strategy_cls, from_t, to_t):
+        context = {'tangents': [1.0, 0.5, 0.0, 0.0, -1.0, 2.0]} if strategy_cls is CubicInterpolation else None
+        seg = NormalSegment(MULTI_BREAKPOINTS, strategy_cls(), context)
+        assert seg.integrate(from_t, to_t) == pytest.approx(_scan_integrate(seg, from_t, to_t), abs=1e-12)
+
+    def test_duplicate_times_zero_width(self, linear_strategy):
+        """Due breakpoint allo stesso tempo (salto) non aggiungono area."""
+        seg = NormalSegment([[0, 0], [1, 0], [1, 10], [2, 10]], linear_strategy)
+        assert seg.integrate(0, 2) == pytest.approx(10.0)
+        assert seg.integrate(0.5, 1.5) == pytest.approx(5.0)
+
+    def test_single_breakpoint(self, linear_strategy):
+        seg = NormalSegment([[1, 3]], linear_strategy)
+        assert seg.integrate(0, 2) == pytest.approx(6.0)
+
+    def test_custom_strategy_without_integrate_segment(self):
+        """Strategie esterne senza integrate_segment ricadono su integrate()."""
+        class ConstantStrategy(InterpolationStrategy):
+            def evaluate(self, t, breakpoints, **context):
+                return 1.0
+
+            def integrate(self, from_t, to_t, breakpoints, **context):
+                return to_t - from_t
+
+        seg = NormalSegment([[0, 1], [1, 1], [2, 1]], ConstantStrategy())
+        assert seg.integrate(0.5, 1.5) == pytest.approx(1.0)
+        np.testing.assert_allclose(seg.integrate_many(0, [0.5, 2.0]), [0.5, 2.0])
+
+
+class TestNormalSegmentIntegrateMany:
+    """integrate_many(): versione batch con ricerca binaria vettoriale."""
+
+    @pytest.mark.parametrize("strategy_cls", [LinearInterpolation, StepInterpolation, CubicInterpolation])
+    def test_matches_scalar(self, strategy_cls):
+        context = {'tangents': [1.0, 0.5, 0.0, 0.0, -1.0, 2.0]} if strategy_cls is CubicInterpolation else None
+        seg = NormalSegment(MULTI_BREAKPOINTS, strategy_cls(), context)
+        times = np.linspace(-0.5, 2.5, 61)
+        expected = [seg.integrate(0.0, t) if t >= 0 else -seg.integrate(t, 0.0) for t in times]
+        np.testing.assert_allclose(seg.integrate_many(0.0, times), expected, atol=1e-12)
+
+    def test_from_start_identical_to_scalar(self, linear_strategy):
+        """Da start_time il risultato batch e' identico (bit a bit) allo scalare."""
+        seg = NormalSegment(MULTI_BREAKPOINTS, linear_strategy)
+        times = np.linspace(0.0, 2.0, 41)
+        assert seg.integrate_many(0.0, times).tolist() == [seg.integrate(0.0, t) for t in times]
+
+    def test_nonzero_origin(self, simple_ramp_breakpoints, linear_strategy):
+        seg = NormalSegment(simple_ramp_breakpoints, linear_strategy)
+        np.testing.assert_allclose(seg.integrate_many(0.5, [0.5, 1.0, 2.0]), [0.0, 3.75, 13.75])
+
+    def test_signed_when_before_origin(self, simple_ramp_breakpoints, linear_strategy):
+        seg = NormalSegment(simple_ramp_breakpoints, linear_strategy)
+        np.testing.assert_allclose(seg.integrate_many(1.0, [0.0]), [-5.0])
+
+    def test_empty_times(self, simple_ramp_breakpoints, linear_strategy):
+        seg = NormalSegment(simple_ramp_breakpoints, linear_strategy)
+        assert len(seg.integrate_many(0.0, [])) == 0
+
+
+# =============================================================================
+# 4. TEST NORMALSEGMENT - VALUTAZIONE COMPILATA (RICERCA BINARIA)
+# =============================================================================
+
+JUMP_BREAKPOINTS = [[0, 0], [0.5, 1], [0.5, 4], [1, 2], [1, 2], [2, 5]]
+
+
+def _scan_evaluate(seg, t):
+    """Riferimento: scansione lineare storica della strategia."""
+    if t < seg.start_time:
+        return seg.breakpoints[0][1]
+    if t > seg.end_time:
+        return seg.breakpoints[-1][1]
+    return seg.strategy.evaluate(t, seg.breakpoints, **seg.context)
+
+
+class TestNormalSegmentCompiledEvaluate:
+    """evaluate() con bisect ed evaluate_many() con searchsorted."""
+
+    @pytest.mark.parametrize("strategy_cls", [LinearInterpolation, StepInterpolation, CubicInterpolation])
+    @pytest.mark.parametrize("breakpoints", [MULTI_BREAKPOINTS, JUMP_BREAKPOINTS])
+    def test_scalar_identical_to_scan(self, strategy_cls, breakpoints):
+        context = {'tangents': [1.0, 0.5, 0.0, 0.0, -1.0, 2.0]} if strategy_cls is CubicInterpolation else None
+        seg = NormalSegment(breakpoints, strategy_cls(), context)
+        for t in np.linspace(-0.5, 2.5, 121).tolist() + [0.5, 1.0, 2.0]:
+            assert seg.evaluate(t) == _scan_evaluate(seg, t), t
+
+    @pytest.mark.parametrize("strategy_cls", [LinearInterpolation, StepInterpolation, CubicInterpolation])
+    @pytest.mark.parametrize("breakpoints", [MULTI_BREAKPOINTS, JUMP_BREAKPOINTS])
+    def test_many_matches_scalar(self, strategy_cls, breakpoints):
+        context = {'tangents': [1.0, 0.5, 0.0, 0.0, -1.0, 2.0]} if strategy_cls is CubicInterpolation else None
+        seg = NormalSegment(breakpoints, strategy_cls(), context)
+        times = np.concatenate([np.linspace(-0.5, 2.5, 121), [0.5, 1.0, 2.0]])
+        expected = [seg.evaluate(t) for t in times]
+        np.testing.assert_allclose(seg.evaluate_many(times), expected, rtol=0, atol=1e-12)
+
+    def test_jump_takes_left_value_linear(self, linear_strategy):
+        """Su tempi duplicati vale il primo breakpoint (come la scansione)."""
+        seg = NormalSegment(JUMP_BREAKPOINTS, linear_strategy)
+        assert seg.evaluate(0.5) == 1.0
+        assert seg.evaluate_many([0.5])[0] == 1.0
+
+    def test_jump_takes_right_value_step(self, step_strategy):
+        seg = NormalSegment(JUMP_BREAKPOINTS, step_strategy)
+        assert seg.evaluate(0.5) == 4.0
+        assert seg.evaluate_many([0.5])[0] == 4.0
+
+    def test_unsorted_times(self, simple_ramp_breakpoints, linear_strategy):
+        seg = NormalSegment(simple_ramp_breakpoints, linear_strategy)
+        np.testing.assert_allclose(seg.evaluate_many([0.75, -1.0, 0.25, 3.0]), [7.5, 0.0, 2.5, 10.0])
+
+    def test_missing_tangents_treated_as_zero(self, cubic_strategy, triangle_breakpoints):
+        seg = NormalSegment(triangle_breakpoints, cubic_strategy, {'tangents': [1.0]})
+        times = np.linspace(0, 1, 21)
+        np.testing.assert_allclose(seg.evaluate_many(times), [seg.evaluate(t) for t in times], atol=1e-12)
+
+    def test_empty_times(self, simple_ramp_breakpoints, linear_strategy):
+        seg = NormalSegment(simple_ramp_breakpoints, linear_strategy)
+        assert len(seg.evaluate_many([])) == 0
+
+    def test_compiled_arrays(self, triangle_breakpoints, cubic_strategy):
+        seg = NormalSegment(triangle_breakpoints, cubic_strategy, {'tangents': [0.0, 1.0, 0.0]})
+        np.testing.assert_array_equal(seg._times, [0, 0.5, 1])
+        np.testing.assert_array_equal(seg._values, [0, 10, 0])
+        assert isinstance(seg._array_context['tangents'], np.ndarray)
+
+
 # =============================================================================
 # 5. TEST EDGE CASES E VALIDAZIONE
 # =============================================================================
@@ -256,4 +428,110 @@ class TestSegmentAbstractMethodBodies:
             [[0.0, 0.0], [1.0, 1.0]], LinearInterpolation()
         )
         result = seg.integrate(0.0, 1.0)
-        assert result is not None
\ No newline at end of file
+        assert result is not None
+
+
+# =============================================================================
+# 7. TEST PERIODICBREAKPOINTS / PERIODICSEGMENT
+# =============================================================================
+
+PATTERN = [[0, 0.0], [50, 1.0], [100, 0.5]]
+
+
+def _periodic(n_cycles=3, duration=1.0, discontinuity=1e-6):
+    return PeriodicBreakpoints(
+        PATTERN,
+        [k * duration for k in range(n_cycles)],
+        [duration] * n_cycles,
+        discontinuity=discontinuity
+    )
+
+
+class TestPeriodicBreakpoints:
+
+    def test_len(self):
+        assert len(_periodic(n_cycles=4)) == 12
+
+    def test_items_match_expansion(self):
+        points = _periodic()
+        assert points[0] == [0.0, 0.0]
+        assert points[2] == [1.0, 0.5]
+        assert points[3] == [1.0 + 1e-6, 0.0]
+        assert points[4] == [1.5, 1.0]
+        assert points[-1] == [3.0, 0.5]
+
+    def test_slice_and_to_list(self):
+        points = _periodic()
+        assert points[1:3] == points.to_list()[1:3]
+        assert len(points.to_list()) == len(points)
+
+    def test_index_out_of_range(self):
+        with pytest.raises(IndexError):
+            _periodic()[9]
+
+    def test_times_view_sorted(self):
+        times = list(_periodic().times)
+        assert times == sorted(times)
+        assert len(times) == 9
+
+    def test_value_range(self):
+        assert _periodic().value_range() == (0.0, 1.0)
+
+    def test_cycles_ordered(self):
+        assert _periodic().cycles_ordered()
+
+    def test_offset_overtaking_next_point_not_ordered(self):
+        """Cicli piu' corti dell'offset di discontinuita' non sono rappresentabili."""
+        assert not _periodic(duration=1e-7).cycles_ordered()
+
+
+class TestPeriodicSegment:
+
+    @pytest.fixture(params=['linear', 'step'])
+    def strategy(self, request, linear_strategy, step_strategy):
+        return {'linear': linear_strategy, 'step': step_strategy}[request.param]
+
+    def test_evaluate_identical_to_normal(self, strategy):
+        points = _periodic(n_cycles=5)
+        periodic = PeriodicSegment(points, strategy)
+        normal = NormalSegment(points.to_list(), strategy)
+        times = np.random.default_rng(0).uniform(-0.5, 5.5, 300).tolist()
+        times += list(points.times)
+        assert [periodic.evaluate(t) for t in times] == [normal.evaluate(t) for t in times]
+
+    def test_integrate_matches_normal(self, strategy):
+        points = _periodic(n_cycles=5)
+        periodic = PeriodicSegment(points, strategy)
+        normal = NormalSegment(points.to_list(), strategy)
+        for t in np.linspace(-0.5, 5.5, 37):
+            assert periodic.integrate(0.2, t) == pytest.approx(normal.integrate(0.2, t), abs=1e-12)
+
+    def test_batch_matches_normal(self, strategy):
+        points = _periodic(n_cycles=5)
+        periodic = PeriodicSegment(points, strategy)
+        normal = NormalSegment(points.to_list(), strategy)
+        times = np.linspace(-0.5, 5.5, 101)
+        np.testing.assert_array_equal(periodic.evaluate_many(times), normal.evaluate_many(times))
+        np.testing.assert_allclose(periodic.integrate_many(0.0, times),
+                                   normal.integrate_many(0.0, times), atol=1e-12)
+
+    def test_scalar_evaluate_does_not_compile(self, linear_strategy):
+        segment = PeriodicSegment(_periodic(), linear_strategy)
+        segment.evaluate(1.7)
+        assert segment._compiled is None
+
+    def test_time_bounds(self, linear_strategy):
+        segment = PeriodicSegment(_periodic(n_cycles=4), linear_strategy)
+        assert segment.start_time == 0.0
+        assert segment.end_time == 4.0
+        assert segment.duration == 4.0
+
+    def test_expanded_breakpoints(self, linear_strategy):
+        points = _periodic()
+        assert PeriodicSegment(points, linear_strategy).expanded_breakpoints() == points.to_list()
+
+    def test_value_range(self, linear_strategy):
+        assert PeriodicSegment(_periodic(), linear_strategy).value_range() == (0.0, 1.0)
+
+    def test_repr(self, linear_strategy):
+        assert 'cycles=3' in repr(PeriodicSegment(_periodic(), linear_strategy))
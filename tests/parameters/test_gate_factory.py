@@ -18,6 +18,8 @@ Coverage:
 12. _parse_raw_value - numeri, envelope, errori, fallback logging
 13. Edge cases e validazione errori
 14. Integrazione - workflow realistici multi-step
+15. Sorgente casuale (rng) propagata ai gate stocastici
+16. EnvelopeGate valuta l'envelope tramite EnvelopeCursor
 """
 
 import pytest
@@ -29,6 +31,7 @@ from shared.probability_gate import (
     ProbabilityGate, NeverGate, AlwaysGate, RandomGate, EnvelopeGate
 )
 from envelopes.envelope import Envelope
+from shared.rng import SeededRandom
 
 
 # =============================================================================
@@ -1071,4 +1074,152 @@ class TestCreateGateFallthrough:
                 has_explicit_range=False,
             )
 
-        assert isinstance(gate, NeverGate)
\ No newline at end of file
+        assert isinstance(gate, NeverGate)
+
+
+# =============================================================================
+# 15. TEST SORGENTE CASUALE (rng)
+# =============================================================================
+
+class TestCreateGateRng:
+    """Il gate stocastico usa l'rng ricevuto, non il modulo random."""
+
+    def _decisions(self, gate, n=50):
+        return [gate.should_apply(t * 0.1) for t in range(n)]
+
+    @pytest.mark.parametrize("dephase", [
+        50.0,
+        {'volume': 50.0},
+        [[0, 50], [10, 50]],
+        {'volume': [[0, 50], [10, 50]]},
+    ])
+    def test_stochastic_gate_reproducible(self, dephase):
+        gates = [
+            GateFactory.create_gate(
+                dephase=dephase, param_key='volume', duration=10.0,
+                rng=SeededRandom.from_seed(3)
+            )
+            for _ in range(2)
+        ]
+        assert isinstance(gates[0], (RandomGate, EnvelopeGate))
+        assert self._decisions(gates[0]) == self._decisions(gates[1])
+
+    def test_seeded_gate_ignores_global_random(self):
+        gate = GateFactory.create_gate(
+            dephase=50.0, param_key='volume', rng=SeededRandom.from_seed(3)
+        )
+        with patch('random.uniform', side_effect=AssertionError("random globale")):
+            self._decisions(gate)
+
+    def test_without_rng_uses_global_random(self):
+        gate = GateFactory.create_gate(dephase=50.0, param_key='volume')
+        with patch('random.uniform', return_value=0.0) as mock_uniform:
+            assert gate.should_apply(0.0) is True
+        mock_uniform.assert_called_once_with(0, 100)
+
+    def test_parse_raw_value_passes_rng(self):
+        rng = SeededRandom.from_seed(1)
+        gate = GateFactory._parse_raw_value(40, 10.0, 'absolute', rng)
+        assert gate._rng is rng
+
+    def test_create_probability_gate_passes_rng(self):
+        rng = SeededRandom.from_seed(1)
+        assert GateFactory._create_probability_gate(40.0, rng)._rng is rng
+
+
+# =============================================================================
+# 16. TEST ENVELOPEGATE - CURSORE
+# =============================================================================
+
+class TestEnvelopeGateCursor:
+    """EnvelopeGate usa un EnvelopeCursor: stessi valori di Envelope.evaluate()."""
+
+    def test_probability_identical_to_envelope(self):
+        env = Envelope([[0, 0], [2, 100], [3, 40], [6, 80]])
+        gate = EnvelopeGate(env)
+        times = [0.0, 0.4, 2.0, 2.9, 5.5, 7.0, 1.0]
+        assert [gate.get_probability_value(t) for t in times] == [env.evaluate(t) for t in times]
+
+    def test_cursor_bound_to_envelope(self):
+        env = Envelope([[0, 0], [1, 100]])
+        assert EnvelopeGate(env)._cursor.envelope is env
+
+    def test_should_apply_uses_cursor_value(self):
+        gate = EnvelopeGate(Envelope([[0, 0], [1, 100]]), rng=SeededRandom.from_seed(2))
+        assert gate.should_apply(0.0) is False
+        assert gate.should_apply(5.0) is True
+
+
+# =============================================================================
+# 17. TEST DEPHASE ENVELOPE GLOBALE CONDIVISO
+# =============================================================================
+
+class TestSharedGlobalEnvelope:
+    """I gate di un dephase envelope globale condividono envelope e valutazione."""
+
+    def _gate(self, dephase, key, duration=10.0, time_mode='absolute', shared=None):
+        return GateFactory.create_gate(
+            dephase=dephase, param_key=key, default_prob=0.0,
+            duration=duration, time_mode=time_mode,
+            shared=self.shared if shared is None else shared
+        )
+
+    def setup_method(self):
+        self.shared = {}
+
+    def test_same_dephase_shares_probability(self):
+        dephase = [[0, 0], [10, 100]]
+        a, b = self._gate(dephase, 'volume'), self._gate(dephase, 'pan')
+        assert a._probability is b._probability
+        assert a._envelope is b._envelope
+
+    def test_independent_cursors_and_rng(self):
+        dephase = [[0, 0], [10, 100]]
+        a, b = self._gate(dephase, 'volume'), self._gate(dephase, 'pan')
+        assert a._cursor is not b._cursor
+
+    def test_new_dephase_object_new_probability(self):
+        a = self._gate([[0, 0], [10, 100]], 'volume')
+        b = self._gate([[0, 0], [10, 100]], 'volume')
+        assert a._probability is not b._probability
+
+    def test_different_duration_not_shared(self):
+        dephase = [[0, 0], [1, 100]]
+        a = self._gate(dephase, 'volume', duration=2.0, time_mode='normalized')
+        b = self._gate(dephase, 'volume', duration=4.0, time_mode='normalized')
+        assert a._probability is not b._probability
+        assert b.get_probability_value(4.0) == pytest.approx(100.0)
+
+    def test_specific_envelopes_not_shared(self):
+        dephase = {'volume': [[0, 0], [10, 100]], 'pan': [[0, 0], [10, 100]]}
+        a, b = self._gate(dephase, 'volume'), self._gate(dephase, 'pan')
+        assert a._probability is not b._probability
+
+    def test_cache_is_per_stream(self):
+        """Stesso oggetto dephase in due stream: nessuno stato condiviso."""
+        dephase = [[0, 0], [10, 100]]
+        a = self._gate(dephase, 'volume')
+        b = self._gate(dephase, 'volume', shared={})
+        assert a._probability is not b._probability
+
+    def test_without_cache_not_shared(self):
+        dephase = [[0, 0], [10, 100]]
+        a, b = (GateFactory.create_gate(dephase=dephase, param_key=key, duration=10.0)
+                for key in ('volume', 'pan'))
+        assert a._probability is not b._probability
+        assert not hasattr(GateFactory, '_global_probability')
+
+    def test_stream_gates_share_per_stream(self):
+        """I parametri di uno stream condividono il dephase, due stream no."""
+        from unittest.mock import patch as mock_patch
+        from core.stream import Stream
+        params = {
+            'stream_id': 's', 'onset': 0.0, 'duration': 10.0, 'sample': 'a.wav',
+            'volume': -6, 'volume_range': 6, 'pan': 0, 'pan_range': 30,
+            'dephase': [[0, 0], [10, 100]],
+        }
+        with mock_patch('core.stream.get_sample_duration', return_value=10.0):
+            a, b = Stream(dict(params)), Stream(dict(params))
+        gate_volume, gate_pan = a.volume._probability_gate, a.pan._probability_gate
+        assert gate_volume._probability is gate_pan._probability
+        assert gate_volume._probability is not b.volume._probability_gate._probability
@@ -14,6 +14,8 @@ Coverage:
 8. Test bounds e clamping
 9. Test workflow completi
 10. Test edge cases
+11. Test parametrizzati
+12. Test get_values() batch (classe reale)
 """
 
 import pytest
@@ -871,4 +873,131 @@ class TestParameterParametrized:
         else:
             # Variazione presente (probabilistica)
             # Almeno alcuni valori diversi
-            assert len(set(samples)) > 1 or mod_range < 1.0
\ No newline at end of file
+            assert len(set(samples)) > 1 or mod_range < 1.0
+
+
+# =============================================================================
+# 12. TEST GET_VALUES() BATCH (classe reale)
+# =============================================================================
+
+import numpy as np
+from unittest.mock import patch
+
+from parameters.parameter import Parameter as _RealParameter
+from parameters.parameter_definitions import ParameterBounds as _RealBounds
+from envelopes.envelope import Envelope as _RealEnvelope
+from shared import probability_gate as _gates
+from shared.rng import SeededRandom
+
+
+def _real_param(value, mode='additive', mod_range=None, gate=None, **bounds):
+    limits = dict(min_val=-100.0, max_val=100.0, min_range=0.0, max_range=50.0,
+                  default_jitter=0.0, variation_mode=mode)
+    limits.update(bounds)
+    param = _RealParameter('test', value, _RealBounds(**limits), mod_range=mod_range)
+    if gate is not None:
+        param.set_probability_gate(gate)
+    return param
+
+
+class TestParameterGetValues:
+
+    TIMES = np.linspace(0.0, 2.0, 41)
+
+    def test_constant_without_gate(self):
+        values, clip_mask = _real_param(12.5).get_values(self.TIMES)
+        np.testing.assert_array_equal(values, np.full(41, 12.5))
+        assert not clip_mask.any()
+
+    def test_envelope_identical_to_scalar(self):
+        param = _real_param(_RealEnvelope([[0, -10], [1, 40], [2, 5]]))
+        values, _ = param.get_values(self.TIMES)
+        assert values.tolist() == [param.get_value(t) for t in self.TIMES.tolist()]
+
+    def test_invert_identical_to_scalar(self):
+        param = _real_param(_RealEnvelope([[0, 0], [2, 1]]), mode='invert', gate=_gates.AlwaysGate(),
+                            min_val=0.0, max_val=1.0)
+        values, _ = param.get_values(self.TIMES)
+        assert values.tolist() == [param.get_value(t) for t in self.TIMES.tolist()]
+
+    def test_closed_gate_returns_base(self):
+        param = _real_param(5.0, mod_range=10.0, gate=_gates.RandomGate(0.0))
+        values, _ = param.get_values(self.TIMES)
+        np.testing.assert_array_equal(values, np.full(41, 5.0))
+
+    def test_additive_within_range(self):
+        param = _real_param(0.0, mod_range=_RealEnvelope([[0, 2], [2, 8]]), gate=_gates.AlwaysGate())
+        values, _ = param.get_values(self.TIMES)
+        half_range = (2 + 3 * self.TIMES) / 2
+        assert np.all(np.abs(values) <= half_range + 1e-12)
+        assert values.std() > 0
+
+    def test_quantized_integer_offsets(self):
+        param = _real_param(3.0, mode='quantized', mod_range=6.0, gate=_gates.AlwaysGate())
+        values, _ = param.get_values(self.TIMES)
+        np.testing.assert_array_equal(values, np.round(values))
+
+    def test_range_clipped_to_range_bounds(self):
+        param = _real_param(0.0, mod_range=500.0, gate=_gates.AlwaysGate(), max_range=4.0)
+        values, _ = param.get_values(self.TIMES)
+        assert np.all(np.abs(values) <= 2.0)
+
+    def test_default_jitter_without_range(self):
+        param = _real_param(0.0, gate=_gates.AlwaysGate(), default_jitter=1.0)
+        values, _ = param.get_values(self.TIMES)
+        assert np.all(np.abs(values) <= 0.5)
+        assert values.std() > 0
+
+    def test_only_gated_times_varied(self):
+        class _FirstHalfGate(_gates.AlwaysGate):
+            def should_apply_many(self, times, rng=None):
+                return times < 1.0
+
+        param = _real_param(0.0, mod_range=10.0, gate=_FirstHalfGate())
+        values, _ = param.get_values(self.TIMES)
+        assert np.all(values[self.TIMES >= 1.0] == 0.0)
+        assert np.any(values[self.TIMES < 1.0] != 0.0)
+
+    def test_clip_mask_and_clip(self):
+        param = _real_param(_RealEnvelope([[0, -150], [2, 150]]))
+        values, clip_mask = param.get_values(self.TIMES)
+        assert values.min() == -100.0 and values.max() == 100.0
+        raw = _RealEnvelope([[0, -150], [2, 150]]).evaluate_many(self.TIMES)
+        np.testing.assert_array_equal(clip_mask, (raw < -100.0) | (raw > 100.0))
+
+    def test_clips_logged_once_per_batch(self):
+        param = _real_param(_RealEnvelope([[0, -150], [2, 150]]))
+        with patch('parameters.parameter.log_clip_summary') as summary, \
+                patch('parameters.parameter.log_clip_warning') as warning:
+            _, clip_mask = param.get_values(self.TIMES)
+        summary.assert_called_once()
+        warning.assert_not_called()
+        assert len(summary.call_args.kwargs['times']) == int(clip_mask.sum())
+        assert summary.call_args.kwargs['is_envelope'] is True
+
+    def test_no_clip_no_log(self):
+        with patch('parameters.parameter.log_clip_summary') as summary:
+            _real_param(1.0).get_values(self.TIMES)
+        summary.assert_not_called()
+
+    def test_rng_forwarded_to_gate_and_variation(self):
+        param = _real_param(0.0, mod_range=10.0, gate=_gates.AlwaysGate())
+        rng = np.random.default_rng(0)
+        with patch.object(_gates.AlwaysGate, 'should_apply_many',
+                          return_value=np.ones(41, dtype=bool)) as gate_many, \
+                patch.object(param._distribution, 'sample_many',
+                             return_value=np.zeros(41)) as sample_many:
+            param.get_values(self.TIMES, rng)
+        assert gate_many.call_args[0][1] is rng
+        assert sample_many.call_args[0][2] is rng
+
+    def test_seeded_reproducible(self):
+        def run():
+            param = _real_param(0.0, mod_range=10.0, gate=_gates.RandomGate(50.0, SeededRandom.from_seed(1)))
+            param.set_rng(SeededRandom.from_seed(2))
+            return param.get_values(self.TIMES)[0]
+        np.testing.assert_array_equal(run(), run())
+
+    def test_empty_times(self):
+        values, clip_mask = _real_param(_RealEnvelope([[0, 0], [1, 1]])).get_values(np.array([]))
+        assert len(values) == 0 and len(clip_mask) == 0
@@ -42,7 +42,7 @@ from parameters.parameter_definitions import (
 # Lista completa dei parametri attesi nel registry
 EXPECTED_PARAMETERS = {
     # Density & Time
-    'density', 'fill_factor', 'distribution', 'effective_density',
+    'density', 'integral_density', 'fill_factor', 'distribution', 'effective_density',
     # Grain Properties
     'grain_duration', 'reverse', 'grain_envelope',
     # Pitch
@@ -54,7 +54,7 @@ EXPECTED_PARAMETERS = {
     'volume', 'pan',
     # Voices
     'num_voices', 'voice_pitch_offset', 'voice_pointer_offset',
-    'voice_pointer_range',
+    'voice_pointer_range', 'voice_pan_spread',
 }
 
 # Variation modes validi nel sistema
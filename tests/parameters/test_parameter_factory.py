@@ -14,6 +14,8 @@ Coverage:
 8. Test integrazione schema completi
 9. Test error handling
 10. Test edge cases
+12. Test Parameter - cursori sugli envelope
+13. Test Parameter.compile - percorsi specializzati
 """
 
 import pytest
@@ -702,4 +704,166 @@ class TestFactoryOrchestratorParametrized:
         if is_smart:
             assert isinstance(params['volume'], Parameter)
         else:
-            assert params['volume'] == -12.0
\ No newline at end of file
+            assert params['volume'] == -12.0
+
+# =============================================================================
+# 12. TEST PARAMETER - CURSORI SUGLI ENVELOPE
+# =============================================================================
+
+class TestParameterEnvelopeCursor:
+    """Parameter valuta gli envelope tramite EnvelopeCursor (stessi valori)."""
+
+    def _parameter(self, value, mod_range=None):
+        from parameters.parameter_definitions import ParameterBounds
+        bounds = ParameterBounds(min_val=-100.0, max_val=100.0, min_range=0.0, max_range=50.0)
+        return Parameter('volume', value, bounds, mod_range=mod_range, owner_id='test')
+
+    def test_values_identical_to_envelope(self):
+        from envelopes.envelope import Envelope
+        env = Envelope({'type': 'cubic', 'points': [[0, -20], [1, -3], [2, -12], [4, 0]]})
+        param = self._parameter(env)
+        times = [0.0, 0.3, 1.0, 1.7, 2.5, 3.9, 5.0, 0.5]
+        assert [param.get_value(t) for t in times] == [env.evaluate(t) for t in times]
+
+    def test_one_cursor_per_envelope(self):
+        from envelopes.envelope import Envelope
+        value = Envelope([[0, 0], [1, 10]])
+        mod_range = Envelope([[0, 0], [1, 5]])
+        param = self._parameter(value, mod_range)
+        for t in (0.1, 0.5, 0.9):
+            param.get_value(t)
+        assert len(param._cursors) == 2
+        assert param._cursor(value).envelope is value
+        assert param._cursor(mod_range).envelope is mod_range
+
+    def test_static_value_creates_no_cursor(self):
+        param = self._parameter(-6.0)
+        assert param.get_value(1.0) == -6.0
+        assert param._cursors == {}
+
+
+# =============================================================================
+# 13. TEST PARAMETER.COMPILE - PERCORSI SPECIALIZZATI
+# =============================================================================
+
+class TestParameterCompile:
+    """compile() sceglie il percorso di get_value() senza cambiarne i valori."""
+
+    TIMES = [0.0, 0.25, 0.5, 1.0, 1.5, 2.0, 3.0]
+
+    def _parameter(self, value, mod_range=None, mode='additive'):
+        from parameters.parameter_definitions import ParameterBounds
+        bounds = ParameterBounds(min_val=-100.0, max_val=100.0, min_range=0.0,
+                                 max_range=50.0, variation_mode=mode)
+        return Parameter('volume', value, bounds, mod_range=mod_range, owner_id='test')
+
+    def test_default_is_generic(self):
+        param = self._parameter(-6.0)
+        assert param._kind == 'generic'
+        assert not param.is_time_invariant
+
+    def test_constant_without_gate(self):
+        param = self._parameter(-6.0)
+        assert param.compile() == 'constant'
+        assert param.is_time_invariant
+        assert [param.get_value(t) for t in self.TIMES] == [-6.0] * len(self.TIMES)
+
+    def test_constant_out_of_bounds_stays_generic(self):
+        param = self._parameter(500.0)
+        with patch('parameters.parameter.log_clip_warning') as log:
+            assert param.compile() == 'generic'
+            assert param.get_value(0.0) == 100.0
+        log.assert_called_once()
+
+    def test_envelope_without_gate(self):
+        from envelopes.envelope import Envelope
+        env = Envelope({'type': 'cubic', 'points': [[0, -20], [1, -3], [2, -12]]})
+        param = self._parameter(env)
+        assert param.compile() == 'envelope'
+        assert not param.is_time_invariant
+        assert [param.get_value(t) for t in self.TIMES] == [env.evaluate(t) for t in self.TIMES]
+
+    def test_envelope_out_of_bounds_still_clamped(self):
+        from envelopes.envelope import Envelope
+        param = self._parameter(Envelope([[0, 0], [2, 300]]))
+        assert param.compile() == 'envelope'
+        with patch('parameters.parameter.log_clip_warning') as log:
+            assert param.get_value(2.0) == 100.0
+            assert param.get_value(0.5) == 75.0
+        log.assert_called_once()
+
+    def test_always_gate_additive(self):
+        from shared.probability_gate import AlwaysGate
+        param = self._parameter(0.0, mod_range=10.0)
+        param.set_probability_gate(AlwaysGate())
+        assert param.compile() == 'always_additive'
+        with patch.object(AlwaysGate, 'should_apply') as should_apply:
+            values = [param.get_value(t) for t in self.TIMES]
+        should_apply.assert_not_called()
+        assert all(-5.0 <= v <= 5.0 for v in values)
+        assert len(set(values)) > 1
+
+    def test_always_gate_additive_identical_to_generic(self):
+        from shared.probability_gate import AlwaysGate
+        from shared.rng import SeededRandom
+
+        def values(compiled):
+            param = self._parameter(0.0, mod_range=10.0)
+            param.set_rng(SeededRandom.from_seed(4))
+            param.set_probability_gate(AlwaysGate())
+            if compiled:
+                param.compile()
+            return [param.get_value(t) for t in self.TIMES]
+
+        assert values(True) == values(False)
+
+    def test_random_gate_stays_generic(self):
+        from shared.probability_gate import RandomGate
+        param = self._parameter(0.0, mod_range=10.0)
+        param.set_probability_gate(RandomGate(50.0))
+        assert param.compile() == 'generic'
+
+    def test_always_gate_invert_stays_generic(self):
+        from shared.probability_gate import AlwaysGate
+        param = self._parameter(0.0, mode='invert')
+        param.set_probability_gate(AlwaysGate())
+        assert param.compile() == 'generic'
+        assert param.get_value(0.0) == 1.0
+
+    def test_set_gate_resets_compilation(self):
+        from shared.probability_gate import AlwaysGate
+        param = self._parameter(1.0)
+        param.compile()
+        param.set_probability_gate(AlwaysGate())
+        assert param._kind == 'generic'
+        assert not param.is_time_invariant
+
+    def test_constant_get_values(self):
+        import numpy as np
+        param = self._parameter(-6.0)
+        param.compile()
+        values, clip_mask = param.get_values(np.linspace(0, 1, 5))
+        assert values.tolist() == [-6.0] * 5
+        assert not clip_mask.any()
+
+    def test_orchestrator_compiles_parameters(self):
+        orchestrator = ParameterOrchestrator(make_config())
+        schema = [
+            ParameterSpec('volume', 'volume', -6.0),
+            ParameterSpec('pan', 'pan', 0.0),
+        ]
+        params = orchestrator.create_all_parameters({'volume': -12.0, 'pan': [[0, 0], [1, 10]]}, schema)
+        assert params['volume']._kind == 'constant'
+        assert params['pan']._kind == 'envelope'
+
+    def test_orchestrator_constant_parameter_compiled(self):
+        orchestrator = ParameterOrchestrator(make_config())
+        assert orchestrator.create_constant_parameter('density', 10.0).is_time_invariant
+
+    def test_compiled_parameter_picklable(self):
+        import pickle
+        from envelopes.envelope import Envelope
+        param = self._parameter(Envelope([[0, 0], [1, 10]]))
+        param.compile()
+        restored = pickle.loads(pickle.dumps(param))
+        assert restored.get_value(0.5) == 5.0
@@ -414,7 +414,7 @@ class TestDensityParameterSchema:
 
     def test_expected_parameters(self):
         names = {s.name for s in DENSITY_PARAMETER_SCHEMA}
-        assert names == {'fill_factor', 'density', 'distribution', 'effective_density'}
+        assert names == {'fill_factor', 'density', 'integral_density', 'distribution', 'effective_density'}
 
     def test_density_mode_exclusive_group(self):
         """fill_factor e density appartengono a 'density_mode'."""
@@ -464,7 +464,7 @@ class TestAllSchemasRegistry:
 
     def test_expected_keys(self):
         assert set(ALL_SCHEMAS.keys()) == {
-            'stream', 'pointer', 'pitch', 'density'
+            'stream', 'pointer', 'pitch', 'density', 'voice'
         }
 
     def test_stream_reference(self):
@@ -594,7 +594,7 @@ class TestGetAllSchemaNames:
 
     def test_contains_all_expected_names(self):
         result = get_all_schema_names()
-        assert set(result) == {'stream', 'pointer', 'pitch', 'density'}
+        assert set(result) == {'stream', 'pointer', 'pitch', 'density', 'voice'}
 
     def test_count_matches_all_schemas(self):
         assert len(get_all_schema_names()) == len(ALL_SCHEMAS)
@@ -0,0 +1,173 @@
+"""
+Test per il modulo compact_score.py
+Testa CompactScoreEncoder: equivalenza con il formato verboso dopo
+l'espansione di carry e onset relativi (come fa il lettore di score Csound),
+precisione per colonna, statistiche e report.
+"""
+
+import pytest
+import numpy as np
+
+from core.grain import Grain
+from core.grain_block import GrainBlock, FLOAT_FIELDS
+from rendering.compact_score import (
+    CompactScoreEncoder,
+    DEFAULT_PRECISION,
+    parse_precision,
+)
+
+
+def _expand(text):
+    """
+    Espande le linee compatte in p-field numerici (p2..p9):
+    '.' copia il p-field precedente, '+' = p2 + p3 precedenti,
+    '^+x' / '^-x' = p2 precedente +/- x.
+    """
+    rows = []
+    for line in text.splitlines():
+        instr, *fields = line.split(' ')
+        values = []
+        for i, token in enumerate(fields):
+            prev = rows[-1] if rows else None
+            if token == '.':
+                values.append(prev[i])
+            elif i == 0 and token == '+':
+                values.append(prev[0] + prev[1])
+            elif i == 0 and token.startswith('^'):
+                values.append(prev[0] + float(token[1:]))
+            else:
+                values.append(float(token))
+        rows.append(values)
+    return np.array(rows)
+
+
+def _block(n=200, seed=0, contiguous=False):
+    rng = np.random.default_rng(seed)
+    durations = np.round(rng.choice([0.01, 0.02, 0.0125], n), 6)
+    if contiguous:
+        onsets = np.concatenate([[0.5], 0.5 + np.cumsum(durations[:-1])])
+    else:
+        onsets = np.sort(rng.random(n) * 20)
+    return GrainBlock(
+        onset=onsets,
+        duration=durations,
+        pointer_pos=rng.random(n) * 5,
+        pitch_ratio=rng.choice([1.0, -1.0, 1.5], n),
+        volume=rng.choice([-6.0, -12.0], n),
+        pan=rng.random(n) * 90 - 45,
+        sample_table=np.full(n, 3, dtype=np.int32),
+        envelope_table=rng.integers(4, 6, n).astype(np.int32),
+    )
+
+
+def _rounded(block, precision):
+    columns = [np.round(getattr(block, name), precision[name]) for name in FLOAT_FIELDS]
+    columns += [block.sample_table, block.envelope_table]
+    return np.column_stack(columns)
+
+
+class TestEncoding:
+
+    @pytest.mark.parametrize("contiguous", [False, True])
+    def test_expands_to_verbose_values(self, contiguous):
+        block = _block(contiguous=contiguous)
+        encoder = CompactScoreEncoder()
+        np.testing.assert_allclose(
+            _expand(encoder.encode(block)), _rounded(block, DEFAULT_PRECISION), atol=1e-9
+        )
+
+    def test_custom_precision(self):
+        block = _block()
+        precision = dict(DEFAULT_PRECISION, onset=3, pointer_pos=2, pan=0)
+        encoder = CompactScoreEncoder(precision={'onset': 3, 'pointer_pos': 2, 'pan': 0})
+        np.testing.assert_allclose(_expand(encoder.encode(block)), _rounded(block, precision), atol=1e-9)
+
+    def test_relative_onsets_do_not_drift(self):
+        n = 5000
+        block = GrainBlock(
+            onset=np.arange(n) * 0.0031 + 1000.0, duration=np.full(n, 0.001),
+            pointer_pos=np.zeros(n), pitch_ratio=np.ones(n), volume=np.zeros(n),
+            pan=np.zeros(n), sample_table=1, envelope_table=2,
+        )
+        text = CompactScoreEncoder().encode(block)
+        assert '^+0.0031' in text
+        np.testing.assert_allclose(_expand(text)[:, 0], np.round(block.onset, 6), atol=1e-7)
+
+    def test_first_line_is_complete(self):
+        first = CompactScoreEncoder().encode(_block()).splitlines()[0]
+        assert first.startswith('i1 ')
+        assert '.' not in first.split(' ')[1:] and '+' not in first
+
+    def test_contiguous_grains_use_plus(self):
+        lines = CompactScoreEncoder().encode(_block(contiguous=True)).splitlines()
+        assert all(line.split(' ')[1] == '+' for line in lines[1:])
+
+    def test_constant_columns_carried(self):
+        lines = CompactScoreEncoder().encode(_block()).splitlines()
+        assert all(line.split(' ')[7] == '.' for line in lines[1:])
+
+    def test_trailing_zeros_trimmed(self):
+        block = GrainBlock.from_grains([Grain(1.5, 0.05, 2.0, 1.0, -6.0, -0.0001, 1, 2)])
+        assert CompactScoreEncoder().encode(block) == 'i1 1.5 0.05 2 1 -6 0 1 2\n'
+
+    def test_options_disabled(self):
+        block = _block(contiguous=True)
+        text = CompactScoreEncoder(instrument=7, carry=False, relative_onsets=False).encode(block)
+        fields = [line.split(' ') for line in text.splitlines()]
+        assert all(row[0] == 'i7' for row in fields)
+        assert not any(token in ('.', '+') or token.startswith('^') for row in fields for token in row)
+
+    def test_empty_block(self):
+        assert CompactScoreEncoder().encode(GrainBlock.empty()) == ''
+
+    def test_smaller_than_verbose(self):
+        block = _block(contiguous=True)
+        encoder = CompactScoreEncoder()
+        assert len(encoder.encode(block)) < len(block.to_score_text()) / 1.5
+
+
+class TestStatsAndReport:
+
+    def test_stats_accumulate(self):
+        encoder = CompactScoreEncoder()
+        block = _block(contiguous=True)
+        encoder.encode(block)
+        encoder.encode(block)
+        assert encoder.stats['grains'] == 2 * len(block)
+        assert encoder.stats['verbose_bytes'] == 2 * len(block.to_score_text())
+        assert encoder.stats['contiguous_onsets'] == 2 * (len(block) - 1)
+
+    def test_reset_stats(self):
+        encoder = CompactScoreEncoder()
+        encoder.encode(_block())
+        encoder.reset_stats()
+        assert all(value == 0 for value in encoder.stats.values())
+
+    def test_report_written_next_to_score(self, tmp_path):
+        encoder = CompactScoreEncoder()
+        score = tmp_path / 'piece.sco'
+        score.write_text(encoder.encode(_block(contiguous=True)))
+        path = encoder.write_report(str(score))
+        assert path == str(tmp_path / 'piece.score_report.txt')
+        report = open(path).read()
+        assert f"Dimensione file: {score.stat().st_size} byte" in report
+        assert "p-field numerici da convertire" in report
+
+
+class TestPrecisionValidation:
+
+    def test_parse_precision(self):
+        assert parse_precision('onset=5, pan=1') == {'onset': 5, 'pan': 1}
+
+    @pytest.mark.parametrize("spec", ['gain=2', 'onset', 'onset=x'])
+    def test_parse_precision_invalid(self, spec):
+        with pytest.raises(ValueError, match="Precisione"):
+            parse_precision(spec)
+
+    def test_unknown_column_raises(self):
+        with pytest.raises(ValueError, match="sconosciute"):
+            CompactScoreEncoder(precision={'gain': 2})
+
+    def test_negative_precision_raises(self):
+        with pytest.raises(ValueError, match="intero >= 0"):
+            CompactScoreEncoder(precision={'onset': -1})
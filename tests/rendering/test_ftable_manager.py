@@ -18,6 +18,8 @@ Sezioni:
 10. Test integrazione - workflow completi multi-tipo
 11. Test edge cases e boundary conditions
 12. Test parametrizzati per copertura sistematica
+13. Test riferimenti per owner - pruning delle tabelle per-stem
+14. Test numerazione stable - numeri derivati dal contenuto
 
 Strategia di mocking:
 - WindowRegistry viene mockato per isolare FtableManager dalla
@@ -34,7 +36,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 from controllers.window_registry import WindowRegistry, WindowSpec
-from rendering.ftable_manager import FtableManager
+from rendering.ftable_manager import FtableManager, STABLE_TABLE_RANGES
 
 
 # =============================================================================
@@ -1024,4 +1026,124 @@ class TestParametrized:
     def test_invalid_window_names_raise(self, fm, invalid_name):
         """Nomi window non validi sollevano ValueError."""
         with pytest.raises(ValueError):
-            fm.register_window(invalid_name)
\ No newline at end of file
+            fm.register_window(invalid_name)
+
+
+# =============================================================================
+# 13. TEST RIFERIMENTI PER OWNER - PRUNING PER-STEM
+# =============================================================================
+
+class TestOwnerReferences:
+    """Ogni stem scrive solo le tabelle dei propri stream/cartridge."""
+
+    @pytest.fixture
+    def fm_owned(self, fm):
+        fm.register_sample("/audio/a.wav", owner="s1")      # 1
+        fm.register_window("hanning", owner="s1")           # 2
+        fm.register_sample("/audio/b.wav", owner="s2")      # 3
+        fm.register_window("hanning", owner="s2")           # 2 (dedup)
+        fm.register_sample("/audio/tape.wav", owner="t1")   # 4
+        return fm
+
+    def test_table_nums_per_owner(self, fm_owned):
+        assert fm_owned.get_table_nums("s1") == {1, 2}
+        assert fm_owned.get_table_nums("s2") == {2, 3}
+        assert fm_owned.get_table_nums("t1") == {4}
+        assert fm_owned.get_table_nums("missing") == set()
+
+    def test_get_all_tables_filtered(self, fm_owned):
+        assert set(fm_owned.get_all_tables(["s2"])) == {2, 3}
+        assert set(fm_owned.get_all_tables(["s1", "t1"])) == {1, 2, 4}
+        assert set(fm_owned.get_all_tables()) == {1, 2, 3, 4}
+
+    def test_unowned_tables_always_included(self, fm_owned):
+        fm_owned.register_sample("/audio/shared.wav")
+        assert set(fm_owned.get_all_tables(["t1"])) == {4, 5}
+
+    def test_write_to_file_prunes_samples(self, fm_owned):
+        buf = io.StringIO()
+        fm_owned.write_to_file(buf, owners=["s2"])
+        content = buf.getvalue()
+        assert '"/audio/b.wav"' in content
+        assert '"/audio/a.wav"' not in content
+        assert '"/audio/tape.wav"' not in content
+        assert "Window: hanning" in content
+
+    def test_numbering_unchanged_by_pruning(self, fm_owned):
+        buf = io.StringIO()
+        fm_owned.write_to_file(buf, owners=["s2"])
+        assert 'f 3 0 0 1 "/audio/b.wav"' in buf.getvalue()
+
+
+# =============================================================================
+# 14. TEST NUMERAZIONE STABLE
+# =============================================================================
+
+class TestStableNumbering:
+    """Numeri derivati da tipo + chiave, indipendenti dall'ordine."""
+
+    def test_invalid_numbering_raises(self):
+        with pytest.raises(ValueError, match="Numerazione"):
+            FtableManager(numbering="random")
+
+    def test_numbers_in_type_ranges(self):
+        fm = FtableManager(numbering="stable")
+        sample = fm.register_sample("/audio/voice.wav")
+        window = fm.register_window("hanning")
+        assert STABLE_TABLE_RANGES['sample'][0] <= sample < STABLE_TABLE_RANGES['sample'][1]
+        assert STABLE_TABLE_RANGES['window'][0] <= window < STABLE_TABLE_RANGES['window'][1]
+
+    def test_independent_of_registration_order(self):
+        a = FtableManager(numbering="stable")
+        a.register_sample("/audio/a.wav")
+        a.register_window("hamming")
+        b = FtableManager(numbering="stable")
+        b.register_sample("/audio/new.wav")
+        b.register_window("hanning")
+        assert b.register_window("hamming") == a.get_window_table_num("hamming")
+        assert b.register_sample("/audio/a.wav") == a.get_sample_table_num("/audio/a.wav")
+
+    def test_dedup_still_applies(self):
+        fm = FtableManager(numbering="stable")
+        assert fm.register_sample("/audio/a.wav") == fm.register_sample("/audio/a.wav")
+        assert len(fm.tables) == 1
+
+    def test_next_num_untouched(self):
+        fm = FtableManager(numbering="stable")
+        fm.register_sample("/audio/a.wav")
+        assert fm.next_num == 1
+
+    @pytest.mark.parametrize("order", [("/audio/a.wav", "/audio/b.wav"),
+                                       ("/audio/b.wav", "/audio/a.wav")])
+    def test_collision_raises_in_any_order(self, order):
+        """Con una sola cella ogni coppia collide: errore, mai un numero spostato."""
+        first, second = order
+        with patch.dict(STABLE_TABLE_RANGES, {'sample': (10, 11)}):
+            fm = FtableManager(numbering="stable")
+            assert fm.register_sample(first) == 10
+            with pytest.raises(ValueError, match="Collisione"):
+                fm.register_sample(second)
+        assert fm.tables == {10: ('sample', first)}
+        assert fm.get_sample_table_num(second) is None
+
+    def test_small_range_independent_of_order(self):
+        """Intervallo stretto: i numeri restano quelli dell'hash in ogni ordine."""
+        paths = [f"/audio/{name}.wav" for name in "abcdefgh"]
+        with patch.dict(STABLE_TABLE_RANGES, {'sample': (10, 30)}):
+            alone = {path: FtableManager(numbering="stable").register_sample(path) for path in paths}
+            results = []
+            for ordered in (paths, paths[::-1]):
+                fm = FtableManager(numbering="stable")
+                numbers = {}
+                for path in ordered:
+                    try:
+                        numbers[path] = fm.register_sample(path)
+                    except ValueError:
+                        pass
+                results.append(numbers)
+        assert len(set(alone.values())) < len(paths)  # almeno una collisione
+        for numbers in results:
+            assert all(num == alone[path] for path, num in numbers.items())
+
+    def test_repr_shows_numbering(self):
+        assert "numbering=stable" in repr(FtableManager(numbering="stable"))
@@ -0,0 +1,234 @@
+"""
+test_render_scheduler.py
+
+Test suite per RenderScheduler.
+
+Il binario csound e' sostituito da uno script Python locale (stand-in) che:
+- registra l'ordine di avvio degli stem
+- scrive argomenti e contenuto dello score su stdout (-> log dello stem)
+- crea il file audio indicato da -o
+- esce con il codice scritto nello score ('exit N')
+
+Coverage:
+  1. Stima del costo (grani x durata media)
+  2. RenderJob e command line
+  3. Scheduling longest-first
+  4. Rendering: output, log per stem, tempi, parallelismo
+  5. Errori: exit code, binario mancante, jobs non validi
+"""
+
+import os
+import stat
+import sys
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from core.grain_block import GrainBlock
+from rendering.render_scheduler import (
+    RenderJob,
+    RenderResult,
+    RenderScheduler,
+    estimate_render_cost,
+)
+
+
+STAND_IN = '''#!{python}
+import sys, time
+args = sys.argv[1:]
+score = args[args.index('-o') - 1]
+output = args[args.index('-o') + 1]
+with open({order!r}, 'a') as f:
+    f.write(score + '\\n')
+print('stand-in', ' '.join(args), flush=True)
+code = 0
+for line in open(score):
+    word, _, value = line.partition(' ')
+    if word == 'sleep':
+        time.sleep(float(value))
+    elif word == 'exit':
+        code = int(value)
+with open(output, 'w') as f:
+    f.write('audio')
+sys.exit(code)
+'''
+
+
+@pytest.fixture
+def csound(tmp_path):
+    """Stand-in eseguibile di csound; restituisce (path, file dell'ordine di avvio)."""
+    order = tmp_path / 'order.txt'
+    path = tmp_path / 'fake_csound'
+    path.write_text(STAND_IN.format(python=sys.executable, order=str(order)))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path), order
+
+
+def _score(tmp_path, name, body=''):
+    path = tmp_path / f'{name}.sco'
+    path.write_text(body)
+    return str(path)
+
+
+def _scheduler(tmp_path, csound_path, **kwargs):
+    return RenderScheduler(
+        orchestra=str(tmp_path / 'main.orc'),
+        output_dir=str(tmp_path / 'output'),
+        log_dir=str(tmp_path / 'logs'),
+        csound=csound_path,
+        **kwargs
+    )
+
+
+def _grains(durations):
+    n = len(durations)
+    return GrainBlock(
+        onset=np.arange(n, dtype=float), duration=np.asarray(durations, dtype=float),
+        pointer_pos=np.zeros(n), pitch_ratio=np.ones(n), volume=np.zeros(n), pan=np.zeros(n),
+        sample_table=np.ones(n, dtype=int), envelope_table=np.ones(n, dtype=int)
+    )
+
+
+# =============================================================================
+# 1. STIMA DEL COSTO
+# =============================================================================
+
+class TestEstimateRenderCost:
+
+    def test_sum_of_grain_durations(self):
+        stream = MagicMock(voices=[_grains([0.1, 0.2]), _grains([0.3])], duration=60.0)
+        assert estimate_render_cost(stream) == pytest.approx(0.6)
+
+    def test_fallback_to_duration_without_grains(self):
+        assert estimate_render_cost(MagicMock(voices=[], duration=12.0)) == 12.0
+
+    def test_cartridge_uses_duration(self):
+        cartridge = MagicMock(spec=['duration'], duration=4.0)
+        assert estimate_render_cost(cartridge) == 4.0
+
+
+# =============================================================================
+# 2. JOB E COMMAND LINE
+# =============================================================================
+
+class TestJob:
+
+    def test_paths_derived_from_stem(self, tmp_path):
+        scheduler = _scheduler(tmp_path, 'csound')
+        job = scheduler.job('generated/piece_s1.sco', cost=3.0)
+        assert job.stem == 'piece_s1'
+        assert job.output_path == os.path.join(str(tmp_path / 'output'), 'piece_s1.aif')
+        assert job.log_path == os.path.join(str(tmp_path / 'logs'), 'piece_s1.log')
+        assert job.cost == 3.0
+
+    def test_command_line(self, tmp_path):
+        scheduler = _scheduler(tmp_path, 'my-csound', search_paths={'SSDIR': 'refs'})
+        job = scheduler.job('a.sco')
+        command = scheduler.build_command(job)
+        assert command[0] == 'my-csound'
+        assert command[1] == f"--env:SSDIR+={os.path.abspath('refs')}"
+        assert command[2:] == ['-m', '134', scheduler.orchestra, 'a.sco', '-o', job.output_path]
+
+
+# =============================================================================
+# 3. SCHEDULING
+# =============================================================================
+
+class TestSchedule:
+
+    def test_longest_first(self, tmp_path):
+        scheduler = _scheduler(tmp_path, 'csound')
+        jobs = [scheduler.job('a.sco', 1.0), scheduler.job('b.sco', 5.0), scheduler.job('c.sco', 3.0)]
+        assert [job.stem for job in scheduler.schedule(jobs)] == ['b', 'c', 'a']
+
+    def test_ties_keep_original_order(self, tmp_path):
+        scheduler = _scheduler(tmp_path, 'csound')
+        jobs = [scheduler.job(f'{name}.sco', 2.0) for name in 'xyz']
+        assert [job.stem for job in scheduler.schedule(jobs)] == ['x', 'y', 'z']
+
+
+# =============================================================================
+# 4. RENDERING
+# =============================================================================
+
+class TestRender:
+
+    def test_renders_every_stem(self, tmp_path, csound):
+        scheduler = _scheduler(tmp_path, csound[0], jobs=2)
+        jobs = [scheduler.job(_score(tmp_path, name)) for name in ('a', 'b', 'c')]
+        results = scheduler.render(jobs)
+        assert [result.job.stem for result in results] == ['a', 'b', 'c']
+        assert all(result.ok for result in results)
+        assert all(os.path.exists(job.output_path) for job in jobs)
+
+    def test_start_order_is_longest_first(self, tmp_path, csound):
+        scheduler = _scheduler(tmp_path, csound[0], jobs=1)
+        jobs = [scheduler.job(_score(tmp_path, name), cost)
+                for name, cost in (('short', 1.0), ('long', 9.0), ('mid', 4.0))]
+        scheduler.render(jobs)
+        started = [os.path.basename(line) for line in csound[1].read_text().split()]
+        assert started == ['long.sco', 'mid.sco', 'short.sco']
+
+    def test_log_per_stem(self, tmp_path, csound):
+        scheduler = _scheduler(tmp_path, csound[0])
+        job = scheduler.job(_score(tmp_path, 'a'))
+        scheduler.render([job])
+        log = open(job.log_path).read()
+        assert log.startswith(' '.join(scheduler.build_command(job)))
+        assert 'stand-in' in log
+
+    def test_wall_time_per_stem(self, tmp_path, csound):
+        scheduler = _scheduler(tmp_path, csound[0])
+        result, = scheduler.render([scheduler.job(_score(tmp_path, 'a', 'sleep 0.2\n'))])
+        assert result.wall_time >= 0.2
+
+    def test_stems_run_in_parallel(self, tmp_path, csound):
+        scheduler = _scheduler(tmp_path, csound[0], jobs=4)
+        jobs = [scheduler.job(_score(tmp_path, f's{i}', 'sleep 0.5\n')) for i in range(4)]
+        start = time.perf_counter()
+        results = scheduler.render(jobs)
+        wall = time.perf_counter() - start
+        assert wall < sum(result.wall_time for result in results) * 0.75
+
+    def test_prints_report(self, tmp_path, csound, capsys):
+        scheduler = _scheduler(tmp_path, csound[0])
+        scheduler.render([scheduler.job(_score(tmp_path, 'a'))])
+        out = capsys.readouterr().out
+        assert '✓ a:' in out
+        assert 'Rendering completato' in out
+
+    def test_empty_jobs(self, tmp_path):
+        assert _scheduler(tmp_path, 'csound').render([]) == []
+
+
+# =============================================================================
+# 5. ERRORI
+# =============================================================================
+
+class TestErrors:
+
+    def test_failed_stem_reported(self, tmp_path, csound):
+        scheduler = _scheduler(tmp_path, csound[0], jobs=2)
+        jobs = [scheduler.job(_score(tmp_path, 'ok')), scheduler.job(_score(tmp_path, 'bad', 'exit 3\n'))]
+        ok, bad = scheduler.render(jobs)
+        assert ok.ok
+        assert not bad.ok and bad.returncode == 3
+
+    def test_missing_binary(self, tmp_path):
+        scheduler = _scheduler(tmp_path, str(tmp_path / 'no_csound'))
+        job = scheduler.job(_score(tmp_path, 'a'))
+        result, = scheduler.render([job])
+        assert result.returncode == -1
+        assert 'Impossibile avviare csound' in open(job.log_path).read()
+
+    @pytest.mark.parametrize('jobs', [0, -1, 1.5])
+    def test_invalid_jobs_raises(self, tmp_path, jobs):
+        with pytest.raises(ValueError, match="jobs"):
+            _scheduler(tmp_path, 'csound', jobs=jobs)
+
+    def test_result_ok(self):
+        job = RenderJob('a', 'a.sco', 'a.aif', 'a.log')
+        assert RenderResult(job, 0, 0.1).ok
+        assert not RenderResult(job, 1, 0.1).ok
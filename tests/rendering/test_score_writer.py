@@ -159,6 +159,7 @@ def make_mock_stream(
     """
     stream = Mock()
     stream.stream_id = stream_id
+    stream.table_owner = stream_id
     stream.grain_duration = grain_duration
     stream.density = density
     stream.distribution = distribution
@@ -170,6 +171,7 @@ def make_mock_stream(
         voices = [voice_0, voice_1]
 
     stream.voices = voices
+    stream.max_voices = max(len(voices), 1)
     return stream
 
 
@@ -400,6 +402,20 @@ class TestWriteEvents:
         tape_pos = content.index("TAPE RECORDER")
         assert gran_pos < tape_pos
 
+    def test_no_advance_by_default(self, writer, string_file, sample_stream):
+        writer._write_events(string_file, [sample_stream], [])
+        assert "\na " not in string_file.getvalue()
+        assert not string_file.getvalue().startswith("a ")
+
+    def test_advance_statement_before_events(self, writer, string_file, sample_stream):
+        """Estratto: advance statement prima di qualsiasi evento."""
+        writer.advance = 0.25
+        writer._write_events(string_file, [sample_stream], [])
+        content = string_file.getvalue()
+
+        assert "a 0 0 0.250000\n" in content
+        assert content.index("a 0 0") < content.index("GRANULAR STREAMS")
+
 
 # =============================================================================
 # 5. TEST _write_granular_streams
@@ -504,6 +520,20 @@ class TestWriteStreamSection:
             g.to_score_line.assert_called_once()
 
 
+    def test_grain_block_written_in_bulk(self, writer, string_file):
+        """Le voci GrainBlock vengono scritte identiche a Grain.to_score_line."""
+        from core.grain import Grain
+        from core.grain import Grain
+        from core.grain_block import GrainBlock
+        grains = [Grain(0.1 * i, 0.05, 1.0 + i, 1.0, -6.0, 15.0 * i, 1, 2) for i in range(4)]
+        stream = make_mock_stream(voices=[GrainBlock.from_grains(grains), GrainBlock.empty()])
+
+        writer._write_stream_section(string_file, stream)
+        content = string_file.getvalue()
+
+        assert ''.join(g.to_score_line() for g in grains) in content
+        assert "Voice 1" not in content
+
 # =============================================================================
 # 7. TEST _write_stream_metadata
 # =============================================================================
@@ -966,6 +996,23 @@ class TestWriteScore:
             content = f.read()
         assert content.strip().endswith("e")
 
+    def test_ftables_limited_to_written_elements(self, writer, tmp_path, sample_cartridge):
+        """Le ftable scritte sono solo quelle degli stream/cartridge del file."""
+        stream = make_mock_stream(stream_id='texture_01')
+        writer.write_score(str(tmp_path / 'stem.sco'), [stream], [sample_cartridge])
+
+        _, kwargs = writer.ftable_manager.write_to_file.call_args
+        assert kwargs['owners'] == ['texture_01', sample_cartridge.cartridge_id]
+
+    def test_ftables_owner_of_duplicate_stream_id(self, writer, tmp_path):
+        """Stream omonimi: le ftable sono scelte per table_owner, non per stream_id."""
+        stream = make_mock_stream(stream_id='texture1')
+        stream.table_owner = 'texture1#1'
+        writer.write_score(str(tmp_path / 'stem.sco'), [stream], [])
+
+        _, kwargs = writer.ftable_manager.write_to_file.call_args
+        assert kwargs['owners'] == ['texture1#1']
+
 
 # =============================================================================
 # 13. TEST INTEGRAZIONE - SCORE COMPLETO
@@ -1155,4 +1202,117 @@ class TestFormatParamParametrized:
     def test_format_special_values(self, writer, param, expected):
         """Valori speciali (None, stringhe)."""
         result = writer._format_param(param)
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+# =============================================================================
+# 16. TEST SCRITTURA INCREMENTALE (STREAMING)
+# =============================================================================
+
+def _make_streamed_stream(blocks, max_voices=1):
+    """Stream mock non ancora generato che produce blocchi in streaming."""
+    stream = make_mock_stream(voices=[])
+    stream.max_voices = max_voices
+    stream.generated = False
+    stream.iter_grain_blocks = Mock(return_value=iter(blocks))
+    return stream
+
+
+class TestStreamingWrite:
+    """Stream non generati vengono scritti blocco per blocco."""
+
+    def test_streamed_lines_written_in_order(self, writer, string_file):
+        blocks = [
+            [make_mock_grain(0.0, 0.05), make_mock_grain(0.1, 0.05)],
+            [make_mock_grain(0.2, 0.05)],
+        ]
+        stream = _make_streamed_stream(blocks)
+
+        writer._write_stream_section(string_file, stream)
+
+        output = string_file.getvalue()
+        lines = [g.to_score_line() for block in blocks for g in block]
+        assert output.index(lines[0]) < output.index(lines[1]) < output.index(lines[2])
+        assert ';   Streamed grains: 3' in output
+
+    def test_single_voice_header(self, writer, string_file):
+        writer._write_stream_section(string_file, _make_streamed_stream([]))
+        assert ';   Voice 0 (streamed)' in string_file.getvalue()
+
+    def test_multi_voice_header(self, writer, string_file):
+        writer._write_stream_section(string_file, _make_streamed_stream([], max_voices=3))
+        output = string_file.getvalue()
+        assert ';   Voices 0-2 (streamed, merged by onset)' in output
+        assert 'Voice 0 (streamed)' not in output
+
+    def test_uses_writer_chunk_size(self, ftable_manager, string_file):
+        SW = _get_score_writer_class()
+        sw = SW(ftable_manager, chunk_size=128)
+        stream = _make_streamed_stream([])
+
+        sw._write_stream_section(string_file, stream)
+
+        stream.iter_grain_blocks.assert_called_once_with(128)
+
+    def test_metadata_defers_total(self, writer, string_file):
+        stream = _make_streamed_stream([])
+        writer._write_stream_metadata(string_file, stream)
+        assert 'Total grains: streamed' in string_file.getvalue()
+
+    def test_generated_stream_not_streamed(self, writer, string_file, sample_stream):
+        sample_stream.iter_grain_blocks = Mock()
+        writer._write_stream_section(string_file, sample_stream)
+        sample_stream.iter_grain_blocks.assert_not_called()
+
+    def test_summary_counts_streamed_grains(self, writer, tmp_path, capsys):
+        blocks = [[make_mock_grain(i * 0.1, 0.05) for i in range(4)]]
+        stream = _make_streamed_stream(blocks)
+
+        writer.write_score(str(tmp_path / 'out.sco'), [stream], [])
+
+        assert '4 grani totali' in capsys.readouterr().out
+
+
+# =============================================================================
+# CODIFICA COMPATTA
+# =============================================================================
+
+class TestCompactEncoding:
+    """ScoreWriter con CompactScoreEncoder."""
+
+    @pytest.fixture
+    def compact_writer(self, ftable_manager):
+        from rendering.compact_score import CompactScoreEncoder
+        return _get_score_writer_class()(ftable_manager, encoder=CompactScoreEncoder())
+
+    @pytest.fixture
+    def block_stream(self):
+        from core.grain import Grain
+        from core.grain_block import GrainBlock
+        grains = [Grain(0.1 * i, 0.1, 1.0 + i, 1.0, -6.0, 0.0, 1, 2) for i in range(4)]
+        return make_mock_stream(voices=[GrainBlock.from_grains(grains)])
+
+    def test_grain_blocks_encoded(self, compact_writer, string_file, block_stream):
+        compact_writer._write_stream_section(string_file, block_stream)
+        content = string_file.getvalue()
+        assert 'i1 0 0.1 1 1 -6 0 1 2\n' in content
+        assert 'i1 + . 2 . . . . .\n' in content
+        assert 'i "Grain"' not in content
+
+    def test_header_documents_encoding(self, compact_writer, string_file):
+        compact_writer._write_header(string_file)
+        assert "Compact encoding: i1 = instr Grain" in string_file.getvalue()
+
+    def test_report_written_with_score(self, compact_writer, tmp_path, block_stream):
+        filepath = str(tmp_path / 'piece.sco')
+        compact_writer.write_score(filepath, [block_stream], [])
+        report = (tmp_path / 'piece.score_report.txt').read_text()
+        assert "Grani: 4" in report
+
+    def test_stats_reset_per_file(self, compact_writer, tmp_path, block_stream):
+        compact_writer.write_score(str(tmp_path / 'a.sco'), [block_stream], [])
+        compact_writer.write_score(str(tmp_path / 'b.sco'), [block_stream], [])
+        assert compact_writer.encoder.stats['grains'] == 4
+
+    def test_cartridges_only_no_report(self, compact_writer, tmp_path, sample_cartridge):
+        compact_writer.write_score(str(tmp_path / 'tape.sco'), [], [sample_cartridge])
+        assert not (tmp_path / 'tape.score_report.txt').exists()
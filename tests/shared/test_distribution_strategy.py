@@ -12,6 +12,8 @@ Coverage:
 6. Test get_bounds() - bounds teorici
 7. Test edge cases e validazione
 8. Test estensibilità del registry
+9. Test sample_many - versione batch
+10. Test distribuzioni batch (triangular, truncated_gaussian, beta, cauchy)
 """
 
 import pytest
@@ -21,10 +23,17 @@ import sys
 import os
 from abc import ABC
 
+import numpy as np
+
 from shared.distribution_strategy import (
     DistributionStrategy,
     UniformDistribution,
     GaussianDistribution,
+    BatchDistribution,
+    TriangularDistribution,
+    TruncatedGaussianDistribution,
+    BetaDistribution,
+    ClippedCauchyDistribution,
     DistributionFactory,
 )
 # =============================================================================
@@ -382,8 +391,10 @@ class TestDistributionFactory:
         with pytest.raises(ValueError):
             DistributionFactory.create('UNIFORM')
     
-    def test_register_new_distribution(self):
+    def test_register_new_distribution(self, monkeypatch):
         """Registrazione di una nuova distribuzione."""
+        # Registry isolato: 'triangular' e' anche una distribuzione built-in
+        monkeypatch.setattr(DistributionFactory, '_registry', dict(DistributionFactory._registry))
         class TriangularDistribution(DistributionStrategy):
             def sample(self, center, spread):
                 return center
@@ -698,4 +709,235 @@ class TestDistributionStrategyABCCoverage:
         # I pass negli astratti vengono coperti solo se chiamati esplicitamente
         # Non e' possibile chiamare super() su abstractmethod senza override
         # quindi questi pass rimangono unreachable a meno di usare __wrapped__
-        pass
\ No newline at end of file
+        pass
+
+# =============================================================================
+# 9. TEST SORGENTE CASUALE (rng)
+# =============================================================================
+
+class TestDistributionRng:
+    """Distribuzioni con SeededRandom iniettato."""
+
+    def test_default_rng_none(self):
+        assert UniformDistribution().rng is None
+
+    def test_factory_passes_rng(self):
+        from shared.rng import SeededRandom
+        rng = SeededRandom.from_seed(1)
+        assert DistributionFactory.create('gaussian', rng=rng).rng is rng
+
+    def test_factory_rng_with_no_arg_init(self, monkeypatch):
+        """Distribuzioni registrate con __init__ senza argomenti."""
+        from shared.rng import SeededRandom
+        monkeypatch.setattr(DistributionFactory, '_registry', dict(DistributionFactory._registry))
+
+        class FixedDistribution(UniformDistribution):
+            def __init__(self):
+                self.offset = 1.0
+
+            def sample(self, center, spread):
+                return super().sample(center + self.offset, spread)
+
+        DistributionFactory.register('fixed', FixedDistribution)
+        rng = SeededRandom.from_seed(3)
+        dist = DistributionFactory.create('fixed', rng=rng)
+        assert dist.rng is rng
+        assert DistributionFactory.create('fixed').rng is None
+        assert 10.5 <= dist.sample(10.0, 1.0) <= 11.5
+
+    @pytest.mark.parametrize("mode", ['uniform', 'gaussian'])
+    def test_seeded_samples_reproducible(self, mode):
+        from shared.rng import SeededRandom
+        a = DistributionFactory.create(mode, rng=SeededRandom.from_seed(5))
+        b = DistributionFactory.create(mode, rng=SeededRandom.from_seed(5))
+        assert [a.sample(0.0, 1.0) for _ in range(20)] == [b.sample(0.0, 1.0) for _ in range(20)]
+
+    def test_seeded_uniform_bounds(self):
+        from shared.rng import SeededRandom
+        dist = UniformDistribution(SeededRandom.from_seed(2))
+        values = [dist.sample(10.0, 4.0) for _ in range(500)]
+        assert all(8.0 <= v <= 12.0 for v in values)
+
+    def test_seeded_ignores_global_random(self):
+        from shared.rng import SeededRandom
+        dist = GaussianDistribution(SeededRandom.from_seed(2))
+        with patch('random.gauss', side_effect=AssertionError("random globale")):
+            dist.sample(0.0, 1.0)
+
+
+# =============================================================================
+# 10. TEST SAMPLE_MANY (versione batch)
+# =============================================================================
+
+class TestDistributionSampleMany:
+    """sample_many(): default per elemento tramite sample()."""
+
+    def test_default_calls_sample_per_element(self):
+        class ScalarOnly(DistributionStrategy):
+            name = 'scalar_only'
+            def sample(self, center, spread):
+                return center + spread
+            def get_bounds(self, center, spread):
+                return (center, center + spread)
+
+        dist = ScalarOnly()
+        with patch.object(ScalarOnly, 'sample', side_effect=lambda c, s: c + s) as sample:
+            result = dist.sample_many(np.array([1.0, 2.0]), np.array([0.5, 0.25]))
+        np.testing.assert_array_equal(result, [1.5, 2.25])
+        assert sample.call_count == 2
+
+    def test_returns_float64(self):
+        result = GaussianDistribution().sample_many(np.array([0.0]), np.array([0.0]))
+        assert result.dtype == np.float64
+        assert result.tolist() == [0.0]
+
+    def test_empty(self):
+        assert len(UniformDistribution().sample_many(np.array([]), np.array([]))) == 0
+
+    @pytest.mark.parametrize("mode", ['uniform', 'gaussian'])
+    def test_seeded_reproducible(self, mode):
+        from shared.rng import SeededRandom
+        centers = np.zeros(50)
+        spreads = np.ones(50)
+        a = DistributionFactory.create(mode, rng=SeededRandom.from_seed(5)).sample_many(centers, spreads)
+        b = DistributionFactory.create(mode, rng=SeededRandom.from_seed(5)).sample_many(centers, spreads)
+        np.testing.assert_array_equal(a, b)
+
+    @pytest.mark.parametrize("mode", ['uniform', 'gaussian'])
+    def test_seeded_matches_scalar_sequence(self, mode):
+        """Con seed, sample_many() == sample() ripetuto (stesso flusso)."""
+        from shared.rng import SeededRandom
+        centers = np.array([0.0, 5.0, -2.0, 1.0, 3.0])
+        spreads = np.array([1.0, 0.0, 2.0, 0.5, 0.0])
+        batch = DistributionFactory.create(mode, rng=SeededRandom.from_seed(9))
+        scalar = DistributionFactory.create(mode, rng=SeededRandom.from_seed(9))
+        expected = [scalar.sample(c, s) for c, s in zip(centers, spreads)]
+        np.testing.assert_allclose(batch.sample_many(centers, spreads), expected, rtol=1e-12)
+
+    @pytest.mark.parametrize("mode", ['uniform', 'gaussian'])
+    def test_vectorized_does_not_call_sample(self, mode):
+        dist = DistributionFactory.create(mode)
+        with patch.object(type(dist), 'sample', side_effect=AssertionError("scalare")):
+            dist.sample_many(np.zeros(10), np.ones(10))
+
+    @pytest.mark.parametrize("mode", ['uniform', 'gaussian'])
+    def test_zero_spread_returns_center(self, mode):
+        centers = np.array([1.0, 2.0, 3.0])
+        result = DistributionFactory.create(mode).sample_many(centers, np.zeros(3))
+        np.testing.assert_array_equal(result, centers)
+
+    def test_uniform_bounds(self):
+        result = UniformDistribution().sample_many(np.full(2000, 10.0), np.full(2000, 4.0))
+        assert result.min() >= 8.0 and result.max() <= 12.0
+
+    def test_explicit_generator(self):
+        centers, spreads = np.zeros(20), np.ones(20)
+        a = GaussianDistribution().sample_many(centers, spreads, rng=np.random.default_rng(3))
+        b = GaussianDistribution().sample_many(centers, spreads, rng=np.random.default_rng(3))
+        np.testing.assert_array_equal(a, b)
+
+    def test_does_not_modify_centers(self):
+        centers = np.zeros(5)
+        UniformDistribution().sample_many(centers, np.ones(5))
+        assert centers.tolist() == [0.0] * 5
+
+
+# =============================================================================
+# 11. TEST DISTRIBUZIONI BATCH
+# =============================================================================
+
+BATCH_MODES = ['triangular', 'truncated_gaussian', 'beta', 'cauchy']
+
+
+class TestBatchDistributions:
+    """Distribuzioni nate batch: registry, bounds, statistiche, sample()."""
+
+    N = 20000
+
+    @pytest.fixture
+    def seeded(self):
+        from shared.rng import SeededRandom
+        return lambda mode: DistributionFactory.create(mode, rng=SeededRandom.from_seed(11))
+
+    @pytest.mark.parametrize("mode,cls", [
+        ('triangular', TriangularDistribution),
+        ('truncated_gaussian', TruncatedGaussianDistribution),
+        ('beta', BetaDistribution),
+        ('cauchy', ClippedCauchyDistribution),
+    ])
+    def test_factory_creates(self, mode, cls):
+        dist = DistributionFactory.create(mode)
+        assert isinstance(dist, cls)
+        assert isinstance(dist, BatchDistribution)
+        assert dist.name == mode
+
+    @pytest.mark.parametrize("mode", BATCH_MODES)
+    def test_within_bounds(self, mode, seeded):
+        dist = seeded(mode)
+        values = dist.sample_many(np.full(self.N, 10.0), np.full(self.N, 2.0))
+        low, high = dist.get_bounds(10.0, 2.0)
+        assert values.min() >= low and values.max() <= high
+
+    @pytest.mark.parametrize("mode", BATCH_MODES)
+    def test_symmetric_around_center(self, mode, seeded):
+        values = seeded(mode).sample_many(np.full(self.N, 5.0), np.ones(self.N))
+        assert abs(np.median(values) - 5.0) < 0.05
+
+    @pytest.mark.parametrize("mode", BATCH_MODES)
+    def test_zero_spread_returns_center(self, mode):
+        dist = DistributionFactory.create(mode)
+        centers = np.array([1.0, 2.0])
+        np.testing.assert_array_equal(dist.sample_many(centers, np.zeros(2)), centers)
+        assert dist.sample(3.0, 0.0) == 3.0
+
+    @pytest.mark.parametrize("mode", BATCH_MODES)
+    def test_scalar_sample_delegates(self, mode, seeded):
+        dist = seeded(mode)
+        value = dist.sample(0.0, 1.0)
+        assert isinstance(value, float)
+        low, high = dist.get_bounds(0.0, 1.0)
+        assert low <= value <= high
+
+    @pytest.mark.parametrize("mode", BATCH_MODES)
+    def test_seeded_reproducible(self, mode, seeded):
+        centers, spreads = np.zeros(100), np.ones(100)
+        np.testing.assert_array_equal(
+            seeded(mode).sample_many(centers, spreads),
+            seeded(mode).sample_many(centers, spreads)
+        )
+
+    def test_triangular_variance(self, seeded):
+        """Triangolare simmetrica su [-1/2, 1/2]: varianza 1/24."""
+        values = seeded('triangular').sample_many(np.zeros(self.N), np.ones(self.N))
+        assert values.var() == pytest.approx(1 / 24, rel=0.05)
+
+    def test_triangular_denser_than_uniform_at_center(self, seeded):
+        tri = seeded('triangular').sample_many(np.zeros(self.N), np.ones(self.N))
+        uni = UniformDistribution().sample_many(np.zeros(self.N), np.ones(self.N))
+        assert (np.abs(tri) < 0.1).mean() > (np.abs(uni) < 0.1).mean()
+
+    def test_truncated_gaussian_std_below_sigma(self, seeded):
+        """Troncata a ±2σ: deviazione standard ~0.88σ."""
+        values = seeded('truncated_gaussian').sample_many(np.zeros(self.N), np.full(self.N, 3.0))
+        assert values.std() == pytest.approx(0.88 * 3.0, rel=0.03)
+        assert np.abs(values).max() <= 6.0
+
+    def test_beta_variance(self, seeded):
+        """Beta(2, 2) - 1/2: varianza 1/20."""
+        values = seeded('beta').sample_many(np.zeros(self.N), np.ones(self.N))
+        assert values.var() == pytest.approx(1 / 20, rel=0.05)
+
+    def test_cauchy_heavy_tails_clipped(self, seeded):
+        values = seeded('cauchy').sample_many(np.zeros(self.N), np.ones(self.N))
+        limit = ClippedCauchyDistribution.CLIP
+        assert (np.abs(values) > 3.0).any()
+        assert np.abs(values).max() <= limit
+        # Cauchy: meta' dei valori entro ±γ
+        assert (np.abs(values) < 1.0).mean() == pytest.approx(0.5, abs=0.03)
+
+    def test_per_element_spreads(self, seeded):
+        centers = np.array([0.0, 100.0])
+        spreads = np.array([0.0, 1.0])
+        result = seeded('triangular').sample_many(centers, spreads)
+        assert result[0] == 0.0
+        assert 99.5 <= result[1] <= 100.5
@@ -12,6 +12,7 @@ from shared.logger import (
     get_clip_logger,
     get_clip_log_path,
     log_clip_warning,
+    log_clip_summary,
     log_config_warning,
     log_loop_drift_warning,
     log_loop_dynamic_mode,
@@ -26,7 +27,7 @@ from shared.logger import (
 # =============================================================================
 
 @pytest.fixture(autouse=True)
-def reset_logger_state():
+def reset_logger_state(clip_log_dir):
     """
     Resetta lo stato globale del modulo shared.logger prima e dopo ogni test.
     Chiude tutti gli handler aperti per non lasciare file descriptor pendenti.
@@ -42,7 +43,7 @@ def reset_logger_state():
             'enabled': True,
             'console_enabled': True,
             'file_enabled': True,
-            'log_dir': './logs',
+            'log_dir': clip_log_dir,
             'log_filename': None,
             'validation_mode': 'strict',
             'log_transformations': True,
@@ -1069,3 +1070,50 @@ class TestIntegration:
         content = log_file.read_text()
         assert '[CONFIG]' in content
 
+
+# =============================================================================
+# TEST: log_clip_summary
+# =============================================================================
+
+class TestLogClipSummary:
+
+    def _capture(self, tmp_path, *args, **kwargs):
+        configure_clip_logger(
+            enabled=True,
+            file_enabled=True,
+            console_enabled=False,
+            log_dir=str(tmp_path),
+            yaml_name='clipsummary'
+        )
+        l = get_clip_logger()
+        captured = []
+        with patch.object(l, 'warning', side_effect=lambda msg: captured.append(msg)):
+            log_clip_summary(*args, **kwargs)
+        return captured
+
+    def test_does_not_raise_when_logger_none(self):
+        configure_clip_logger(enabled=False)
+        log_clip_summary('s1', 'pan', [1.0], [3.0], [2.0], 0.0, 2.0)
+
+    def test_single_line_for_batch(self, tmp_path):
+        captured = self._capture(
+            tmp_path, 's1', 'volume', [0.1, 0.2, 0.5], [7.0, -130.0, 9.0], [6.0, -120.0, 6.0], -120.0, 6.0
+        )
+        assert len(captured) == 1
+        assert '3 clip' in captured[0]
+        assert 'x1' in captured[0] and 'x2' in captured[0]
+
+    def test_reports_time_span_and_worst_deviation(self, tmp_path):
+        captured = self._capture(
+            tmp_path, 's1', 'volume', [0.1, 0.2, 0.5], [7.0, -130.0, 9.0], [6.0, -120.0, 6.0], -120.0, 6.0
+        )
+        assert 't=[0.100, 0.500]s' in captured[0]
+        assert '-10.000000' in captured[0]
+        assert '@ t=0.200s' in captured[0]
+
+    def test_empty_batch_not_logged(self, tmp_path):
+        assert self._capture(tmp_path, 's1', 'volume', [], [], [], 0.0, 1.0) == []
+
+    def test_env_tag(self, tmp_path):
+        captured = self._capture(tmp_path, 's1', 'pan', [1.0], [3.0], [2.0], 0.0, 2.0, is_envelope=True)
+        assert '(ENV)' in captured[0]
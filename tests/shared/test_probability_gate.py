@@ -24,6 +24,8 @@ sys.path.insert(0, '/home/claude')
 from abc import ABC, abstractmethod
 import random
 
+import numpy as np
+
 class ProbabilityGate(ABC):
     """Gateway pattern: interfaccia unificata per gate probabilistici."""
     
@@ -742,4 +744,112 @@ class TestProbabilityGateParametrized:
         gate = RandomGate(prob)
         
         values = [gate.get_probability_value(t) for t in range(10)]
-        assert all(v == prob for v in values)
\ No newline at end of file
+        assert all(v == prob for v in values)
+
+
+# =============================================================================
+# 9. TEST SHOULD_APPLY_MANY (modulo reale)
+# =============================================================================
+
+class TestShouldApplyMany:
+    """should_apply_many() di shared.probability_gate (modulo reale)."""
+
+    def test_never_gate_all_false(self):
+        from shared.probability_gate import NeverGate as RealNeverGate
+        mask = RealNeverGate().should_apply_many(np.linspace(0, 1, 5))
+        assert mask.dtype == bool
+        assert not mask.any()
+
+    def test_always_gate_all_true(self):
+        from shared.probability_gate import AlwaysGate as RealAlwaysGate
+        assert RealAlwaysGate().should_apply_many(np.linspace(0, 1, 5)).all()
+
+    def test_default_follows_should_apply(self):
+        from shared.probability_gate import ProbabilityGate as RealProbabilityGate
+
+        class _HalfGate(RealProbabilityGate):
+            def should_apply(self, time):
+                return time < 0.5
+
+            def get_probability_value(self, time):
+                return 50.0
+
+            @property
+            def mode(self):
+                return 'half'
+
+        mask = _HalfGate().should_apply_many(np.array([0.0, 0.4, 0.5, 0.9]))
+        assert mask.tolist() == [True, True, False, False]
+
+    def test_empty_times(self):
+        from shared.probability_gate import AlwaysGate as RealAlwaysGate
+        assert len(RealAlwaysGate().should_apply_many(np.array([]))) == 0
+
+    def test_never_gate_does_not_call_should_apply(self):
+        from shared.probability_gate import NeverGate as RealNeverGate
+        with patch.object(RealNeverGate, 'should_apply', side_effect=AssertionError):
+            RealNeverGate().should_apply_many(np.zeros(3))
+
+    def test_random_gate_seeded_identical_to_scalar(self):
+        from shared.probability_gate import RandomGate as RealRandomGate
+        from shared.rng import SeededRandom
+        times = np.linspace(0, 1, 200)
+        scalar = RealRandomGate(30.0, SeededRandom.from_seed(6))
+        batch = RealRandomGate(30.0, SeededRandom.from_seed(6))
+        expected = [scalar.should_apply(t) for t in times.tolist()]
+        assert batch.should_apply_many(times).tolist() == expected
+
+    def test_random_gate_statistics(self):
+        from shared.probability_gate import RandomGate as RealRandomGate
+        mask = RealRandomGate(25.0).should_apply_many(np.zeros(20000), np.random.default_rng(1))
+        assert mask.mean() == pytest.approx(0.25, abs=0.01)
+
+    def test_random_gate_single_draw_array(self):
+        from shared.probability_gate import RandomGate as RealRandomGate
+        rng = Mock()
+        rng.uniform.return_value = np.array([10.0, 60.0, 49.9])
+        mask = RealRandomGate(50.0).should_apply_many(np.zeros(3), rng)
+        assert mask.tolist() == [True, False, True]
+        rng.uniform.assert_called_once_with(0, 100, 3)
+
+    def test_envelope_gate_seeded_identical_to_scalar(self):
+        from envelopes.envelope import Envelope as RealEnvelope
+        from shared.probability_gate import EnvelopeGate as RealEnvelopeGate
+        from shared.rng import SeededRandom
+        env = RealEnvelope([[0, 0], [1, 100], [2, 20]])
+        times = np.linspace(0, 2, 300)
+        scalar = RealEnvelopeGate(env, SeededRandom.from_seed(3))
+        batch = RealEnvelopeGate(env, SeededRandom.from_seed(3))
+        expected = [scalar.should_apply(t) for t in times.tolist()]
+        assert batch.should_apply_many(times).tolist() == expected
+
+    def test_envelope_gate_extremes(self):
+        from envelopes.envelope import Envelope as RealEnvelope
+        from shared.probability_gate import EnvelopeGate as RealEnvelopeGate
+        gate = RealEnvelopeGate(RealEnvelope([[0, 0], [1, 0], [1.5, 100], [2, 100]]))
+        times = np.array([0.0, 0.5, 1.6, 2.0, 3.0])
+        assert gate.should_apply_many(times, np.random.default_rng(0)).tolist() == [
+            False, False, True, True, True
+        ]
+
+    def test_shared_probability_evaluated_once_per_array(self):
+        from envelopes.envelope import Envelope as RealEnvelope
+        from shared.probability_gate import (
+            EnvelopeGate as RealEnvelopeGate, EnvelopeProbability
+        )
+        env = RealEnvelope([[0, 0], [1, 100]])
+        probability = EnvelopeProbability(env)
+        gates = [RealEnvelopeGate(env, probability=probability) for _ in range(5)]
+        times = np.linspace(0, 1, 50)
+        with patch.object(RealEnvelope, 'evaluate_many', wraps=env.evaluate_many) as evaluate_many:
+            for gate in gates:
+                gate.should_apply_many(times)
+            assert evaluate_many.call_count == 1
+            gates[0].should_apply_many(times.copy())
+            assert evaluate_many.call_count == 2
+
+    def test_own_probability_by_default(self):
+        from envelopes.envelope import Envelope as RealEnvelope
+        from shared.probability_gate import EnvelopeGate as RealEnvelopeGate
+        env = RealEnvelope([[0, 0], [1, 100]])
+        assert RealEnvelopeGate(env)._probability is not RealEnvelopeGate(env)._probability
@@ -0,0 +1,155 @@
+"""
+test_rng.py
+
+Test per shared/rng.py: gerarchia deterministica di SeededRandom.
+
+Coverage:
+1. Costruzione e validazione del seed
+2. Derivazione dei figli (indipendenza, stabilita', percorso)
+3. API compatibile con il modulo random
+4. Serializzazione (worker di generazione parallela)
+"""
+
+import pickle
+import pytest
+import numpy as np
+
+from shared.rng import SeededRandom, child_rng, stable_key, batch_generator
+
+
+def _draws(rng, n=5):
+    return [rng.uniform(0, 1) for _ in range(n)]
+
+
+class TestSeededRandomConstruction:
+
+    def test_same_seed_same_sequence(self):
+        assert _draws(SeededRandom.from_seed(42)) == _draws(SeededRandom.from_seed(42))
+
+    def test_different_seed_different_sequence(self):
+        assert _draws(SeededRandom.from_seed(1)) != _draws(SeededRandom.from_seed(2))
+
+    def test_zero_seed_valid(self):
+        assert len(_draws(SeededRandom.from_seed(0))) == 5
+
+    @pytest.mark.parametrize("seed", [-1, 1.5, '42', None, True])
+    def test_invalid_seed_raises(self, seed):
+        with pytest.raises(ValueError, match="seed"):
+            SeededRandom.from_seed(seed)
+
+    def test_generator_is_numpy_generator(self):
+        assert isinstance(SeededRandom.from_seed(3).generator, np.random.Generator)
+
+    def test_generator_cached(self):
+        rng = SeededRandom.from_seed(3)
+        assert rng.generator is rng.generator
+
+
+class TestSeededRandomChildren:
+
+    def test_child_reproducible(self):
+        a = SeededRandom.from_seed(7).child('volume')
+        b = SeededRandom.from_seed(7).child('volume')
+        assert _draws(a) == _draws(b)
+
+    def test_siblings_independent(self):
+        root = SeededRandom.from_seed(7)
+        assert _draws(root.child('volume')) != _draws(root.child('pan'))
+
+    def test_child_independent_from_parent_consumption(self):
+        """Consumare il padre non sposta i figli: contano solo i nomi."""
+        fresh = SeededRandom.from_seed(7)
+        used = SeededRandom.from_seed(7)
+        _draws(used, 100)
+        assert _draws(fresh.child('s1')) == _draws(used.child('s1'))
+
+    def test_child_order_irrelevant(self):
+        root_a = SeededRandom.from_seed(7)
+        first_a = root_a.child('a')
+        root_a.child('b')
+        root_b = SeededRandom.from_seed(7)
+        root_b.child('b')
+        first_b = root_b.child('a')
+        assert _draws(first_a) == _draws(first_b)
+
+    def test_nested_path(self):
+        rng = SeededRandom.from_seed(1).child('s1').child('volume').child('gate')
+        assert rng.path == 's1/volume/gate'
+
+    def test_nested_differs_from_flat(self):
+        root = SeededRandom.from_seed(1)
+        assert _draws(root.child('a').child('b')) != _draws(root.child('b'))
+
+    def test_child_rng_propagates_none(self):
+        assert child_rng(None, 'volume') is None
+
+    def test_child_rng_derives(self):
+        root = SeededRandom.from_seed(5)
+        assert _draws(child_rng(root, 'x')) == _draws(SeededRandom.from_seed(5).child('x'))
+
+    def test_stable_key_deterministic(self):
+        assert stable_key('texture1') == stable_key('texture1')
+        assert stable_key('texture1') != stable_key('texture2')
+
+
+class TestSeededRandomApi:
+
+    @pytest.fixture
+    def rng(self):
+        return SeededRandom.from_seed(11)
+
+    def test_random_in_unit_interval(self, rng):
+        values = [rng.random() for _ in range(200)]
+        assert all(0.0 <= v < 1.0 for v in values)
+
+    def test_uniform_bounds_and_type(self, rng):
+        values = [rng.uniform(-2.0, 3.0) for _ in range(200)]
+        assert all(type(v) is float for v in values)
+        assert all(-2.0 <= v <= 3.0 for v in values)
+
+    def test_gauss_statistics(self, rng):
+        values = np.array([rng.gauss(10.0, 2.0) for _ in range(5000)])
+        assert values.mean() == pytest.approx(10.0, abs=0.15)
+        assert values.std() == pytest.approx(2.0, rel=0.05)
+
+    def test_choice_returns_element(self, rng):
+        options = ['hanning', 'hamming', 'bartlett']
+        picks = {rng.choice(options) for _ in range(100)}
+        assert picks == set(options)
+        assert all(type(p) is str for p in picks)
+
+    def test_choice_empty_raises(self, rng):
+        with pytest.raises(IndexError):
+            rng.choice([])
+
+
+class TestSeededRandomPickle:
+
+    def test_pickle_preserves_sequence(self):
+        rng = SeededRandom.from_seed(9).child('s1')
+        clone = pickle.loads(pickle.dumps(rng))
+        assert _draws(clone) == _draws(rng)
+        assert clone.path == 's1'
+
+
+class TestBatchGenerator:
+
+    def test_seeded_returns_node_generator(self):
+        rng = SeededRandom.from_seed(4)
+        assert batch_generator(rng) is rng.generator
+
+    def test_seeded_batch_continues_scalar_sequence(self):
+        a = SeededRandom.from_seed(4)
+        b = SeededRandom.from_seed(4)
+        scalar = [a.uniform(0, 100) for _ in range(10)]
+        assert batch_generator(b).uniform(0, 100, 10).tolist() == scalar
+
+    def test_unseeded_follows_global_random(self):
+        import random
+        random.seed(8)
+        first = batch_generator(None).random(5)
+        random.seed(8)
+        assert batch_generator(None).random(5).tolist() == first.tolist()
+
+    def test_unseeded_returns_generator(self):
+        assert isinstance(batch_generator(None), np.random.Generator)
@@ -20,6 +20,8 @@ Copre:
     11. StrategyFactory.create_density_strategy - factory density
     12. Integrazione end-to-end
     13. Edge cases e robustezza
+    14. calculate_density_many - versione batch
+    15. IntegralDensityStrategy - inversione di N(t)
 """
 
 import pytest
@@ -30,6 +32,8 @@ from unittest.mock import Mock, MagicMock, patch, PropertyMock
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+
 
 # =============================================================================
 # MOCK INFRASTRUCTURE
@@ -87,6 +91,11 @@ class MockParameter(_RealParameter):
             return self._value.evaluate(time)
         return float(self._value)
 
+    def get_values(self, times, rng=None, log_clips=True):
+        self.last_batch_args = (rng, log_clips)
+        values = np.array([self.get_value(t) for t in times], dtype=np.float64)
+        return values, np.zeros(len(values), dtype=bool)
+
 
 class MockEnvelope(_RealEnvelope):
     """
@@ -163,6 +172,7 @@ with patch.dict(sys.modules, {
     from strategies.strategie import (
         PitchStrategy, SemitonesStrategy, RatioStrategy,
         DensityStrategy, FillFactorStrategy, DirectDensityStrategy,
+        IntegralDensityStrategy,
     )
     from strategies.strategy_registry import (
         PITCH_STRATEGIES, DENSITY_STRATEGIES,
@@ -331,6 +341,20 @@ class TestSemitonesStrategyCalculate:
         # A t=10 -> 12 semitoni -> ratio 2.0
         assert strategy.calculate(10.0) == pytest.approx(2.0)
 
+    def test_calculate_many_matches_calculate(self):
+        """calculate_many(): semitoni in batch da get_values(), 2^(st/12) con exp2."""
+        strategy = SemitonesStrategy(_make_envelope_param([[0, -12], [10, 24]]))
+        times = np.linspace(0.0, 12.0, 25)
+        np.testing.assert_allclose(
+            strategy.calculate_many(times), [strategy.calculate(t) for t in times]
+        )
+
+    def test_calculate_many_forwards_rng_and_log_clips(self):
+        param = _make_param(7.0)
+        rng = np.random.default_rng(0)
+        SemitonesStrategy(param).calculate_many(np.zeros(3), rng=rng, log_clips=False)
+        assert param.last_batch_args == (rng, False)
+
     def test_result_always_positive(self):
         """Il ratio e sempre positivo (2^x > 0 per ogni x)."""
         for st in [-36, -24, -12, 0, 12, 24, 36]:
@@ -431,6 +455,14 @@ class TestRatioStrategyCalculate:
         assert strategy.calculate(5.0) == pytest.approx(1.5)
         assert strategy.calculate(10.0) == pytest.approx(2.0)
 
+    def test_calculate_many_matches_calculate(self):
+        """calculate_many(): passthrough batch di get_values()."""
+        strategy = RatioStrategy(_make_envelope_param([[0, 1.0], [10, 2.0]]))
+        times = np.linspace(0.0, 12.0, 25)
+        np.testing.assert_allclose(
+            strategy.calculate_many(times), [strategy.calculate(t) for t in times]
+        )
+
 
 class TestRatioStrategyProperties:
     """Test properties di RatioStrategy."""
@@ -743,6 +775,7 @@ class TestRegistryContent:
         ('pitch_ratio',     PITCH_STRATEGIES),
         ('fill_factor',     DENSITY_STRATEGIES),
         ('density',         DENSITY_STRATEGIES),
+        ('integral_density', DENSITY_STRATEGIES),
     ])
     def test_registry_contains_key(self, key, registry):
         """Ogni chiave attesa e' presente nel registry corretto."""
@@ -753,6 +786,7 @@ class TestRegistryContent:
         ('pitch_ratio',     PITCH_STRATEGIES,    RatioStrategy),
         ('fill_factor',     DENSITY_STRATEGIES,  FillFactorStrategy),
         ('density',         DENSITY_STRATEGIES,  DirectDensityStrategy),
+        ('integral_density', DENSITY_STRATEGIES, IntegralDensityStrategy),
     ])
     def test_registry_maps_to_correct_class(self, key, registry, expected_class):
         """Ogni chiave mappa alla classe di strategia corretta."""
@@ -763,8 +797,8 @@ class TestRegistryContent:
         assert len(PITCH_STRATEGIES) == 2
 
     def test_density_strategies_count(self):
-        """DENSITY_STRATEGIES ha esattamente 2 strategie."""
-        assert len(DENSITY_STRATEGIES) == 2
+        """DENSITY_STRATEGIES ha esattamente 3 strategie."""
+        assert len(DENSITY_STRATEGIES) == 3
 
     def test_all_pitch_strategies_are_subclass(self):
         """Tutte le strategie pitch sono subclass di PitchStrategy."""
@@ -1205,6 +1239,144 @@ class TestEdgeCases:
         assert r1 == pytest.approx(2.0)
         assert r2 == pytest.approx(2 ** (7/12))
 
+# =============================================================================
+# GRUPPO 14: VERSIONE BATCH (calculate_density_many)
+# =============================================================================
+
+def _with_values(param, values):
+    """MockParameter con get_values() batch che restituisce values."""
+    param.get_values = Mock(return_value=(np.asarray(values, dtype=float), None))
+    return param
+
+
+class TestCalculateDensityMany:
+    """calculate_density_many(): stessi valori di calculate_density() su array."""
+
+    TIMES = np.array([0.0, 2.5, 5.0, 10.0])
+
+    def test_default_per_element_with_context(self):
+        class _Scalar(DensityStrategy):
+            def calculate_density(self, elapsed_time, **context):
+                return elapsed_time + context['grain_duration']
+            @property
+            def name(self):
+                return "scalar"
+
+        result = _Scalar().calculate_density_many(
+            self.TIMES, grain_duration=np.array([0.1, 0.2, 0.3, 0.4])
+        )
+        np.testing.assert_allclose(result, [0.1, 2.7, 5.3, 10.4])
+        assert result.dtype == np.float64
+
+    def test_default_without_context(self):
+        strategy = DirectDensityStrategy(_make_envelope_param([[0, 10.0], [10, 100.0]]), _make_param(0.0))
+        result = DensityStrategy.calculate_density_many(strategy, self.TIMES)
+        np.testing.assert_allclose(result, [10.0, 32.5, 55.0, 100.0])
+
+    def test_direct_uses_get_values(self):
+        d_param = _with_values(_make_param(20.0), [20.0, 30.0, 40.0, 50.0])
+        strategy = DirectDensityStrategy(d_param, _make_param(0.0))
+        rng = np.random.default_rng(0)
+        result = strategy.calculate_density_many(self.TIMES, rng, False)
+        np.testing.assert_array_equal(result, [20.0, 30.0, 40.0, 50.0])
+        args = d_param.get_values.call_args[0]
+        assert args[1] is rng and args[2] is False
+
+    def test_fill_factor_formula(self):
+        ff_param = _with_values(_make_param(2.0), [2.0, 2.0, 4.0, 4.0])
+        strategy = FillFactorStrategy(ff_param, _make_param(0.0))
+        result = strategy.calculate_density_many(
+            self.TIMES, grain_duration=np.array([0.05, 0.1, 0.1, 0.2])
+        )
+        np.testing.assert_allclose(result, [40.0, 20.0, 40.0, 20.0])
+
+    def test_fill_factor_clamped_like_scalar(self):
+        ff_param = _with_values(_make_param(2.0), [2.0] * 4)
+        strategy = FillFactorStrategy(ff_param, _make_param(0.0))
+        durations = np.array([0.0001, 0.05, 10.0, 1000.0])
+        result = strategy.calculate_density_many(self.TIMES, grain_duration=durations)
+        expected = [strategy.calculate_density(t, grain_duration=d)
+                    for t, d in zip(self.TIMES, durations)]
+        np.testing.assert_allclose(result, expected)
+
+    def test_fill_factor_requires_grain_duration(self):
+        strategy = FillFactorStrategy(_make_param(2.0), _make_param(0.0))
+        with pytest.raises(ValueError, match="grain_duration"):
+            strategy.calculate_density_many(self.TIMES)
+
+
+# =============================================================================
+# GRUPPO 15: INTEGRAL DENSITY (inversione di N(t))
+# =============================================================================
+
+class TestIntegralDensityStrategy:
+    """Onset dove N(t) = integrale di density raggiunge un intero."""
+
+    def test_constant_rate_lattice(self):
+        strategy = IntegralDensityStrategy(_make_param(20.0), _make_param(0.0))
+        onsets = strategy.onset_times(1.0)
+        np.testing.assert_allclose(onsets, np.arange(20) / 20.0)
+        assert strategy.grain_count(1.0) == 20
+
+    def test_envelope_onsets_hit_integer_counts(self):
+        env = _RealEnvelope([[0, 10.0], [2, 200.0], [3, 5.0]])
+        strategy = IntegralDensityStrategy(_make_param(env), _make_param(0.0))
+
+        onsets = strategy.onset_times(4.0)
+
+        np.testing.assert_allclose(strategy.cumulative_count(onsets),
+                                   np.arange(len(onsets)), atol=1e-9)
+        assert len(onsets) == strategy.grain_count(4.0)
+        assert np.all(np.diff(onsets) > 0.0)
+
+    def test_grain_count_matches_integral(self):
+        env = _RealEnvelope([[0, 10.0], [1, 30.0]])
+        strategy = IntegralDensityStrategy(_make_param(env), _make_param(0.0))
+        # integrale = 20 su [0, 1] + 30 su [1, 2]
+        assert strategy.grain_count(2.0) == 50
+        assert strategy.grain_count(0.0) == 0
+
+    @pytest.mark.parametrize("duration, expected", [(1.1, 110), (2.2, 220), (0.7, 70)])
+    def test_grain_count_integral_just_above_integer(self, duration, expected):
+        """100 * 1.1 = 110.00000000000001: nessun onset in piu'."""
+        strategy = IntegralDensityStrategy(_make_param(100.0), _make_param(0.0))
+        assert strategy.grain_count(duration) == expected
+        assert len(strategy.onset_times(duration)) == expected
+
+    def test_step_envelope_fast_changes(self):
+        env = _RealEnvelope({'type': 'step', 'points': [[0, 5.0], [0.1, 500.0], [0.2, 5.0]]})
+        strategy = IntegralDensityStrategy(_make_param(env), _make_param(0.0))
+
+        onsets = strategy.onset_times(1.0)
+
+        np.testing.assert_allclose(strategy.cumulative_count(onsets),
+                                   np.arange(len(onsets)), atol=1e-9)
+
+    def test_scalar_recurrence_reproduces_lattice(self):
+        env = _RealEnvelope([[0, 10.0], [1, 80.0]])
+        strategy = IntegralDensityStrategy(_make_param(env), _make_param(0.0))
+
+        onsets = []
+        current = 0.0
+        while current < 1.5:
+            onsets.append(current)
+            current += 1.0 / strategy.calculate_density(current)
+
+        np.testing.assert_allclose(onsets, strategy.onset_times(1.5), atol=1e-9)
+
+    def test_batch_density_matches_scalar(self):
+        env = _RealEnvelope([[0, 10.0], [1, 80.0]])
+        strategy = IntegralDensityStrategy(_make_param(env), _make_param(0.0))
+        times = np.array([0.0, 0.13, 0.5, 0.99, 1.7])
+
+        expected = [strategy.calculate_density(t) for t in times]
+        np.testing.assert_allclose(strategy.calculate_density_many(times), expected)
+
+    def test_name(self):
+        strategy = IntegralDensityStrategy(_make_param(20.0), _make_param(0.0))
+        assert strategy.name == "integral_density"
+
+
 # =============================================================================
 # TEST COPERTURA CORPI ABSTRACT (righe 22, 28, 34, 90, 95)
 # =============================================================================
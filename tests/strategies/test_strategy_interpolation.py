@@ -336,6 +336,50 @@ class TestCubicIntegrate:
         assert 2.0 < area < 3.5
 
 
+    def test_integrate_exact_on_parabola(self, cubic_strategy):
+        """Hermite con tangenti esatte riproduce y = x^2: integrale 8/3 esatto."""
+        area = cubic_strategy.integrate(0, 2, [[0, 0], [2, 4]], tangents=[0, 4])
+        assert area == pytest.approx(8.0 / 3.0, rel=1e-14)
+
+    def test_integrate_partial_exact(self, cubic_strategy):
+        """Integrale parziale in forma chiusa: ∫[0.5, 1.5] x^2 = 13/12."""
+        area = cubic_strategy.integrate(0.5, 1.5, [[0, 0], [2, 4]], tangents=[0, 4])
+        assert area == pytest.approx(13.0 / 12.0, rel=1e-14)
+
+    def test_integrate_matches_fine_quadrature(self, cubic_strategy):
+        """Multi-tratto con tangenti arbitrarie contro quadratura fine."""
+        breakpoints = [[0, 1], [0.7, 3], [1.5, -2], [3, 0.5]]
+        tangents = [2.0, 0.0, -1.5, 4.0]
+        ts = [i * 3.0 / 30000 for i in range(30001)]
+        ys = [cubic_strategy.evaluate(t, breakpoints, tangents=tangents) for t in ts]
+        trapezoid = sum(0.5 * (a + b) * (3.0 / 30000) for a, b in zip(ys, ys[1:]))
+        area = cubic_strategy.integrate(0, 3, breakpoints, tangents=tangents)
+        assert area == pytest.approx(trapezoid, abs=1e-7)
+
+    def test_integrate_zero_length_segment(self, cubic_strategy):
+        """Tratto di durata nulla (salto) non contribuisce all'area."""
+        breakpoints = [[0, 0], [1, 2], [1, 5], [2, 5]]
+        area = cubic_strategy.integrate(0, 2, breakpoints, tangents=[0, 0, 0, 0])
+        assert area == pytest.approx(1.0 + 5.0)
+
+    def test_integrate_segment_many_matches_scalar(self, cubic_strategy):
+        import numpy as np
+        breakpoints = [[0, 1], [0.7, 3], [1.5, -2], [3, 0.5]]
+        tangents = [2.0, 0.0, -1.5, 4.0]
+        times = np.array([p[0] for p in breakpoints], dtype=float)
+        values = np.array([p[1] for p in breakpoints], dtype=float)
+        indices = np.array([0, 0, 1, 2, 2])
+        to_times = np.array([0.0, 0.35, 1.2, 1.5, 3.0])
+        expected = [
+            cubic_strategy.integrate_segment(i, times[i], t, breakpoints, tangents=tangents)
+            for i, t in zip(indices, to_times)
+        ]
+        result = cubic_strategy.integrate_segment_many(
+            indices, to_times, times, values, breakpoints, tangents=tangents
+        )
+        assert result.tolist() == pytest.approx(expected, abs=1e-15)
+
+
 # =============================================================================
 # 7. TEST PROPRIETA MATEMATICHE
 # =============================================================================
@@ -26,6 +26,8 @@ import random
 from unittest.mock import Mock, patch, MagicMock
 from abc import ABC
 
+import numpy as np
+
 from shared.distribution_strategy import DistributionStrategy
 from strategies.variation_strategy import (
     VariationStrategy,
@@ -759,4 +761,75 @@ class TestVariationStrategyAbstractBody:
 
         strategy = _ConcreteStrategy()
         result = strategy.apply(1.0, 0.5, mock_dist)
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+
+# =============================================================================
+# 13. TEST apply_many (versione batch)
+# =============================================================================
+
+class TestApplyMany:
+    """apply_many(): operazioni NumPy, campioni batch dalla distribuzione."""
+
+    @pytest.fixture
+    def batch_distribution(self):
+        dist = Mock(spec=DistributionStrategy)
+        dist.sample_many.side_effect = lambda centers, spreads, rng: centers + spreads
+        return dist
+
+    def test_additive_samples_only_active(self, additive, batch_distribution):
+        base = np.array([1.0, 2.0, 3.0])
+        mod_range = np.array([0.5, 0.0, 2.0])
+        result = additive.apply_many(base, mod_range, batch_distribution)
+        np.testing.assert_array_equal(result, [1.5, 2.0, 5.0])
+        centers, spreads, _ = batch_distribution.sample_many.call_args[0]
+        np.testing.assert_array_equal(centers, [1.0, 3.0])
+        np.testing.assert_array_equal(spreads, [0.5, 2.0])
+
+    def test_additive_no_active_no_sampling(self, additive, batch_distribution):
+        result = additive.apply_many(np.array([4.0]), np.array([0.0]), batch_distribution)
+        np.testing.assert_array_equal(result, [4.0])
+        batch_distribution.sample_many.assert_not_called()
+
+    def test_quantized_rounds_half_to_even(self, quantized, batch_distribution):
+        batch_distribution.sample_many.side_effect = lambda c, s, rng: np.array([0.5, 1.5, -2.6])
+        base = np.array([10.0, 10.0, 10.0, 10.0])
+        mod_range = np.array([1.0, 0.5, 3.0, 2.0])
+        result = quantized.apply_many(base, mod_range, batch_distribution)
+        np.testing.assert_array_equal(result, [10.0 + round(0.5), 10.0, 10.0 + round(1.5), 10.0 + round(-2.6)])
+
+    def test_quantized_centers_zero(self, quantized, batch_distribution):
+        quantized.apply_many(np.array([5.0, 6.0]), np.array([2.0, 3.0]), batch_distribution)
+        centers, _, _ = batch_distribution.sample_many.call_args[0]
+        np.testing.assert_array_equal(centers, [0.0, 0.0])
+
+    def test_invert(self, invert, batch_distribution):
+        result = invert.apply_many(np.array([0.0, 1.0]), np.array([0.0, 0.0]), batch_distribution)
+        np.testing.assert_array_equal(result, [1.0, 0.0])
+
+    def test_rng_forwarded(self, additive, batch_distribution):
+        rng = np.random.default_rng(0)
+        additive.apply_many(np.array([1.0]), np.array([1.0]), batch_distribution, rng)
+        assert batch_distribution.sample_many.call_args[0][2] is rng
+
+    def test_input_not_modified(self, additive, batch_distribution):
+        base = np.array([1.0, 2.0])
+        additive.apply_many(base, np.array([1.0, 1.0]), batch_distribution)
+        np.testing.assert_array_equal(base, [1.0, 2.0])
+
+    def test_default_falls_back_to_apply(self, mock_distribution):
+        class _Doubling(VariationStrategy):
+            def apply(self, base, mod_range, distribution):
+                return base * 2 + mod_range
+
+        result = _Doubling().apply_many(np.array([1.0, 2.0]), np.array([0.5, 0.0]), mock_distribution)
+        np.testing.assert_array_equal(result, [2.5, 4.0])
+
+    @pytest.mark.parametrize("mode", ['additive', 'quantized'])
+    def test_matches_scalar_statistically(self, mode):
+        from shared.distribution_strategy import UniformDistribution
+        strategy = {'additive': AdditiveVariation(), 'quantized': QuantizedVariation()}[mode]
+        random.seed(3)
+        result = strategy.apply_many(np.full(2000, 10.0), np.full(2000, 4.0), UniformDistribution())
+        assert np.all((result >= 8.0) & (result <= 12.0))
+        assert result.mean() == pytest.approx(10.0, abs=0.2)
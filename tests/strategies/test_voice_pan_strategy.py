@@ -571,6 +571,19 @@ class TestVoicePanStrategyFactory:
         result = VoicePanStrategyFactory.create('additive')
         assert isinstance(result, AdditivePanStrategy)
 
+    def test_create_attaches_rng(self):
+        """create(name, rng) assegna la sorgente casuale: offset random riproducibili."""
+        from shared.rng import SeededRandom
+        _, _, _, _, _, _, VoicePanStrategyFactory = _get_module()
+        a = VoicePanStrategyFactory.create('random', rng=SeededRandom.from_seed(5))
+        b = VoicePanStrategyFactory.create('random', rng=SeededRandom.from_seed(5))
+        assert [a.get_pan_offset(v, 4, 90.0) for v in range(4)] == \
+               [b.get_pan_offset(v, 4, 90.0) for v in range(4)]
+
+    def test_create_without_rng_uses_global_random(self):
+        _, _, _, _, _, _, VoicePanStrategyFactory = _get_module()
+        assert VoicePanStrategyFactory.create('random').rng is None
+
     def test_create_unknown_raises_valueerror(self):
         """create() con nome sconosciuto solleva ValueError."""
         _, _, _, _, _, _, VoicePanStrategyFactory = _get_module()
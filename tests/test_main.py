@@ -15,6 +15,7 @@ Copre:
 - main(): seconda chiamata a configure_clip_logger con yaml_basename
 """
 
+import os
 import sys
 import types
 import pytest
@@ -460,4 +461,172 @@ class TestPerStreamFlag:
         with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--per-stream']):
             with pytest.raises(SystemExit) as exc_info:
                 mocks['main'].main()
-        assert exc_info.value.code == 1
\ No newline at end of file
+        assert exc_info.value.code == 1
+
+# =============================================================================
+# TEST FLAG --engine
+# =============================================================================
+
+class TestEngineFlag:
+    """--engine NAME seleziona il motore di generazione di default."""
+
+    def test_engine_passed_to_generator(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--engine', 'vectorized']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', engine='vectorized')
+
+    def test_engine_missing_value_ignored(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--engine']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml')
+
+
+# =============================================================================
+# TEST FLAG --streaming
+# =============================================================================
+
+class TestStreamingFlag:
+    """--streaming attiva la scrittura incrementale dei grani."""
+
+    def test_streaming_passed_to_generator(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--streaming']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', streaming=True)
+
+    def test_streaming_ignored_with_visualize(self, mocks, capsys):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--streaming', '--visualize']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml')
+        assert '--streaming ignorato' in capsys.readouterr().out
+
+
+# =============================================================================
+# TEST FLAG --jobs
+# =============================================================================
+
+class TestJobsFlag:
+    """--jobs N / -j N abilita la generazione parallela."""
+
+    @pytest.mark.parametrize("flag", ['--jobs', '-j'])
+    def test_jobs_passed_to_generator(self, mocks, flag):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', flag, '4']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', jobs=4)
+
+
+# =============================================================================
+# TEST FLAG --from / --to
+# =============================================================================
+
+class TestTimeWindowFlags:
+    """--from T0 / --to T1 generano solo l'estratto [T0, T1)."""
+
+    def test_window_passed_to_generator(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--from', '30', '--to', '45.5']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', time_window=(30.0, 45.5))
+
+    def test_from_only_open_end(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--from', '12']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', time_window=(12.0, float('inf')))
+
+    def test_to_only_starts_at_zero(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--to', '8']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', time_window=(0.0, 8.0))
+
+    def test_window_disables_cache(self, mocks, capsys):
+        mocks['generator_instance'].generate_score_files_per_stream = MagicMock(return_value=[])
+        argv = ['main.py', 'test.yml', 'out.sco', '--per-stream', '--cache', '--from', '5']
+        with patch.object(sys, 'argv', argv):
+            mocks['main'].main()
+        call_kwargs = mocks['generator_instance'].generate_score_files_per_stream.call_args.kwargs
+        assert call_kwargs['cache_manager'] is None
+        assert '--cache ignorato' in capsys.readouterr().out
+
+
+class TestCompactScoreFlags:
+    """--compact / --precision attivano la codifica compatta dello score."""
+
+    def test_compact_passed_to_generator(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--compact']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', compact_score=True)
+
+    def test_precision_implies_compact(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--precision', 'onset=5,pan=1']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with(
+            'test.yml', compact_score=True, score_precision={'onset': 5, 'pan': 1}
+        )
+
+    def test_invalid_precision_raises(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--precision', 'gain=2']):
+            with pytest.raises(ValueError, match="Precisione"):
+                mocks['main'].main()
+
+
+class TestStableTablesFlag:
+    """--stable-tables: numeri ftable derivati dal contenuto."""
+
+    def test_stable_tables_passed_to_generator(self, mocks):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--stable-tables']):
+            mocks['main'].main()
+        mocks['Generator'].assert_called_once_with('test.yml', stable_tables=True)
+
+
+class TestRenderFlag:
+    """--render: rendering Csound degli score generati con RenderScheduler."""
+
+    @pytest.fixture
+    def render(self, mocks):
+        with patch.object(mocks['main'].RenderScheduler, 'render', return_value=[]) as render:
+            yield render
+
+    def test_no_render_by_default(self, mocks, render):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco']):
+            mocks['main'].main()
+        render.assert_not_called()
+
+    def test_render_single_score(self, mocks, render):
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--render']):
+            mocks['main'].main()
+        jobs, = render.call_args.args
+        assert [job.score_path for job in jobs] == ['out.sco']
+        assert jobs[0].output_path == os.path.join('output', 'out.aif')
+
+    def test_render_options(self, mocks):
+        with patch.object(mocks['main'], 'RenderScheduler') as MockScheduler:
+            MockScheduler.return_value.render.return_value = []
+            with patch.object(sys, 'argv', [
+                'main.py', 'test.yml', 'out.sco', '--render', '--jobs', '3',
+                '--csound', '/opt/cs', '--orc', 'orc/main.orc', '--sf-dir', 'aif',
+                '--log-dir', 'log', '--ss-dir', 'refs'
+            ]):
+                mocks['main'].main()
+        MockScheduler.assert_called_once_with(
+            orchestra='orc/main.orc', output_dir='aif', log_dir='log', csound='/opt/cs',
+            jobs=3, search_paths={'INCDIR': 'orc', 'SSDIR': 'refs'}
+        )
+
+    def test_per_stream_costs_from_stem_elements(self, mocks, render):
+        gen = mocks['generator_instance']
+        gen.generate_score_files_per_stream = MagicMock(return_value=['s1.sco', 'c1.sco'])
+        gen.stem_elements = {
+            's1.sco': MagicMock(voices=[], duration=30.0),
+            'c1.sco': MagicMock(spec=['duration'], duration=5.0),
+        }
+        with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--per-stream', '--render']):
+            mocks['main'].main()
+        jobs, = render.call_args.args
+        assert [(job.stem, job.cost) for job in jobs] == [('s1', 30.0), ('c1', 5.0)]
+
+    def test_failed_stem_exits_with_1(self, mocks):
+        from rendering.render_scheduler import RenderJob, RenderResult
+        failed = RenderResult(RenderJob('out', 'out.sco', 'out.aif', 'out.log'), 1, 0.1)
+        with patch.object(mocks['main'].RenderScheduler, 'render', return_value=[failed]):
+            with patch.object(sys, 'argv', ['main.py', 'test.yml', 'out.sco', '--render']):
+                with pytest.raises(SystemExit) as exc_info:
+                    mocks['main'].main()
+        assert exc_info.value.code == 1